@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for Valerie hot paths.
+
+Each command builds its own synthetic workload, so no production data or
+external services are needed.
+
+Usage:
+    python scripts/benchmark.py compare-suppliers
+    python scripts/benchmark.py compare-suppliers --suppliers 5000 --iterations 50
+    python scripts/benchmark.py analytics
+    python scripts/benchmark.py guardrails
+    python scripts/benchmark.py intents
+"""
+
+import asyncio
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import event
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from valerie.data.rankings import refresh_supplier_rankings
+from valerie.data.schema import Category, Supplier, SupplierCategory, SupplierItem
+from valerie.data.sources.sqlite import SQLiteDataSource
+
+app = typer.Typer(help="Run Valerie micro-benchmarks.")
+console = Console()
+
+
+@app.callback()
+def main():
+    """Run Valerie micro-benchmarks."""
+
+
+def seed_synthetic_data(
+    data_source: SQLiteDataSource,
+    suppliers: int,
+    items_per_supplier: int,
+    categories: int,
+    seed: int = 42,
+) -> None:
+    """Fill a data source with random suppliers, items and categories.
+
+    Args:
+        data_source: Empty SQLiteDataSource to populate.
+        suppliers: Number of suppliers.
+        items_per_supplier: Items created for each supplier.
+        categories: Number of level-3 categories.
+        seed: Random seed for reproducible datasets.
+    """
+    rng = random.Random(seed)
+    with data_source.db as session:
+        category_rows = [
+            Category(
+                name=f"Controlled Material-Group {i % 20}-Type {i}",
+                level1="Controlled Material",
+                level2=f"Group {i % 20}",
+                level3=f"Type {i}",
+            )
+            for i in range(categories)
+        ]
+        session.add_all(category_rows)
+        session.flush()
+
+        supplier_rows = []
+        for i in range(suppliers):
+            orders = rng.randint(1, 500)
+            amount = rng.uniform(1_000, 5_000_000)
+            supplier_rows.append(
+                Supplier(
+                    name=f"Supplier {i:05d}",
+                    total_orders=orders,
+                    total_amount=amount,
+                    avg_order_value=amount / orders,
+                )
+            )
+        session.add_all(supplier_rows)
+        session.flush()
+
+        for supplier in supplier_rows:
+            picked = rng.sample(category_rows, k=min(8, len(category_rows)))
+            for category in picked:
+                session.add(
+                    SupplierCategory(
+                        supplier_id=supplier.id,
+                        category_id=category.id,
+                        item_count=rng.randint(1, 50),
+                        total_amount=rng.uniform(100, 500_000),
+                    )
+                )
+            # Item codes are unique per supplier (shared across suppliers)
+            codes = rng.sample(range(suppliers * 4 + items_per_supplier), items_per_supplier)
+            for j, code in enumerate(codes):
+                price = rng.uniform(1, 1_000)
+                session.add(
+                    SupplierItem(
+                        supplier_id=supplier.id,
+                        item_code=f"ITM-{code:06d}",
+                        description=f"Synthetic part {j} for {supplier.name}",
+                        category_id=rng.choice(picked).id,
+                        avg_price=price,
+                        min_price=price * 0.9,
+                        max_price=price * 1.1,
+                        total_ordered_amount=rng.uniform(10, 100_000),
+                        order_count=rng.randint(1, 40),
+                    )
+                )
+        session.commit()
+
+    # Derived tables, as the importer would leave them
+    refresh_supplier_rankings(data_source.db.engine)
+
+
+def _timed(fn, iterations: int) -> tuple[float, float]:
+    """Run ``fn`` repeatedly and return (p50, p95) latency in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+@app.command("compare-suppliers")
+def compare_suppliers(
+    suppliers: int = typer.Option(2000, help="Suppliers in the synthetic dataset."),
+    items_per_supplier: int = typer.Option(20, help="Items per supplier."),
+    iterations: int = typer.Option(30, help="Timed runs per comparison size."),
+):
+    """Query count and latency of compare_suppliers for 2, 5 and 20 suppliers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_source = SQLiteDataSource(Path(tmp) / "bench.db")
+        console.print(f"Seeding {suppliers:,} suppliers x {items_per_supplier} items...")
+        seed_synthetic_data(data_source, suppliers, items_per_supplier, categories=200)
+
+        query_count = 0
+
+        def count_query(*args, **kwargs):
+            nonlocal query_count
+            query_count += 1
+
+        event.listen(data_source.db.engine, "before_cursor_execute", count_query)
+
+        table = Table(title="compare_suppliers")
+        table.add_column("Suppliers", justify="right")
+        table.add_column("Queries", justify="right")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p95 ms", justify="right")
+
+        rng = random.Random(7)
+        for size in (2, 5, 20):
+            ids = [str(i) for i in rng.sample(range(1, suppliers + 1), size)]
+            query_count = 0
+            compare = partial(
+                data_source._call_with_session, data_source._compare_suppliers_sync, ids
+            )
+            compare()
+            queries = query_count
+            p50, p95 = _timed(compare, iterations)
+            table.add_row(str(size), str(queries), f"{p50:.2f}", f"{p95:.2f}")
+
+        console.print(table)
+
+
+@app.command("analytics")
+def analytics(
+    suppliers: int = typer.Option(5000, help="Suppliers in the synthetic dataset."),
+    items_per_supplier: int = typer.Option(10, help="Items per supplier."),
+    categories: int = typer.Option(2000, help="Categories in the synthetic dataset."),
+    iterations: int = typer.Option(30, help="Timed runs per query."),
+):
+    """Latency of ranking/rollup/comparison queries: SQLite vs analytics snapshot."""
+    from valerie.data.sources.analytics import AnalyticsDataSource
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_source = SQLiteDataSource(Path(tmp) / "bench.db")
+        console.print(
+            f"Seeding {suppliers:,} suppliers x {items_per_supplier} items, "
+            f"{categories:,} categories..."
+        )
+        seed_synthetic_data(data_source, suppliers, items_per_supplier, categories)
+        engine = AnalyticsDataSource(data_source)
+
+        loop = asyncio.new_event_loop()
+        start = time.perf_counter()
+        loop.run_until_complete(engine.refresh())
+        console.print(f"Snapshot loaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        rng = random.Random(7)
+        ids = [str(i) for i in rng.sample(range(1, suppliers + 1), 5)]
+        queries = {
+            "get_top_suppliers(amount, 10)": lambda s: s.get_top_suppliers("amount", 10),
+            "get_top_suppliers(items, 50)": lambda s: s.get_top_suppliers("items", 50),
+            "get_categories()": lambda s: s.get_categories(),
+            "get_categories(level=3)": lambda s: s.get_categories(level=3),
+            "get_categories(parent)": lambda s: s.get_categories(parent="Controlled-Group 1"),
+            "compare_suppliers(5)": lambda s: s.compare_suppliers(ids),
+        }
+
+        table = Table(title="Analytics snapshot vs SQLite")
+        table.add_column("Query")
+        table.add_column("SQLite p50 ms", justify="right")
+        table.add_column("Snapshot p50 ms", justify="right")
+        table.add_column("Speedup", justify="right")
+        for label, query in queries.items():
+            sqlite_p50, _ = _timed(lambda: loop.run_until_complete(query(data_source)), iterations)
+            snapshot_p50, _ = _timed(lambda: loop.run_until_complete(query(engine)), iterations)
+            table.add_row(
+                label,
+                f"{sqlite_p50:.2f}",
+                f"{snapshot_p50:.2f}",
+                f"{sqlite_p50 / max(snapshot_p50, 1e-6):.1f}x",
+            )
+
+        loop.run_until_complete(data_source.close())
+        loop.close()
+        console.print(table)
+
+
+def synthetic_document(size: int, rng: random.Random, digits: bool = True) -> str:
+    """Build a pasted supplier document of roughly ``size`` characters.
+
+    Args:
+        size: Target length in characters.
+        rng: Random source.
+        digits: Include specs, lot numbers and quantities (and occasional PII).
+    """
+    words = (
+        "the supplier provides heat treatment anodizing and chemical processing for "
+        "aerospace titanium parts with nadcap accreditation delivered on schedule"
+    ).split()
+    lines = []
+    length = 0
+    while length < size:
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(8, 16)))
+        if digits:
+            line += f" lot {rng.randint(1000, 9999)} qty {rng.randint(1, 500)} per AMS 2750F"
+            if rng.random() < 0.02:
+                line += " contact buyer@example.com or 555-123-4567"
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+@app.command("guardrails")
+def guardrails(
+    iterations: int = typer.Option(20, help="Timed runs per document."),
+):
+    """Guardrail scan latency on pasted documents: per-call re.search vs compiled scanner."""
+    from valerie.infrastructure.guardrails import GuardrailsAgent
+
+    agent = GuardrailsAgent()
+
+    def legacy(text: str) -> None:
+        # Previous implementation: one re.search per pattern through the re cache
+        [n for n, p in GuardrailsAgent.PII_PATTERNS.items() if re.search(p, text, re.IGNORECASE)]
+        text_lower = text.lower()
+        any(re.search(p, text_lower) for p in GuardrailsAgent.INJECTION_PATTERNS)
+        [kw for kw in GuardrailsAgent.ITAR_KEYWORDS if kw in text_lower]
+
+    def scanner(text: str) -> None:
+        agent._check_pii(text)
+        agent._check_injection(text)
+        agent._check_itar(text)
+
+    rng = random.Random(7)
+    documents = {
+        "chat message": "Necesito proveedores de anodizado con nadcap, que es ITAR?",
+    }
+    for size in (1_000, 10_000, 100_000):
+        documents[f"{size // 1000}k chars, specs"] = synthetic_document(size, rng)
+        documents[f"{size // 1000}k chars, prose"] = synthetic_document(size, rng, digits=False)
+
+    table = Table(title="Guardrail scan")
+    table.add_column("Input")
+    table.add_column("re.search p50 ms", justify="right")
+    table.add_column("Scanner p50 ms", justify="right")
+    table.add_column("Speedup", justify="right")
+    for label, text in documents.items():
+        legacy_p50, _ = _timed(lambda: legacy(text), iterations)
+        scanner_p50, _ = _timed(lambda: scanner(text), iterations)
+        table.add_row(
+            label,
+            f"{legacy_p50:.3f}",
+            f"{scanner_p50:.3f}",
+            f"{legacy_p50 / max(scanner_p50, 1e-6):.1f}x",
+        )
+    console.print(table)
+
+    huge = synthetic_document(1_000_000, rng)
+    capped_p50, _ = _timed(lambda: scanner(huge), max(3, iterations // 5))
+    console.print(
+        f"1M-char paste with guardrails_scan_max_chars="
+        f"{agent.settings.guardrails_scan_max_chars:,}: {capped_p50:.1f} ms"
+    )
+
+
+@app.command("intents")
+def intents(
+    messages: int = typer.Option(5000, help="Synthetic chat messages to classify."),
+    iterations: int = typer.Option(10, help="Timed runs over the whole batch."),
+):
+    """Intent pattern matching: per-call re.search loop vs compiled intent matcher."""
+    from valerie.agents.intent_classifier import (
+        INTENT_PATTERNS,
+        PATTERN_MATCHER,
+        PATTERN_PRIORITY,
+    )
+    from valerie.domains.supplier.intents import INTENT_EXAMPLES
+
+    def legacy(message: str):
+        # Previous implementation: re.search per raw pattern in priority order
+        message_lower = message.lower()
+        for intent in PATTERN_PRIORITY:
+            for pattern in INTENT_PATTERNS[intent]:
+                if re.search(pattern, message_lower):
+                    return intent, 0.85 if len(pattern) > 15 else 0.75
+        return None, 0.0
+
+    rng = random.Random(7)
+    examples = [e for group in INTENT_EXAMPLES.values() for e in group]
+    chatter = (
+        "necesito ayuda con el pedido de la semana pasada gracias por la respuesta "
+        "the delivery arrived late please check the invoice numbers again"
+    ).split()
+    batch = [
+        rng.choice(examples)
+        if rng.random() < 0.5
+        else " ".join(rng.choice(chatter) for _ in range(rng.randint(4, 20)))
+        for _ in range(messages)
+    ]
+    mismatches = sum(
+        legacy(m) != (r.intent, r.confidence)
+        for m, r in zip(batch, PATTERN_MATCHER.classify_many(batch), strict=True)
+    )
+
+    legacy_p50, legacy_p95 = _timed(lambda: [legacy(m) for m in batch], iterations)
+    matcher_p50, matcher_p95 = _timed(lambda: PATTERN_MATCHER.classify_many(batch), iterations)
+
+    table = Table(title=f"Intent matching, {messages:,} messages")
+    table.add_column("Implementation")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("us/message", justify="right")
+    for label, p50, p95 in (
+        ("re.search loop", legacy_p50, legacy_p95),
+        ("IntentMatcher", matcher_p50, matcher_p95),
+    ):
+        table.add_row(label, f"{p50:.2f}", f"{p95:.2f}", f"{p50 * 1000 / messages:.2f}")
+    console.print(table)
+    console.print(
+        f"Speedup {legacy_p50 / max(matcher_p50, 1e-6):.1f}x, "
+        f"{mismatches} disagreements with the previous implementation"
+    )
+
+
+@app.command("rate-limit")
+def rate_limit(
+    clients: int = typer.Option(1000, help="Distinct client identifiers."),
+    requests: int = typer.Option(50000, help="Requests per algorithm."),
+    per_minute: int = typer.Option(60, help="Per-minute limit."),
+    per_hour: int = typer.Option(1000, help="Per-hour limit."),
+):
+    """In-memory rate limiting throughput: sliding log vs GCRA vs sliding window counter."""
+    import tracemalloc
+
+    from starlette.applications import Starlette
+
+    from valerie.middleware import RateLimitMiddleware
+
+    rng = random.Random(7)
+    start = time.time()
+    # Zipf-like traffic: a few hot clients hit their limits, the long tail does not
+    traffic = [
+        (f"ip:10.0.{i // 256}.{i % 256}", start + n * 3600 / requests)
+        for n, i in enumerate(
+            min(int(rng.paretovariate(1.2)) - 1, clients - 1) for _ in range(requests)
+        )
+    ]
+
+    table = Table(title=f"Rate limiting, {requests:,} requests from {clients:,} clients over 1h")
+    table.add_column("Algorithm")
+    table.add_column("req/s", justify="right")
+    table.add_column("us/request", justify="right")
+    table.add_column("Allowed", justify="right")
+    table.add_column("Peak KiB", justify="right")
+
+    def replay(algorithm: str) -> int:
+        middleware = RateLimitMiddleware(
+            Starlette(),
+            enabled=True,
+            per_minute=per_minute,
+            per_hour=per_hour,
+            redis_url="",
+            algorithm=algorithm,
+        )
+
+        async def run() -> int:
+            allowed = 0
+            for identifier, timestamp in traffic:
+                result = await middleware._check_rate_limit(identifier, timestamp)
+                allowed += result[0]
+            return allowed
+
+        return asyncio.run(run())
+
+    for algorithm in ("sliding_log", "sliding_window", "gcra"):
+        began = time.perf_counter()
+        allowed = replay(algorithm)
+        elapsed = time.perf_counter() - began
+
+        # Replay again with allocation tracing; the limiter state is what survives
+        tracemalloc.start()
+        replay(algorithm)
+        memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        table.add_row(
+            algorithm,
+            f"{requests / elapsed:,.0f}",
+            f"{elapsed * 1e6 / requests:.2f}",
+            f"{allowed:,}",
+            f"{memory / 1024:,.0f}",
+        )
+    console.print(table)
+    console.print("Peak KiB is the peak traced allocation during the replay, mostly limiter state")
+
+
+if __name__ == "__main__":
+    app()
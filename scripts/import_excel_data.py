@@ -1,19 +1,32 @@
 #!/usr/bin/env python3
 """Import supplier data from Excel file into SQLite database.
 
-This script reads PO history data from an Excel file and aggregates it into
-the Valerie chatbot database schema.
+This script reads PO history data from an Excel (.xlsx) or CSV export and
+aggregates it into the Valerie chatbot database schema.
 
 Usage:
     python scripts/import_excel_data.py --excel-path PATH --db-path data/valerie.db
+
+    # Large exports: bounded-memory PO dedup and batched bulk upserts
+    python scripts/import_excel_data.py --input export.csv --streaming
+
+    # Daily refresh: only rows newer than the last import's watermark
+    python scripts/import_excel_data.py --input export.csv --incremental
 """
 
+import csv
+import functools
+import hashlib
+import math
+import os
 import sys
-from collections import defaultdict
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
 
 import typer
 from openpyxl import load_workbook
@@ -27,7 +40,9 @@ from rich.progress import (
     TimeElapsedColumn,
     TimeRemainingColumn,
 )
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 
 # Add src to path for imports
@@ -36,11 +51,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from valerie.data.database import Database
 from valerie.data.schema import (
     Category,
+    ImportState,
     LegalEntity,
     Supplier,
     SupplierCategory,
     SupplierItem,
+    SupplierItemPriceStats,
 )
+from valerie.data.sources.cached import mark_data_changed
 
 app = typer.Typer(help="Import supplier data from Excel into SQLite database.")
 console = Console()
@@ -68,22 +86,128 @@ COLUMN_MAP = {
 }
 
 
+# HyperLogLog precision: 2**12 one-byte registers, ~1.6% standard error
+_HLL_PRECISION = 12
+
+# Distinct POs tracked exactly per supplier/legal entity in streaming mode
+# before switching to a HyperLogLog sketch
+STREAMING_PO_EXACT_LIMIT = 1024
+
+
+class DistinctCounter:
+    """Counts distinct PO numbers in bounded memory.
+
+    Values are kept as 64-bit hashes in a set until ``exact_limit`` distinct
+    values have been seen, then folded into a fixed-size HyperLogLog sketch.
+    With ``exact_limit=None`` the count stays exact.
+    """
+
+    __slots__ = ("exact_limit", "_hashes", "_registers")
+
+    def __init__(self, exact_limit: int | None = None):
+        self.exact_limit = exact_limit
+        self._hashes: set[int] | None = set()
+        self._registers: bytearray | None = None
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether the count is still exact (not yet a sketch)."""
+        return self._registers is None
+
+    def add(self, value: str) -> None:
+        """Add a value to the counter."""
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        if self._registers is not None:
+            self._add_to_sketch(hashed)
+            return
+        self._hashes.add(hashed)
+        if self.exact_limit is not None and len(self._hashes) > self.exact_limit:
+            self._convert_to_sketch()
+
+    def merge(self, other: "DistinctCounter") -> None:
+        """Merge another counter into this one (set union)."""
+        if self._registers is None and other._registers is None:
+            self._hashes |= other._hashes
+            if self.exact_limit is not None and len(self._hashes) > self.exact_limit:
+                self._convert_to_sketch()
+            return
+        if self._registers is None:
+            self._convert_to_sketch()
+        if other._registers is None:
+            for hashed in other._hashes:
+                self._add_to_sketch(hashed)
+        else:
+            self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def _convert_to_sketch(self) -> None:
+        """Replace the exact hash set with a HyperLogLog sketch."""
+        self._registers = bytearray(1 << _HLL_PRECISION)
+        for hashed in self._hashes:
+            self._add_to_sketch(hashed)
+        self._hashes = None
+
+    def _add_to_sketch(self, hashed: int) -> None:
+        """Update the sketch register selected by a 64-bit hash."""
+        index = hashed >> (64 - _HLL_PRECISION)
+        remainder = hashed & ((1 << (64 - _HLL_PRECISION)) - 1)
+        rank = (64 - _HLL_PRECISION) - remainder.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def __len__(self) -> int:
+        if self._registers is None:
+            return len(self._hashes)
+
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
 @dataclass
 class SupplierAgg:
     """Aggregation data for a supplier."""
 
     name: str
     site: str = ""
-    total_orders: int = 0
     total_amount: float = 0.0
-    first_order_date: Optional[datetime] = None
-    last_order_date: Optional[datetime] = None
-    po_numbers: set = field(default_factory=set)
+    first_order_date: datetime | None = None
+    last_order_date: datetime | None = None
+    po_numbers: DistinctCounter = field(default_factory=DistinctCounter)
+    base_orders: int = 0  # Orders counted by earlier imports
+
+    @property
+    def total_orders(self) -> int:
+        """Number of distinct purchase orders."""
+        return self.base_orders + len(self.po_numbers)
+
+    def merge(self, other: "SupplierAgg") -> None:
+        """Merge aggregates from later rows of the same supplier."""
+        self.base_orders += other.base_orders
+        self.total_amount += other.total_amount
+        if other.first_order_date and (
+            self.first_order_date is None or other.first_order_date < self.first_order_date
+        ):
+            self.first_order_date = other.first_order_date
+        if other.last_order_date and (
+            self.last_order_date is None or other.last_order_date > self.last_order_date
+        ):
+            self.last_order_date = other.last_order_date
+        self.po_numbers.merge(other.po_numbers)
 
 
 @dataclass
 class ItemAgg:
-    """Aggregation data for a supplier item."""
+    """Aggregation data for a supplier item.
+
+    Prices are kept as running count/sum/min/max rather than a list, so
+    memory per item is constant regardless of how often it was ordered.
+    """
 
     item_code: str
     supplier_name: str
@@ -91,11 +215,47 @@ class ItemAgg:
     supplier_item_code: str = ""
     category: str = ""
     uom: str = "EA"
-    prices: list = field(default_factory=list)
+    price_count: int = 0
+    price_sum: float = 0.0
+    min_price: float = 0.0
+    max_price: float = 0.0
     total_qty: float = 0.0
     total_amount: float = 0.0
     order_count: int = 0
-    last_order_date: Optional[datetime] = None
+    last_order_date: datetime | None = None
+
+    def add_price(self, price: float) -> None:
+        """Fold a unit price into the running price aggregates."""
+        if self.price_count == 0:
+            self.min_price = self.max_price = price
+        else:
+            self.min_price = min(self.min_price, price)
+            self.max_price = max(self.max_price, price)
+        self.price_count += 1
+        self.price_sum += price
+
+    @property
+    def avg_price(self) -> float:
+        """Mean unit price, or 0 if no priced lines were seen."""
+        return self.price_sum / self.price_count if self.price_count else 0.0
+
+    def merge(self, other: "ItemAgg") -> None:
+        """Merge aggregates from later rows of the same supplier item."""
+        if other.price_count:
+            if self.price_count == 0:
+                self.min_price, self.max_price = other.min_price, other.max_price
+            else:
+                self.min_price = min(self.min_price, other.min_price)
+                self.max_price = max(self.max_price, other.max_price)
+            self.price_count += other.price_count
+            self.price_sum += other.price_sum
+        self.total_qty += other.total_qty
+        self.total_amount += other.total_amount
+        self.order_count += other.order_count
+        if other.last_order_date and (
+            self.last_order_date is None or other.last_order_date > self.last_order_date
+        ):
+            self.last_order_date = other.last_order_date
 
 
 @dataclass
@@ -109,6 +269,11 @@ class CategoryAgg:
     item_count: int = 0
     total_amount: float = 0.0
 
+    def merge(self, other: "CategoryAgg") -> None:
+        """Merge aggregates from later rows of the same category."""
+        self.item_count += other.item_count
+        self.total_amount += other.total_amount
+
 
 @dataclass
 class SupplierCategoryAgg:
@@ -119,17 +284,69 @@ class SupplierCategoryAgg:
     item_count: int = 0
     total_amount: float = 0.0
 
+    def merge(self, other: "SupplierCategoryAgg") -> None:
+        """Merge aggregates from later rows of the same supplier category."""
+        self.item_count += other.item_count
+        self.total_amount += other.total_amount
+
 
 @dataclass
 class LegalEntityAgg:
     """Aggregation data for a legal entity."""
 
     name: str
-    total_orders: int = 0
     total_amount: float = 0.0
-    po_numbers: set = field(default_factory=set)
+    po_numbers: DistinctCounter = field(default_factory=DistinctCounter)
+    base_orders: int = 0  # Orders counted by earlier imports
 
+    @property
+    def total_orders(self) -> int:
+        """Number of distinct purchase orders."""
+        return self.base_orders + len(self.po_numbers)
 
+    def merge(self, other: "LegalEntityAgg") -> None:
+        """Merge aggregates from later rows of the same legal entity."""
+        self.base_orders += other.base_orders
+        self.total_amount += other.total_amount
+        self.po_numbers.merge(other.po_numbers)
+
+
+@dataclass
+class ImportAggregates:
+    """All aggregates built from one import file."""
+
+    suppliers: dict[str, SupplierAgg] = field(default_factory=dict)
+    items: dict[tuple[str, str], ItemAgg] = field(default_factory=dict)  # (supplier, item)
+    categories: dict[str, CategoryAgg] = field(default_factory=dict)
+    supplier_categories: dict[tuple[str, str], SupplierCategoryAgg] = field(
+        default_factory=dict
+    )
+    legal_entities: dict[str, LegalEntityAgg] = field(default_factory=dict)
+    rows_read: int = 0
+
+    def merge(self, other: "ImportAggregates") -> None:
+        """Merge aggregates built from rows that come after this one's.
+
+        Sums and extremes combine; fields taken from the first row seen
+        (supplier site, item description, category, UOM) keep this side's
+        value, so merging shards in file order matches a sequential run.
+        """
+        for mine, theirs in (
+            (self.suppliers, other.suppliers),
+            (self.items, other.items),
+            (self.categories, other.categories),
+            (self.supplier_categories, other.supplier_categories),
+            (self.legal_entities, other.legal_entities),
+        ):
+            for key, agg in theirs.items():
+                if key in mine:
+                    mine[key].merge(agg)
+                else:
+                    mine[key] = agg
+        self.rows_read += other.rows_read
+
+
+@functools.cache
 def parse_category(category_str: str) -> tuple[str, str, str]:
     """Parse category string into level1, level2, level3.
 
@@ -186,6 +403,23 @@ def parse_category(category_str: str) -> tuple[str, str, str]:
     return (level1, level2, level3)
 
 
+def _track_progress(
+    rows: Iterable[dict], progress: Progress, label: str
+) -> Iterator[dict]:
+    """Yield rows while updating a progress task every 1,000 rows."""
+    # The total row count is not known up front for streamed files
+    task = progress.add_task(f"[cyan]Reading {label} rows...", total=None)
+
+    row_count = 0
+    for row in rows:
+        yield row
+        row_count += 1
+        if row_count % 1000 == 0:
+            progress.update(task, advance=1000, description=f"[cyan]Read {row_count:,} rows...")
+
+    progress.update(task, completed=row_count, total=row_count)
+
+
 def read_excel_rows(excel_path: Path, progress: Progress):
     """Read rows from Excel file with progress tracking.
 
@@ -208,42 +442,178 @@ def read_excel_rows(excel_path: Path, progress: Progress):
         if header in COLUMN_MAP:
             header_map[i] = COLUMN_MAP[header]
 
-    # Count total rows (approximate for progress)
-    # For read-only mode, we can't easily get max_row, so estimate
-    task = progress.add_task("[cyan]Reading Excel rows...", total=None)
+    def rows():
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            yield {header_map[i]: value for i, value in enumerate(row) if i in header_map}
 
-    row_count = 0
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        row_dict = {}
-        for i, value in enumerate(row):
-            if i in header_map:
-                row_dict[header_map[i]] = value
-        yield row_dict
-        row_count += 1
-        if row_count % 1000 == 0:
-            progress.update(task, advance=1000, description=f"[cyan]Read {row_count:,} rows...")
+    try:
+        yield from _track_progress(rows(), progress, "Excel")
+    finally:
+        wb.close()
 
-    progress.update(task, completed=row_count, total=row_count)
-    wb.close()
 
+def read_csv_rows(csv_path: Path, progress: Progress):
+    """Read rows from a CSV export with progress tracking.
 
-def aggregate_data(excel_path: Path, progress: Progress):
-    """Aggregate data from Excel rows.
+    The CSV must use the same column headers as the Excel export. Values
+    are strings; empty cells are treated like empty Excel cells.
 
     Args:
-        excel_path: Path to the Excel file.
+        csv_path: Path to the CSV file.
         progress: Rich Progress instance.
 
-    Returns:
-        Tuple of (suppliers, items, categories, supplier_categories, legal_entities).
+    Yields:
+        Dict of column name -> value for each row.
     """
-    suppliers: dict[str, SupplierAgg] = {}
-    items: dict[tuple[str, str], ItemAgg] = {}  # (supplier_name, item_code)
-    categories: dict[str, CategoryAgg] = {}
-    supplier_categories: dict[tuple[str, str], SupplierCategoryAgg] = {}
-    legal_entities: dict[str, LegalEntityAgg] = {}
+    # utf-8-sig strips the BOM that Excel writes when saving as CSV
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        header_map = {
+            i: COLUMN_MAP[header.strip()]
+            for i, header in enumerate(headers)
+            if header.strip() in COLUMN_MAP
+        }
+
+        def rows():
+            for row in reader:
+                yield {
+                    header_map[i]: value or None
+                    for i, value in enumerate(row)
+                    if i in header_map
+                }
+
+        yield from _track_progress(rows(), progress, "CSV")
+
+
+def read_rows(path: Path, progress: Progress):
+    """Read rows from an Excel or CSV file, chosen by file extension.
+
+    Args:
+        path: Path to a .xlsx/.xlsm or .csv file.
+        progress: Rich Progress instance.
+
+    Yields:
+        Dict of column name -> value for each row.
+    """
+    if path.suffix.lower() == ".csv":
+        return read_csv_rows(path, progress)
+    return read_excel_rows(path, progress)
+
+
+def parse_creation_date(value) -> datetime | None:
+    """Convert an Open Date cell (datetime or ISO string) to a datetime."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _po_sort_key(po_number: str) -> tuple:
+    """Order PO numbers numerically when they are numeric."""
+    return (0, int(po_number), "") if po_number.isdigit() else (1, 0, po_number)
+
 
-    for row in read_excel_rows(excel_path, progress):
+class WatermarkFilter:
+    """Passes through only rows newer than a stored watermark.
+
+    The watermark is either the Open Date (``by="date"``) or the PO number
+    (``by="po"``, compared numerically for numeric POs). Rows without a
+    value for the watermark column are treated as already imported. The
+    highest value seen is kept in ``high`` to become the next watermark.
+
+    Rows equal to the watermark are treated as already imported too, so
+    rows a later export adds for the watermark's Open Date (or PO) are not
+    picked up by an incremental import; ``rows_at_watermark`` counts them
+    and a full import picks them up.
+    """
+
+    COLUMNS = {"date": "Open Date", "po": "Purchase Order Number"}
+
+    def __init__(self, by: str = "date", after: str | None = None):
+        """Initialize the filter.
+
+        Args:
+            by: Watermark column, "date" or "po".
+            after: Stored watermark; None passes every row through.
+        """
+        if by not in ("date", "po"):
+            raise ValueError(f"Unknown watermark column: {by}")
+        self.by = by
+        self.after = after
+        self.high = after
+        self.rows_skipped = 0
+        self.rows_without_value = 0
+        self.rows_at_watermark = 0
+        self._after_key = self._key(after) if after is not None else None
+        self._high_key = self._after_key
+
+    @property
+    def column(self) -> str:
+        """Export header of the watermark column."""
+        return self.COLUMNS[self.by]
+
+    def _key(self, value: str):
+        """Comparison key of a stored watermark value."""
+        return datetime.fromisoformat(value) if self.by == "date" else _po_sort_key(value)
+
+    def _row_value(self, row: dict) -> tuple[str | None, object]:
+        """Get a row's watermark value as (stored string, comparison key)."""
+        if self.by == "date":
+            date = parse_creation_date(row.get("creation_date"))
+            return (date.isoformat(), date) if date else (None, None)
+        po_number = str(row.get("po_number") or "").strip()
+        return (po_number, _po_sort_key(po_number)) if po_number else (None, None)
+
+    def __call__(self, rows: Iterable[dict]) -> Iterator[dict]:
+        for row in rows:
+            value, key = self._row_value(row)
+            if key is None:
+                self.rows_without_value += 1
+                if self._after_key is not None:
+                    self.rows_skipped += 1
+                    continue
+            else:
+                if self._after_key is not None and key <= self._after_key:
+                    self.rows_skipped += 1
+                    self.rows_at_watermark += key == self._after_key
+                    continue
+                if self._high_key is None or key > self._high_key:
+                    self.high, self._high_key = value, key
+            yield row
+
+
+# Rows per shard handed to a worker process in parallel mode
+PARALLEL_CHUNK_ROWS = 20_000
+
+
+def aggregate_rows(
+    rows: Iterable[dict], po_exact_limit: int | None = None
+) -> ImportAggregates:
+    """Aggregate parsed rows.
+
+    Args:
+        rows: Dicts of column name -> value.
+        po_exact_limit: Distinct POs counted exactly per supplier and legal
+                        entity before switching to an approximate sketch.
+                        None keeps all counts exact.
+
+    Returns:
+        The aggregated data.
+    """
+    aggregates = ImportAggregates()
+    suppliers = aggregates.suppliers
+    items = aggregates.items
+    categories = aggregates.categories
+    supplier_categories = aggregates.supplier_categories
+    legal_entities = aggregates.legal_entities
+
+    for row in rows:
+        aggregates.rows_read += 1
         supplier_name = str(row.get("supplier_name") or "").strip()
         if not supplier_name:
             continue
@@ -262,21 +632,20 @@ def aggregate_data(excel_path: Path, progress: Progress):
         legal_entity_name = str(row.get("legal_entity") or "").strip()
 
         # Convert creation_date to datetime if needed
-        if creation_date and not isinstance(creation_date, datetime):
-            try:
-                creation_date = datetime.fromisoformat(str(creation_date))
-            except ValueError:
-                creation_date = None
+        creation_date = parse_creation_date(creation_date)
 
         # Aggregate supplier data
         if supplier_name not in suppliers:
-            suppliers[supplier_name] = SupplierAgg(name=supplier_name, site=supplier_site)
+            suppliers[supplier_name] = SupplierAgg(
+                name=supplier_name,
+                site=supplier_site,
+                po_numbers=DistinctCounter(po_exact_limit),
+            )
 
         sup = suppliers[supplier_name]
         sup.total_amount += amount
-        if po_number and po_number not in sup.po_numbers:
+        if po_number:
             sup.po_numbers.add(po_number)
-            sup.total_orders += 1
 
         if creation_date:
             if sup.first_order_date is None or creation_date < sup.first_order_date:
@@ -299,7 +668,7 @@ def aggregate_data(excel_path: Path, progress: Progress):
 
             item = items[item_key]
             if unit_price > 0:
-                item.prices.append(unit_price)
+                item.add_price(unit_price)
             item.total_qty += quantity
             item.total_amount += amount
             item.order_count += 1
@@ -337,15 +706,80 @@ def aggregate_data(excel_path: Path, progress: Progress):
         # Aggregate legal entity data
         if legal_entity_name:
             if legal_entity_name not in legal_entities:
-                legal_entities[legal_entity_name] = LegalEntityAgg(name=legal_entity_name)
+                legal_entities[legal_entity_name] = LegalEntityAgg(
+                    name=legal_entity_name,
+                    po_numbers=DistinctCounter(po_exact_limit),
+                )
 
             le = legal_entities[legal_entity_name]
             le.total_amount += amount
-            if po_number and po_number not in le.po_numbers:
+            if po_number:
                 le.po_numbers.add(po_number)
-                le.total_orders += 1
 
-    return suppliers, items, categories, supplier_categories, legal_entities
+    return aggregates
+
+
+def _chunked(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """Split a row stream into lists of at most ``size`` rows."""
+    chunk: list[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def aggregate_data(
+    excel_path: Path,
+    progress: Progress,
+    po_exact_limit: int | None = None,
+    workers: int = 1,
+    chunk_rows: int = PARALLEL_CHUNK_ROWS,
+    row_filter: Callable[[Iterable[dict]], Iterable[dict]] | None = None,
+) -> ImportAggregates:
+    """Aggregate data from Excel or CSV rows.
+
+    Rows are consumed as a stream; memory grows with the number of distinct
+    suppliers, items and categories, not with the number of rows.
+
+    With ``workers > 1`` the file is still read by this process, but rows
+    are sharded into chunks that worker processes parse and aggregate.
+    Partial results are merged in file order, so the output does not
+    depend on which worker finishes first.
+
+    Args:
+        excel_path: Path to the Excel or CSV file.
+        progress: Rich Progress instance.
+        po_exact_limit: Distinct POs counted exactly per supplier and legal
+                        entity before switching to an approximate sketch.
+                        None keeps all counts exact.
+        workers: Number of worker processes; 1 aggregates in-process.
+        chunk_rows: Rows per shard in parallel mode.
+        row_filter: Applied to the row stream in this process before
+                    aggregation, e.g. a WatermarkFilter.
+
+    Returns:
+        The aggregated data.
+    """
+    rows = read_rows(excel_path, progress)
+    if row_filter is not None:
+        rows = row_filter(rows)
+    if workers <= 1:
+        return aggregate_rows(rows, po_exact_limit)
+
+    aggregates = ImportAggregates()
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _chunked(rows, chunk_rows):
+            pending.append(pool.submit(aggregate_rows, chunk, po_exact_limit))
+            # Bound the number of shards held in memory
+            if len(pending) >= workers * 2:
+                aggregates.merge(pending.popleft().result())
+        while pending:
+            aggregates.merge(pending.popleft().result())
+    return aggregates
 
 
 def insert_or_update_data(
@@ -406,7 +840,9 @@ def insert_or_update_data(
     supplier_id_map: dict[str, int] = {}
 
     for sup_agg in suppliers.values():
-        avg_order_value = sup_agg.total_amount / sup_agg.total_orders if sup_agg.total_orders > 0 else 0
+        avg_order_value = (
+            sup_agg.total_amount / sup_agg.total_orders if sup_agg.total_orders > 0 else 0
+        )
 
         existing = session.execute(
             select(Supplier).where(Supplier.name == sup_agg.name)
@@ -472,9 +908,9 @@ def insert_or_update_data(
             progress.advance(task)
             continue
 
-        avg_price = sum(item_agg.prices) / len(item_agg.prices) if item_agg.prices else 0
-        min_price = min(item_agg.prices) if item_agg.prices else 0
-        max_price = max(item_agg.prices) if item_agg.prices else 0
+        avg_price = item_agg.avg_price
+        min_price = item_agg.min_price
+        max_price = item_agg.max_price
 
         existing = session.execute(
             select(SupplierItem).where(
@@ -517,6 +953,17 @@ def insert_or_update_data(
 
     session.commit()
 
+    task = progress.add_task("[green]Recording item price statistics...", total=len(items))
+    _executemany_batched(
+        session.connection(),
+        _PRICE_STATS_UPSERT,
+        _price_stats_rows(items.values(), supplier_id_map),
+        5000,
+        progress,
+        task,
+    )
+    session.commit()
+
     # Insert/update supplier-category junctions
     task = progress.add_task(
         "[green]Inserting supplier-category relations...",
@@ -555,13 +1002,489 @@ def insert_or_update_data(
     session.commit()
 
 
+# Bulk upsert statements (SQLite >= 3.24). Conflict targets are the
+# natural keys the ORM path looks rows up by.
+_CATEGORY_UPSERT = """
+INSERT INTO categories (name, level1, level2, level3, item_count, total_amount)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    level1 = excluded.level1,
+    level2 = excluded.level2,
+    level3 = excluded.level3,
+    item_count = excluded.item_count,
+    total_amount = excluded.total_amount
+"""
+
+_SUPPLIER_UPSERT = """
+INSERT INTO suppliers (
+    name, site, total_orders, total_amount, avg_order_value,
+    first_order_date, last_order_date, created_at, updated_at
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    site = excluded.site,
+    total_orders = excluded.total_orders,
+    total_amount = excluded.total_amount,
+    avg_order_value = excluded.avg_order_value,
+    first_order_date = excluded.first_order_date,
+    last_order_date = excluded.last_order_date,
+    updated_at = excluded.updated_at
+"""
+
+_LEGAL_ENTITY_UPSERT = """
+INSERT INTO legal_entities (name, total_orders, total_amount)
+VALUES (?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    total_orders = excluded.total_orders,
+    total_amount = excluded.total_amount
+"""
+
+_SUPPLIER_ITEM_UPSERT = """
+INSERT INTO supplier_items (
+    supplier_id, item_code, description, supplier_item_code, category_id, uom,
+    avg_price, min_price, max_price, total_ordered_qty, total_ordered_amount,
+    order_count, last_order_date
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (supplier_id, item_code) DO UPDATE SET
+    description = excluded.description,
+    supplier_item_code = excluded.supplier_item_code,
+    category_id = excluded.category_id,
+    uom = excluded.uom,
+    avg_price = excluded.avg_price,
+    min_price = excluded.min_price,
+    max_price = excluded.max_price,
+    total_ordered_qty = excluded.total_ordered_qty,
+    total_ordered_amount = excluded.total_ordered_amount,
+    order_count = excluded.order_count,
+    last_order_date = excluded.last_order_date
+"""
+
+_PRICE_STATS_UPSERT = """
+INSERT INTO supplier_item_price_stats (supplier_item_id, price_count, price_sum)
+VALUES ((SELECT id FROM supplier_items WHERE supplier_id = ? AND item_code = ?), ?, ?)
+ON CONFLICT (supplier_item_id) DO UPDATE SET
+    price_count = excluded.price_count,
+    price_sum = excluded.price_sum
+"""
+
+_SUPPLIER_CATEGORY_UPSERT = """
+INSERT INTO supplier_categories (supplier_id, category_id, item_count, total_amount)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (supplier_id, category_id) DO UPDATE SET
+    item_count = excluded.item_count,
+    total_amount = excluded.total_amount
+"""
+
+
+def _sql_datetime(value: datetime | None) -> str | None:
+    """Format a datetime the way SQLAlchemy stores it in SQLite."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f") if value else None
+
+
+def _price_stats_rows(
+    items: Iterable[ItemAgg], supplier_id_map: dict[str, int]
+) -> Iterator[tuple]:
+    """Build _PRICE_STATS_UPSERT parameters for items of known suppliers."""
+    for item in items:
+        supplier_id = supplier_id_map.get(item.supplier_name)
+        if supplier_id:
+            yield (supplier_id, item.item_code, item.price_count, item.price_sum)
+
+
+def _ensure_supplier_item_key(connection: Connection) -> None:
+    """Make sure supplier_items has the unique key ON CONFLICT targets.
+
+    Databases created before the key was declared unique only have a plain
+    index on (supplier_id, item_code).
+    """
+    for index in connection.exec_driver_sql("PRAGMA index_list(supplier_items)"):
+        name, unique = index[1], index[2]
+        if not unique:
+            continue
+        columns = [
+            info[2] for info in connection.exec_driver_sql(f'PRAGMA index_info("{name}")')
+        ]
+        if columns == ["supplier_id", "item_code"]:
+            return
+    connection.exec_driver_sql(
+        "CREATE UNIQUE INDEX ux_supplier_item ON supplier_items (supplier_id, item_code)"
+    )
+
+
+def _executemany_batched(
+    connection: Connection,
+    statement: str,
+    rows: Iterable[tuple],
+    batch_size: int,
+    progress: Progress,
+    task,
+) -> None:
+    """Execute a statement with executemany over fixed-size batches of rows."""
+    batch: list[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            connection.exec_driver_sql(statement, batch)
+            progress.advance(task, len(batch))
+            batch = []
+    if batch:
+        connection.exec_driver_sql(statement, batch)
+        progress.advance(task, len(batch))
+
+
+def bulk_upsert_data(
+    connection: Connection,
+    aggregates: ImportAggregates,
+    progress: Progress,
+    batch_size: int = 5000,
+) -> None:
+    """Write aggregated data with batched INSERT ... ON CONFLICT DO UPDATE.
+
+    Same results as insert_or_update_data, without an ORM round trip per
+    row. Run it inside a single transaction (``engine.begin()``) so readers
+    never see a partially imported database.
+
+    Args:
+        connection: Connection with an open transaction.
+        aggregates: Aggregated data to write.
+        progress: Rich Progress instance.
+        batch_size: Rows per executemany call.
+    """
+    now = _sql_datetime(datetime.utcnow())
+    _ensure_supplier_item_key(connection)
+
+    task = progress.add_task("[green]Upserting categories...", total=len(aggregates.categories))
+    _executemany_batched(
+        connection,
+        _CATEGORY_UPSERT,
+        (
+            (c.name, c.level1, c.level2, c.level3, c.item_count, c.total_amount)
+            for c in aggregates.categories.values()
+        ),
+        batch_size,
+        progress,
+        task,
+    )
+    category_id_map = dict(connection.exec_driver_sql("SELECT name, id FROM categories").all())
+
+    task = progress.add_task("[green]Upserting suppliers...", total=len(aggregates.suppliers))
+    _executemany_batched(
+        connection,
+        _SUPPLIER_UPSERT,
+        (
+            (
+                s.name,
+                s.site,
+                s.total_orders,
+                s.total_amount,
+                s.total_amount / s.total_orders if s.total_orders > 0 else 0,
+                _sql_datetime(s.first_order_date),
+                _sql_datetime(s.last_order_date),
+                now,
+                now,
+            )
+            for s in aggregates.suppliers.values()
+        ),
+        batch_size,
+        progress,
+        task,
+    )
+    supplier_id_map = dict(connection.exec_driver_sql("SELECT name, id FROM suppliers").all())
+
+    task = progress.add_task(
+        "[green]Upserting legal entities...", total=len(aggregates.legal_entities)
+    )
+    _executemany_batched(
+        connection,
+        _LEGAL_ENTITY_UPSERT,
+        ((le.name, le.total_orders, le.total_amount) for le in aggregates.legal_entities.values()),
+        batch_size,
+        progress,
+        task,
+    )
+
+    task = progress.add_task("[green]Upserting supplier items...", total=len(aggregates.items))
+    _executemany_batched(
+        connection,
+        _SUPPLIER_ITEM_UPSERT,
+        (
+            (
+                supplier_id_map[i.supplier_name],
+                i.item_code,
+                i.description,
+                i.supplier_item_code,
+                category_id_map.get(i.category) if i.category else None,
+                i.uom,
+                i.avg_price,
+                i.min_price,
+                i.max_price,
+                i.total_qty,
+                i.total_amount,
+                i.order_count,
+                _sql_datetime(i.last_order_date),
+            )
+            for i in aggregates.items.values()
+            if i.supplier_name in supplier_id_map
+        ),
+        batch_size,
+        progress,
+        task,
+    )
+
+    task = progress.add_task(
+        "[green]Upserting item price statistics...", total=len(aggregates.items)
+    )
+    _executemany_batched(
+        connection,
+        _PRICE_STATS_UPSERT,
+        _price_stats_rows(aggregates.items.values(), supplier_id_map),
+        batch_size,
+        progress,
+        task,
+    )
+
+    task = progress.add_task(
+        "[green]Upserting supplier-category relations...",
+        total=len(aggregates.supplier_categories),
+    )
+    _executemany_batched(
+        connection,
+        _SUPPLIER_CATEGORY_UPSERT,
+        (
+            (
+                supplier_id_map[sc.supplier_name],
+                category_id_map[sc.category_name],
+                sc.item_count,
+                sc.total_amount,
+            )
+            for sc in aggregates.supplier_categories.values()
+            if sc.supplier_name in supplier_id_map and sc.category_name in category_id_map
+        ),
+        batch_size,
+        progress,
+        task,
+    )
+
+
+# Keys per IN (...) lookup, well under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 400
+
+
+def _batches(values: list, size: int = _LOOKUP_CHUNK) -> Iterator[list]:
+    """Split a list into consecutive slices of at most ``size`` values."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def load_existing_aggregates(connection: Connection, delta: ImportAggregates) -> ImportAggregates:
+    """Load the stored aggregates for every key that appears in a delta.
+
+    Only rows touched by the delta are read, so the cost is proportional
+    to the new data rather than to the stored history.
+
+    Args:
+        connection: Database connection.
+        delta: Aggregates of the new rows.
+
+    Returns:
+        Stored aggregates as *Agg objects, ready to ``merge(delta)`` into.
+    """
+    existing = ImportAggregates()
+
+    for names in _batches(list(delta.suppliers)):
+        for row in connection.execute(
+            select(
+                Supplier.name,
+                Supplier.site,
+                Supplier.total_orders,
+                Supplier.total_amount,
+                Supplier.first_order_date,
+                Supplier.last_order_date,
+            ).where(Supplier.name.in_(names))
+        ):
+            existing.suppliers[row.name] = SupplierAgg(
+                name=row.name,
+                site=row.site or "",
+                total_amount=row.total_amount or 0.0,
+                first_order_date=row.first_order_date,
+                last_order_date=row.last_order_date,
+                base_orders=row.total_orders or 0,
+            )
+
+    for keys in _batches(list(delta.items)):
+        for row in connection.execute(
+            select(
+                Supplier.name.label("supplier_name"),
+                SupplierItem.item_code,
+                SupplierItem.description,
+                SupplierItem.supplier_item_code,
+                Category.name.label("category"),
+                SupplierItem.uom,
+                SupplierItem.avg_price,
+                SupplierItem.min_price,
+                SupplierItem.max_price,
+                SupplierItem.total_ordered_qty,
+                SupplierItem.total_ordered_amount,
+                SupplierItem.order_count,
+                SupplierItem.last_order_date,
+                SupplierItemPriceStats.price_count,
+                SupplierItemPriceStats.price_sum,
+            )
+            .join(Supplier, Supplier.id == SupplierItem.supplier_id)
+            .outerjoin(Category, Category.id == SupplierItem.category_id)
+            .outerjoin(
+                SupplierItemPriceStats,
+                SupplierItemPriceStats.supplier_item_id == SupplierItem.id,
+            )
+            .where(tuple_(Supplier.name, SupplierItem.item_code).in_(keys))
+        ):
+            price_count, price_sum = row.price_count, row.price_sum
+            if price_count is None:
+                # Imported before price statistics were recorded: every
+                # order line is assumed to have carried a price
+                price_count = row.order_count or 0 if row.max_price else 0
+                price_sum = (row.avg_price or 0.0) * price_count
+            existing.items[(row.supplier_name, row.item_code)] = ItemAgg(
+                item_code=row.item_code,
+                supplier_name=row.supplier_name,
+                description=row.description or "",
+                supplier_item_code=row.supplier_item_code or "",
+                category=row.category or "",
+                uom=row.uom or "EA",
+                price_count=price_count,
+                price_sum=price_sum or 0.0,
+                min_price=row.min_price or 0.0,
+                max_price=row.max_price or 0.0,
+                total_qty=row.total_ordered_qty or 0.0,
+                total_amount=row.total_ordered_amount or 0.0,
+                order_count=row.order_count or 0,
+                last_order_date=row.last_order_date,
+            )
+
+    for names in _batches(list(delta.categories)):
+        for row in connection.execute(
+            select(
+                Category.name,
+                Category.level1,
+                Category.level2,
+                Category.level3,
+                Category.item_count,
+                Category.total_amount,
+            ).where(Category.name.in_(names))
+        ):
+            existing.categories[row.name] = CategoryAgg(
+                name=row.name,
+                level1=row.level1 or "",
+                level2=row.level2 or "",
+                level3=row.level3 or "",
+                item_count=row.item_count or 0,
+                total_amount=row.total_amount or 0.0,
+            )
+
+    for keys in _batches(list(delta.supplier_categories)):
+        for row in connection.execute(
+            select(
+                Supplier.name.label("supplier_name"),
+                Category.name.label("category_name"),
+                SupplierCategory.item_count,
+                SupplierCategory.total_amount,
+            )
+            .join(Supplier, Supplier.id == SupplierCategory.supplier_id)
+            .join(Category, Category.id == SupplierCategory.category_id)
+            .where(tuple_(Supplier.name, Category.name).in_(keys))
+        ):
+            existing.supplier_categories[(row.supplier_name, row.category_name)] = (
+                SupplierCategoryAgg(
+                    supplier_name=row.supplier_name,
+                    category_name=row.category_name,
+                    item_count=row.item_count or 0,
+                    total_amount=row.total_amount or 0.0,
+                )
+            )
+
+    for names in _batches(list(delta.legal_entities)):
+        for row in connection.execute(
+            select(
+                LegalEntity.name, LegalEntity.total_orders, LegalEntity.total_amount
+            ).where(LegalEntity.name.in_(names))
+        ):
+            existing.legal_entities[row.name] = LegalEntityAgg(
+                name=row.name,
+                total_amount=row.total_amount or 0.0,
+                base_orders=row.total_orders or 0,
+            )
+
+    return existing
+
+
+def merge_delta(
+    connection: Connection,
+    delta: ImportAggregates,
+    progress: Progress,
+    batch_size: int = 5000,
+) -> ImportAggregates:
+    """Fold the aggregates of new rows into the stored aggregates.
+
+    Stored values are loaded for the touched keys, combined with the delta
+    through the same merge() rules used for parallel shards (sums, min/max
+    prices and dates, price-weighted averages, order counts), and written
+    back with bulk upserts.
+
+    Args:
+        connection: Connection with an open transaction.
+        delta: Aggregates of the new rows.
+        progress: Rich Progress instance.
+        batch_size: Rows per executemany call.
+
+    Returns:
+        The merged aggregates that were written.
+    """
+    merged = load_existing_aggregates(connection, delta)
+    merged.merge(delta)
+    bulk_upsert_data(connection, merged, progress, batch_size=batch_size)
+    return merged
+
+
+def read_import_state(connection: Connection, source: str) -> ImportState | None:
+    """Get the stored import state of a source, if it was imported before."""
+    row = connection.execute(
+        select(ImportState.__table__).where(ImportState.source == source)
+    ).first()
+    return ImportState(**row._mapping) if row else None
+
+
+def write_import_state(
+    connection: Connection,
+    source: str,
+    watermark: WatermarkFilter,
+    mode: str,
+    rows_read: int,
+    rows_imported: int,
+) -> None:
+    """Record the watermark and counters of a finished import."""
+    values = {
+        "watermark_by": watermark.by,
+        "watermark": watermark.high,
+        "last_mode": mode,
+        "rows_read": rows_read,
+        "rows_imported": rows_imported,
+        "imported_at": datetime.utcnow(),
+    }
+    statement = sqlite_insert(ImportState).values(source=source, **values)
+    connection.execute(
+        statement.on_conflict_do_update(index_elements=["source"], set_=values)
+    )
+
+
 @app.command()
 def main(
     excel_path: Path = typer.Option(
         ...,
         "--excel-path",
+        "--input",
         "-e",
-        help="Path to the Excel file containing PO history data.",
+        help="Path to the Excel (.xlsx) or CSV file containing PO history data.",
         exists=True,
         dir_okay=False,
         readable=True,
@@ -577,20 +1500,97 @@ def main(
         "--drop-existing",
         help="Drop existing tables before import.",
     ),
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help=(
+            "Large-export mode: approximate PO counts beyond "
+            f"{STREAMING_PO_EXACT_LIMIT:,} orders per supplier and batched "
+            "bulk upserts in a single transaction."
+        ),
+    ),
+    batch_size: int = typer.Option(
+        5000,
+        "--batch-size",
+        help="Rows per executemany batch in streaming mode.",
+        min=1,
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        help="Worker processes for aggregation (0 = one per CPU).",
+        min=0,
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help=(
+            "Only import rows newer than the watermark of the previous import; "
+            "rows equal to the watermark are treated as already imported."
+        ),
+    ),
+    watermark_by: str = typer.Option(
+        "date",
+        "--watermark-by",
+        help="Watermark column for incremental imports: 'date' (Open Date) or 'po'.",
+    ),
+    source: str = typer.Option(
+        "po_history",
+        "--source",
+        help="Name under which the import watermark is stored.",
+    ),
 ):
-    """Import supplier data from Excel file into SQLite database."""
-    console.print(f"\n[bold blue]Valerie Chatbot - Excel Data Import[/bold blue]\n")
-    console.print(f"Excel file: [green]{excel_path}[/green]")
+    """Import supplier data from Excel or CSV file into SQLite database."""
+    console.print("\n[bold blue]Valerie Chatbot - Excel Data Import[/bold blue]\n")
+    console.print(f"Input file: [green]{excel_path}[/green]")
     console.print(f"Database:   [green]{db_path}[/green]\n")
 
+    # Validate every option before anything is dropped
+    if watermark_by not in ("date", "po"):
+        console.print(f"[red]--watermark-by must be 'date' or 'po', got '{watermark_by}'[/red]")
+        raise typer.Exit(1)
+    if incremental and drop_existing:
+        console.print(
+            "[red]--incremental cannot be combined with --drop-existing, "
+            "which deletes the stored watermark[/red]"
+        )
+        raise typer.Exit(1)
+
     # Initialize database
     db = Database(db_path)
+    db.create_tables()
+
+    with db.engine.connect() as connection:
+        state = read_import_state(connection, source)
+    if incremental and state is None:
+        console.print(
+            f"[yellow]No previous import of '{source}', running a full import[/yellow]"
+        )
+        incremental = False
+    if incremental and state.watermark_by != watermark_by:
+        console.print(
+            f"[red]'{source}' was imported with --watermark-by {state.watermark_by}; "
+            f"run a full import to switch to '{watermark_by}'[/red]"
+        )
+        raise typer.Exit(1)
+    if incremental and state.watermark is None:
+        # Without a watermark every row would pass and be added a second time
+        console.print(
+            f"[red]'{source}' has no stored watermark: no row of the previous import had a "
+            f"parseable {WatermarkFilter.COLUMNS[watermark_by]}. Run a full import with "
+            "--drop-existing instead[/red]"
+        )
+        raise typer.Exit(1)
 
     if drop_existing:
         console.print("[yellow]Dropping existing tables...[/yellow]")
         db.drop_tables()
+        db.create_tables()
 
-    db.create_tables()
+    watermark = WatermarkFilter(watermark_by, state.watermark if incremental else None)
+    if incremental:
+        console.print(f"Watermark:  [green]{watermark_by} > {state.watermark}[/green]")
 
     with Progress(
         SpinnerColumn(),
@@ -601,33 +1601,102 @@ def main(
         TimeRemainingColumn(),
         console=console,
     ) as progress:
-        # Phase 1: Aggregate data from Excel
+        # Phase 1: Aggregate data from Excel/CSV
         console.print("\n[bold]Phase 1: Reading and aggregating data[/bold]")
-        suppliers, items, categories, supplier_categories, legal_entities = aggregate_data(
-            excel_path, progress
+        started = time.perf_counter()
+        aggregates = aggregate_data(
+            excel_path,
+            progress,
+            po_exact_limit=STREAMING_PO_EXACT_LIMIT if streaming else None,
+            workers=workers or os.cpu_count() or 1,
+            row_filter=watermark,
         )
+        read_seconds = time.perf_counter() - started
+        rows_read = aggregates.rows_read + watermark.rows_skipped
 
-        console.print(f"\n[cyan]Found:[/cyan]")
-        console.print(f"  - {len(suppliers):,} suppliers")
-        console.print(f"  - {len(items):,} unique items")
-        console.print(f"  - {len(categories):,} categories")
-        console.print(f"  - {len(supplier_categories):,} supplier-category relations")
-        console.print(f"  - {len(legal_entities):,} legal entities")
+        console.print(
+            f"\n[cyan]Read {rows_read:,} rows in {read_seconds:.1f}s "
+            f"({rows_read / max(read_seconds, 1e-9):,.0f} rows/s)[/cyan]"
+        )
+        if incremental:
+            console.print(
+                f"[cyan]Skipped {watermark.rows_skipped:,} rows at or before the watermark[/cyan]"
+            )
+            if watermark.rows_at_watermark:
+                console.print(
+                    f"[yellow]{watermark.rows_at_watermark:,} rows equal to the watermark "
+                    f"({state.watermark}) were treated as already imported; run a full import "
+                    "if the export added rows for it since the last import[/yellow]"
+                )
+        if watermark.rows_without_value:
+            console.print(
+                f"[yellow]{watermark.rows_without_value:,} rows have no parseable "
+                f"{watermark.column} and are not covered by the watermark[/yellow]"
+            )
+        if watermark.high is None:
+            console.print(
+                f"[yellow]No {watermark.column} to store as watermark: "
+                "--incremental will need a full import first[/yellow]"
+            )
+        console.print("[cyan]Found:[/cyan]")
+        console.print(f"  - {len(aggregates.suppliers):,} suppliers")
+        console.print(f"  - {len(aggregates.items):,} unique items")
+        console.print(f"  - {len(aggregates.categories):,} categories")
+        console.print(f"  - {len(aggregates.supplier_categories):,} supplier-category relations")
+        console.print(f"  - {len(aggregates.legal_entities):,} legal entities")
 
         # Phase 2: Insert/update data in database
         console.print("\n[bold]Phase 2: Inserting data into database[/bold]")
-        with db.get_session() as session:
-            insert_or_update_data(
-                session,
-                suppliers,
-                items,
-                categories,
-                supplier_categories,
-                legal_entities,
-                progress,
-            )
+        if incremental:
+            with db.engine.begin() as connection:
+                merge_delta(connection, aggregates, progress, batch_size=batch_size)
+                write_import_state(
+                    connection, source, watermark, "incremental", rows_read, aggregates.rows_read
+                )
+        elif streaming:
+            with db.engine.begin() as connection:
+                bulk_upsert_data(connection, aggregates, progress, batch_size=batch_size)
+                write_import_state(
+                    connection, source, watermark, "full", rows_read, aggregates.rows_read
+                )
+        else:
+            with db.get_session() as session:
+                insert_or_update_data(
+                    session,
+                    aggregates.suppliers,
+                    aggregates.items,
+                    aggregates.categories,
+                    aggregates.supplier_categories,
+                    aggregates.legal_entities,
+                    progress,
+                )
+            with db.engine.begin() as connection:
+                write_import_state(
+                    connection, source, watermark, "full", rows_read, aggregates.rows_read
+                )
+
+        # Phase 3: Refresh derived tables
+        ranked = db.refresh_supplier_rankings()
+        console.print(f"\n[bold]Phase 3: Ranked {ranked:,} suppliers[/bold]")
+
+        # Phase 4: Refresh the full-text search index. Incremental imports
+        # only touch a few rows, which the index triggers already applied.
+        if incremental:
+            console.print("\n[bold]Phase 4: Search index updated incrementally[/bold]")
+        elif db.rebuild_search_index():
+            console.print("\n[bold]Phase 4: Rebuilt full-text search index[/bold]")
+        else:
+            console.print("\n[yellow]FTS5 unavailable, skipping search index[/yellow]")
+
+    # Invalidate query caches of running chatbot processes
+    mark_data_changed(db_path)
 
-    console.print(f"\n[bold green]Import complete![/bold green]")
+    total_seconds = time.perf_counter() - started
+    console.print(
+        f"\n[bold green]Import complete![/bold green] "
+        f"{rows_read:,} rows in {total_seconds:.1f}s "
+        f"({rows_read / max(total_seconds, 1e-9):,.0f} rows/s)"
+    )
     console.print(f"Database saved to: [green]{db_path.absolute()}[/green]\n")
 
 
@@ -15,6 +15,10 @@ from ..llm import (
     get_llm_provider,
 )
 from ..llm.base import MessageRole
+from ..llm.cache import CachedLLMProvider, get_response_cache
+from ..llm.hedging import get_hedged_provider
+from ..llm.langchain_chat import LangChainChatProvider
+from ..llm.retry import RetryEngine, RetryPolicy
 from ..models import AgentOutput, ChatState, Settings, get_settings
 
 logger = logging.getLogger(__name__)
@@ -29,12 +33,14 @@ class BaseAgent(ABC):
 
     name: str = "base_agent"
     use_provider: bool = False  # Set to True to use new LLM provider abstraction
+    hedged: bool = False  # Hedge slow provider calls when VALERIE_LLM_HEDGE_PROVIDERS is set
 
     def __init__(self, settings: Settings | None = None):
         """Initialize the agent."""
         self.settings = settings or get_settings()
         self._llm: ChatAnthropic | None = None
         self._provider: BaseLLMProvider | None = None
+        self._retry_engine: RetryEngine | None = None
 
     @property
     def llm(self) -> ChatAnthropic:
@@ -48,13 +54,33 @@ class BaseAgent(ABC):
             )
         return self._llm
 
+    def _langchain_provider(self) -> BaseLLMProvider:
+        """Get the LangChain LLM wrapped in the provider interface.
+
+        Returns:
+            LangChainChatProvider reporting the model's real provider and
+            model name, behind the response cache when it is enabled.
+        """
+        provider = LangChainChatProvider(self.llm, self.settings.model_name)
+        cache = get_response_cache()
+        return CachedLLMProvider(provider, cache) if cache else provider
+
     @property
     def provider(self) -> BaseLLMProvider:
         """Get the LLM provider instance (lazy initialization)."""
         if self._provider is None:
-            self._provider = get_llm_provider()
+            provider = (get_hedged_provider() if self.hedged else None) or get_llm_provider()
+            cache = get_response_cache()
+            self._provider = CachedLLMProvider(provider, cache) if cache else provider
         return self._provider
 
+    @property
+    def retry_engine(self) -> RetryEngine:
+        """Get the retry/failover engine for provider calls (lazy initialization)."""
+        if self._retry_engine is None:
+            self._retry_engine = RetryEngine(RetryPolicy.from_settings(self.settings))
+        return self._retry_engine
+
     @abstractmethod
     def get_system_prompt(self) -> str:
         """Get the system prompt for this agent."""
@@ -96,9 +122,11 @@ class BaseAgent(ABC):
         """Invoke the LLM with a message.
 
         Uses either LangChain (legacy) or the new provider abstraction
-        based on the use_provider flag.
+        based on the use_provider flag. Hedged agents use the provider
+        abstraction whenever a hedged provider is configured, since only
+        provider calls can be hedged.
         """
-        if self.use_provider:
+        if self.use_provider or (self.hedged and get_hedged_provider() is not None):
             return await self._invoke_provider(user_message, system_prompt, context)
         else:
             return await self._invoke_langchain(user_message, system_prompt, context)
@@ -109,7 +137,11 @@ class BaseAgent(ABC):
         system_prompt: str | None = None,
         context: list[Any] | None = None,
     ) -> str:
-        """Invoke using LangChain (legacy method)."""
+        """Invoke using LangChain (legacy method).
+
+        The call goes through the retry engine like provider calls, so it
+        gets backoff, retry-after, the deadline budget and failover.
+        """
         messages = []
 
         if system_prompt:
@@ -124,8 +156,19 @@ class BaseAgent(ABC):
 
         messages.append(HumanMessage(content=user_message))
 
-        response = await self.llm.ainvoke(messages)
-        return str(response.content)
+        roles = {SystemMessage: MessageRole.SYSTEM, AIMessage: MessageRole.ASSISTANT}
+        llm_messages = [
+            LLMMessage(role=roles.get(type(m), MessageRole.USER), content=str(m.content))
+            for m in messages
+        ]
+        config = LLMConfig(
+            temperature=self.settings.temperature,
+            max_tokens=self.settings.max_tokens,
+        )
+        response = await self.retry_engine.generate(
+            self._langchain_provider(), llm_messages, config
+        )
+        return response.content
 
     async def _invoke_provider(
         self,
@@ -164,7 +207,7 @@ class BaseAgent(ABC):
 
         # Generate response
         try:
-            response = await self.provider.generate(messages, config)
+            response = await self.retry_engine.generate(self.provider, messages, config)
             logger.debug(
                 f"Agent {self.name} used provider {response.provider} "
                 f"(model: {response.model}, tokens: {response.total_tokens})"
@@ -1,15 +1,17 @@
 """Intent Classifier agent - classifies user intent and extracts entities."""
 
 import json
-import re
+import logging
 from datetime import datetime
 
 from langchain_core.messages import HumanMessage
 
 from ..domains.supplier.intents import INTENT_EXAMPLES, SupplierIntent
 from ..models import ChatState, Intent
+from ..utils.intent_matcher import IntentMatch, IntentMatcher
 from .base import BaseAgent
 
+logger = logging.getLogger(__name__)
 
 # Pattern definitions for Spanish keyword detection
 INTENT_PATTERNS: dict[Intent, list[str]] = {
@@ -135,6 +137,95 @@ INTENT_PATTERNS: dict[Intent, list[str]] = {
 }
 
 
+# Order in which INTENT_PATTERNS win when several match (more specific first)
+PATTERN_PRIORITY: list[Intent] = [
+    Intent.ITEM_COMPARISON,  # Check before PRODUCT_SEARCH
+    Intent.SUPPLIER_COMPARISON,  # Check before SUPPLIER_SEARCH
+    Intent.PRICE_INQUIRY,
+    Intent.CATEGORY_BROWSE,
+    Intent.PRODUCT_SEARCH,
+    Intent.SUPPLIER_DETAIL,
+    Intent.TOP_SUPPLIERS,
+    Intent.COMPLIANCE_CHECK,
+    Intent.RISK_ASSESSMENT,
+    Intent.SUPPLIER_SEARCH,
+    Intent.GREETING,
+]
+
+# Compiled once at import; longer (more specific) patterns get higher confidence
+PATTERN_MATCHER = IntentMatcher(
+    INTENT_PATTERNS,
+    priority=PATTERN_PRIORITY,
+    confidence=lambda pattern: 0.85 if len(pattern) > 15 else 0.75,
+)
+
+
+def match_intent(message: str) -> IntentMatch:
+    """Match a message against INTENT_PATTERNS.
+
+    Args:
+        message: The user message to analyze.
+
+    Returns:
+        IntentMatch with the winning intent (None if no pattern matched),
+        its confidence, and the confidence of every matching intent.
+    """
+    return PATTERN_MATCHER.classify(message)
+
+
+# Intents whose agents read the raw message rather than LLM-extracted entities,
+# so a confident pattern or local-model match can skip the LLM call. Category
+# browse (category), supplier detail (supplier_id) and item comparison
+# (supplier_ids) need entities the fast path cannot extract.
+FAST_PATH_INTENTS = frozenset(
+    {
+        Intent.PRODUCT_SEARCH,
+        Intent.PRICE_INQUIRY,
+        Intent.TOP_SUPPLIERS,
+        Intent.GREETING,
+    }
+)
+
+_local_models: dict[str, object] = {}
+_local_model_unavailable = False
+
+
+def get_local_intent_model(kind: str = "tfidf"):
+    """Get a local intent model built from INTENT_EXAMPLES.
+
+    Args:
+        kind: "tfidf" for TF-IDF + logistic regression (predicts a
+            probability), or "embedding" for hashed n-gram centroids
+            (predicts a cosine similarity).
+
+    Returns:
+        The model, exposing ``predict(text) -> (intent, score)``, or None if
+        numpy is not installed.
+    """
+    global _local_model_unavailable
+    if kind not in _local_models and not _local_model_unavailable:
+        try:
+            from ..utils.embeddings import CentroidClassifier
+            from ..utils.text_classifier import TfidfLogisticClassifier
+        except ImportError:
+            logger.info("numpy not installed, local intent model tier disabled")
+            _local_model_unavailable = True
+            return None
+        examples = {Intent(intent.value): texts for intent, texts in INTENT_EXAMPLES.items()}
+        if kind == "embedding":
+            _local_models[kind] = CentroidClassifier(examples)
+        else:
+            _local_models[kind] = TfidfLogisticClassifier().fit(examples)
+    return _local_models.get(kind)
+
+
+def _record_tier(tier: str, hit: bool) -> None:
+    # Imported lazily: valerie.infrastructure imports the agents package
+    from ..infrastructure.metrics import record_intent_tier
+
+    record_intent_tier(tier, hit)
+
+
 def _format_intent_examples() -> str:
     """Format intent examples for the system prompt."""
     examples_text = []
@@ -151,6 +242,7 @@ class IntentClassifierAgent(BaseAgent):
     """Classifies user intent and extracts relevant entities."""
 
     name = "intent_classifier"
+    hedged = True  # On the critical path of every message
 
     def get_system_prompt(self) -> str:
         examples_section = _format_intent_examples()
@@ -236,32 +328,50 @@ Respond in JSON format:
         Returns:
             Tuple of (detected_intent, confidence) or (None, 0.0) if no match.
         """
-        message_lower = message.lower()
-
-        # Check patterns in priority order (more specific patterns first)
-        priority_order = [
-            Intent.ITEM_COMPARISON,  # Check before PRODUCT_SEARCH
-            Intent.SUPPLIER_COMPARISON,  # Check before SUPPLIER_SEARCH
-            Intent.PRICE_INQUIRY,
-            Intent.CATEGORY_BROWSE,
-            Intent.PRODUCT_SEARCH,
-            Intent.SUPPLIER_DETAIL,
-            Intent.TOP_SUPPLIERS,
-            Intent.COMPLIANCE_CHECK,
-            Intent.RISK_ASSESSMENT,
-            Intent.SUPPLIER_SEARCH,
-            Intent.GREETING,
-        ]
-
-        for intent in priority_order:
-            if intent in INTENT_PATTERNS:
-                for pattern in INTENT_PATTERNS[intent]:
-                    if re.search(pattern, message_lower):
-                        # Higher confidence for more specific patterns
-                        confidence = 0.85 if len(pattern) > 15 else 0.75
-                        return intent, confidence
-
-        return None, 0.0
+        match = match_intent(message)
+        return match.intent, match.confidence
+
+    def _classify_without_llm(
+        self, message: str, pattern_intent: Intent | None, pattern_confidence: float
+    ) -> tuple[Intent, float, str] | None:
+        """Try the pattern and local model tiers in front of the LLM.
+
+        A pattern match decides when it is confident and its intent is in
+        FAST_PATH_INTENTS. Any other pattern match goes to the LLM, which also
+        extracts the entities those intents need. The local model is only
+        consulted when no pattern matched.
+
+        Args:
+            message: The user message to analyze.
+            pattern_intent: Intent from pattern matching, or None.
+            pattern_confidence: Confidence of the pattern match.
+
+        Returns:
+            Tuple of (intent, confidence, classification_method), or None if
+            the LLM must decide.
+        """
+        if pattern_intent is not None:
+            hit = (
+                pattern_intent in FAST_PATH_INTENTS
+                and pattern_confidence >= self.settings.intent_pattern_threshold
+            )
+            _record_tier("pattern", hit)
+            return (pattern_intent, pattern_confidence, "pattern_matching") if hit else None
+        _record_tier("pattern", False)
+
+        kind = self.settings.intent_local_model
+        model = get_local_intent_model(kind)
+        if model is None:
+            return None
+        intent, score = model.predict(message)
+        threshold = (
+            self.settings.intent_embedding_threshold
+            if kind == "embedding"
+            else self.settings.intent_local_model_threshold
+        )
+        hit = intent in FAST_PATH_INTENTS and score >= threshold
+        _record_tier("local_model", hit)
+        return (intent, round(score, 4), "local_model") if hit else None
 
     async def process(self, state: ChatState) -> ChatState:
         """Classify intent and extract entities from the last user message."""
@@ -287,6 +397,24 @@ Respond in JSON format:
         # First try pattern matching for quick classification
         pattern_intent, pattern_confidence = self._detect_intent_by_pattern(last_message)
 
+        if self.settings.intent_tiered_classification:
+            decided = self._classify_without_llm(last_message, pattern_intent, pattern_confidence)
+            if decided is not None:
+                state.intent, state.confidence, method = decided
+                state.entities = {}
+                state.agent_outputs[self.name] = self.create_output(
+                    success=True,
+                    data={
+                        "intent": state.intent.value,
+                        "confidence": state.confidence,
+                        "classification_method": method,
+                        "entities": {},
+                    },
+                    confidence=state.confidence,
+                    start_time=start_time,
+                )
+                return state
+
         try:
             response = await self.invoke_llm(last_message)
             result = json.loads(response)
@@ -315,6 +443,7 @@ Respond in JSON format:
                 result["classification_method"] = "llm"
 
             state.entities = result.get("entities", {})
+            _record_tier("llm", True)
 
             state.agent_outputs[self.name] = self.create_output(
                 success=True,
@@ -324,6 +453,7 @@ Respond in JSON format:
             )
 
         except (json.JSONDecodeError, KeyError) as e:
+            _record_tier("llm", False)
             # If LLM fails but we have a pattern match, use that
             if pattern_intent is not None:
                 state.intent = pattern_intent
@@ -1,15 +1,36 @@
 """Oracle Fusion Integration agent - interfaces with Oracle Fusion Cloud."""
 
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timedelta
 
 import httpx
 
+from ..infrastructure.logging_config import get_logger
 from ..models import ChatState, Settings
+from ..utils.cache import TTLLRUCache
 from .base import BaseAgent
 
+logger = get_logger(__name__)
+
+SUPPLIERS_PATH = "/fscmRestApi/resources/11.13.18.05/suppliers"
+
+
+def _record_oracle(endpoint: str, status: str, duration: float) -> None:
+    # Imported lazily: valerie.infrastructure imports the agents package
+    from ..infrastructure.metrics import record_oracle_request
+
+    record_oracle_request(endpoint, status, duration)
+
 
 class OracleIntegrationAgent(BaseAgent):
-    """Handles all interactions with Oracle Fusion Cloud APIs."""
+    """Handles all interactions with Oracle Fusion Cloud APIs.
+
+    Supplier lookups run concurrently (bounded by ``oracle_max_concurrency``)
+    over one pooled keep-alive client. Concurrent requests for the same
+    supplier, e.g. from parallel sessions sharing this agent, share a single
+    HTTP call, and payloads are cached for ``oracle_cache_ttl_seconds``.
+    """
 
     name = "oracle_integration"
 
@@ -18,6 +39,13 @@ class OracleIntegrationAgent(BaseAgent):
         self._client: httpx.AsyncClient | None = None
         self._token: str | None = None
         self._token_expires: datetime | None = None
+        self._payloads = TTLLRUCache(
+            max_entries=4096, ttl_seconds=self.settings.oracle_cache_ttl_seconds
+        )
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._token_lock: asyncio.Lock | None = None
+        self._semaphore: asyncio.Semaphore | None = None
 
     def get_system_prompt(self) -> str:
         return """You are an Oracle Fusion Integration Agent.
@@ -71,56 +99,137 @@ Implement circuit breaker for resilience."""
         return state
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
+        """Get or create the pooled keep-alive HTTP client."""
         if self._client is None:
+            concurrency = self.settings.oracle_max_concurrency
             self._client = httpx.AsyncClient(
                 base_url=self.settings.oracle_base_url,
                 timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=concurrency,
+                    max_keepalive_connections=concurrency,
+                    keepalive_expiry=30.0,
+                ),
             )
         return self._client
 
+    def _bind_loop(self) -> None:
+        """Bind the locks and HTTP client to the running loop.
+
+        None of them can be used from another loop, so they are recreated
+        when the agent is called from a new one. The previous client is
+        dropped rather than closed, as its loop may no longer be running.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                logger.info("oracle_client_rebound", had_client=self._client is not None)
+                self._client = None
+            self._loop = loop
+            self._token_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.settings.oracle_max_concurrency)
+            self._inflight = {}
+
+    def _token_valid(self) -> bool:
+        return bool(self._token and self._token_expires and self._token_expires > datetime.now())
+
     async def _ensure_token(self) -> None:
-        """Ensure we have a valid OAuth token."""
-        now = datetime.now()
-        if self._token and self._token_expires and self._token_expires > now:
-            return
+        """Ensure we have a valid OAuth token.
 
-        client = await self._get_client()
-        response = await client.post(
-            "/oauth2/v1/token",
-            data={
-                "grant_type": "client_credentials",
-                "client_id": self.settings.oracle_client_id,
-                "client_secret": self.settings.oracle_client_secret,
-            },
-        )
-        response.raise_for_status()
+        Refreshes are single-flight: concurrent callers wait for the one
+        token request in progress instead of issuing their own.
+        """
+        if self._token_valid():
+            return
 
-        data = response.json()
-        self._token = data.get("access_token")
-        # Token expires in 1 hour, refresh 5 minutes early
-        from datetime import timedelta
+        self._bind_loop()
+        async with self._token_lock:
+            if self._token_valid():
+                return
+
+            now = datetime.now()
+            client = await self._get_client()
+            start = time.monotonic()
+            response = await client.post(
+                "/oauth2/v1/token",
+                data={
+                    "grant_type": "client_credentials",
+                    "client_id": self.settings.oracle_client_id,
+                    "client_secret": self.settings.oracle_client_secret,
+                },
+            )
+            _record_oracle("token", str(response.status_code), time.monotonic() - start)
+            response.raise_for_status()
 
-        self._token_expires = now + timedelta(minutes=55)
+            data = response.json()
+            self._token = data.get("access_token")
+            # Token expires in 1 hour, refresh 5 minutes early
+            self._token_expires = now + timedelta(minutes=55)
 
     async def _fetch_suppliers(self, supplier_ids: list[str]) -> list[dict]:
-        """Fetch supplier data from Oracle."""
-        client = await self._get_client()
-        results = []
+        """Fetch supplier data from Oracle.
 
-        for supplier_id in supplier_ids:
+        Args:
+            supplier_ids: Supplier IDs; duplicates are fetched once.
+
+        Returns:
+            Payloads of the suppliers found, in request order.
+        """
+        self._bind_loop()
+        client = await self._get_client()
+        unique_ids = list(dict.fromkeys(supplier_ids))
+        payloads = await asyncio.gather(*(self._fetch_supplier(client, i) for i in unique_ids))
+        return [payload for payload in payloads if payload is not None]
+
+    async def _fetch_supplier(self, client: httpx.AsyncClient, supplier_id: str) -> dict | None:
+        """Fetch one supplier, from cache or by joining an in-flight request."""
+        cached = self._payloads.get(supplier_id)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(supplier_id)
+        if task is None:
+            task = asyncio.ensure_future(self._request_supplier(client, supplier_id))
+            self._inflight[supplier_id] = task
+            task.add_done_callback(lambda done, key=supplier_id: self._forget(key, done))
+        # Shielded so one caller giving up does not cancel the others' request
+        return await asyncio.shield(task)
+
+    def _forget(self, supplier_id: str, task: asyncio.Task) -> None:
+        """Drop a finished request, unless the key now holds another loop's request."""
+        if self._inflight.get(supplier_id) is task:
+            del self._inflight[supplier_id]
+
+    async def _request_supplier(self, client: httpx.AsyncClient, supplier_id: str) -> dict | None:
+        """GET one supplier record, bounded by the concurrency limit."""
+        async with self._semaphore:
+            start = time.monotonic()
             try:
                 response = await client.get(
-                    f"/fscmRestApi/resources/11.13.18.05/suppliers/{supplier_id}",
+                    f"{SUPPLIERS_PATH}/{supplier_id}",
                     headers={"Authorization": f"Bearer {self._token}"},
                 )
-                if response.status_code == 200:
-                    results.append(response.json())
-            except httpx.HTTPError:
-                # Skip failed fetches, log in production
-                pass
-
-        return results
+            except httpx.HTTPError as e:
+                _record_oracle("suppliers", "error", time.monotonic() - start)
+                logger.warning(
+                    "oracle_supplier_fetch_failed",
+                    supplier_id=supplier_id,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+                return None
+
+        _record_oracle("suppliers", str(response.status_code), time.monotonic() - start)
+        if response.status_code != 200:
+            return None
+        payload = response.json()
+        if self.settings.oracle_cache_ttl_seconds > 0:
+            self._payloads.set(supplier_id, payload)
+        return payload
+
+    def clear_cache(self) -> None:
+        """Drop cached supplier payloads."""
+        self._payloads.clear()
 
     async def close(self) -> None:
         """Close the HTTP client."""
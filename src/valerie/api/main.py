@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
@@ -17,6 +18,13 @@ from valerie.infrastructure import (
     record_request,
     set_correlation_id,
 )
+from valerie.infrastructure.observability import TRACE_EXPORT_ENABLED
+from valerie.infrastructure.otel import configure_tracing, shutdown_tracing
+from valerie.infrastructure.request_timing import (
+    SERVER_TIMING_HEADER,
+    end_request_timing,
+    start_request_timing,
+)
 
 from .routes import chat_router, health_router, webhooks_router
 from .schemas import ErrorResponse
@@ -37,6 +45,8 @@ async def lifespan(app: FastAPI):
         "observability_ready",
         backend=type(observability._backend).__name__,
     )
+    # OpenTelemetry span export (VALERIE_OTEL_ENABLED)
+    configure_tracing()
 
     # Verify graph can be built
     try:
@@ -64,10 +74,25 @@ async def lifespan(app: FastAPI):
     except Exception:
         logger.warning("settings_load_failed", message="Could not load settings")
 
+    # Probe LLM providers in the background so requests never wait on it
+    from valerie.llm.health import get_health_registry
+
+    get_health_registry().start()
+
     yield
 
     # Shutdown
-    observability.flush()
+    from valerie.data.factory import close_data_source
+    from valerie.infrastructure.evaluation_queue import shutdown_evaluation_queue
+    from valerie.llm import close_http_clients
+    from valerie.llm.health import shutdown_health_registry
+
+    await shutdown_health_registry()
+    await shutdown_evaluation_queue()
+    await close_data_source()
+    await close_http_clients()
+    await observability.shutdown()
+    shutdown_tracing()
     logger.info("api_shutdown", message="Shutting down Valerie Supplier Chatbot API...")
 
 
@@ -108,6 +133,7 @@ API key authentication coming soon. Currently in demo mode.
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[SERVER_TIMING_HEADER],
     )
 
     # Correlation ID middleware
@@ -121,20 +147,25 @@ API key authentication coming soon. Currently in demo mode.
         else:
             set_correlation_id(correlation_id)
 
-        # Track request timing
+        # Track request timing, with a per-phase breakdown for Server-Timing
         start_time = time.time()
+        timings = start_request_timing(correlation_id)
 
         # Process request
-        response = await call_next(request)
+        try:
+            response = await call_next(request)
+        finally:
+            end_request_timing(timings)
 
         # Calculate duration
         duration = time.time() - start_time
 
-        # Add correlation ID to response headers
+        # Add correlation ID and latency breakdown to response headers
         response.headers[CORRELATION_ID_HEADER] = correlation_id
+        response.headers[SERVER_TIMING_HEADER] = timings.server_timing()
 
-        # Record metrics (skip /metrics and /health endpoints)
-        skip_metrics = request.url.path.startswith(("/metrics", "/health"))
+        # Record metrics (skip /metrics, /health and /debug endpoints)
+        skip_metrics = request.url.path.startswith(("/metrics", "/health", "/debug"))
         if not skip_metrics:
             record_request(
                 endpoint=request.url.path,
@@ -167,6 +198,31 @@ API key authentication coming soon. Currently in demo mode.
             media_type=CONTENT_TYPE_LATEST,
         )
 
+    # Recent traces from the bounded in-memory buffer, for local debugging
+    @app.get("/debug/traces", include_in_schema=False)
+    async def recent_traces(limit: int = 50) -> JSONResponse:
+        """Export the most recent buffered traces as JSON."""
+        if not TRACE_EXPORT_ENABLED:
+            return JSONResponse(status_code=404, content={"detail": "Not Found"})
+        observability = get_observability()
+        limit = max(1, min(limit, observability.trace_buffer.max_traces))
+        return JSONResponse(
+            content=jsonable_encoder(
+                {
+                    "stats": observability.trace_buffer.stats(),
+                    "traces": observability.recent_traces(limit),
+                }
+            )
+        )
+
+    @app.get("/debug/traces/{trace_id}", include_in_schema=False)
+    async def trace_detail(trace_id: str) -> JSONResponse:
+        """Export one buffered trace as JSON."""
+        trace = get_observability().trace_buffer.get_trace(trace_id)
+        if not TRACE_EXPORT_ENABLED or trace is None:
+            return JSONResponse(status_code=404, content={"detail": "Not Found"})
+        return JSONResponse(content=jsonable_encoder(trace))
+
     # Global exception handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
@@ -8,8 +8,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
+from ...infrastructure import GuardrailsAgent, get_or_create_correlation_id
+from ...infrastructure.request_timing import RequestTimings, get_request_timings, timed
+from ...llm.retry import RetryEngine
+from ...utils.intent_matcher import IntentMatcher
 from ..schemas import (
     AgentExecution,
     AgentStatus,
@@ -29,6 +33,12 @@ router = APIRouter(prefix="/api/v1", tags=["Chat"])
 # In-memory session storage (replace with Redis in production)
 _sessions: dict[str, dict[str, Any]] = {}
 
+# Input guardrails for real mode, created on first use
+_guardrails: GuardrailsAgent | None = None
+
+# Retry/failover engine for real-mode LLM calls, created on first use
+_retry_engine: RetryEngine | None = None
+
 # Load sample data for demo mode
 # Try multiple paths to find the sample data
 _BASE_PATH = Path(__file__).parent.parent.parent.parent.parent
@@ -96,6 +106,22 @@ if not SAMPLE_DATA:
     }
 
 
+def _get_guardrails() -> GuardrailsAgent:
+    """Get the shared guardrails agent used in real mode."""
+    global _guardrails
+    if _guardrails is None:
+        _guardrails = GuardrailsAgent()
+    return _guardrails
+
+
+def _get_retry_engine() -> RetryEngine:
+    """Get the shared retry engine used for real-mode LLM calls."""
+    global _retry_engine
+    if _retry_engine is None:
+        _retry_engine = RetryEngine()
+    return _retry_engine
+
+
 def _get_or_create_session(session_id: str | None) -> tuple[str, dict]:
     """Get existing session or create a new one."""
     if session_id and session_id in _sessions:
@@ -121,43 +147,56 @@ async def _process_with_llm(
     chat_history: list,
     detected_intent: str
 ) -> tuple[str, list[AgentExecution]]:
-    """Process message using real LLM provider."""
-    from valerie.llm import get_llm_provider, LLMConfig, LLMMessage
+    """Process message using real LLM provider.
+
+    Every phase is measured into the request's timing collector (also sent
+    as the Server-Timing header) and reported with its measured duration.
+    Input rejected by the guardrails is answered without calling the LLM.
+    """
+    from langchain_core.messages import HumanMessage
+
+    from valerie.llm import LLMConfig, LLMMessage, get_llm_provider
     from valerie.llm.base import MessageRole as LLMRole
+    from valerie.models import ChatState
 
-    start_time = time.time()
+    timings = get_request_timings() or RequestTimings(get_or_create_correlation_id())
     executions = []
 
-    # Add agent executions for UI tracking
+    # Validate input before it is sent to the LLM
+    with timings.measure("guardrails", "Guardrails"):
+        checked = await _get_guardrails().process(
+            ChatState(messages=[HumanMessage(content=user_message)])
+        )
     executions.append(AgentExecution(
         agent_name="guardrails",
         display_name="Guardrails",
-        status=AgentStatus.COMPLETED,
-        duration_ms=35,
-        output={"passed": True},
+        status=AgentStatus.COMPLETED if checked.guardrails_passed else AgentStatus.ERROR,
+        duration_ms=timings.duration_ms("guardrails"),
+        output={
+            "passed": checked.guardrails_passed,
+            "pii_detected": checked.pii_detected,
+            "itar_flagged": checked.itar_flagged,
+            "warnings": checked.guardrails_warnings,
+        },
     ))
+    if not checked.guardrails_passed:
+        return BLOCKED_RESPONSE, executions
 
+    # Classified by the chat endpoint before calling us
     executions.append(AgentExecution(
         agent_name="intent_classifier",
         display_name="Intent Classifier",
         status=AgentStatus.COMPLETED,
-        duration_ms=50,
+        duration_ms=timings.duration_ms("classification"),
         output={"intent": detected_intent},
     ))
 
-    executions.append(AgentExecution(
-        agent_name="memory",
-        display_name="Memory & Context",
-        status=AgentStatus.COMPLETED,
-        duration_ms=25,
-        output={"context_loaded": True},
-    ))
-
     # Get LLM provider
     provider = get_llm_provider()
 
     # Build system prompt with supplier context
-    supplier_context = _get_supplier_context()
+    with timings.measure("supplier_context", "Supplier context"):
+        supplier_context = _get_supplier_context()
     system_prompt = f"""You are Valerie, an AI assistant for supplier management in aerospace manufacturing.
 You help users find suppliers, check compliance, and compare options.
 
@@ -171,54 +210,70 @@ Instructions:
 - If asked about suppliers, use the data provided above"""
 
     # Build messages
-    messages = [LLMMessage(role=LLMRole.SYSTEM, content=system_prompt)]
-
-    # Add chat history (last 10 messages)
-    for msg in chat_history[-10:]:
-        if hasattr(msg, 'role') and hasattr(msg, 'content'):
-            role = LLMRole.USER if msg.role == MessageRole.USER else LLMRole.ASSISTANT
-            messages.append(LLMMessage(role=role, content=msg.content))
+    with timings.measure("memory", "Memory & Context"):
+        messages = [LLMMessage(role=LLMRole.SYSTEM, content=system_prompt)]
 
-    # Add current message
-    messages.append(LLMMessage(role=LLMRole.USER, content=user_message))
+        # Add chat history (last 10 messages)
+        for msg in chat_history[-10:]:
+            if hasattr(msg, 'role') and hasattr(msg, 'content'):
+                role = LLMRole.USER if msg.role == MessageRole.USER else LLMRole.ASSISTANT
+                messages.append(LLMMessage(role=role, content=msg.content))
 
-    # Add LLM execution tracking
+        # Add current message
+        messages.append(LLMMessage(role=LLMRole.USER, content=user_message))
     executions.append(AgentExecution(
-        agent_name="llm_provider",
-        display_name=f"LLM ({provider.name})",
-        status=AgentStatus.RUNNING,
-        duration_ms=0,
-        output={"model": provider.default_model},
+        agent_name="memory",
+        display_name="Memory & Context",
+        status=AgentStatus.COMPLETED,
+        duration_ms=timings.duration_ms("memory"),
+        output={"context_loaded": True, "history_messages": len(messages) - 2},
     ))
 
-    # Generate response
+    # Stream the response to measure time to first token. The retry engine
+    # retries and fails over until the first chunk arrives.
     config = LLMConfig(temperature=0.7, max_tokens=1024)
-    response = await provider.generate(messages, config)
-
-    # Update LLM execution
-    llm_time = int((time.time() - start_time) * 1000)
-    executions[-1] = AgentExecution(
+    parts: list[str] = []
+    usage: dict[str, int] = {}
+    model = provider.default_model
+    provider_name = provider.name
+    llm_start = time.perf_counter()
+    with timings.measure("llm", f"LLM ({provider.name})"):
+        async for chunk in _get_retry_engine().generate_stream(provider, messages, config):
+            if chunk.content:
+                if not parts:
+                    timings.record(
+                        "llm_ttft", (time.perf_counter() - llm_start) * 1000, "LLM first token"
+                    )
+                parts.append(chunk.content)
+            model = chunk.model or model
+            provider_name = chunk.provider or provider_name
+            usage.update(chunk.usage)
+    executions.append(AgentExecution(
         agent_name="llm_provider",
-        display_name=f"LLM ({provider.name})",
+        display_name=f"LLM ({provider_name})",
         status=AgentStatus.COMPLETED,
-        duration_ms=llm_time,
+        duration_ms=timings.duration_ms("llm"),
         output={
-            "model": response.model,
-            "tokens": response.total_tokens,
-            "provider": response.provider,
+            "model": model,
+            "provider": provider_name,
+            "ttft_ms": timings.duration_ms("llm_ttft"),
+            "input_tokens": usage.get("input_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "tokens": sum(usage.values()) if usage else None,
         },
-    )
+    ))
 
-    # Add response generation
+    with timings.measure("response_generation", "Response Generation"):
+        content = "".join(parts).strip()
     executions.append(AgentExecution(
         agent_name="response_generation",
         display_name="Response Generation",
         status=AgentStatus.COMPLETED,
-        duration_ms=10,
+        duration_ms=timings.duration_ms("response_generation"),
         output={"formatted": True},
     ))
 
-    return response.content, executions
+    return content, executions
 
 
 def _get_supplier_context() -> str:
@@ -242,59 +297,62 @@ def _get_supplier_context() -> str:
     return "\n".join(context_lines)
 
 
-def _detect_intent(message: str) -> tuple[str, float]:
-    """Simple intent detection for demo mode. Supports English and Spanish."""
-    message_lower = message.lower()
-
-    # Check patterns - Security (blocked)
-    if any(kw in message_lower for kw in ["ignore", "system:", "<script", "reveal"]):
-        return "blocked", 1.0
-
-    # ITAR sensitive (EN + ES)
-    if any(kw in message_lower for kw in [
-        "itar", "defense", "classified",
-        "defensa", "clasificado", "militar"
-    ]):
-        return "itar_sensitive", 0.95
+BLOCKED_RESPONSE = (
+    "Your request was blocked by security guardrails. Please rephrase your question."
+)
 
-    # Supplier comparison (EN + ES)
-    if any(kw in message_lower for kw in [
+# Demo-mode keywords (EN + ES), in priority order: the first intent with a hit wins
+DEMO_INTENT_KEYWORDS: dict[str, list[str]] = {
+    # Security (blocked)
+    "blocked": ["ignore", "system:", "<script", "reveal"],
+    # ITAR sensitive
+    "itar_sensitive": ["itar", "defense", "classified", "defensa", "clasificado", "militar"],
+    "supplier_comparison": [
         "compare", "versus", "vs", "comparison",
-        "comparar", "comparación", "comparacion", "cual es mejor", "diferencia"
-    ]):
-        return "supplier_comparison", 0.92
-
-    # Risk assessment (EN + ES)
-    if any(kw in message_lower for kw in [
+        "comparar", "comparación", "comparacion", "cual es mejor", "diferencia",
+    ],
+    "risk_assessment": [
         "risk", "assess", "evaluate",
-        "riesgo", "evaluar", "evaluación", "evaluacion"
-    ]):
-        return "risk_assessment", 0.89
-
-    # Compliance check (EN + ES)
-    if any(kw in message_lower for kw in [
+        "riesgo", "evaluar", "evaluación", "evaluacion",
+    ],
+    "compliance_check": [
         "compliance", "certified", "nadcap", "certification",
-        "cumplimiento", "certificado", "certificación", "certificacion", "cumple"
-    ]):
-        return "compliance_check", 0.91
-
-    # Supplier search (EN + ES)
-    if any(kw in message_lower for kw in [
+        "cumplimiento", "certificado", "certificación", "certificacion", "cumple",
+    ],
+    "supplier_search": [
         "find", "search", "supplier", "heat", "anodiz",
         "buscar", "busca", "proveedor", "proveedores", "encuentra", "encontrar",
         "dame", "lista", "mostrar", "muestra", "necesito", "quien vende",
-        "donde comprar", "quiero"
-    ]):
-        return "supplier_search", 0.94
-
-    # Greeting (EN + ES)
-    if any(kw in message_lower for kw in [
+        "donde comprar", "quiero",
+    ],
+    "greeting": [
         "hello", "hi", "hey", "help",
-        "hola", "buenos", "ayuda", "ayúdame", "ayudame"
-    ]):
-        return "greeting", 0.98
+        "hola", "buenos", "ayuda", "ayúdame", "ayudame",
+    ],
+}
+
+DEMO_INTENT_CONFIDENCE = {
+    "blocked": 1.0,
+    "itar_sensitive": 0.95,
+    "supplier_comparison": 0.92,
+    "risk_assessment": 0.89,
+    "compliance_check": 0.91,
+    "supplier_search": 0.94,
+    "greeting": 0.98,
+}
+
+_demo_intent_matcher = IntentMatcher(
+    DEMO_INTENT_KEYWORDS,
+    confidence=DEMO_INTENT_CONFIDENCE,
+    default=("unknown", 0.45),
+    literal=True,
+)
 
-    return "unknown", 0.45
+
+def _detect_intent(message: str) -> tuple[str, float]:
+    """Simple intent detection for demo mode. Supports English and Spanish."""
+    match = _demo_intent_matcher.classify(message)
+    return match.intent, match.confidence
 
 
 def _generate_demo_response(intent: str, message: str) -> tuple[str, list[AgentExecution]]:
@@ -311,8 +369,7 @@ def _generate_demo_response(intent: str, message: str) -> tuple[str, list[AgentE
                 output={"passed": False, "reason": "Potential injection detected"},
             )
         )
-        response = "Your request was blocked by security guardrails. Please rephrase your question."
-        return response, executions
+        return BLOCKED_RESPONSE, executions
 
     # Standard flow
     executions.append(
@@ -461,12 +518,13 @@ def _generate_demo_response(intent: str, message: str) -> tuple[str, list[AgentE
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+async def chat(request: ChatRequest) -> Response:
     """
     Send a message to the chatbot.
 
     In demo mode (no API key), returns simulated responses.
     With API key configured, uses the full multi-agent pipeline.
+    Measured phase durations are returned in the Server-Timing header.
     """
     # Get or create session
     session_id, session = _get_or_create_session(request.session_id)
@@ -477,7 +535,8 @@ async def chat(request: ChatRequest) -> ChatResponse:
     )
 
     # Detect intent
-    intent, confidence = _detect_intent(request.message)
+    with timed("classification", "Intent Classifier"):
+        intent, confidence = _detect_intent(request.message)
 
     # Security: Always handle blocked/injection attempts with demo response (don't send to LLM)
     if intent == "blocked":
@@ -516,7 +575,7 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
     requires_approval = intent == "itar_sensitive"
 
-    return ChatResponse(
+    response = ChatResponse(
         session_id=session_id,
         message=response_text,
         agents_executed=agents_executed,
@@ -525,6 +584,11 @@ async def chat(request: ChatRequest) -> ChatResponse:
         requires_approval=requires_approval,
     )
 
+    # Serialize here rather than in FastAPI so it shows up in Server-Timing
+    with timed("serialization", "Serialization"):
+        body = response.model_dump_json()
+    return Response(content=body, media_type="application/json")
+
 
 @router.get("/sessions/{session_id}", response_model=SessionResponse)
 async def get_session(session_id: str) -> SessionResponse:
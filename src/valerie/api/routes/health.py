@@ -95,6 +95,22 @@ async def health_check() -> HealthResponse:
     except Exception as e:
         services.append(ServiceHealth(name="llm_api", status="unhealthy", message=str(e)))
 
+    # LLM provider probes, read from the background registry (no network calls)
+    from valerie.llm.health import get_health_registry
+
+    snapshot = get_health_registry().snapshot()
+    if snapshot:
+        up = sorted(name for name, health in snapshot.items() if health["available"])
+        latencies = [snapshot[name]["latency_ms"] for name in up]
+        services.append(
+            ServiceHealth(
+                name="llm_providers",
+                status="healthy" if up else "unhealthy",
+                latency_ms=min(latencies) if latencies else None,
+                message=f"Available: {', '.join(up)}" if up else "No LLM provider reachable",
+            )
+        )
+
     return HealthResponse(
         status=overall_status, version=VERSION, timestamp=datetime.now(), services=services
     )
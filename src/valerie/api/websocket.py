@@ -9,6 +9,8 @@ from typing import Any
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+from ..utils.intent_matcher import IntentMatcher
+
 router = APIRouter(tags=["WebSocket"])
 
 
@@ -132,15 +134,19 @@ DEMO_RESPONSES = {
 }
 
 
+_scenario_matcher = IntentMatcher(
+    {
+        "blocked": ["ignore", "system:", "<script"],
+        "greeting": ["hello", "hi", "hey", "help"],
+    },
+    default=("supplier_search", 0.0),
+    literal=True,
+)
+
+
 def detect_scenario(message: str) -> str:
     """Detect which demo scenario matches the input."""
-    message_lower = message.lower()
-
-    if any(kw in message_lower for kw in ["ignore", "system:", "<script"]):
-        return "blocked"
-    if any(kw in message_lower for kw in ["hello", "hi", "hey", "help"]):
-        return "greeting"
-    return "supplier_search"
+    return _scenario_matcher.classify(message).intent
 
 
 @router.websocket("/ws/chat/{session_id}")
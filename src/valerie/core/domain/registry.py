@@ -32,6 +32,9 @@ class DomainRegistry:
 
         # Find domain by keywords
         domain = registry.find_by_keywords(["vendor", "procurement"])
+
+        # Find domain by similarity to its example queries
+        domain = registry.find_by_text("Which vendors carry sulfuric acid?")
     """
 
     _instance: "DomainRegistry | None" = None
@@ -50,6 +53,7 @@ class DomainRegistry:
 
         self._domains: dict[str, BaseDomain] = {}
         self._keyword_index: dict[str, str] = {}  # keyword -> domain_id
+        self._classifier: Any = None  # CentroidClassifier over example queries, built lazily
         DomainRegistry._initialized = True
         logger.info("DomainRegistry initialized")
 
@@ -69,6 +73,7 @@ class DomainRegistry:
             )
 
         self._domains[domain.domain_id] = domain
+        self._classifier = None
 
         # Index keywords for fast lookup
         for keyword in domain.get_keywords():
@@ -96,6 +101,7 @@ class DomainRegistry:
         """
         domain = self._domains.pop(domain_id, None)
         if domain:
+            self._classifier = None
             # Remove keyword mappings
             keywords_to_remove = [k for k, v in self._keyword_index.items() if v == domain_id]
             for keyword in keywords_to_remove:
@@ -172,6 +178,47 @@ class DomainRegistry:
         best_domain_id = max(domain_scores.keys(), key=lambda d: domain_scores[d])
         return self._domains.get(best_domain_id)
 
+    def get_classifier(self) -> Any:
+        """Get the embedding classifier over every domain's example queries.
+
+        Centroids are computed on first use and kept until a domain is
+        registered or removed.
+
+        Returns:
+            A CentroidClassifier labelled by domain_id, or None if numpy is
+            not installed.
+        """
+        if self._classifier is None:
+            try:
+                from ...utils.embeddings import CentroidClassifier
+            except ImportError:
+                logger.info("numpy not installed, routing domains by keyword only")
+                return None
+            self._classifier = CentroidClassifier(self.get_example_queries())
+        return self._classifier
+
+    def find_by_text(self, text: str, min_similarity: float = 0.1) -> BaseDomain | None:
+        """Find the domain whose example queries are most similar to a text.
+
+        Uses cosine similarity of hashed n-gram embeddings against each
+        domain's example-query centroid. Falls back to find_by_keywords when
+        the embedding classifier is unavailable.
+
+        Args:
+            text: The user message.
+            min_similarity: Similarity below which no domain matches.
+
+        Returns:
+            The best matching domain or None.
+        """
+        classifier = self.get_classifier()
+        if classifier is None:
+            return self.find_by_keywords(text.lower().split())
+        domain_id, similarity = classifier.predict(text)
+        if domain_id is None or similarity < min_similarity:
+            return None
+        return self._domains.get(domain_id)
+
     def get_all_intents(self) -> dict[str, list[str]]:
         """Get all intents across all domains.
 
@@ -230,6 +277,7 @@ class DomainRegistry:
         """
         self._domains.clear()
         self._keyword_index.clear()
+        self._classifier = None
         logger.info("DomainRegistry cleared")
 
     @classmethod
@@ -7,12 +7,17 @@ from valerie.data.schema import (
     SupplierItem,
     SupplierCategory,
     LegalEntity,
+    SupplierRanking,
+    SupplierItemPriceStats,
+    ImportState,
 )
 from valerie.data.database import (
     Database,
+    SQLiteTuning,
     get_database,
     init_database,
 )
+from valerie.data.rankings import refresh_supplier_rankings
 
 __all__ = [
     # Schema
@@ -22,8 +27,14 @@ __all__ = [
     "SupplierItem",
     "SupplierCategory",
     "LegalEntity",
+    "SupplierRanking",
+    "SupplierItemPriceStats",
+    "ImportState",
     # Database
     "Database",
+    "SQLiteTuning",
     "get_database",
     "init_database",
+    # Derived tables
+    "refresh_supplier_rankings",
 ]
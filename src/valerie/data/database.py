@@ -1,13 +1,19 @@
 """Database connection and session management."""
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+from valerie.data.rankings import refresh_supplier_rankings
 from valerie.data.schema import Base
+from valerie.data.search_index import rebuild_search_index
 
 
 # Enable foreign keys for SQLite
@@ -19,23 +25,66 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.close()
 
 
+@dataclass
+class SQLiteTuning:
+    """Connection pool and PRAGMA settings for file-backed SQLite databases.
+
+    The defaults are read-optimized: WAL lets chat queries read while an
+    import is writing, and memory-mapped I/O plus a larger page cache keep
+    hot pages out of the read() path.
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 5
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024  # bytes
+    cache_size_kb: int = 64 * 1024
+    busy_timeout_ms: int = 5000
+    temp_store: str = "MEMORY"
+    # Share one page cache between connections of this process. Off by
+    # default: it serializes access at the table level, which only pays
+    # off for read-mostly workloads with a small working set.
+    shared_cache: bool = False
+
+    def pragmas(self) -> list[str]:
+        """Get the PRAGMA statements to run on each new connection."""
+        return [
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA cache_size=-{self.cache_size_kb}",
+            f"PRAGMA busy_timeout={self.busy_timeout_ms}",
+            f"PRAGMA temp_store={self.temp_store}",
+        ]
+
+
 class Database:
     """Database manager for SQLite."""
 
-    def __init__(self, db_path: Union[str, Path] = "data/valerie.db"):
+    def __init__(
+        self,
+        db_path: Union[str, Path] = "data/valerie.db",
+        tuning: SQLiteTuning | None = None,
+    ):
         """Initialize database connection.
 
         Args:
             db_path: Path to the SQLite database file.
+            tuning: Pool and PRAGMA settings. Defaults to SQLiteTuning().
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.tuning = tuning or SQLiteTuning()
 
         self.engine = create_engine(
-            f"sqlite:///{self.db_path}",
+            self._url("sqlite"),
             echo=False,
             connect_args={"check_same_thread": False},
+            pool_size=self.tuning.pool_size,
+            max_overflow=self.tuning.max_overflow,
         )
+        event.listen(self.engine, "connect", self._apply_pragmas)
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
@@ -43,10 +92,70 @@ class Database:
         )
         self._session: Session | None = None
 
+    def _url(self, driver: str) -> str:
+        """Build the connection URL for a SQLAlchemy SQLite driver."""
+        if self.tuning.shared_cache:
+            return f"{driver}:///file:{self.db_path}?cache=shared&uri=true"
+        return f"{driver}:///{self.db_path}"
+
+    def _apply_pragmas(self, dbapi_connection, connection_record) -> None:
+        """Apply the tuning PRAGMAs to a new connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in self.tuning.pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+    def create_async_engine(self) -> "AsyncEngine":
+        """Create an aiosqlite-backed async engine for the same database.
+
+        The engine uses the same pool size and PRAGMAs as the sync engine.
+
+        Returns:
+            A new SQLAlchemy AsyncEngine.
+
+        Raises:
+            ImportError: If aiosqlite or greenlet is not installed.
+        """
+        try:
+            import aiosqlite  # noqa: F401
+            import greenlet  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Async engine mode requires aiosqlite and greenlet. "
+                "Install it with: pip install 'valerie-chatbot[async]'"
+            ) from e
+
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        engine = create_async_engine(
+            self._url("sqlite+aiosqlite"),
+            echo=False,
+            pool_size=self.tuning.pool_size,
+            max_overflow=self.tuning.max_overflow,
+        )
+        event.listen(engine.sync_engine, "connect", self._apply_pragmas)
+        return engine
+
     def create_tables(self) -> None:
         """Create all tables defined in the schema."""
         Base.metadata.create_all(bind=self.engine)
 
+    def rebuild_search_index(self) -> bool:
+        """Repopulate the FTS5 search index from the current table contents.
+
+        Returns:
+            True if the index was rebuilt, False if FTS5 is unavailable.
+        """
+        return rebuild_search_index(self.engine)
+
+    def refresh_supplier_rankings(self) -> int:
+        """Recompute the precomputed supplier_rankings table.
+
+        Returns:
+            Number of suppliers ranked.
+        """
+        return refresh_supplier_rankings(self.engine)
+
     def drop_tables(self) -> None:
         """Drop all tables from the database."""
         Base.metadata.drop_all(bind=self.engine)
@@ -47,6 +47,12 @@ class DataSourceConfig(BaseModel):
     type: str = "sqlite"
     # SQLite
     sqlite_path: str | None = None
+    sqlite_pool_size: int = 5
+    sqlite_max_overflow: int = 5
+    sqlite_max_workers: int | None = None
+    sqlite_async: bool = False
+    # Columnar analytics engine for rankings/rollups/comparisons (needs numpy)
+    analytics_enabled: bool = False
     # API
     api_base_url: str | None = None
     api_key: str | None = None
@@ -56,6 +62,12 @@ class DataSourceConfig(BaseModel):
     oracle_base_url: str | None = None
     oracle_client_id: str | None = None
     oracle_client_secret: str | None = None
+    # Read-through query cache (not applied to the mock source). Unset means on
+    # for SQLite, whose data only changes on import, and off for live sources
+    # (api, oracle), whose data changes without the cache being invalidated.
+    cache_enabled: bool | None = None
+    cache_max_entries: int = 1024
+    cache_ttl_seconds: float = 300.0
 
 
 class EnvironmentConfig(BaseModel):
@@ -144,10 +156,47 @@ def get_data_source(config: DataSourceConfig | None = None) -> ISupplierDataSour
     if config is None:
         config = load_config()
 
+    data_source = _create_data_source(config)
+
+    cache_enabled = config.cache_enabled
+    if cache_enabled is None:
+        cache_enabled = config.type == "sqlite"
+    if cache_enabled and config.type != "mock":
+        from valerie.data.sources.cached import CachedDataSource, import_marker_path
+
+        marker_path = None
+        if config.type == "sqlite":
+            marker_path = import_marker_path(config.sqlite_path or "data/valerie.db")
+        return CachedDataSource(
+            data_source,
+            max_entries=config.cache_max_entries,
+            ttl_seconds=config.cache_ttl_seconds,
+            marker_path=marker_path,
+        )
+
+    return data_source
+
+
+def _create_data_source(config: DataSourceConfig) -> ISupplierDataSource:
+    """Create the uncached data source for a configuration."""
     if config.type == "sqlite":
+        from valerie.data.database import SQLiteTuning
         from valerie.data.sources.sqlite import SQLiteDataSource
         db_path = config.sqlite_path or "data/valerie.db"
-        return SQLiteDataSource(db_path)
+        source = SQLiteDataSource(
+            db_path,
+            tuning=SQLiteTuning(
+                pool_size=config.sqlite_pool_size,
+                max_overflow=config.sqlite_max_overflow,
+            ),
+            max_workers=config.sqlite_max_workers,
+            async_engine=config.sqlite_async,
+        )
+        if config.analytics_enabled:
+            from valerie.data.sources.analytics import AnalyticsDataSource
+            from valerie.data.sources.cached import import_marker_path
+            return AnalyticsDataSource(source, marker_path=import_marker_path(db_path))
+        return source
 
     elif config.type == "api":
         from valerie.data.sources.api import APIDataSource
@@ -198,6 +247,15 @@ def get_default_data_source() -> ISupplierDataSource:
     return _data_source_instance
 
 
+async def close_data_source():
+    """Close the default data source, if it was created and supports closing."""
+    global _data_source_instance
+    close = getattr(_data_source_instance, "close", None)
+    if close is not None:
+        await close()
+    _data_source_instance = None
+
+
 def reset_data_source():
     """Reset the default data source singleton (useful for testing)."""
     global _data_source_instance
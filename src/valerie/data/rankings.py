@@ -0,0 +1,58 @@
+"""Refresh of the precomputed supplier_rankings table."""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+_REFRESH_SQL = """
+INSERT INTO supplier_rankings (
+    supplier_id, item_count, rank_by_amount, rank_by_orders, rank_by_items,
+    market_share, percentile, refreshed_at
+)
+WITH item_counts AS (
+    SELECT supplier_id, COUNT(*) AS item_count
+    FROM supplier_items
+    GROUP BY supplier_id
+),
+base AS (
+    SELECT
+        s.id AS supplier_id,
+        COALESCE(s.total_amount, 0) AS total_amount,
+        COALESCE(s.total_orders, 0) AS total_orders,
+        COALESCE(ic.item_count, 0) AS item_count
+    FROM suppliers s
+    LEFT JOIN item_counts ic ON ic.supplier_id = s.id
+),
+market AS (
+    SELECT SUM(total_amount) AS total FROM base
+)
+SELECT
+    base.supplier_id,
+    base.item_count,
+    RANK() OVER (ORDER BY base.total_amount DESC),
+    RANK() OVER (ORDER BY base.total_orders DESC),
+    RANK() OVER (ORDER BY base.item_count DESC),
+    CASE WHEN market.total > 0 THEN base.total_amount * 100.0 / market.total ELSE 0 END,
+    PERCENT_RANK() OVER (ORDER BY base.total_amount) * 100.0,
+    CURRENT_TIMESTAMP
+FROM base, market
+"""
+
+
+def refresh_supplier_rankings(engine: Engine) -> int:
+    """Recompute the supplier_rankings table from the current aggregates.
+
+    Ranks follow the same rule as the live queries they replace: a
+    supplier's rank is one plus the number of suppliers with a strictly
+    greater metric, so ties share a rank. The table is replaced inside one
+    transaction so readers never see a partial refresh.
+
+    Args:
+        engine: SQLAlchemy engine for the database.
+
+    Returns:
+        Number of suppliers ranked.
+    """
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM supplier_rankings"))
+        result = connection.execute(text(_REFRESH_SQL))
+        return result.rowcount
@@ -86,7 +86,7 @@ class SupplierItem(Base):
     category = relationship("Category")
 
     __table_args__ = (
-        Index("ix_supplier_item", "supplier_id", "item_code"),
+        Index("ix_supplier_item", "supplier_id", "item_code", unique=True),
         Index("ix_item_description", "description"),
     )
 
@@ -128,3 +128,61 @@ class LegalEntity(Base):
 
     def __repr__(self) -> str:
         return f"<LegalEntity(name='{self.name}')>"
+
+
+class SupplierRanking(Base):
+    """Precomputed supplier rankings and market share.
+
+    Derived from suppliers/supplier_items by ``refresh_supplier_rankings``
+    after each import, so top-N and detail lookups avoid full-table scans.
+    """
+
+    __tablename__ = "supplier_rankings"
+
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), primary_key=True)
+    item_count = Column(Integer, default=0)
+    rank_by_amount = Column(Integer, nullable=False, index=True)
+    rank_by_orders = Column(Integer, nullable=False, index=True)
+    rank_by_items = Column(Integer, nullable=False, index=True)
+    market_share = Column(Float, default=0.0)  # Percent of total spend
+    percentile = Column(Float, default=0.0)  # Percent of suppliers with lower spend
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+    supplier = relationship("Supplier")
+
+    def __repr__(self) -> str:
+        return f"<SupplierRanking(supplier_id={self.supplier_id}, rank={self.rank_by_amount})>"
+
+
+class SupplierItemPriceStats(Base):
+    """Running unit-price totals behind SupplierItem.avg_price.
+
+    Kept alongside supplier_items so incremental imports can fold new
+    order lines into the average exactly instead of re-reading history.
+    """
+
+    __tablename__ = "supplier_item_price_stats"
+
+    supplier_item_id = Column(Integer, ForeignKey("supplier_items.id"), primary_key=True)
+    price_count = Column(Integer, default=0)  # Order lines with a unit price
+    price_sum = Column(Float, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<SupplierItemPriceStats(supplier_item_id={self.supplier_item_id})>"
+
+
+class ImportState(Base):
+    """Watermark and bookkeeping of the last import of a PO history source."""
+
+    __tablename__ = "import_state"
+
+    source = Column(String(255), primary_key=True)
+    watermark_by = Column(String(20), nullable=False)  # "date" or "po"
+    watermark = Column(String(255))  # ISO datetime or PO number
+    last_mode = Column(String(20))  # "full" or "incremental"
+    rows_read = Column(Integer, default=0)
+    rows_imported = Column(Integer, default=0)
+    imported_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<ImportState(source='{self.source}', watermark='{self.watermark}')>"
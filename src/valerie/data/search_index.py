@@ -0,0 +1,234 @@
+"""FTS5 full-text search index for supplier items and categories.
+
+The search methods of SQLiteDataSource used to run ``ILIKE '%term%'`` over
+item descriptions and category names. Leading-wildcard scans cannot use the
+B-tree indexes in schema.py, so this module maintains two external-content
+FTS5 tables next to the regular schema:
+
+- ``supplier_items_fts``: item_code, description (rowid = supplier_items.id)
+- ``categories_fts``: name, level1, level2, level3 (rowid = categories.id)
+
+Triggers keep both tables in sync with their content tables, and
+``rebuild_search_index`` repopulates them in bulk (used by the importer).
+A table created over existing rows, e.g. when a database from before the
+index is opened, is rebuilt on creation so search never sees it empty.
+When the SQLite build lacks FTS5 nothing is created and callers fall back
+to LIKE matching.
+"""
+
+import logging
+import re
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from valerie.data.schema import Base
+
+logger = logging.getLogger(__name__)
+
+ITEMS_FTS_TABLE = "supplier_items_fts"
+CATEGORIES_FTS_TABLE = "categories_fts"
+
+# unicode61 with diacritics removed so "quimicos" matches "Químicos"
+_TOKENIZER = "unicode61 remove_diacritics 2"
+
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {ITEMS_FTS_TABLE} USING fts5(
+        item_code, description,
+        content='supplier_items', content_rowid='id',
+        tokenize='{_TOKENIZER}'
+    )
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {CATEGORIES_FTS_TABLE} USING fts5(
+        name, level1, level2, level3,
+        content='categories', content_rowid='id',
+        tokenize='{_TOKENIZER}'
+    )
+    """,
+    # supplier_items triggers
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ITEMS_FTS_TABLE}_ai AFTER INSERT ON supplier_items BEGIN
+        INSERT INTO {ITEMS_FTS_TABLE}(rowid, item_code, description)
+        VALUES (new.id, new.item_code, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ITEMS_FTS_TABLE}_ad AFTER DELETE ON supplier_items BEGIN
+        INSERT INTO {ITEMS_FTS_TABLE}({ITEMS_FTS_TABLE}, rowid, item_code, description)
+        VALUES ('delete', old.id, old.item_code, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ITEMS_FTS_TABLE}_au
+    AFTER UPDATE OF item_code, description ON supplier_items BEGIN
+        INSERT INTO {ITEMS_FTS_TABLE}({ITEMS_FTS_TABLE}, rowid, item_code, description)
+        VALUES ('delete', old.id, old.item_code, old.description);
+        INSERT INTO {ITEMS_FTS_TABLE}(rowid, item_code, description)
+        VALUES (new.id, new.item_code, new.description);
+    END
+    """,
+    # categories triggers
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CATEGORIES_FTS_TABLE}_ai AFTER INSERT ON categories BEGIN
+        INSERT INTO {CATEGORIES_FTS_TABLE}(rowid, name, level1, level2, level3)
+        VALUES (new.id, new.name, new.level1, new.level2, new.level3);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CATEGORIES_FTS_TABLE}_ad AFTER DELETE ON categories BEGIN
+        INSERT INTO {CATEGORIES_FTS_TABLE}(
+            {CATEGORIES_FTS_TABLE}, rowid, name, level1, level2, level3
+        )
+        VALUES ('delete', old.id, old.name, old.level1, old.level2, old.level3);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CATEGORIES_FTS_TABLE}_au
+    AFTER UPDATE OF name, level1, level2, level3 ON categories BEGIN
+        INSERT INTO {CATEGORIES_FTS_TABLE}(
+            {CATEGORIES_FTS_TABLE}, rowid, name, level1, level2, level3
+        )
+        VALUES ('delete', old.id, old.name, old.level1, old.level2, old.level3);
+        INSERT INTO {CATEGORIES_FTS_TABLE}(rowid, name, level1, level2, level3)
+        VALUES (new.id, new.name, new.level1, new.level2, new.level3);
+    END
+    """,
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts5_supported(connection: Connection) -> bool:
+    """Check whether the SQLite library behind a connection has FTS5.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+
+    Returns:
+        True if FTS5 virtual tables can be created.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    try:
+        connection.exec_driver_sql("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        connection.exec_driver_sql("DROP TABLE temp._fts5_probe")
+        return True
+    except OperationalError:
+        return False
+
+
+def search_index_exists(engine: Engine) -> bool:
+    """Check whether the FTS5 tables exist in the database.
+
+    Args:
+        engine: SQLAlchemy engine for the database.
+
+    Returns:
+        True if both FTS tables are present.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect() as connection:
+        return len(_existing_index_tables(connection)) == 2
+
+
+def _existing_index_tables(connection: Connection) -> set[str]:
+    """Names of the FTS5 tables present in the database."""
+    rows = connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+        (ITEMS_FTS_TABLE, CATEGORIES_FTS_TABLE),
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def create_search_index(connection: Connection) -> bool:
+    """Create the FTS5 tables and sync triggers if FTS5 is available.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+
+    Tables that did not exist yet are rebuilt from their content tables,
+    which may already hold rows the triggers never saw.
+
+    Returns:
+        True if the index exists after the call, False if FTS5 is unavailable.
+    """
+    if not fts5_supported(connection):
+        logger.info("SQLite FTS5 not available, search will use LIKE matching")
+        return False
+
+    existing = _existing_index_tables(connection)
+    for statement in _CREATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    for table in (ITEMS_FTS_TABLE, CATEGORIES_FTS_TABLE):
+        if table not in existing:
+            connection.exec_driver_sql(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    return True
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop the FTS5 tables (their triggers are dropped with the content tables).
+
+    Args:
+        connection: An open SQLAlchemy connection.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for table in (ITEMS_FTS_TABLE, CATEGORIES_FTS_TABLE):
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+
+
+def rebuild_search_index(engine: Engine) -> bool:
+    """Create (if needed) and fully repopulate the FTS5 tables.
+
+    Used after bulk imports and for databases created before the index
+    existed, where the triggers never saw the original rows.
+
+    Args:
+        engine: SQLAlchemy engine for the database.
+
+    Returns:
+        True if the index was rebuilt, False if FTS5 is unavailable.
+    """
+    with engine.begin() as connection:
+        existing = _existing_index_tables(connection)
+        if not create_search_index(connection):
+            return False
+        # Newly created tables were already rebuilt by create_search_index
+        for table in existing:
+            connection.exec_driver_sql(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    return True
+
+
+def build_match_query(term: str) -> str | None:
+    """Convert free user text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix token and all tokens must match,
+    so "acetona grado" -> '"acetona"* "grado"*'. Quoting keeps FTS5
+    operators (AND, NEAR, column filters) in user input from being parsed.
+
+    Args:
+        term: Raw search text.
+
+    Returns:
+        The MATCH expression, or None if the text has no searchable tokens.
+    """
+    tokens = _TOKEN_RE.findall(term or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index_after_schema(target, connection, **kw):
+    """Create the search index whenever the schema is created."""
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index_before_schema(target, connection, **kw):
+    """Drop the search index together with the schema."""
+    drop_search_index(connection)
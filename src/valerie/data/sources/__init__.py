@@ -14,6 +14,7 @@ from valerie.data.interfaces import (
 )
 from valerie.data.sources.sqlite import SQLiteDataSource
 from valerie.data.sources.mock import MockDataSource
+from valerie.data.sources.cached import CachedDataSource
 
 __all__ = [
     "ISupplierDataSource",
@@ -29,4 +30,5 @@ __all__ = [
     "SearchCriteria",
     "SQLiteDataSource",
     "MockDataSource",
+    "CachedDataSource",
 ]
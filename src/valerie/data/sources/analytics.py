@@ -0,0 +1,551 @@
+"""Columnar analytics engine for ranking, rollup and comparison queries.
+
+Top-N rankings, category rollups and supplier comparisons scan whole
+tables and build one Pydantic object per ORM row. AnalyticsDataSource
+loads the supplier, category and item aggregates once into NumPy arrays
+(on first use and again after each import) and answers those three
+questions with vectorized operations. All other calls go to the wrapped
+SQLiteDataSource unchanged.
+
+Requires numpy: pip install 'valerie-chatbot[analytics]'
+"""
+
+import asyncio
+import logging
+import string
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - exercised only without numpy
+    raise ImportError(
+        "The analytics engine requires numpy. "
+        "Install it with: pip install 'valerie-chatbot[analytics]'"
+    ) from e
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session
+
+from valerie.data.interfaces import (
+    CategoryResult,
+    ComparisonResult,
+    ProductResult,
+    ProductWithSuppliers,
+    SupplierDetail,
+    SupplierRankingResult,
+    SupplierResult,
+)
+from valerie.data.schema import Category, Supplier, SupplierCategory, SupplierItem
+from valerie.data.sources.cached import ImportMarker
+from valerie.data.sources.sqlite import DETAIL_TOP_N, SQLiteDataSource, build_comparison
+
+logger = logging.getLogger(__name__)
+
+# SQLite's LIKE only folds ASCII letters; fold the same way for parity
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+_RANKING_METRICS = {
+    "amount": "total_amount",
+    "orders": "total_orders",
+    "items": "item_count",
+}
+
+
+def _fold(value: str | None) -> str:
+    """Lowercase ASCII letters, like SQLite's case-insensitive LIKE."""
+    return (value or "").translate(_ASCII_LOWER)
+
+
+def _contains(haystack: np.ndarray, needle: str) -> np.ndarray:
+    """Vectorized case-insensitive ``LIKE '%needle%'`` over folded strings."""
+    if haystack.size == 0:
+        return np.zeros(0, dtype=bool)
+    return np.char.find(haystack, _fold(needle)) >= 0
+
+
+def _str_array(values) -> np.ndarray:
+    """Build a fixed-width unicode array of ASCII-folded strings."""
+    return np.array([_fold(v) for v in values], dtype=str)
+
+
+def _group_offsets(groups: np.ndarray, count: int) -> np.ndarray:
+    """CSR offsets of rows sorted by group index: rows of g are [off[g], off[g+1])."""
+    return np.searchsorted(groups, np.arange(count + 1), side="left")
+
+
+@dataclass
+class AnalyticsSnapshot:
+    """Columnar copy of the supplier, category and item aggregates.
+
+    Suppliers are sorted by id and categories by name. Per-supplier top
+    categories and top items are stored CSR-style: the rows of supplier
+    ``i`` are ``[offsets[i], offsets[i + 1])``.
+    """
+
+    # Suppliers
+    supplier_ids: np.ndarray
+    supplier_names: list[str]
+    supplier_names_folded: np.ndarray
+    supplier_sites: list
+    total_orders: np.ndarray
+    total_amount: np.ndarray
+    avg_order_value: np.ndarray
+    first_order_dates: list
+    last_order_dates: list
+    item_counts: np.ndarray
+    sorted_amounts: np.ndarray
+    market_total: float
+    rankings: dict[str, np.ndarray]
+
+    # Categories
+    category_ids: np.ndarray
+    category_names: list[str]
+    category_levels: list[tuple]
+    level1_folded: np.ndarray
+    level2_folded: np.ndarray
+    level1_present: np.ndarray
+    level2_not_null: np.ndarray
+    level2_present: np.ndarray
+    level3_present: np.ndarray
+    category_level: np.ndarray
+    category_parents: list
+    category_item_count: np.ndarray
+    category_total_amount: np.ndarray
+    category_supplier_count: np.ndarray
+
+    # Top categories per supplier
+    top_category_offsets: np.ndarray
+    top_category_idx: np.ndarray
+    top_category_item_count: np.ndarray
+    top_category_amount: np.ndarray
+
+    # Top items per supplier
+    top_item_offsets: np.ndarray
+    top_items: list[ProductResult]
+
+    @property
+    def supplier_count(self) -> int:
+        return len(self.supplier_ids)
+
+    def supplier_index(self, supplier_id: int) -> int | None:
+        """Get the row of a supplier id, or None if it does not exist."""
+        i = int(np.searchsorted(self.supplier_ids, supplier_id))
+        if i < self.supplier_count and self.supplier_ids[i] == supplier_id:
+            return i
+        return None
+
+    def category_result(self, i: int) -> CategoryResult:
+        """Build the CategoryResult of category row ``i``."""
+        level1, level2, level3 = self.category_levels[i]
+        return CategoryResult(
+            id=str(self.category_ids[i]),
+            name=self.category_names[i],
+            level=int(self.category_level[i]),
+            level1=level1,
+            level2=level2,
+            level3=level3,
+            parent=self.category_parents[i],
+            item_count=int(self.category_item_count[i]),
+            supplier_count=int(self.category_supplier_count[i]),
+            total_amount=float(self.category_total_amount[i]),
+        )
+
+
+def load_snapshot(session: Session) -> AnalyticsSnapshot:
+    """Load the aggregates into columnar arrays.
+
+    Args:
+        session: Database session.
+
+    Returns:
+        A new AnalyticsSnapshot.
+    """
+    # Suppliers
+    rows = session.execute(
+        select(
+            Supplier.id,
+            Supplier.name,
+            Supplier.site,
+            Supplier.total_orders,
+            Supplier.total_amount,
+            Supplier.avg_order_value,
+            Supplier.first_order_date,
+            Supplier.last_order_date,
+        ).order_by(Supplier.id)
+    ).all()
+    supplier_ids = np.array([r.id for r in rows], dtype=np.int64)
+    total_orders = np.array([r.total_orders or 0 for r in rows], dtype=np.int64)
+    total_amount = np.array([r.total_amount or 0.0 for r in rows], dtype=np.float64)
+    n_suppliers = len(rows)
+
+    item_counts = np.zeros(n_suppliers, dtype=np.int64)
+    counted = session.execute(
+        select(SupplierItem.supplier_id, func.count(SupplierItem.id)).group_by(
+            SupplierItem.supplier_id
+        )
+    ).all()
+    if counted:
+        counted_ids, counts = (np.array(c, dtype=np.int64) for c in zip(*counted))
+        item_counts[np.searchsorted(supplier_ids, counted_ids)] = counts
+
+    # Same order as the supplier_rankings table: metric descending, then id
+    rankings = {
+        "amount": np.lexsort((supplier_ids, -total_amount)),
+        "orders": np.lexsort((supplier_ids, -total_orders)),
+        "items": np.lexsort((supplier_ids, -item_counts)),
+    }
+
+    # Categories
+    categories = session.execute(
+        select(
+            Category.id,
+            Category.name,
+            Category.level1,
+            Category.level2,
+            Category.level3,
+            Category.item_count,
+            Category.total_amount,
+        ).order_by(Category.name)
+    ).all()
+    category_ids = np.array([c.id for c in categories], dtype=np.int64)
+    level1_present = np.array([c.level1 is not None for c in categories], dtype=bool)
+    level2_not_null = np.array([c.level2 is not None for c in categories], dtype=bool)
+    level2_present = np.array([bool(c.level2) for c in categories], dtype=bool)
+    level3_present = np.array([bool(c.level3) for c in categories], dtype=bool)
+    category_level = np.where(level3_present, 3, np.where(level2_present, 2, 1))
+    parents = []
+    for c, level in zip(categories, category_level):
+        if level == 3 and c.level2:
+            parents.append(f"{c.level1}-{c.level2}")
+        elif level == 2 and c.level1:
+            parents.append(c.level1)
+        else:
+            parents.append(None)
+    # Row of each category id, for the junction and item tables
+    category_order = np.argsort(category_ids)
+    sorted_category_ids = category_ids[category_order]
+
+    # Supplier-category junction: supplier counts and per-supplier top categories
+    junction = session.execute(
+        select(
+            SupplierCategory.id,
+            SupplierCategory.supplier_id,
+            SupplierCategory.category_id,
+            SupplierCategory.item_count,
+            SupplierCategory.total_amount,
+        )
+    ).all()
+    n_categories = len(categories)
+    if junction:
+        sc_ids = np.array([r.id for r in junction], dtype=np.int64)
+        sc_items = np.array([r.item_count or 0 for r in junction], dtype=np.int64)
+        sc_amount = np.array([r.total_amount or 0.0 for r in junction], dtype=np.float64)
+        sc_supplier_idx = np.searchsorted(
+            supplier_ids, np.array([r.supplier_id for r in junction], dtype=np.int64)
+        )
+        sc_category_idx = category_order[
+            np.searchsorted(
+                sorted_category_ids,
+                np.array([r.category_id for r in junction], dtype=np.int64),
+            )
+        ]
+        category_supplier_count = np.bincount(sc_category_idx, minlength=n_categories)
+
+        # Sort by supplier, amount descending, id; keep the first N per supplier
+        order = np.lexsort((sc_ids, -sc_amount, sc_supplier_idx))
+        groups = sc_supplier_idx[order]
+        starts = _group_offsets(groups, n_suppliers)
+        keep = order[np.arange(len(order)) - starts[groups] < DETAIL_TOP_N]
+        top_category_idx = sc_category_idx[keep]
+        top_category_item_count = sc_items[keep]
+        top_category_amount = sc_amount[keep]
+        top_category_offsets = _group_offsets(sc_supplier_idx[keep], n_suppliers)
+    else:
+        category_supplier_count = np.zeros(n_categories, dtype=np.int64)
+        top_category_idx = np.zeros(0, dtype=np.int64)
+        top_category_item_count = np.zeros(0, dtype=np.int64)
+        top_category_amount = np.zeros(0, dtype=np.float64)
+        top_category_offsets = np.zeros(n_suppliers + 1, dtype=np.int64)
+
+    # Top items per supplier; only DETAIL_TOP_N rows per supplier are kept,
+    # so the snapshot does not grow with the size of the item catalog
+    ranked_items = select(
+        SupplierItem,
+        func.row_number()
+        .over(
+            partition_by=SupplierItem.supplier_id,
+            order_by=(desc(SupplierItem.total_ordered_amount), SupplierItem.id),
+        )
+        .label("row_num"),
+    ).subquery()
+    item_rows = session.execute(
+        select(
+            ranked_items.c.supplier_id,
+            ranked_items.c.item_code,
+            ranked_items.c.description,
+            ranked_items.c.category_id,
+            ranked_items.c.uom,
+            ranked_items.c.avg_price,
+            ranked_items.c.min_price,
+            ranked_items.c.max_price,
+            Category.name,
+        )
+        .outerjoin(Category, Category.id == ranked_items.c.category_id)
+        .where(ranked_items.c.row_num <= DETAIL_TOP_N)
+        .order_by(ranked_items.c.supplier_id, ranked_items.c.row_num)
+    ).all()
+    top_items = [
+        ProductResult(
+            item_code=r.item_code or "",
+            description=r.description or "",
+            category=r.name or "",
+            category_id=str(r.category_id) if r.category_id else None,
+            uom=r.uom or "EA",
+            avg_price=r.avg_price or 0.0,
+            min_price=r.min_price or 0.0,
+            max_price=r.max_price or 0.0,
+            supplier_count=1,
+        )
+        for r in item_rows
+    ]
+    item_supplier_idx = np.searchsorted(
+        supplier_ids, np.array([r.supplier_id for r in item_rows], dtype=np.int64)
+    )
+
+    return AnalyticsSnapshot(
+        supplier_ids=supplier_ids,
+        supplier_names=[r.name for r in rows],
+        supplier_names_folded=_str_array(r.name for r in rows),
+        supplier_sites=[r.site for r in rows],
+        total_orders=total_orders,
+        total_amount=total_amount,
+        avg_order_value=np.array([r.avg_order_value or 0.0 for r in rows], dtype=np.float64),
+        first_order_dates=[r.first_order_date for r in rows],
+        last_order_dates=[r.last_order_date for r in rows],
+        item_counts=item_counts,
+        sorted_amounts=np.sort(total_amount),
+        market_total=float(total_amount.sum()),
+        rankings=rankings,
+        category_ids=category_ids,
+        category_names=[c.name for c in categories],
+        category_levels=[(c.level1, c.level2, c.level3) for c in categories],
+        level1_folded=_str_array(c.level1 for c in categories),
+        level2_folded=_str_array(c.level2 for c in categories),
+        level1_present=level1_present,
+        level2_not_null=level2_not_null,
+        level2_present=level2_present,
+        level3_present=level3_present,
+        category_level=category_level,
+        category_parents=parents,
+        category_item_count=np.array([c.item_count or 0 for c in categories], dtype=np.int64),
+        category_total_amount=np.array(
+            [c.total_amount or 0.0 for c in categories], dtype=np.float64
+        ),
+        category_supplier_count=category_supplier_count,
+        top_category_offsets=top_category_offsets,
+        top_category_idx=top_category_idx,
+        top_category_item_count=top_category_item_count,
+        top_category_amount=top_category_amount,
+        top_item_offsets=_group_offsets(item_supplier_idx, n_suppliers),
+        top_items=top_items,
+    )
+
+
+class AnalyticsDataSource:
+    """SQLiteDataSource decorator that serves analytics from a columnar snapshot.
+
+    ``get_top_suppliers``, ``get_categories`` and ``compare_suppliers`` are
+    computed in memory with NumPy and return the same results as the SQLite
+    queries. The snapshot is loaded on first use and reloaded when the
+    import marker changes or ``refresh()`` is called.
+    """
+
+    def __init__(
+        self,
+        inner: SQLiteDataSource,
+        marker_path: str | Path | None = None,
+    ):
+        """
+        Initialize the analytics engine.
+
+        Args:
+            inner: SQLite data source to load from and forward other calls to.
+            marker_path: Import marker file to watch (see import_marker_path).
+        """
+        self.inner = inner
+        self._snapshot: AnalyticsSnapshot | None = None
+        self._load_lock = asyncio.Lock()
+        self._marker = ImportMarker(marker_path)
+
+    async def refresh(self) -> AnalyticsSnapshot:
+        """Reload the snapshot from the database."""
+        snapshot = await self.inner._run_sync(load_snapshot)
+        self._snapshot = snapshot
+        logger.info(
+            "Loaded analytics snapshot: %d suppliers, %d categories",
+            snapshot.supplier_count,
+            len(snapshot.category_ids),
+        )
+        return snapshot
+
+    async def _get_snapshot(self) -> AnalyticsSnapshot:
+        """Get the current snapshot, loading it if missing or stale."""
+        if self._marker.changed():
+            self._snapshot = None
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        async with self._load_lock:
+            if self._snapshot is None:
+                return await self.refresh()
+            return self._snapshot
+
+    async def get_top_suppliers(
+        self, by: str = "amount", limit: int = 10
+    ) -> list[SupplierRankingResult]:
+        """Get top suppliers by a metric (from the snapshot)."""
+        snap = await self._get_snapshot()
+        by = by if by in _RANKING_METRICS else "amount"
+        metric_name = _RANKING_METRICS[by]
+        values = {
+            "amount": snap.total_amount,
+            "orders": snap.total_orders,
+            "items": snap.item_counts,
+        }[by]
+        return [
+            SupplierRankingResult(
+                rank=rank,
+                supplier_id=str(snap.supplier_ids[i]),
+                supplier_name=snap.supplier_names[i],
+                metric_value=float(values[i]),
+                metric_name=metric_name,
+            )
+            for rank, i in enumerate(snap.rankings[by][:limit], start=1)
+        ]
+
+    async def get_categories(
+        self, parent: str | None = None, level: int | None = None
+    ) -> list[CategoryResult]:
+        """Get product categories (from the snapshot)."""
+        snap = await self._get_snapshot()
+        mask = np.ones(len(snap.category_ids), dtype=bool)
+
+        if level == 1:
+            mask &= snap.level1_present & ~snap.level2_present
+        elif level == 2:
+            mask &= snap.level2_present & ~snap.level3_present
+        elif level == 3:
+            mask &= snap.level3_present
+
+        if parent:
+            # NULL levels never match LIKE
+            mask &= snap.level1_present
+            if "-" in parent:
+                level1, level2 = parent.split("-", 1)
+                mask &= _contains(snap.level1_folded, level1)
+                mask &= _contains(snap.level2_folded, level2) & snap.level2_not_null
+            else:
+                mask &= _contains(snap.level1_folded, parent)
+
+        return [snap.category_result(i) for i in np.flatnonzero(mask)]
+
+    def _resolve(self, snap: AnalyticsSnapshot, supplier_ids: list[str]) -> list[int]:
+        """Resolve IDs or partial names to supplier rows, like the SQLite source."""
+        resolved = []
+        for sid in supplier_ids:
+            index = None
+            try:
+                index = snap.supplier_index(int(sid))
+            except ValueError:
+                pass
+            if index is None:
+                matches = np.flatnonzero(_contains(snap.supplier_names_folded, sid))
+                index = int(matches[0]) if matches.size else None
+            if index is not None:
+                resolved.append(index)
+        return resolved
+
+    def _details(self, snap: AnalyticsSnapshot, rows: list[int]) -> list[SupplierDetail]:
+        """Build SupplierDetail objects for supplier rows."""
+        idx = np.array(rows, dtype=np.int64)
+        amounts = snap.total_amount[idx]
+        # Rank = 1 + number of suppliers with strictly greater spend
+        ranks = snap.supplier_count - np.searchsorted(snap.sorted_amounts, amounts, "right") + 1
+        if snap.market_total:
+            shares = amounts / snap.market_total * 100
+        else:
+            shares = np.zeros(len(idx))
+
+        details = []
+        for i, rank, share in zip(rows, ranks, shares):
+            start, end = snap.top_category_offsets[i], snap.top_category_offsets[i + 1]
+            top_categories = []
+            for j in range(start, end):
+                category = snap.category_result(snap.top_category_idx[j])
+                category.item_count = int(snap.top_category_item_count[j])
+                category.total_amount = float(snap.top_category_amount[j])
+                category.supplier_count = 0
+                top_categories.append(category)
+
+            start, end = snap.top_item_offsets[i], snap.top_item_offsets[i + 1]
+            details.append(
+                SupplierDetail(
+                    id=str(snap.supplier_ids[i]),
+                    name=snap.supplier_names[i],
+                    site=snap.supplier_sites[i],
+                    total_orders=int(snap.total_orders[i]),
+                    total_amount=float(snap.total_amount[i]),
+                    avg_order_value=float(snap.avg_order_value[i]),
+                    first_order_date=snap.first_order_dates[i],
+                    last_order_date=snap.last_order_dates[i],
+                    top_categories=top_categories,
+                    top_items=[item.model_copy() for item in snap.top_items[start:end]],
+                    rank_by_volume=int(rank),
+                    market_share=round(float(share), 2),
+                )
+            )
+        return details
+
+    async def compare_suppliers(self, supplier_ids: list[str]) -> ComparisonResult:
+        """Compare multiple suppliers (from the snapshot)."""
+        snap = await self._get_snapshot()
+        rows = self._resolve(snap, supplier_ids)
+        return build_comparison(self._details(snap, rows))
+
+    async def search_suppliers(
+        self,
+        name: str | None = None,
+        category: str | None = None,
+        product: str | None = None,
+        limit: int = 10,
+    ) -> list[SupplierResult]:
+        """Search suppliers by criteria."""
+        return await self.inner.search_suppliers(name, category, product, limit)
+
+    async def get_supplier_detail(self, supplier_id: str) -> SupplierDetail | None:
+        """Get detailed supplier information."""
+        return await self.inner.get_supplier_detail(supplier_id)
+
+    async def search_products(
+        self, query: str, category: str | None = None, limit: int = 20
+    ) -> list[ProductResult]:
+        """Search for products."""
+        return await self.inner.search_products(query, category, limit)
+
+    async def get_product_suppliers(self, item_code: str) -> ProductWithSuppliers | None:
+        """Get product with suppliers."""
+        return await self.inner.get_product_suppliers(item_code)
+
+    async def get_category_suppliers(self, category: str, limit: int = 20) -> list[SupplierResult]:
+        """Get suppliers for a category."""
+        return await self.inner.get_category_suppliers(category, limit)
+
+    async def health_check(self) -> bool:
+        """Check data source health."""
+        return await self.inner.health_check()
+
+    async def close(self) -> None:
+        """Drop the snapshot and close the wrapped data source."""
+        self._snapshot = None
+        await self.inner.close()
@@ -0,0 +1,281 @@
+"""Read-through query cache for any ISupplierDataSource.
+
+Procurement data only changes when scripts/import_excel_data.py runs, so
+category trees, top-N lists and search results can be served from memory
+between imports. Entries are bounded by an LRU size limit and a TTL, and
+are dropped explicitly when an import finishes:
+
+- in-process, through ``invalidate_caches()``
+- across processes, through an import marker file next to the database
+  that the importer touches (see ``mark_data_changed``)
+
+The factory enables the cache by default for SQLite only. Live sources
+(api, oracle) change without an import, so for them it is opt-in with
+``cache_enabled: true`` and their staleness is bounded by the TTL alone.
+"""
+
+import inspect
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from valerie.data.interfaces import (
+    CategoryResult,
+    ComparisonResult,
+    ISupplierDataSource,
+    ProductResult,
+    ProductWithSuppliers,
+    SupplierDetail,
+    SupplierRankingResult,
+    SupplierResult,
+)
+from valerie.infrastructure.metrics import (
+    data_source_cache_invalidations_total,
+    record_data_source_cache,
+)
+from valerie.utils.cache import TTLLRUCache
+
+# Arguments matched case-insensitively by every data source (partial matches)
+_CASE_INSENSITIVE_ARGS = {"name", "category", "product", "query", "parent"}
+
+# How often the import marker file is checked, in seconds
+_MARKER_CHECK_INTERVAL = 1.0
+
+_live_caches: "weakref.WeakSet[CachedDataSource]" = weakref.WeakSet()
+
+_MISS = object()
+
+
+def import_marker_path(db_path: str | Path) -> Path:
+    """Get the import marker file for a database.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        Path of the marker file touched after each import.
+    """
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.name + ".imported")
+
+
+def mark_data_changed(db_path: str | Path | None = None) -> None:
+    """Signal that supplier data changed, invalidating query caches.
+
+    Clears every cache in this process and, when ``db_path`` is given,
+    touches its import marker so caches in other processes drop their
+    entries on their next lookup.
+
+    Args:
+        db_path: Path to the SQLite database file that was updated.
+    """
+    if db_path is not None:
+        marker = import_marker_path(db_path)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        # Bump mtime explicitly: touch() may not change it within the
+        # filesystem timestamp resolution
+        stamp = time.time_ns()
+        os.utime(marker, ns=(stamp, stamp))
+    invalidate_caches()
+
+
+def invalidate_caches() -> None:
+    """Clear all live CachedDataSource instances in this process."""
+    for cache in list(_live_caches):
+        cache.invalidate()
+
+
+class ImportMarker:
+    """Watches an import marker file for imports finished by other processes.
+
+    The file is stat()ed at most once per ``check_interval`` seconds.
+    """
+
+    def __init__(self, path: str | Path | None, check_interval: float | None = None):
+        """
+        Initialize the watcher.
+
+        Args:
+            path: Marker file (see import_marker_path). None never reports changes.
+            check_interval: Minimum seconds between checks. Defaults to
+                            _MARKER_CHECK_INTERVAL.
+        """
+        self.path = Path(path) if path else None
+        self.check_interval = check_interval
+        self._mtime = self._read_mtime()
+        self._checked_at = time.monotonic()
+
+    def _read_mtime(self) -> int | None:
+        """Get the marker file mtime, or None if there is no marker."""
+        if self.path is None:
+            return None
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def changed(self) -> bool:
+        """Check whether an import finished since the last call that returned True."""
+        if self.path is None:
+            return False
+        now = time.monotonic()
+        interval = _MARKER_CHECK_INTERVAL if self.check_interval is None else self.check_interval
+        if now - self._checked_at < interval:
+            return False
+        self._checked_at = now
+        mtime = self._read_mtime()
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        return True
+
+
+def _freeze(value: Any) -> Any:
+    """Make an argument value hashable for use in a cache key."""
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy a cached result so callers cannot mutate the cached object."""
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    return value
+
+
+class CachedDataSource:
+    """Caching decorator around another ISupplierDataSource.
+
+    Results are keyed on the method name and its normalized arguments:
+    defaults are filled in, lists become tuples and partial-match text
+    arguments are lowercased. ``health_check`` is never cached.
+    """
+
+    def __init__(
+        self,
+        inner: ISupplierDataSource,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        marker_path: str | Path | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            inner: Data source to read through to.
+            max_entries: Maximum cached results.
+            ttl_seconds: Time-to-live of each cached result.
+            marker_path: Import marker file to watch for cross-process
+                         invalidation (see import_marker_path).
+        """
+        self.inner = inner
+        self._cache = TTLLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._signatures: dict[str, inspect.Signature] = {}
+        self._marker = ImportMarker(marker_path)
+        _live_caches.add(self)
+
+    def _check_marker(self) -> None:
+        """Invalidate if another process finished an import since last check."""
+        if self._marker.changed():
+            self._cache.clear()
+            data_source_cache_invalidations_total.labels(reason="import").inc()
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        self._cache.clear()
+        data_source_cache_invalidations_total.labels(reason="explicit").inc()
+
+    def _make_key(self, method: str, args: tuple, kwargs: dict) -> tuple:
+        """Build a cache key from a method call."""
+        signature = self._signatures.get(method)
+        if signature is None:
+            signature = inspect.signature(getattr(self.inner, method))
+            self._signatures[method] = signature
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        parts = []
+        for name, value in bound.arguments.items():
+            # Only ASCII is safe to fold: SQLite LIKE is case-sensitive beyond it
+            if name in _CASE_INSENSITIVE_ARGS and isinstance(value, str) and value.isascii():
+                value = value.lower()
+            parts.append((name, _freeze(value)))
+        return (method, tuple(parts))
+
+    async def _cached_call(self, method: str, *args, **kwargs) -> Any:
+        """Serve a call from cache, or forward it and cache the result."""
+        self._check_marker()
+        key = self._make_key(method, args, kwargs)
+        value = self._cache.get(key, _MISS)
+        if value is not _MISS:
+            record_data_source_cache(method, hit=True)
+            return _copy_result(value)
+
+        record_data_source_cache(method, hit=False)
+        value = await getattr(self.inner, method)(*args, **kwargs)
+        self._cache.set(key, value)
+        return _copy_result(value)
+
+    async def search_suppliers(
+        self,
+        name: str | None = None,
+        category: str | None = None,
+        product: str | None = None,
+        limit: int = 10,
+    ) -> list[SupplierResult]:
+        """Search suppliers by criteria (cached)."""
+        return await self._cached_call(
+            "search_suppliers", name=name, category=category, product=product, limit=limit
+        )
+
+    async def get_supplier_detail(self, supplier_id: str) -> SupplierDetail | None:
+        """Get detailed supplier information (cached)."""
+        return await self._cached_call("get_supplier_detail", supplier_id)
+
+    async def search_products(
+        self, query: str, category: str | None = None, limit: int = 20
+    ) -> list[ProductResult]:
+        """Search for products (cached)."""
+        return await self._cached_call("search_products", query, category=category, limit=limit)
+
+    async def get_product_suppliers(self, item_code: str) -> ProductWithSuppliers | None:
+        """Get product with suppliers (cached)."""
+        return await self._cached_call("get_product_suppliers", item_code)
+
+    async def get_categories(
+        self, parent: str | None = None, level: int | None = None
+    ) -> list[CategoryResult]:
+        """Get categories (cached)."""
+        return await self._cached_call("get_categories", parent=parent, level=level)
+
+    async def get_top_suppliers(
+        self, by: str = "amount", limit: int = 10
+    ) -> list[SupplierRankingResult]:
+        """Get top suppliers by metric (cached)."""
+        return await self._cached_call("get_top_suppliers", by=by, limit=limit)
+
+    async def compare_suppliers(self, supplier_ids: list[str]) -> ComparisonResult:
+        """Compare suppliers (cached)."""
+        return await self._cached_call("compare_suppliers", supplier_ids)
+
+    async def get_category_suppliers(self, category: str, limit: int = 20) -> list[SupplierResult]:
+        """Get suppliers for a category (cached)."""
+        return await self._cached_call("get_category_suppliers", category, limit=limit)
+
+    async def health_check(self) -> bool:
+        """Check data source health (never cached)."""
+        return await self.inner.health_check()
+
+    async def close(self) -> None:
+        """Close the wrapped data source, if it supports closing."""
+        self._cache.clear()
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            await close()
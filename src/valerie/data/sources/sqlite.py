@@ -1,14 +1,38 @@
 """SQLite data source implementation."""
 import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pathlib import Path
-from typing import Union
 
-from sqlalchemy import func, or_, and_, desc, text
-from sqlalchemy.orm import Session, joinedload
-
-from valerie.data.database import Database
-from valerie.data.schema import Supplier, Category, SupplierItem, SupplierCategory
+from sqlalchemy import (
+    and_,
+    column,
+    desc,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.orm import Session, aliased, joinedload
+
+from valerie.data.database import Database, SQLiteTuning
+from valerie.data.schema import (
+    Category,
+    Supplier,
+    SupplierCategory,
+    SupplierItem,
+    SupplierRanking,
+)
+from valerie.data.search_index import (
+    CATEGORIES_FTS_TABLE,
+    ITEMS_FTS_TABLE,
+    build_match_query,
+    search_index_exists,
+)
 from valerie.data.interfaces import (
     BaseDataSource,
     SupplierResult,
@@ -20,6 +44,82 @@ from valerie.data.interfaces import (
     SupplierRankingResult,
     ComparisonResult,
 )
+from valerie.infrastructure.otel import instrument_engine
+from valerie.infrastructure.request_timing import timed
+
+# Number of top categories/items included in a SupplierDetail
+DETAIL_TOP_N = 5
+
+# Lightweight table constructs for the FTS5 virtual tables (see search_index.py)
+_items_fts = table(ITEMS_FTS_TABLE, column("rowid"), column("rank"))
+_categories_fts = table(CATEGORIES_FTS_TABLE, column("rowid"), column("rank"))
+
+
+def _fts_match(table_name: str, match: str):
+    """Build a ``<fts table> MATCH :expr`` clause."""
+    return literal_column(table_name).op("MATCH")(match)
+
+
+def build_comparison(suppliers_detail: list[SupplierDetail]) -> ComparisonResult:
+    """Build side-by-side metrics and recommendations for supplier details.
+
+    Args:
+        suppliers_detail: Details of the compared suppliers, in request order.
+
+    Returns:
+        The comparison result.
+    """
+    # Build metrics comparison
+    metrics = {
+        "total_amount": {s.name: s.total_amount for s in suppliers_detail},
+        "total_orders": {s.name: float(s.total_orders) for s in suppliers_detail},
+        "avg_order_value": {s.name: s.avg_order_value for s in suppliers_detail},
+        "market_share": {s.name: s.market_share for s in suppliers_detail},
+    }
+
+    # Find common categories
+    if suppliers_detail:
+        category_sets = []
+        for detail in suppliers_detail:
+            cat_names = {c.name for c in detail.top_categories}
+            category_sets.append(cat_names)
+
+        common_categories = list(set.intersection(*category_sets)) if category_sets else []
+    else:
+        common_categories = []
+
+    # Generate recommendations
+    recommendations = []
+    if suppliers_detail:
+        # Find highest volume supplier
+        by_volume = sorted(suppliers_detail, key=lambda s: s.total_amount, reverse=True)
+        if by_volume:
+            recommendations.append(
+                f"{by_volume[0].name} has the highest total spend "
+                f"(${by_volume[0].total_amount:,.2f})"
+            )
+
+        # Find supplier with most orders
+        by_orders = sorted(suppliers_detail, key=lambda s: s.total_orders, reverse=True)
+        if by_orders and len(suppliers_detail) > 1:
+            recommendations.append(
+                f"{by_orders[0].name} has the most orders ({by_orders[0].total_orders})"
+            )
+
+        # Find best avg order value
+        by_avg = sorted(suppliers_detail, key=lambda s: s.avg_order_value, reverse=True)
+        if by_avg and len(suppliers_detail) > 1:
+            recommendations.append(
+                f"{by_avg[0].name} has the highest average order value "
+                f"(${by_avg[0].avg_order_value:,.2f})"
+            )
+
+    return ComparisonResult(
+        suppliers=suppliers_detail,
+        metrics=metrics,
+        common_categories=common_categories,
+        recommendations=recommendations,
+    )
 
 
 class SQLiteDataSource(BaseDataSource):
@@ -27,23 +127,65 @@ class SQLiteDataSource(BaseDataSource):
     SQLite data source implementation.
 
     Uses SQLAlchemy for database access with the Database class from database.py.
-    All methods are async-compatible by running sync SQLAlchemy code in a thread pool.
+    All methods are async-compatible: sync SQLAlchemy code runs on a dedicated
+    thread pool sized to the connection pool, or through an aiosqlite engine
+    when ``async_engine=True``.
     """
 
-    def __init__(self, db_path: Union[str, Path] = "data/valerie.db"):
+    def __init__(
+        self,
+        db_path: str | Path = "data/valerie.db",
+        tuning: SQLiteTuning | None = None,
+        max_workers: int | None = None,
+        async_engine: bool = False,
+    ):
         """
         Initialize SQLite data source.
 
         Args:
             db_path: Path to the SQLite database file.
                      Use ':memory:' for an in-memory database (useful for testing).
+            tuning: Connection pool and PRAGMA settings for file databases.
+            max_workers: Query threads. Defaults to the connection pool size.
+            async_engine: Run queries through an aiosqlite async engine
+                          instead of the thread pool (requires aiosqlite).
         """
+        self._async_engine = None
+        self._async_sessions = None
+
         # Handle :memory: special case
         if str(db_path) == ":memory:":
+            if async_engine:
+                raise ValueError("Async engine mode is not supported for ':memory:'")
             self._init_memory_db()
+            # A single shared connection: more threads would only contend for it
+            pool_size = 1
         else:
-            self.db = Database(db_path)
+            self.db = Database(db_path, tuning)
             self.db.create_tables()
+            pool_size = self.db.tuning.pool_size
+
+        # Dedicated executor so DB calls don't compete with the loop's default one
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or pool_size,
+            thread_name_prefix="valerie-db",
+        )
+
+        if async_engine:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self._async_engine = self.db.create_async_engine()
+            self._async_sessions = async_sessionmaker(
+                self._async_engine, autoflush=False, expire_on_commit=False
+            )
+
+        # Record queries as OpenTelemetry spans when span export is enabled
+        instrument_engine(self.db.engine)
+        if self._async_engine is not None:
+            instrument_engine(self._async_engine.sync_engine)
+
+        # Use the FTS5 index when present, otherwise fall back to LIKE scans
+        self._fts_enabled = search_index_exists(self.db.engine)
 
     def _init_memory_db(self):
         """Initialize an in-memory SQLite database."""
@@ -101,10 +243,76 @@ class SQLiteDataSource(BaseDataSource):
         self.db = MemoryDatabase(engine, SessionLocal)
         self.db.create_tables()
 
-    def _run_sync(self, func, *args, **kwargs):
-        """Run a synchronous function in a thread pool."""
-        loop = asyncio.get_event_loop()
-        return loop.run_in_executor(None, partial(func, *args, **kwargs))
+    def _call_with_session(self, func, *args, **kwargs):
+        """Call ``func(session, *args, **kwargs)`` with a fresh session."""
+        session = self.db.get_session()
+        try:
+            return func(session, *args, **kwargs)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def _run_sync(self, func, *args, **kwargs):
+        """Run a synchronous query function off the event loop.
+
+        ``func`` receives a session as its first argument. Each call gets its
+        own session, so concurrent calls never share one. The time taken,
+        including waiting for a worker, is added to the request's "db" timing.
+        """
+        with timed("db", "Data source queries"):
+            if self._async_sessions is not None:
+                async with self._async_sessions() as session:
+                    return await session.run_sync(func, *args, **kwargs)
+
+            # Run in a copy of the caller's context so query spans get the
+            # current span as parent and the request's correlation ID
+            context = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                partial(context.run, self._call_with_session, func, *args, **kwargs),
+            )
+
+    async def close(self) -> None:
+        """Shut down the query executor and release pooled connections."""
+        self._executor.shutdown(wait=False)
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        self.db.engine.dispose()
+
+    def _match_expression(self, term: str) -> str | None:
+        """Get the FTS5 MATCH expression for a term, or None to use LIKE."""
+        if not self._fts_enabled:
+            return None
+        return build_match_query(term)
+
+    def _item_filter(self, term: str):
+        """Filter clause matching supplier items by code or description."""
+        match = self._match_expression(term)
+        if match is None:
+            return or_(
+                SupplierItem.item_code.ilike(f"%{term}%"),
+                SupplierItem.description.ilike(f"%{term}%"),
+            )
+        return SupplierItem.id.in_(
+            select(_items_fts.c.rowid).where(_fts_match(ITEMS_FTS_TABLE, match))
+        )
+
+    def _category_filter(self, term: str):
+        """Filter clause matching categories by name or any hierarchy level."""
+        match = self._match_expression(term)
+        if match is None:
+            return or_(
+                Category.name.ilike(f"%{term}%"),
+                Category.level1.ilike(f"%{term}%"),
+                Category.level2.ilike(f"%{term}%"),
+                Category.level3.ilike(f"%{term}%"),
+            )
+        return Category.id.in_(
+            select(_categories_fts.c.rowid).where(_fts_match(CATEGORIES_FTS_TABLE, match))
+        )
 
     def _supplier_to_result(self, supplier: Supplier) -> SupplierResult:
         """Convert a Supplier model to SupplierResult DTO."""
@@ -168,64 +376,41 @@ class SQLiteDataSource(BaseDataSource):
 
     def _search_suppliers_sync(
         self,
+        session: Session,
         name: str | None = None,
         category: str | None = None,
         product: str | None = None,
         limit: int = 10,
     ) -> list[SupplierResult]:
         """Synchronous implementation of supplier search."""
-        with self.db as session:
-            query = session.query(Supplier)
-
-            if name:
-                query = query.filter(Supplier.name.ilike(f"%{name}%"))
-
-            if category:
-                # Join through SupplierCategory to Category
-                query = (
-                    query.join(SupplierCategory, Supplier.id == SupplierCategory.supplier_id)
-                    .join(Category, SupplierCategory.category_id == Category.id)
-                    .filter(
-                        or_(
-                            Category.name.ilike(f"%{category}%"),
-                            Category.level1.ilike(f"%{category}%"),
-                            Category.level2.ilike(f"%{category}%"),
-                            Category.level3.ilike(f"%{category}%"),
-                        )
-                    )
-                )
+        query = session.query(Supplier)
 
-            if product:
-                # Join through SupplierItem
-                if category:
-                    # Already joined, need to also join items
-                    query = query.join(
-                        SupplierItem, Supplier.id == SupplierItem.supplier_id
-                    ).filter(
-                        or_(
-                            SupplierItem.item_code.ilike(f"%{product}%"),
-                            SupplierItem.description.ilike(f"%{product}%"),
-                        )
-                    )
-                else:
-                    query = query.join(
-                        SupplierItem, Supplier.id == SupplierItem.supplier_id
-                    ).filter(
-                        or_(
-                            SupplierItem.item_code.ilike(f"%{product}%"),
-                            SupplierItem.description.ilike(f"%{product}%"),
-                        )
-                    )
+        if name:
+            query = query.filter(Supplier.name.ilike(f"%{name}%"))
 
-            # Deduplicate and order by total_amount descending
+        if category:
+            # Join through SupplierCategory to Category
             query = (
-                query.distinct()
-                .order_by(desc(Supplier.total_amount))
-                .limit(limit)
+                query.join(SupplierCategory, Supplier.id == SupplierCategory.supplier_id)
+                .join(Category, SupplierCategory.category_id == Category.id)
+                .filter(self._category_filter(category))
             )
 
-            suppliers = query.all()
-            return [self._supplier_to_result(s) for s in suppliers]
+        if product:
+            # Join through SupplierItem
+            query = query.join(
+                SupplierItem, Supplier.id == SupplierItem.supplier_id
+            ).filter(self._item_filter(product))
+
+        # Deduplicate and order by total_amount descending
+        query = (
+            query.distinct()
+            .order_by(desc(Supplier.total_amount))
+            .limit(limit)
+        )
+
+        suppliers = query.all()
+        return [self._supplier_to_result(s) for s in suppliers]
 
     async def search_suppliers(
         self,
@@ -239,171 +424,287 @@ class SQLiteDataSource(BaseDataSource):
             self._search_suppliers_sync, name, category, product, limit
         )
 
-    def _get_supplier_detail_sync(self, supplier_id: str) -> SupplierDetail | None:
-        """Synchronous implementation of get_supplier_detail."""
-        with self.db as session:
-            # Try to find by ID first, then by name
+    def _resolve_suppliers(
+        self, session: Session, supplier_ids: list[str]
+    ) -> list[Supplier]:
+        """Resolve supplier IDs or partial names in a single query.
+
+        Each entry is looked up by numeric ID first and by case-insensitive
+        partial name otherwise. Unresolved entries are skipped.
+
+        Args:
+            session: Active database session.
+            supplier_ids: Supplier IDs or names, in the requested order.
+
+        Returns:
+            Matched suppliers, in the order of ``supplier_ids``.
+        """
+        if not supplier_ids:
+            return []
+
+        other = aliased(Supplier)
+        int_ids = set()
+        name_matches = []
+        for sid in supplier_ids:
+            name_match = Supplier.name.ilike(f"%{sid}%")
+            try:
+                int_id = int(sid)
+            except ValueError:
+                pass
+            else:
+                int_ids.add(int_id)
+                # Only fall back to the name when no supplier has this ID
+                name_match = and_(name_match, ~exists().where(other.id == int_id))
+            name_matches.append(name_match)
+
+        rows = (
+            session.query(
+                Supplier,
+                *[match.label(f"match_{i}") for i, match in enumerate(name_matches)],
+            )
+            .filter(or_(Supplier.id.in_(int_ids), *name_matches))
+            .order_by(Supplier.id)
+            .all()
+        )
+
+        by_id = {row[0].id: row[0] for row in rows}
+        resolved = []
+        for i, sid in enumerate(supplier_ids):
             supplier = None
             try:
-                supplier_int_id = int(supplier_id)
-                supplier = session.query(Supplier).filter(
-                    Supplier.id == supplier_int_id
-                ).first()
+                supplier = by_id.get(int(sid))
             except ValueError:
                 pass
+            if supplier is None:
+                supplier = next((row[0] for row in rows if row[i + 1]), None)
+            if supplier is not None:
+                resolved.append(supplier)
+        return resolved
+
+    def _build_supplier_details(
+        self, session: Session, suppliers: list[Supplier]
+    ) -> list[SupplierDetail]:
+        """Build SupplierDetail DTOs for several suppliers with batched queries.
+
+        Top categories and top items come from one window-function query
+        each, and rank and market share from the supplier_rankings table
+        (or one live query for unranked suppliers), so the number of round
+        trips does not grow with the number of suppliers.
 
-            if not supplier:
-                supplier = session.query(Supplier).filter(
-                    Supplier.name.ilike(f"%{supplier_id}%")
-                ).first()
-
-            if not supplier:
-                return None
-
-            # Get top categories for this supplier
-            top_categories_data = (
-                session.query(Category, SupplierCategory.item_count, SupplierCategory.total_amount)
-                .join(SupplierCategory, Category.id == SupplierCategory.category_id)
-                .filter(SupplierCategory.supplier_id == supplier.id)
-                .order_by(desc(SupplierCategory.total_amount))
-                .limit(5)
-                .all()
-            )
+        Args:
+            session: Active database session.
+            suppliers: Suppliers to describe.
 
-            top_categories = []
-            for cat, item_count, total_amount in top_categories_data:
-                cat_result = self._category_to_result(cat)
-                cat_result.item_count = item_count or 0
-                cat_result.total_amount = total_amount or 0.0
-                top_categories.append(cat_result)
-
-            # Get top items for this supplier
-            top_items_data = (
-                session.query(SupplierItem, Category.name)
-                .outerjoin(Category, SupplierItem.category_id == Category.id)
-                .filter(SupplierItem.supplier_id == supplier.id)
-                .order_by(desc(SupplierItem.total_ordered_amount))
-                .limit(5)
-                .all()
+        Returns:
+            One SupplierDetail per supplier, in the same order.
+        """
+        if not suppliers:
+            return []
+
+        ids = list({s.id for s in suppliers})
+
+        # Top categories per supplier
+        ranked_categories = (
+            session.query(
+                SupplierCategory.supplier_id,
+                SupplierCategory.category_id,
+                SupplierCategory.item_count,
+                SupplierCategory.total_amount,
+                func.row_number()
+                .over(
+                    partition_by=SupplierCategory.supplier_id,
+                    order_by=(desc(SupplierCategory.total_amount), SupplierCategory.id),
+                )
+                .label("row_num"),
             )
-
-            top_items = [
+            .filter(SupplierCategory.supplier_id.in_(ids))
+            .subquery()
+        )
+        top_categories: dict[int, list[CategoryResult]] = {sid: [] for sid in ids}
+        for supplier_id, cat, item_count, total_amount in (
+            session.query(
+                ranked_categories.c.supplier_id,
+                Category,
+                ranked_categories.c.item_count,
+                ranked_categories.c.total_amount,
+            )
+            .join(Category, Category.id == ranked_categories.c.category_id)
+            .filter(ranked_categories.c.row_num <= DETAIL_TOP_N)
+            .order_by(ranked_categories.c.supplier_id, ranked_categories.c.row_num)
+        ):
+            cat_result = self._category_to_result(cat)
+            cat_result.item_count = item_count or 0
+            cat_result.total_amount = total_amount or 0.0
+            top_categories[supplier_id].append(cat_result)
+
+        # Top items per supplier
+        ranked_items = (
+            session.query(
+                SupplierItem,
+                func.row_number()
+                .over(
+                    partition_by=SupplierItem.supplier_id,
+                    order_by=(desc(SupplierItem.total_ordered_amount), SupplierItem.id),
+                )
+                .label("row_num"),
+            )
+            .filter(SupplierItem.supplier_id.in_(ids))
+            .subquery()
+        )
+        ranked_item = aliased(SupplierItem, ranked_items)
+        top_items: dict[int, list[ProductResult]] = {sid: [] for sid in ids}
+        for item, cat_name in (
+            session.query(ranked_item, Category.name)
+            .outerjoin(Category, ranked_item.category_id == Category.id)
+            .filter(ranked_items.c.row_num <= DETAIL_TOP_N)
+            .order_by(ranked_items.c.supplier_id, ranked_items.c.row_num)
+        ):
+            top_items[item.supplier_id].append(
                 self._item_to_product_result(item, cat_name, supplier_count=1)
-                for item, cat_name in top_items_data
-            ]
-
-            # Calculate rank by volume
-            rank_query = (
-                session.query(func.count(Supplier.id) + 1)
-                .filter(Supplier.total_amount > supplier.total_amount)
-                .scalar()
             )
-            rank_by_volume = rank_query or 1
 
-            # Calculate market share
-            total_market = session.query(func.sum(Supplier.total_amount)).scalar() or 0.0
-            market_share = (
-                (supplier.total_amount / total_market * 100) if total_market > 0 else 0.0
+        # Rank and market share from the precomputed rankings table
+        ranks: dict[int, int] = {}
+        shares: dict[int, float] = {}
+        for ranking in session.query(SupplierRanking).filter(
+            SupplierRanking.supplier_id.in_(ids)
+        ):
+            ranks[ranking.supplier_id] = ranking.rank_by_amount
+            shares[ranking.supplier_id] = ranking.market_share or 0.0
+
+        missing = [sid for sid in ids if sid not in ranks]
+        if missing:
+            # Not ranked yet: compute rank and market total live, in one round trip
+            other = aliased(Supplier)
+            rank_col = (
+                select(func.count(other.id) + 1)
+                .where(other.total_amount > Supplier.total_amount)
+                .correlate(Supplier)
+                .scalar_subquery()
             )
-
-            return SupplierDetail(
-                id=str(supplier.id),
-                name=supplier.name,
-                site=supplier.site,
-                total_orders=supplier.total_orders or 0,
-                total_amount=supplier.total_amount or 0.0,
-                avg_order_value=supplier.avg_order_value or 0.0,
-                first_order_date=supplier.first_order_date,
-                last_order_date=supplier.last_order_date,
-                top_categories=top_categories,
-                top_items=top_items,
-                rank_by_volume=rank_by_volume,
-                market_share=round(market_share, 2),
+            market_col = select(func.sum(other.total_amount)).scalar_subquery()
+            for supplier_id, amount, rank, market in session.query(
+                Supplier.id, Supplier.total_amount, rank_col, market_col
+            ).filter(Supplier.id.in_(missing)):
+                ranks[supplier_id] = rank or 1
+                shares[supplier_id] = (amount / market * 100) if market else 0.0
+
+        details = []
+        for supplier in suppliers:
+            details.append(
+                SupplierDetail(
+                    id=str(supplier.id),
+                    name=supplier.name,
+                    site=supplier.site,
+                    total_orders=supplier.total_orders or 0,
+                    total_amount=supplier.total_amount or 0.0,
+                    avg_order_value=supplier.avg_order_value or 0.0,
+                    first_order_date=supplier.first_order_date,
+                    last_order_date=supplier.last_order_date,
+                    top_categories=top_categories[supplier.id],
+                    top_items=top_items[supplier.id],
+                    rank_by_volume=ranks.get(supplier.id, 1),
+                    market_share=round(shares.get(supplier.id, 0.0), 2),
+                )
             )
+        return details
+
+    def _get_supplier_detail_sync(
+        self, session: Session, supplier_id: str
+    ) -> SupplierDetail | None:
+        """Synchronous implementation of get_supplier_detail."""
+        suppliers = self._resolve_suppliers(session, [supplier_id])
+        if not suppliers:
+            return None
+        return self._build_supplier_details(session, suppliers)[0]
 
     async def get_supplier_detail(self, supplier_id: str) -> SupplierDetail | None:
         """Get detailed information about a specific supplier."""
         return await self._run_sync(self._get_supplier_detail_sync, supplier_id)
 
     def _search_products_sync(
-        self, query: str, category: str | None = None, limit: int = 20
+        self, session: Session, query: str, category: str | None = None, limit: int = 20
     ) -> list[ProductResult]:
         """Synchronous implementation of product search."""
-        with self.db as session:
-            # Subquery to count suppliers per item
-            supplier_count_subq = (
-                session.query(
-                    SupplierItem.item_code,
-                    func.count(SupplierItem.supplier_id.distinct()).label("supplier_count"),
-                )
-                .group_by(SupplierItem.item_code)
-                .subquery()
-            )
+        match = self._match_expression(query)
 
-            # Aggregate product data across all suppliers
-            base_query = (
-                session.query(
-                    SupplierItem.item_code,
-                    SupplierItem.description,
-                    SupplierItem.uom,
-                    Category.id.label("category_id"),
-                    Category.name.label("category_name"),
-                    func.avg(SupplierItem.avg_price).label("avg_price"),
-                    func.min(SupplierItem.min_price).label("min_price"),
-                    func.max(SupplierItem.max_price).label("max_price"),
-                    supplier_count_subq.c.supplier_count,
-                )
-                .outerjoin(Category, SupplierItem.category_id == Category.id)
-                .outerjoin(
-                    supplier_count_subq,
-                    SupplierItem.item_code == supplier_count_subq.c.item_code,
-                )
-                .filter(
-                    or_(
-                        SupplierItem.item_code.ilike(f"%{query}%"),
-                        SupplierItem.description.ilike(f"%{query}%"),
-                    )
-                )
+        # Subquery to count suppliers per item
+        supplier_count_subq = (
+            session.query(
+                SupplierItem.item_code,
+                func.count(SupplierItem.supplier_id.distinct()).label("supplier_count"),
             )
+            .group_by(SupplierItem.item_code)
+            .subquery()
+        )
 
-            if category:
-                base_query = base_query.filter(
-                    or_(
-                        Category.name.ilike(f"%{category}%"),
-                        Category.level1.ilike(f"%{category}%"),
-                        Category.level2.ilike(f"%{category}%"),
-                        Category.level3.ilike(f"%{category}%"),
-                    )
-                )
-
-            # Group by item_code to get unique products
-            results = (
-                base_query.group_by(
-                    SupplierItem.item_code,
-                    SupplierItem.description,
-                    SupplierItem.uom,
-                    Category.id,
-                    Category.name,
-                    supplier_count_subq.c.supplier_count,
-                )
-                .limit(limit)
-                .all()
+        # Aggregate product data across all suppliers
+        base_query = (
+            session.query(
+                SupplierItem.item_code,
+                SupplierItem.description,
+                SupplierItem.uom,
+                Category.id.label("category_id"),
+                Category.name.label("category_name"),
+                func.avg(SupplierItem.avg_price).label("avg_price"),
+                func.min(SupplierItem.min_price).label("min_price"),
+                func.max(SupplierItem.max_price).label("max_price"),
+                supplier_count_subq.c.supplier_count,
+            )
+            .outerjoin(Category, SupplierItem.category_id == Category.id)
+            .outerjoin(
+                supplier_count_subq,
+                SupplierItem.item_code == supplier_count_subq.c.item_code,
             )
+        )
 
-            return [
-                ProductResult(
-                    item_code=row.item_code or "",
-                    description=row.description or "",
-                    category=row.category_name or "",
-                    category_id=str(row.category_id) if row.category_id else None,
-                    uom=row.uom or "EA",
-                    avg_price=row.avg_price or 0.0,
-                    min_price=row.min_price or 0.0,
-                    max_price=row.max_price or 0.0,
-                    supplier_count=row.supplier_count or 0,
+        fts_subq = None
+        if match is None:
+            base_query = base_query.filter(self._item_filter(query))
+        else:
+            # Ranked token/prefix match through the FTS5 index
+            fts_subq = (
+                select(
+                    _items_fts.c.rowid.label("item_id"),
+                    _items_fts.c.rank.label("score"),
                 )
-                for row in results
-            ]
+                .where(_fts_match(ITEMS_FTS_TABLE, match))
+                .subquery()
+            )
+            base_query = base_query.join(fts_subq, SupplierItem.id == fts_subq.c.item_id)
+
+        if category:
+            base_query = base_query.filter(self._category_filter(category))
+
+        # Group by item_code to get unique products
+        base_query = base_query.group_by(
+            SupplierItem.item_code,
+            SupplierItem.description,
+            SupplierItem.uom,
+            Category.id,
+            Category.name,
+            supplier_count_subq.c.supplier_count,
+        )
+        if fts_subq is not None:
+            # bm25 rank: lower is a better match
+            base_query = base_query.order_by(func.min(fts_subq.c.score))
+
+        results = base_query.limit(limit).all()
+
+        return [
+            ProductResult(
+                item_code=row.item_code or "",
+                description=row.description or "",
+                category=row.category_name or "",
+                category_id=str(row.category_id) if row.category_id else None,
+                uom=row.uom or "EA",
+                avg_price=row.avg_price or 0.0,
+                min_price=row.min_price or 0.0,
+                max_price=row.max_price or 0.0,
+                supplier_count=row.supplier_count or 0,
+            )
+            for row in results
+        ]
 
     async def search_products(
         self, query: str, category: str | None = None, limit: int = 20
@@ -411,119 +712,119 @@ class SQLiteDataSource(BaseDataSource):
         """Search for products/items."""
         return await self._run_sync(self._search_products_sync, query, category, limit)
 
-    def _get_product_suppliers_sync(self, item_code: str) -> ProductWithSuppliers | None:
+    def _get_product_suppliers_sync(
+        self, session: Session, item_code: str
+    ) -> ProductWithSuppliers | None:
         """Synchronous implementation of get_product_suppliers."""
-        with self.db as session:
-            # Get all supplier items for this item code
-            items_data = (
-                session.query(SupplierItem, Supplier, Category.name)
-                .join(Supplier, SupplierItem.supplier_id == Supplier.id)
-                .outerjoin(Category, SupplierItem.category_id == Category.id)
-                .filter(SupplierItem.item_code == item_code)
-                .all()
-            )
-
-            if not items_data:
-                return None
-
-            # Use the first item for product info
-            first_item, _, category_name = items_data[0]
+        # Get all supplier items for this item code
+        items_data = (
+            session.query(SupplierItem, Supplier, Category.name)
+            .join(Supplier, SupplierItem.supplier_id == Supplier.id)
+            .outerjoin(Category, SupplierItem.category_id == Category.id)
+            .filter(SupplierItem.item_code == item_code)
+            .all()
+        )
 
-            suppliers = [
-                SupplierPricingResult(
-                    supplier_id=str(supplier.id),
-                    supplier_name=supplier.name,
-                    avg_price=item.avg_price or 0.0,
-                    min_price=item.min_price or 0.0,
-                    max_price=item.max_price or 0.0,
-                    order_count=item.order_count or 0,
-                    total_ordered_qty=item.total_ordered_qty or 0.0,
-                    last_order_date=item.last_order_date,
-                )
-                for item, supplier, _ in items_data
-            ]
+        if not items_data:
+            return None
+
+        # Use the first item for product info
+        first_item, _, category_name = items_data[0]
+
+        suppliers = [
+            SupplierPricingResult(
+                supplier_id=str(supplier.id),
+                supplier_name=supplier.name,
+                avg_price=item.avg_price or 0.0,
+                min_price=item.min_price or 0.0,
+                max_price=item.max_price or 0.0,
+                order_count=item.order_count or 0,
+                total_ordered_qty=item.total_ordered_qty or 0.0,
+                last_order_date=item.last_order_date,
+            )
+            for item, supplier, _ in items_data
+        ]
 
-            # Sort suppliers by avg_price ascending
-            suppliers.sort(key=lambda s: s.avg_price)
+        # Sort suppliers by avg_price ascending
+        suppliers.sort(key=lambda s: s.avg_price)
 
-            return ProductWithSuppliers(
-                item_code=first_item.item_code or "",
-                description=first_item.description or "",
-                category=category_name or "",
-                uom=first_item.uom or "EA",
-                suppliers=suppliers,
-            )
+        return ProductWithSuppliers(
+            item_code=first_item.item_code or "",
+            description=first_item.description or "",
+            category=category_name or "",
+            uom=first_item.uom or "EA",
+            suppliers=suppliers,
+        )
 
     async def get_product_suppliers(self, item_code: str) -> ProductWithSuppliers | None:
         """Get a product with all its suppliers and pricing."""
         return await self._run_sync(self._get_product_suppliers_sync, item_code)
 
     def _get_categories_sync(
-        self, parent: str | None = None, level: int | None = None
+        self, session: Session, parent: str | None = None, level: int | None = None
     ) -> list[CategoryResult]:
         """Synchronous implementation of get_categories."""
-        with self.db as session:
-            # Subquery for supplier count per category
-            supplier_count_subq = (
-                session.query(
-                    SupplierCategory.category_id,
-                    func.count(SupplierCategory.supplier_id.distinct()).label(
-                        "supplier_count"
-                    ),
-                )
-                .group_by(SupplierCategory.category_id)
-                .subquery()
+        # Subquery for supplier count per category
+        supplier_count_subq = (
+            session.query(
+                SupplierCategory.category_id,
+                func.count(SupplierCategory.supplier_id.distinct()).label(
+                    "supplier_count"
+                ),
             )
+            .group_by(SupplierCategory.category_id)
+            .subquery()
+        )
 
-            query = session.query(
-                Category, supplier_count_subq.c.supplier_count
-            ).outerjoin(
-                supplier_count_subq, Category.id == supplier_count_subq.c.category_id
-            )
+        query = session.query(
+            Category, supplier_count_subq.c.supplier_count
+        ).outerjoin(
+            supplier_count_subq, Category.id == supplier_count_subq.c.category_id
+        )
 
-            if level is not None:
-                # Filter by level
-                if level == 1:
-                    query = query.filter(
-                        and_(
-                            Category.level1.isnot(None),
-                            or_(Category.level2.is_(None), Category.level2 == ""),
-                        )
+        if level is not None:
+            # Filter by level
+            if level == 1:
+                query = query.filter(
+                    and_(
+                        Category.level1.isnot(None),
+                        or_(Category.level2.is_(None), Category.level2 == ""),
                     )
-                elif level == 2:
-                    query = query.filter(
-                        and_(
-                            Category.level2.isnot(None),
-                            Category.level2 != "",
-                            or_(Category.level3.is_(None), Category.level3 == ""),
-                        )
-                    )
-                elif level == 3:
-                    query = query.filter(
-                        and_(Category.level3.isnot(None), Category.level3 != "")
+                )
+            elif level == 2:
+                query = query.filter(
+                    and_(
+                        Category.level2.isnot(None),
+                        Category.level2 != "",
+                        or_(Category.level3.is_(None), Category.level3 == ""),
                     )
+                )
+            elif level == 3:
+                query = query.filter(
+                    and_(Category.level3.isnot(None), Category.level3 != "")
+                )
 
-            if parent:
-                # Filter by parent category
-                parent_lower = parent.lower()
-                # Check if parent matches level1 or level1-level2 pattern
-                if "-" in parent:
-                    parts = parent.split("-", 1)
-                    query = query.filter(
-                        and_(
-                            Category.level1.ilike(f"%{parts[0]}%"),
-                            Category.level2.ilike(f"%{parts[1]}%"),
-                        )
+        if parent:
+            # Filter by parent category
+            parent_lower = parent.lower()
+            # Check if parent matches level1 or level1-level2 pattern
+            if "-" in parent:
+                parts = parent.split("-", 1)
+                query = query.filter(
+                    and_(
+                        Category.level1.ilike(f"%{parts[0]}%"),
+                        Category.level2.ilike(f"%{parts[1]}%"),
                     )
-                else:
-                    query = query.filter(Category.level1.ilike(f"%{parent}%"))
+                )
+            else:
+                query = query.filter(Category.level1.ilike(f"%{parent}%"))
 
-            results = query.order_by(Category.name).all()
+        results = query.order_by(Category.name).all()
 
-            return [
-                self._category_to_result(cat, supplier_count or 0)
-                for cat, supplier_count in results
-            ]
+        return [
+            self._category_to_result(cat, supplier_count or 0)
+            for cat, supplier_count in results
+        ]
 
     async def get_categories(
         self, parent: str | None = None, level: int | None = None
@@ -532,68 +833,115 @@ class SQLiteDataSource(BaseDataSource):
         return await self._run_sync(self._get_categories_sync, parent, level)
 
     def _get_top_suppliers_sync(
-        self, by: str = "amount", limit: int = 10
+        self, session: Session, by: str = "amount", limit: int = 10
     ) -> list[SupplierRankingResult]:
         """Synchronous implementation of get_top_suppliers."""
-        with self.db as session:
-            if by == "amount":
-                order_col = desc(Supplier.total_amount)
-                metric_name = "total_amount"
-            elif by == "orders":
-                order_col = desc(Supplier.total_orders)
-                metric_name = "total_orders"
-            elif by == "items":
-                # Count distinct items per supplier
-                item_count_subq = (
-                    session.query(
-                        SupplierItem.supplier_id,
-                        func.count(SupplierItem.id).label("item_count"),
-                    )
-                    .group_by(SupplierItem.supplier_id)
-                    .subquery()
-                )
+        results = self._top_suppliers_from_rankings(session, by, limit)
+        if results:
+            return results
+        # Rankings not refreshed yet (e.g. fresh database): compute live
+        return self._top_suppliers_live(session, by, limit)
+
+    def _top_suppliers_from_rankings(
+        self, session: Session, by: str, limit: int
+    ) -> list[SupplierRankingResult]:
+        """Read top suppliers from the precomputed supplier_rankings table."""
+        if by == "orders":
+            rank_col, metric_name = SupplierRanking.rank_by_orders, "total_orders"
+        elif by == "items":
+            rank_col, metric_name = SupplierRanking.rank_by_items, "item_count"
+        else:
+            rank_col, metric_name = SupplierRanking.rank_by_amount, "total_amount"
+
+        rows = (
+            session.query(Supplier, SupplierRanking)
+            .join(SupplierRanking, SupplierRanking.supplier_id == Supplier.id)
+            .order_by(rank_col, Supplier.id)
+            .limit(limit)
+            .all()
+        )
 
-                results = (
-                    session.query(Supplier, item_count_subq.c.item_count)
-                    .outerjoin(
-                        item_count_subq, Supplier.id == item_count_subq.c.supplier_id
-                    )
-                    .order_by(desc(item_count_subq.c.item_count))
-                    .limit(limit)
-                    .all()
+        results = []
+        for i, (supplier, ranking) in enumerate(rows):
+            if metric_name == "total_orders":
+                metric_value = float(supplier.total_orders or 0)
+            elif metric_name == "item_count":
+                metric_value = float(ranking.item_count or 0)
+            else:
+                metric_value = supplier.total_amount or 0.0
+            results.append(
+                SupplierRankingResult(
+                    rank=i + 1,
+                    supplier_id=str(supplier.id),
+                    supplier_name=supplier.name,
+                    metric_value=metric_value,
+                    metric_name=metric_name,
                 )
+            )
+        return results
 
-                return [
-                    SupplierRankingResult(
-                        rank=i + 1,
-                        supplier_id=str(supplier.id),
-                        supplier_name=supplier.name,
-                        metric_value=float(item_count or 0),
-                        metric_name="item_count",
-                    )
-                    for i, (supplier, item_count) in enumerate(results)
-                ]
-            else:
-                # Default to amount
-                order_col = desc(Supplier.total_amount)
-                metric_name = "total_amount"
+    def _top_suppliers_live(
+        self, session: Session, by: str, limit: int
+    ) -> list[SupplierRankingResult]:
+        """Compute top suppliers directly from the suppliers table."""
+        if by == "amount":
+            order_col = desc(Supplier.total_amount)
+            metric_name = "total_amount"
+        elif by == "orders":
+            order_col = desc(Supplier.total_orders)
+            metric_name = "total_orders"
+        elif by == "items":
+            # Count distinct items per supplier
+            item_count_subq = (
+                session.query(
+                    SupplierItem.supplier_id,
+                    func.count(SupplierItem.id).label("item_count"),
+                )
+                .group_by(SupplierItem.supplier_id)
+                .subquery()
+            )
 
-            suppliers = (
-                session.query(Supplier).order_by(order_col).limit(limit).all()
+            results = (
+                session.query(Supplier, item_count_subq.c.item_count)
+                .outerjoin(
+                    item_count_subq, Supplier.id == item_count_subq.c.supplier_id
+                )
+                .order_by(desc(item_count_subq.c.item_count))
+                .limit(limit)
+                .all()
             )
 
             return [
                 SupplierRankingResult(
                     rank=i + 1,
-                    supplier_id=str(s.id),
-                    supplier_name=s.name,
-                    metric_value=(
-                        s.total_amount if metric_name == "total_amount" else float(s.total_orders)
-                    ),
-                    metric_name=metric_name,
+                    supplier_id=str(supplier.id),
+                    supplier_name=supplier.name,
+                    metric_value=float(item_count or 0),
+                    metric_name="item_count",
                 )
-                for i, s in enumerate(suppliers)
+                for i, (supplier, item_count) in enumerate(results)
             ]
+        else:
+            # Default to amount
+            order_col = desc(Supplier.total_amount)
+            metric_name = "total_amount"
+
+        suppliers = (
+            session.query(Supplier).order_by(order_col).limit(limit).all()
+        )
+
+        return [
+            SupplierRankingResult(
+                rank=i + 1,
+                supplier_id=str(s.id),
+                supplier_name=s.name,
+                metric_value=(
+                    s.total_amount if metric_name == "total_amount" else float(s.total_orders)
+                ),
+                metric_name=metric_name,
+            )
+            for i, s in enumerate(suppliers)
+        ]
 
     async def get_top_suppliers(
         self, by: str = "amount", limit: int = 10
@@ -601,175 +949,34 @@ class SQLiteDataSource(BaseDataSource):
         """Get top suppliers by a metric."""
         return await self._run_sync(self._get_top_suppliers_sync, by, limit)
 
-    def _compare_suppliers_sync(self, supplier_ids: list[str]) -> ComparisonResult:
+    def _compare_suppliers_sync(
+        self, session: Session, supplier_ids: list[str]
+    ) -> ComparisonResult:
         """Synchronous implementation of compare_suppliers."""
-        with self.db as session:
-            suppliers_detail = []
-
-            for sid in supplier_ids:
-                # Use the sync detail method logic inline to avoid nested context managers
-                supplier = None
-                try:
-                    supplier_int_id = int(sid)
-                    supplier = session.query(Supplier).filter(
-                        Supplier.id == supplier_int_id
-                    ).first()
-                except ValueError:
-                    pass
-
-                if not supplier:
-                    supplier = session.query(Supplier).filter(
-                        Supplier.name.ilike(f"%{sid}%")
-                    ).first()
-
-                if supplier:
-                    # Get top categories for this supplier
-                    top_categories_data = (
-                        session.query(
-                            Category,
-                            SupplierCategory.item_count,
-                            SupplierCategory.total_amount,
-                        )
-                        .join(SupplierCategory, Category.id == SupplierCategory.category_id)
-                        .filter(SupplierCategory.supplier_id == supplier.id)
-                        .order_by(desc(SupplierCategory.total_amount))
-                        .limit(5)
-                        .all()
-                    )
-
-                    top_categories = []
-                    for cat, item_count, total_amount in top_categories_data:
-                        cat_result = self._category_to_result(cat)
-                        cat_result.item_count = item_count or 0
-                        cat_result.total_amount = total_amount or 0.0
-                        top_categories.append(cat_result)
-
-                    # Get top items for this supplier
-                    top_items_data = (
-                        session.query(SupplierItem, Category.name)
-                        .outerjoin(Category, SupplierItem.category_id == Category.id)
-                        .filter(SupplierItem.supplier_id == supplier.id)
-                        .order_by(desc(SupplierItem.total_ordered_amount))
-                        .limit(5)
-                        .all()
-                    )
-
-                    top_items = [
-                        self._item_to_product_result(item, cat_name, supplier_count=1)
-                        for item, cat_name in top_items_data
-                    ]
-
-                    # Calculate rank by volume
-                    rank_by_volume = (
-                        session.query(func.count(Supplier.id) + 1)
-                        .filter(Supplier.total_amount > supplier.total_amount)
-                        .scalar()
-                    ) or 1
-
-                    # Calculate market share
-                    total_market = (
-                        session.query(func.sum(Supplier.total_amount)).scalar() or 0.0
-                    )
-                    market_share = (
-                        (supplier.total_amount / total_market * 100)
-                        if total_market > 0
-                        else 0.0
-                    )
-
-                    detail = SupplierDetail(
-                        id=str(supplier.id),
-                        name=supplier.name,
-                        site=supplier.site,
-                        total_orders=supplier.total_orders or 0,
-                        total_amount=supplier.total_amount or 0.0,
-                        avg_order_value=supplier.avg_order_value or 0.0,
-                        first_order_date=supplier.first_order_date,
-                        last_order_date=supplier.last_order_date,
-                        top_categories=top_categories,
-                        top_items=top_items,
-                        rank_by_volume=rank_by_volume,
-                        market_share=round(market_share, 2),
-                    )
-                    suppliers_detail.append(detail)
-
-            # Build metrics comparison
-            metrics = {
-                "total_amount": {s.name: s.total_amount for s in suppliers_detail},
-                "total_orders": {s.name: float(s.total_orders) for s in suppliers_detail},
-                "avg_order_value": {s.name: s.avg_order_value for s in suppliers_detail},
-                "market_share": {s.name: s.market_share for s in suppliers_detail},
-            }
-
-            # Find common categories
-            if suppliers_detail:
-                category_sets = []
-                for detail in suppliers_detail:
-                    cat_names = {c.name for c in detail.top_categories}
-                    category_sets.append(cat_names)
-
-                common_categories = list(set.intersection(*category_sets)) if category_sets else []
-            else:
-                common_categories = []
-
-            # Generate recommendations
-            recommendations = []
-            if suppliers_detail:
-                # Find highest volume supplier
-                by_volume = sorted(suppliers_detail, key=lambda s: s.total_amount, reverse=True)
-                if by_volume:
-                    recommendations.append(
-                        f"{by_volume[0].name} has the highest total spend (${by_volume[0].total_amount:,.2f})"
-                    )
-
-                # Find supplier with most orders
-                by_orders = sorted(suppliers_detail, key=lambda s: s.total_orders, reverse=True)
-                if by_orders and len(suppliers_detail) > 1:
-                    recommendations.append(
-                        f"{by_orders[0].name} has the most orders ({by_orders[0].total_orders})"
-                    )
-
-                # Find best avg order value
-                by_avg = sorted(suppliers_detail, key=lambda s: s.avg_order_value, reverse=True)
-                if by_avg and len(suppliers_detail) > 1:
-                    recommendations.append(
-                        f"{by_avg[0].name} has the highest average order value (${by_avg[0].avg_order_value:,.2f})"
-                    )
-
-            return ComparisonResult(
-                suppliers=suppliers_detail,
-                metrics=metrics,
-                common_categories=common_categories,
-                recommendations=recommendations,
-            )
+        suppliers = self._resolve_suppliers(session, supplier_ids)
+        suppliers_detail = self._build_supplier_details(session, suppliers)
+        return build_comparison(suppliers_detail)
 
     async def compare_suppliers(self, supplier_ids: list[str]) -> ComparisonResult:
         """Compare multiple suppliers."""
         return await self._run_sync(self._compare_suppliers_sync, supplier_ids)
 
     def _get_category_suppliers_sync(
-        self, category: str, limit: int = 20
+        self, session: Session, category: str, limit: int = 20
     ) -> list[SupplierResult]:
         """Synchronous implementation of get_category_suppliers."""
-        with self.db as session:
-            query = (
-                session.query(Supplier)
-                .join(SupplierCategory, Supplier.id == SupplierCategory.supplier_id)
-                .join(Category, SupplierCategory.category_id == Category.id)
-                .filter(
-                    or_(
-                        Category.name.ilike(f"%{category}%"),
-                        Category.level1.ilike(f"%{category}%"),
-                        Category.level2.ilike(f"%{category}%"),
-                        Category.level3.ilike(f"%{category}%"),
-                    )
-                )
-                .order_by(desc(SupplierCategory.total_amount))
-                .distinct()
-                .limit(limit)
-            )
+        query = (
+            session.query(Supplier)
+            .join(SupplierCategory, Supplier.id == SupplierCategory.supplier_id)
+            .join(Category, SupplierCategory.category_id == Category.id)
+            .filter(self._category_filter(category))
+            .order_by(desc(SupplierCategory.total_amount))
+            .distinct()
+            .limit(limit)
+        )
 
-            suppliers = query.all()
-            return [self._supplier_to_result(s) for s in suppliers]
+        suppliers = query.all()
+        return [self._supplier_to_result(s) for s in suppliers]
 
     async def get_category_suppliers(
         self, category: str, limit: int = 20
@@ -777,16 +984,15 @@ class SQLiteDataSource(BaseDataSource):
         """Get all suppliers for a specific category."""
         return await self._run_sync(self._get_category_suppliers_sync, category, limit)
 
-    def _health_check_sync(self) -> bool:
+    def _health_check_sync(self, session: Session) -> bool:
         """Synchronous implementation of health_check."""
-        try:
-            with self.db as session:
-                # Simple query to verify connectivity
-                session.execute(text("SELECT 1"))
-                return True
-        except Exception:
-            return False
+        # Simple query to verify connectivity
+        session.execute(text("SELECT 1"))
+        return True
 
     async def health_check(self) -> bool:
         """Check if the data source is available."""
-        return await self._run_sync(self._health_check_sync)
+        try:
+            return await self._run_sync(self._health_check_sync)
+        except Exception:
+            return False
@@ -22,6 +22,7 @@ from ..infrastructure import (
     HITLAgent,
     ObservabilityManager,
 )
+from ..infrastructure.otel import trace_node
 from ..models import ChatState, Intent
 
 # Initialize agents
@@ -99,7 +100,13 @@ async def fallback_node(state: ChatState) -> ChatState:
 
 
 async def evaluation_node(state: ChatState) -> ChatState:
-    """Evaluate response quality."""
+    """Evaluate response quality.
+
+    With ``evaluation_async`` the response is queued for background scoring
+    so the user does not wait for the judge.
+    """
+    if _evaluation.settings.evaluation_async:
+        return _evaluation.submit(state)
     return await _evaluation.process(state)
 
 
@@ -174,18 +181,20 @@ def build_graph() -> StateGraph:
     graph = StateGraph(ChatState)
 
     # Add nodes
-    graph.add_node("guardrails", guardrails_node)
-    graph.add_node("intent_classifier", intent_classifier_node)
-    graph.add_node("supplier_search", supplier_search_node)
-    graph.add_node("compliance", compliance_node)
-    graph.add_node("comparison", comparison_node)
-    graph.add_node("process_expertise", process_expertise_node)
-    graph.add_node("risk_assessment", risk_assessment_node)
-    graph.add_node("memory_context", memory_context_node)
-    graph.add_node("hitl", hitl_node)
-    graph.add_node("response_generation", response_generation_node)
-    graph.add_node("fallback", fallback_node)
-    graph.add_node("evaluation", evaluation_node)
+    graph.add_node("guardrails", trace_node("guardrails", guardrails_node))
+    graph.add_node("intent_classifier", trace_node("intent_classifier", intent_classifier_node))
+    graph.add_node("supplier_search", trace_node("supplier_search", supplier_search_node))
+    graph.add_node("compliance", trace_node("compliance", compliance_node))
+    graph.add_node("comparison", trace_node("comparison", comparison_node))
+    graph.add_node("process_expertise", trace_node("process_expertise", process_expertise_node))
+    graph.add_node("risk_assessment", trace_node("risk_assessment", risk_assessment_node))
+    graph.add_node("memory_context", trace_node("memory_context", memory_context_node))
+    graph.add_node("hitl", trace_node("hitl", hitl_node))
+    graph.add_node(
+        "response_generation", trace_node("response_generation", response_generation_node)
+    )
+    graph.add_node("fallback", trace_node("fallback", fallback_node))
+    graph.add_node("evaluation", trace_node("evaluation", evaluation_node))
 
     # Add edges from START
     graph.add_edge(START, "guardrails")
@@ -4,6 +4,7 @@ This module provides a domain-aware graph builder that routes queries
 to the appropriate business domain based on content analysis.
 """
 
+from collections.abc import Awaitable, Callable
 from typing import Any, Literal
 
 from langgraph.checkpoint.memory import MemorySaver
@@ -28,6 +29,7 @@ from ..infrastructure import (
     HITLAgent,
     ObservabilityManager,
 )
+from ..infrastructure.otel import trace_node
 from ..models import ChatState, Intent
 
 # Initialize infrastructure agents (shared across domains)
@@ -62,8 +64,9 @@ def _get_domain_registry() -> DomainRegistry:
 def _classify_domain(state: ChatState) -> str | None:
     """Classify which domain a query belongs to.
 
-    Uses keyword matching to identify the appropriate domain.
-    Returns None if no domain matches (will use default).
+    Compares the message with each domain's example queries using local
+    embeddings (no LLM call). Falls back to the supplier domain when no
+    domain is similar enough.
 
     Args:
         state: Current chat state with user messages.
@@ -79,15 +82,11 @@ def _classify_domain(state: ChatState) -> str | None:
 
     last_message = state.messages[-1]
     if hasattr(last_message, "content"):
-        content = str(last_message.content).lower()
+        content = str(last_message.content)
     else:
-        content = str(last_message).lower()
+        content = str(last_message)
 
-    # Extract words for keyword matching
-    words = content.split()
-
-    # Try to find matching domain
-    domain = registry.find_by_keywords(words)
+    domain = registry.find_by_text(content)
     if domain:
         return domain.domain_id
 
@@ -252,33 +251,44 @@ def route_after_hitl(
     return "response_generation"
 
 
-def build_multi_domain_graph() -> StateGraph:
+def build_multi_domain_graph(
+    domain_classifier: Callable[[ChatState], Awaitable[ChatState]] | None = None,
+) -> StateGraph:
     """Build a multi-domain aware graph for the chatbot.
 
     This graph includes a domain classification step before intent
     classification, enabling routing to domain-specific subgraphs.
+
+    Args:
+        domain_classifier: Node that sets ``state.entities["_domain"]``,
+            defaults to the embedding-based domain_classifier_node.
     """
     # Create the graph with ChatState
     graph = StateGraph(ChatState)
 
     # Add nodes
-    graph.add_node("guardrails", guardrails_node)
-    graph.add_node("domain_classifier", domain_classifier_node)
-    graph.add_node("intent_classifier", intent_classifier_node)
+    graph.add_node("guardrails", trace_node("guardrails", guardrails_node))
+    graph.add_node(
+        "domain_classifier",
+        trace_node("domain_classifier", domain_classifier or domain_classifier_node),
+    )
+    graph.add_node("intent_classifier", trace_node("intent_classifier", intent_classifier_node))
 
     # Supplier domain nodes
-    graph.add_node("supplier_search", supplier_search_node)
-    graph.add_node("compliance", compliance_node)
-    graph.add_node("comparison", comparison_node)
-    graph.add_node("process_expertise", process_expertise_node)
-    graph.add_node("risk_assessment", risk_assessment_node)
-    graph.add_node("memory_context", memory_context_node)
+    graph.add_node("supplier_search", trace_node("supplier_search", supplier_search_node))
+    graph.add_node("compliance", trace_node("compliance", compliance_node))
+    graph.add_node("comparison", trace_node("comparison", comparison_node))
+    graph.add_node("process_expertise", trace_node("process_expertise", process_expertise_node))
+    graph.add_node("risk_assessment", trace_node("risk_assessment", risk_assessment_node))
+    graph.add_node("memory_context", trace_node("memory_context", memory_context_node))
 
     # Shared infrastructure nodes
-    graph.add_node("hitl", hitl_node)
-    graph.add_node("response_generation", response_generation_node)
-    graph.add_node("fallback", fallback_node)
-    graph.add_node("evaluation", evaluation_node)
+    graph.add_node("hitl", trace_node("hitl", hitl_node))
+    graph.add_node(
+        "response_generation", trace_node("response_generation", response_generation_node)
+    )
+    graph.add_node("fallback", trace_node("fallback", fallback_node))
+    graph.add_node("evaluation", trace_node("evaluation", evaluation_node))
 
     # Add edges from START
     graph.add_edge(START, "guardrails")
@@ -354,16 +364,20 @@ def build_multi_domain_graph() -> StateGraph:
     return graph
 
 
-def get_multi_domain_graph(checkpointer: bool = True) -> Any:
+def get_multi_domain_graph(
+    checkpointer: bool = True,
+    domain_classifier: Callable[[ChatState], Awaitable[ChatState]] | None = None,
+) -> Any:
     """Get a compiled multi-domain graph ready for execution.
 
     Args:
         checkpointer: Whether to use memory checkpointing for HITL.
+        domain_classifier: Replacement domain classifier node.
 
     Returns:
         Compiled LangGraph.
     """
-    graph = build_multi_domain_graph()
+    graph = build_multi_domain_graph(domain_classifier)
 
     if checkpointer:
         memory = MemorySaver()
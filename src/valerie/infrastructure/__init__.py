@@ -30,6 +30,7 @@ from .metrics import (
     llm_requests_total,
     llm_tokens_total,
     record_agent_execution,
+    record_data_source_cache,
     record_llm_request,
     record_request,
     request_duration_seconds,
@@ -88,6 +89,7 @@ __all__ = [
     "record_request",
     "record_llm_request",
     "record_agent_execution",
+    "record_data_source_cache",
     "set_provider_availability",
     "set_health_status",
     # Session
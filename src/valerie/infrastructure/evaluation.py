@@ -1,10 +1,12 @@
 """Evaluation agent - assesses response quality using LLM-as-Judge."""
 
 import json
+import random
 from datetime import datetime
 
 from ..agents.base import BaseAgent
 from ..models import ChatState
+from .evaluation_queue import EvaluationJob, EvaluationQueue, get_evaluation_queue
 
 
 class EvaluationAgent(BaseAgent):
@@ -51,26 +53,23 @@ Output JSON format:
     }
 }"""
 
+    def _skip_reason(self, state: ChatState) -> str | None:
+        """Return why a state is not evaluated, or None if it should be."""
+        if not state.final_response:
+            return "No response to evaluate"
+        if random.random() > self.settings.evaluation_sample_rate:
+            return "Not sampled"
+        return None
+
     async def process(self, state: ChatState) -> ChatState:
         """Evaluate the final response quality."""
         start_time = datetime.now()
 
-        # Only evaluate if we have a final response
-        if not state.final_response:
+        skip_reason = self._skip_reason(state)
+        if skip_reason:
             state.agent_outputs[self.name] = self.create_output(
                 success=True,
-                data={"skipped": True, "reason": "No response to evaluate"},
-                start_time=start_time,
-            )
-            return state
-
-        # Check if we should sample this request
-        import random
-
-        if random.random() > self.settings.evaluation_sample_rate:
-            state.agent_outputs[self.name] = self.create_output(
-                success=True,
-                data={"skipped": True, "reason": "Not sampled"},
+                data={"skipped": True, "reason": skip_reason},
                 start_time=start_time,
             )
             return state
@@ -94,8 +93,39 @@ Output JSON format:
 
         return state
 
-    async def _evaluate_response(self, state: ChatState) -> dict:
-        """Evaluate the response using LLM-as-Judge."""
+    def submit(self, state: ChatState, queue: EvaluationQueue | None = None) -> ChatState:
+        """Queue the final response for background evaluation and return at once.
+
+        The score is written to the queue's results sink, not to the state.
+
+        Args:
+            state: Chat state with the final response.
+            queue: Queue to submit to, defaults to the process-wide queue.
+
+        Returns:
+            The state, with the evaluation output marked queued or skipped.
+        """
+        start_time = datetime.now()
+
+        reason = self._skip_reason(state)
+        if reason is None:
+            queue = queue or get_evaluation_queue(self.evaluate_job)
+            if queue.submit(self.build_job(state)):
+                state.agent_outputs[self.name] = self.create_output(
+                    success=True, data={"queued": True}, start_time=start_time
+                )
+                return state
+            reason = "Evaluation queue full"
+
+        state.agent_outputs[self.name] = self.create_output(
+            success=True,
+            data={"skipped": True, "reason": reason},
+            start_time=start_time,
+        )
+        return state
+
+    def build_job(self, state: ChatState) -> EvaluationJob:
+        """Capture what the judge needs from a state."""
         # Get the original query
         query = ""
         for msg in state.messages:
@@ -103,20 +133,40 @@ Output JSON format:
                 query = str(msg.content)
                 break
 
+        return EvaluationJob(
+            query=query,
+            response=state.final_response,
+            intent=state.intent.value,
+            context={
+                "suppliers_found": len(state.suppliers),
+                "compliance_checks": len(state.compliance_results),
+                "risk_assessments": len(state.risk_results),
+                "itar_flagged": state.itar_flagged,
+            },
+            session_id=state.session_id,
+        )
+
+    async def _evaluate_response(self, state: ChatState) -> dict:
+        """Evaluate the response using LLM-as-Judge."""
+        return await self.evaluate_job(self.build_job(state))
+
+    async def evaluate_job(self, job: EvaluationJob) -> dict:
+        """Score a queued job using LLM-as-Judge."""
+        context = job.context
         prompt = f"""Evaluate the following chatbot response.
 
-User Query: {query}
+User Query: {job.query}
 
-Intent: {state.intent.value}
+Intent: {job.intent}
 
 Response:
-{state.final_response}
+{job.response}
 
 Additional Context:
-- Suppliers found: {len(state.suppliers)}
-- Compliance checks: {len(state.compliance_results)}
-- Risk assessments: {len(state.risk_results)}
-- ITAR flagged: {state.itar_flagged}
+- Suppliers found: {context.get("suppliers_found", 0)}
+- Compliance checks: {context.get("compliance_checks", 0)}
+- Risk assessments: {context.get("risk_assessments", 0)}
+- ITAR flagged: {context.get("itar_flagged", False)}
 
 Evaluate and provide scores (0-100) for each dimension.
 Respond with JSON only."""
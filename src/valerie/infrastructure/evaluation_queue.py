@@ -0,0 +1,346 @@
+"""Background evaluation pipeline.
+
+LLM-as-Judge scoring runs after the user already has the response, so the
+graph only enqueues an ``EvaluationJob`` and returns. A bounded queue feeds
+worker tasks that evaluate jobs in batches and write the results to a sink.
+
+When the queue is full new jobs are dropped rather than slowing requests
+down; drops, queue depth and queue wait time are exported as Prometheus
+metrics so sampling rates can be tuned against judge throughput.
+"""
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .logging_config import get_logger
+from .metrics import (
+    evaluation_queue_depth,
+    record_evaluation_job,
+    record_evaluation_wait,
+)
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EvaluationJob:
+    """A response waiting to be scored."""
+
+    query: str
+    response: str
+    intent: str
+    context: dict[str, Any] = field(default_factory=dict)
+    session_id: str = ""
+    created_at: datetime = field(default_factory=datetime.now)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class EvaluationResult:
+    """Outcome of evaluating one job."""
+
+    job: EvaluationJob
+    evaluation: dict[str, Any] | None = None
+    error: str | None = None
+    duration_ms: int = 0
+
+    @property
+    def success(self) -> bool:
+        """Whether the judge produced an evaluation."""
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        job = asdict(self.job)
+        job.pop("enqueued_at")
+        job["created_at"] = self.job.created_at.isoformat()
+        return {
+            **job,
+            "evaluation": self.evaluation,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+        }
+
+
+Evaluator = Callable[[EvaluationJob], Awaitable[dict[str, Any]]]
+
+
+class EvaluationSink(ABC):
+    """Destination for evaluation results."""
+
+    @abstractmethod
+    async def write(self, results: list[EvaluationResult]) -> None:
+        """Persist a batch of results."""
+        pass
+
+    async def close(self) -> None:
+        """Release sink resources."""
+
+
+class LoggingEvaluationSink(EvaluationSink):
+    """Writes each result as a structured log event."""
+
+    async def write(self, results: list[EvaluationResult]) -> None:
+        """Log a batch of results."""
+        for result in results:
+            if result.success:
+                logger.info(
+                    "evaluation_completed",
+                    session_id=result.job.session_id,
+                    intent=result.job.intent,
+                    overall=result.evaluation.get("overall"),
+                    duration_ms=result.duration_ms,
+                )
+            else:
+                logger.warning(
+                    "evaluation_failed",
+                    session_id=result.job.session_id,
+                    intent=result.job.intent,
+                    error=result.error,
+                )
+
+
+class JSONLEvaluationSink(EvaluationSink):
+    """Appends results to a JSON Lines file."""
+
+    def __init__(self, path: str | Path):
+        """Initialize the sink.
+
+        Args:
+            path: File to append results to; parent directories are created.
+        """
+        self.path = Path(path)
+
+    def _append(self, lines: list[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def write(self, results: list[EvaluationResult]) -> None:
+        """Append a batch of results, one JSON object per line."""
+        lines = [json.dumps(r.to_dict(), ensure_ascii=False, default=str) + "\n" for r in results]
+        await asyncio.to_thread(self._append, lines)
+
+
+class EvaluationQueue:
+    """Bounded queue of evaluation jobs drained by background workers."""
+
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        sink: EvaluationSink | None = None,
+        max_size: int = 1000,
+        batch_size: int = 8,
+        flush_interval: float = 0.5,
+        workers: int = 1,
+    ):
+        """Initialize the queue.
+
+        Args:
+            evaluator: Coroutine function scoring one job.
+            sink: Where results are written, defaults to structured logs.
+            max_size: Maximum queued jobs; further submissions are dropped.
+            batch_size: Maximum jobs evaluated concurrently per batch.
+            flush_interval: Seconds a worker waits to fill a batch.
+            workers: Number of worker tasks.
+        """
+        self.evaluator = evaluator
+        self.sink = sink or LoggingEvaluationSink()
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.workers = workers
+        self.dropped = 0
+        self.completed = 0
+        self._queue: asyncio.Queue[EvaluationJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether worker tasks are active."""
+        return any(not task.done() for task in self._tasks)
+
+    def qsize(self) -> int:
+        """Number of jobs waiting."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start worker tasks on the running event loop.
+
+        Queues and workers belong to one loop; if the loop changed (e.g.
+        successive ``asyncio.run`` calls in the CLI) jobs left on the old
+        loop are counted as dropped and a fresh queue is created.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._queue is not None and self._queue.qsize():
+                self.dropped += self._queue.qsize()
+                record_evaluation_job("dropped", self._queue.qsize())
+            self._queue, self._tasks, self._loop = None, [], loop
+        if self.running:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"evaluation-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def submit(self, job: EvaluationJob) -> bool:
+        """Enqueue a job without waiting.
+
+        Starts the workers on first use.
+
+        Args:
+            job: Job to evaluate.
+
+        Returns:
+            True if queued, False if the queue was full and the job dropped.
+        """
+        self.start()
+        job.enqueued_at = time.monotonic()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            record_evaluation_job("dropped")
+            return False
+        record_evaluation_job("enqueued")
+        evaluation_queue_depth.set(self._queue.qsize())
+        return True
+
+    async def _next_batch(self) -> list[EvaluationJob]:
+        """Wait for one job, then collect more until the batch or interval fills."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        evaluation_queue_depth.set(self._queue.qsize())
+        return batch
+
+    async def _evaluate(self, job: EvaluationJob) -> EvaluationResult:
+        """Score one job, capturing failures as results."""
+        record_evaluation_wait(time.monotonic() - job.enqueued_at)
+        start = time.monotonic()
+        try:
+            evaluation = await self.evaluator(job)
+        except Exception as e:
+            record_evaluation_job("failed")
+            return EvaluationResult(
+                job=job,
+                error=str(e),
+                duration_ms=int((time.monotonic() - start) * 1000),
+            )
+        record_evaluation_job("completed")
+        return EvaluationResult(
+            job=job,
+            evaluation=evaluation,
+            duration_ms=int((time.monotonic() - start) * 1000),
+        )
+
+    async def _worker(self) -> None:
+        """Evaluate batches until cancelled."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                results = await asyncio.gather(*(self._evaluate(job) for job in batch))
+                try:
+                    await self.sink.write(list(results))
+                except Exception as e:
+                    logger.warning("evaluation_sink_failed", error=str(e), batch=len(results))
+                self.completed += len(results)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop the workers.
+
+        Args:
+            drain: Wait for queued jobs to finish first.
+            timeout: Maximum seconds to wait while draining.
+        """
+        if drain and self.running:
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except TimeoutError:
+                logger.warning("evaluation_drain_timeout", pending=self.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        pending = self.qsize()
+        if pending:
+            self.dropped += pending
+            record_evaluation_job("dropped", pending)
+        self._queue = None
+        evaluation_queue_depth.set(0)
+        await self.sink.close()
+
+
+_evaluation_queue: EvaluationQueue | None = None
+
+
+def get_evaluation_queue(evaluator: Evaluator) -> EvaluationQueue:
+    """Get the process-wide evaluation queue, creating it on first use.
+
+    Args:
+        evaluator: Coroutine function used if the queue is created now.
+
+    Returns:
+        The shared EvaluationQueue configured from settings.
+    """
+    global _evaluation_queue
+    if _evaluation_queue is None:
+        from ..models import get_settings
+
+        settings = get_settings()
+        sink: EvaluationSink
+        if settings.evaluation_results_path:
+            sink = JSONLEvaluationSink(settings.evaluation_results_path)
+        else:
+            sink = LoggingEvaluationSink()
+        _evaluation_queue = EvaluationQueue(
+            evaluator,
+            sink=sink,
+            max_size=settings.evaluation_queue_size,
+            batch_size=settings.evaluation_batch_size,
+        )
+    return _evaluation_queue
+
+
+async def shutdown_evaluation_queue(timeout: float = 10.0) -> None:
+    """Drain and stop the process-wide evaluation queue, if one was started.
+
+    Args:
+        timeout: Maximum seconds to wait for queued jobs.
+    """
+    global _evaluation_queue
+    if _evaluation_queue is not None:
+        await _evaluation_queue.stop(drain=True, timeout=timeout)
+        _evaluation_queue = None
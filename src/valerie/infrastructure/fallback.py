@@ -56,6 +56,35 @@ class CircuitBreaker:
         return True
 
 
+# Process-wide breakers, shared by every request (e.g. one per LLM provider)
+_shared_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_shared_circuit_breaker(
+    service: str, failure_threshold: int = 5, timeout_seconds: int = 60
+) -> CircuitBreaker:
+    """Get or create the process-wide circuit breaker for a service.
+
+    Args:
+        service: Service key, e.g. ``llm:groq``.
+        failure_threshold: Failures before opening, used on creation.
+        timeout_seconds: Seconds before a half-open probe, used on creation.
+
+    Returns:
+        The shared CircuitBreaker for the service.
+    """
+    breaker = _shared_circuit_breakers.get(service)
+    if breaker is None:
+        breaker = CircuitBreaker(failure_threshold, timeout_seconds)
+        _shared_circuit_breakers[service] = breaker
+    return breaker
+
+
+def reset_shared_circuit_breakers() -> None:
+    """Forget all shared circuit breaker state."""
+    _shared_circuit_breakers.clear()
+
+
 class FallbackAgent(BaseAgent):
     """Manages error recovery and graceful degradation."""
 
@@ -166,7 +195,8 @@ Strategies:
         error_type = self._classify_error(error)
 
         if error_type == "transient":
-            # Would retry here in real implementation
+            # LLM calls are already retried with backoff and failover in
+            # valerie.llm.retry, so a transient error here means retries ran out
             return {
                 "recovered": False,
                 "action": "retry_exhausted",
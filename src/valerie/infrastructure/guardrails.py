@@ -5,6 +5,7 @@ from datetime import datetime
 
 from ..agents.base import BaseAgent
 from ..models import ChatState
+from ..utils.scanner import KeywordScanner, PatternScanner, ScanRule
 
 
 class GuardrailsAgent(BaseAgent):
@@ -104,6 +105,39 @@ class GuardrailsAgent(BaseAgent):
         r"what\s+(are|is)\s+your\s+(system\s+)?(prompt|instructions)",
     ]
 
+    # Characters a PII pattern cannot match without; texts lacking them skip the pattern
+    PII_PREREQUISITES = {
+        **{
+            name: r"\d"
+            for name in PII_PATTERNS
+            if name not in ("swift_bic", "email", "ip_address_v6", "vin")
+        },
+        "email": "@",
+        "ip_address_v6": ":",
+    }
+
+    # Compiled once per process; see _check_pii/_check_injection/_check_itar
+    _pii_scanner: PatternScanner | None = None
+    _injection_scanner: PatternScanner | None = None
+    _itar_scanner: KeywordScanner | None = None
+
+    @classmethod
+    def _scanners(cls) -> tuple[PatternScanner, PatternScanner, KeywordScanner]:
+        """Build the pattern scanners on first use."""
+        if cls._pii_scanner is None:
+            cls._pii_scanner = PatternScanner(
+                [
+                    ScanRule(name, pattern, cls.PII_PREREQUISITES.get(name))
+                    for name, pattern in cls.PII_PATTERNS.items()
+                ],
+                re.IGNORECASE,
+            )
+            cls._injection_scanner = PatternScanner(
+                {f"injection_{i}": p for i, p in enumerate(cls.INJECTION_PATTERNS)}
+            )
+            cls._itar_scanner = KeywordScanner(cls.ITAR_KEYWORDS)
+        return cls._pii_scanner, cls._injection_scanner, cls._itar_scanner
+
     def get_system_prompt(self) -> str:
         return """You are a Guardrails Agent implementing defense-in-depth.
 
@@ -169,21 +203,20 @@ Always err on the side of caution for safety."""
 
     def _check_pii(self, text: str) -> list[str]:
         """Check for PII patterns."""
-        found = []
-        for name, pattern in self.PII_PATTERNS.items():
-            if re.search(pattern, text, re.IGNORECASE):
-                found.append(name)
-        return found
+        pii_scanner, _, _ = self._scanners()
+        return pii_scanner.matched(text, max_chars=self.settings.guardrails_scan_max_chars)
 
     def _check_injection(self, text: str) -> bool:
         """Check for injection patterns."""
-        text_lower = text.lower()
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, text_lower):
-                return True
-        return False
+        _, injection_scanner, _ = self._scanners()
+        match = injection_scanner.search(
+            text.lower(), max_chars=self.settings.guardrails_scan_max_chars
+        )
+        return match is not None
 
     def _check_itar(self, text: str) -> list[str]:
         """Check for ITAR-related keywords."""
-        text_lower = text.lower()
-        return [kw for kw in self.ITAR_KEYWORDS if kw in text_lower]
+        _, _, itar_scanner = self._scanners()
+        return itar_scanner.matched(
+            text.lower(), max_chars=self.settings.guardrails_scan_max_chars
+        )
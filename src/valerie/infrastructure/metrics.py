@@ -157,6 +157,12 @@ intent_classifications_total = Counter(
     ["intent"],
 )
 
+intent_tier_decisions_total = Counter(
+    "valerie_intent_tier_decisions_total",
+    "Intent classification tier outcomes (hit: decided, miss: passed on)",
+    ["tier", "result"],
+)
+
 # =============================================================================
 # Oracle Fusion Integration Metrics
 # =============================================================================
@@ -174,6 +180,98 @@ oracle_api_latency_seconds = Histogram(
     buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
 )
 
+# =============================================================================
+# Data Source Cache Metrics
+# =============================================================================
+
+data_source_cache_hits_total = Counter(
+    "valerie_data_source_cache_hits_total",
+    "Data source query cache hits",
+    ["method"],
+)
+
+data_source_cache_misses_total = Counter(
+    "valerie_data_source_cache_misses_total",
+    "Data source query cache misses",
+    ["method"],
+)
+
+data_source_cache_invalidations_total = Counter(
+    "valerie_data_source_cache_invalidations_total",
+    "Data source query cache invalidations",
+    ["reason"],  # explicit/import
+)
+
+llm_retries_total = Counter(
+    "valerie_llm_retries_total",
+    "LLM calls retried on the same provider",
+    ["provider", "reason"],  # reason: error class, e.g. RateLimitError
+)
+
+llm_failovers_total = Counter(
+    "valerie_llm_failovers_total",
+    "LLM requests that gave up on a provider and moved down the fallback chain",
+    ["provider"],
+)
+
+llm_hedges_total = Counter(
+    "valerie_llm_hedges_total",
+    "Hedged LLM requests by provider and outcome",
+    ["provider", "outcome"],  # outcome: launched/won/lost
+)
+
+llm_hedge_wasted_tokens_total = Counter(
+    "valerie_llm_hedge_wasted_tokens_total",
+    "Tokens spent on hedged LLM requests that lost the race",
+    ["provider"],
+)
+
+# =============================================================================
+# LLM Response Cache Metrics
+# =============================================================================
+
+llm_cache_lookups_total = Counter(
+    "valerie_llm_cache_lookups_total",
+    "LLM response cache lookups",
+    ["tier", "result"],  # tier: exact/semantic, result: hit/miss
+)
+
+# =============================================================================
+# Background Evaluation Metrics
+# =============================================================================
+
+evaluation_jobs_total = Counter(
+    "valerie_evaluation_jobs_total",
+    "Background evaluation jobs by outcome",
+    ["status"],  # enqueued/dropped/completed/failed
+)
+
+evaluation_queue_depth = Gauge(
+    "valerie_evaluation_queue_depth",
+    "Evaluation jobs waiting in the background queue",
+)
+
+evaluation_queue_wait_seconds = Histogram(
+    "valerie_evaluation_queue_wait_seconds",
+    "Time evaluation jobs spend queued before the judge runs",
+    buckets=[0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0],
+)
+
+# =============================================================================
+# Trace Export Metrics
+# =============================================================================
+
+trace_export_events_total = Counter(
+    "valerie_trace_export_events_total",
+    "Tracing events sent to remote backends by outcome",
+    ["result"],  # enqueued/dropped/exported/failed
+)
+
+trace_export_queue_depth = Gauge(
+    "valerie_trace_export_queue_depth",
+    "Tracing events waiting in the background export queue",
+)
+
 # =============================================================================
 # Health Check Metrics
 # =============================================================================
@@ -245,6 +343,120 @@ def record_agent_execution(agent_name: str, status: str, duration: float) -> Non
     agent_duration_seconds.labels(agent_name=agent_name).observe(duration)
 
 
+def record_intent_tier(tier: str, hit: bool) -> None:
+    """Record whether an intent classification tier decided the intent.
+
+    Args:
+        tier: Classification tier (pattern/local_model/llm)
+        hit: Whether the tier decided, rather than passing to the next one
+    """
+    intent_tier_decisions_total.labels(tier=tier, result="hit" if hit else "miss").inc()
+
+
+def record_data_source_cache(method: str, hit: bool) -> None:
+    """Record a data source cache lookup.
+
+    Args:
+        method: Data source method name
+        hit: Whether the result was served from cache
+    """
+    if hit:
+        data_source_cache_hits_total.labels(method=method).inc()
+    else:
+        data_source_cache_misses_total.labels(method=method).inc()
+
+
+def record_oracle_request(endpoint: str, status: str, duration: float) -> None:
+    """Record an Oracle Fusion API request.
+
+    Args:
+        endpoint: Oracle resource, e.g. suppliers or token
+        status: HTTP status code, or "error" for transport failures
+        duration: Request duration in seconds
+    """
+    oracle_api_requests_total.labels(endpoint=endpoint, status=status).inc()
+    oracle_api_latency_seconds.labels(endpoint=endpoint).observe(duration)
+
+
+def record_llm_retry(provider: str, reason: str) -> None:
+    """Record a retried LLM call.
+
+    Args:
+        provider: LLM provider name
+        reason: Error class that triggered the retry
+    """
+    llm_retries_total.labels(provider=provider, reason=reason).inc()
+
+
+def record_llm_failover(provider: str) -> None:
+    """Record giving up on a provider for one request.
+
+    Args:
+        provider: LLM provider that was abandoned
+    """
+    llm_failovers_total.labels(provider=provider).inc()
+
+
+def record_llm_hedge(provider: str, outcome: str) -> None:
+    """Record a hedged LLM request event.
+
+    Args:
+        provider: LLM provider the request was sent to
+        outcome: Event (launched/won/lost)
+    """
+    llm_hedges_total.labels(provider=provider, outcome=outcome).inc()
+
+
+def record_llm_hedge_waste(provider: str, tokens: int) -> None:
+    """Record tokens spent on a hedged request that lost the race.
+
+    Args:
+        provider: LLM provider of the losing request
+        tokens: Tokens consumed or estimated for the losing request
+    """
+    if tokens > 0:
+        llm_hedge_wasted_tokens_total.labels(provider=provider).inc(tokens)
+
+
+def record_llm_cache(tier: str, hit: bool) -> None:
+    """Record an LLM response cache lookup.
+
+    Args:
+        tier: Cache tier that answered the lookup (exact/semantic)
+        hit: Whether a cached response was returned
+    """
+    llm_cache_lookups_total.labels(tier=tier, result="hit" if hit else "miss").inc()
+
+
+def record_evaluation_job(status: str, count: int = 1) -> None:
+    """Record background evaluation job outcomes.
+
+    Args:
+        status: Job status (enqueued/dropped/completed/failed)
+        count: Number of jobs with this outcome
+    """
+    evaluation_jobs_total.labels(status=status).inc(count)
+
+
+def record_evaluation_wait(seconds: float) -> None:
+    """Record how long an evaluation job waited in the queue.
+
+    Args:
+        seconds: Queue wait time in seconds
+    """
+    evaluation_queue_wait_seconds.observe(seconds)
+
+
+def record_trace_export(result: str, count: int = 1) -> None:
+    """Record background trace export outcomes.
+
+    Args:
+        result: Event outcome (enqueued/dropped/exported/failed)
+        count: Number of events with this outcome
+    """
+    trace_export_events_total.labels(result=result).inc(count)
+
+
 def set_provider_availability(provider: str, available: bool) -> None:
     """Set LLM provider availability status.
 
@@ -7,11 +7,15 @@ Provides a unified interface for observability with:
 - Structlog structured logging
 """
 
+import asyncio
 import os
+import random
 import time
 import uuid
+from collections import OrderedDict
 from collections.abc import Callable, Generator
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from functools import wraps
 from typing import Any
@@ -26,6 +30,7 @@ from .metrics import (
     record_llm_request,
     set_provider_availability,
 )
+from .trace_export import TraceEvent, TraceExportQueue
 
 logger = get_logger(__name__)
 
@@ -43,6 +48,20 @@ LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
 
+# In-memory trace buffer configuration
+TRACE_BUFFER_SIZE = int(os.getenv("VALERIE_TRACE_BUFFER_SIZE", "500"))
+TRACE_SAMPLE_RATE = float(os.getenv("VALERIE_TRACE_SAMPLE_RATE", "1.0"))
+TRACE_SLOW_MS = float(os.getenv("VALERIE_TRACE_SLOW_MS", "0"))
+TRACE_MAX_PAYLOAD_CHARS = int(os.getenv("VALERIE_TRACE_MAX_PAYLOAD_CHARS", "2000"))
+TRACE_MAX_SPANS = int(os.getenv("VALERIE_TRACE_MAX_SPANS", "256"))
+# Background export queue for remote tracing backends
+TRACE_QUEUE_SIZE = int(os.getenv("VALERIE_TRACE_QUEUE_SIZE", "10000"))
+TRACE_BATCH_SIZE = int(os.getenv("VALERIE_TRACE_BATCH_SIZE", "100"))
+TRACE_FLUSH_INTERVAL = float(os.getenv("VALERIE_TRACE_FLUSH_INTERVAL", "1.0"))
+TRACE_DROP_POLICY = os.getenv("VALERIE_TRACE_DROP_POLICY", "newest")
+# /debug/traces serves user messages without auth, so it is opt-in only
+TRACE_EXPORT_ENABLED = os.getenv("VALERIE_TRACE_EXPORT_ENABLED", "false").lower() == "true"
+
 
 class TracingBackend:
     """Base class for tracing backends."""
@@ -65,7 +84,7 @@ class TracingBackend:
         """End a span."""
         raise NotImplementedError
 
-    def end_trace(self, trace_id: str, output: Any = None) -> None:
+    def end_trace(self, trace_id: str, output: Any = None, status: str = "success") -> None:
         """End a trace."""
         raise NotImplementedError
 
@@ -83,35 +102,136 @@ class TracingBackend:
         raise NotImplementedError
 
 
+def truncate_payload(value: Any, max_chars: int) -> Any:
+    """Bound the size of a payload stored in a trace.
+
+    Strings longer than ``max_chars`` are cut, lists and dicts are truncated
+    recursively, and any other object is stored as its (truncated) repr so
+    the buffer never keeps references to large application objects.
+
+    Args:
+        value: Payload to store.
+        max_chars: Maximum characters per string, 0 to store as-is.
+
+    Returns:
+        The bounded payload.
+    """
+    if not max_chars or value is None or isinstance(value, bool | int | float):
+        return value
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"{value[:max_chars]}...[{len(value) - max_chars} chars truncated]"
+    if isinstance(value, dict):
+        return {str(k): truncate_payload(v, max_chars) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [truncate_payload(v, max_chars) for v in value]
+    return truncate_payload(repr(value), max_chars)
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy nested dicts and lists so later mutation does not leak into a payload."""
+    if isinstance(value, dict):
+        return {k: _snapshot(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_snapshot(v) for v in value]
+    return value
+
+
+@dataclass
+class _BufferedTrace:
+    trace: dict
+    started: float  # time.monotonic() at start
+    sampled: bool  # Head sampling decision
+    spans: dict[str, dict] = field(default_factory=dict)  # span_id -> span
+    error: bool = False
+
+
 class InMemoryBackend(TracingBackend):
-    """In-memory tracing backend for testing and fallback."""
+    """In-memory tracing backend for testing and fallback.
 
-    def __init__(self) -> None:
-        self._traces: dict[str, dict] = {}
+    Traces are kept in a bounded ring buffer: once ``max_traces`` are held,
+    the oldest is evicted, including traces that were never ended. A trace
+    is head-sampled at ``sample_rate`` when it starts; unsampled traces are
+    still kept if they fail or take at least ``slow_trace_ms`` (tail
+    sampling). Stored metadata, outputs and LLM messages are truncated to
+    ``max_payload_chars`` per string.
+    """
 
-    def start_trace(self, name: str, metadata: dict | None = None) -> str:
-        trace_id = str(uuid.uuid4())
-        self._traces[trace_id] = {
-            "trace_id": trace_id,
-            "name": name,
-            "start_time": datetime.now().isoformat(),
-            "metadata": metadata or {},
-            "spans": [],
-        }
+    def __init__(
+        self,
+        max_traces: int | None = None,
+        sample_rate: float | None = None,
+        slow_trace_ms: float | None = None,
+        max_payload_chars: int | None = None,
+        max_spans: int | None = None,
+    ) -> None:
+        """Initialize the buffer, defaulting to the VALERIE_TRACE_* settings.
+
+        Args:
+            max_traces: Ring buffer capacity.
+            sample_rate: Fraction of traces kept regardless of outcome.
+            slow_trace_ms: Keep unsampled traces at least this slow, 0 disables.
+            max_payload_chars: Maximum characters per stored string, 0 disables.
+            max_spans: Maximum spans and LLM calls stored per trace.
+        """
+        self.max_traces = max_traces if max_traces is not None else TRACE_BUFFER_SIZE
+        self.sample_rate = sample_rate if sample_rate is not None else TRACE_SAMPLE_RATE
+        self.slow_trace_ms = slow_trace_ms if slow_trace_ms is not None else TRACE_SLOW_MS
+        self.max_payload_chars = (
+            max_payload_chars if max_payload_chars is not None else TRACE_MAX_PAYLOAD_CHARS
+        )
+        self.max_spans = max_spans if max_spans is not None else TRACE_MAX_SPANS
+        self._traces: OrderedDict[str, _BufferedTrace] = OrderedDict()
+        self._evicted = 0
+        self._sampled_out = 0
+
+    def _payload(self, value: Any) -> Any:
+        return truncate_payload(value, self.max_payload_chars)
+
+    def start_trace(
+        self, name: str, metadata: dict | None = None, trace_id: str | None = None
+    ) -> str:
+        trace_id = trace_id or str(uuid.uuid4())
+        self._traces[trace_id] = _BufferedTrace(
+            trace={
+                "trace_id": trace_id,
+                "name": name,
+                "start_time": datetime.now().isoformat(),
+                "metadata": self._payload(metadata or {}),
+                "spans": [],
+            },
+            started=time.monotonic(),
+            sampled=self.sample_rate >= 1 or random.random() < self.sample_rate,
+        )
+        while len(self._traces) > self.max_traces:
+            self._traces.popitem(last=False)
+            self._evicted += 1
         return trace_id
 
-    def start_span(self, trace_id: str, name: str, metadata: dict | None = None) -> str:
-        span_id = str(uuid.uuid4())
-        if trace_id in self._traces:
-            self._traces[trace_id]["spans"].append(
-                {
+    def start_span(
+        self,
+        trace_id: str,
+        name: str,
+        metadata: dict | None = None,
+        span_id: str | None = None,
+    ) -> str:
+        span_id = span_id or str(uuid.uuid4())
+        entry = self._traces.get(trace_id)
+        if entry is not None:
+            spans = entry.trace["spans"]
+            if len(spans) < self.max_spans:
+                span = {
                     "span_id": span_id,
                     "name": name,
                     "start_time": datetime.now().isoformat(),
-                    "metadata": metadata or {},
+                    "metadata": self._payload(metadata or {}),
                     "status": "running",
                 }
-            )
+                spans.append(span)
+                entry.spans[span_id] = span
+            else:
+                entry.trace["dropped_spans"] = entry.trace.get("dropped_spans", 0) + 1
         return span_id
 
     def end_span(
@@ -121,19 +241,36 @@ class InMemoryBackend(TracingBackend):
         status: str = "success",
         output: Any = None,
     ) -> None:
-        if trace_id not in self._traces:
+        entry = self._traces.get(trace_id)
+        if entry is None:
             return
-        for span in self._traces[trace_id]["spans"]:
-            if span["span_id"] == span_id:
-                span["end_time"] = datetime.now().isoformat()
-                span["status"] = status
-                span["output"] = output
-                break
-
-    def end_trace(self, trace_id: str, output: Any = None) -> None:
-        if trace_id in self._traces:
-            self._traces[trace_id]["end_time"] = datetime.now().isoformat()
-            self._traces[trace_id]["output"] = output
+        if status == "error":
+            entry.error = True
+        span = entry.spans.get(span_id)
+        if span is not None:
+            span["end_time"] = datetime.now().isoformat()
+            span["status"] = status
+            span["output"] = self._payload(output)
+
+    def end_trace(self, trace_id: str, output: Any = None, status: str = "success") -> None:
+        entry = self._traces.get(trace_id)
+        if entry is None:
+            return
+        duration_ms = (time.monotonic() - entry.started) * 1000
+        keep = (
+            entry.sampled
+            or entry.error
+            or status == "error"
+            or (self.slow_trace_ms > 0 and duration_ms >= self.slow_trace_ms)
+        )
+        if not keep:
+            del self._traces[trace_id]
+            self._sampled_out += 1
+            return
+        entry.trace["end_time"] = datetime.now().isoformat()
+        entry.trace["duration_ms"] = round(duration_ms, 2)
+        entry.trace["status"] = "error" if entry.error or status == "error" else status
+        entry.trace["output"] = self._payload(output)
 
     def log_llm_call(
         self,
@@ -145,21 +282,56 @@ class InMemoryBackend(TracingBackend):
         tokens: dict | None = None,
         duration_ms: float = 0,
     ) -> None:
-        if trace_id in self._traces:
-            self._traces[trace_id].setdefault("llm_calls", []).append(
-                {
-                    "provider": provider,
-                    "model": model,
-                    "messages": messages,
-                    "response": response,
-                    "tokens": tokens,
-                    "duration_ms": duration_ms,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+        entry = self._traces.get(trace_id)
+        if entry is None:
+            return
+        calls = entry.trace.setdefault("llm_calls", [])
+        if len(calls) >= self.max_spans:
+            entry.trace["dropped_llm_calls"] = entry.trace.get("dropped_llm_calls", 0) + 1
+            return
+        calls.append(
+            {
+                "provider": provider,
+                "model": model,
+                "messages": self._payload(messages),
+                "response": self._payload(response),
+                "tokens": tokens,
+                "duration_ms": duration_ms,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
 
     def get_trace(self, trace_id: str) -> dict | None:
-        return self._traces.get(trace_id)
+        entry = self._traces.get(trace_id)
+        return entry.trace if entry is not None else None
+
+    def recent_traces(self, limit: int = 50, include_running: bool = True) -> list[dict]:
+        """Most recent traces first.
+
+        Args:
+            limit: Maximum number of traces to return.
+            include_running: Include traces that have not ended yet.
+
+        Returns:
+            The trace dicts, newest first.
+        """
+        traces = []
+        for entry in reversed(self._traces.values()):
+            if len(traces) >= limit:
+                break
+            if include_running or "end_time" in entry.trace:
+                traces.append(entry.trace)
+        return traces
+
+    def stats(self) -> dict[str, Any]:
+        """Buffer occupancy and how many traces were evicted or sampled out."""
+        return {
+            "traces": len(self._traces),
+            "capacity": self.max_traces,
+            "evicted": self._evicted,
+            "sampled_out": self._sampled_out,
+            "sample_rate": self.sample_rate,
+        }
 
 
 class LangSmithBackend(TracingBackend):
@@ -197,8 +369,8 @@ class LangSmithBackend(TracingBackend):
     ) -> None:
         self._fallback.end_span(trace_id, span_id, status, output)
 
-    def end_trace(self, trace_id: str, output: Any = None) -> None:
-        self._fallback.end_trace(trace_id, output)
+    def end_trace(self, trace_id: str, output: Any = None, status: str = "success") -> None:
+        self._fallback.end_trace(trace_id, output, status)
 
     def log_llm_call(
         self,
@@ -217,12 +389,35 @@ class LangSmithBackend(TracingBackend):
 
 
 class LangfuseBackend(TracingBackend):
-    """Langfuse tracing backend for production."""
+    """Langfuse tracing backend for production.
 
-    def __init__(self) -> None:
+    Langfuse SDK calls are queued as TraceEvents and made by a background
+    export task, so tracing adds no latency to requests. Traces are also
+    kept in the local in-memory buffer under the same IDs.
+    """
+
+    def __init__(self, export_queue: TraceExportQueue | None = None) -> None:
+        """Initialize the backend.
+
+        Args:
+            export_queue: Queue for SDK calls, defaults to one configured from
+                the VALERIE_TRACE_* settings that exports with this backend.
+        """
         self._fallback = InMemoryBackend()
         self._client = None
-        self._traces: dict[str, Any] = {}
+        # Langfuse trace and span objects, only touched by the exporter. End
+        # events can be dropped from a full queue, so both are bounded and the
+        # oldest open entries are evicted.
+        self.max_open = TRACE_QUEUE_SIZE
+        self._traces: OrderedDict[str, Any] = OrderedDict()
+        self._spans: OrderedDict[str, Any] = OrderedDict()
+        self._export_queue = export_queue or TraceExportQueue(
+            self._export,
+            max_size=TRACE_QUEUE_SIZE,
+            batch_size=TRACE_BATCH_SIZE,
+            flush_interval=TRACE_FLUSH_INTERVAL,
+            drop_policy=TRACE_DROP_POLICY,
+        )
 
         try:
             if LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY:
@@ -242,38 +437,23 @@ class LangfuseBackend(TracingBackend):
         except Exception as e:
             logger.warning("langfuse_init_failed", error=str(e))
 
+    def _submit(self, kind: str, trace_id: str, **data: Any) -> None:
+        if self._client:
+            # Copy containers now: callers may mutate them before the export runs
+            self._export_queue.submit(TraceEvent(kind, trace_id, _snapshot(data)))
+
     def start_trace(self, name: str, metadata: dict | None = None) -> str:
         trace_id = str(uuid.uuid4())
+        self._submit("start_trace", trace_id, name=name, metadata=metadata)
 
-        if self._client:
-            try:
-                trace = self._client.trace(
-                    id=trace_id,
-                    name=name,
-                    metadata=metadata,
-                )
-                self._traces[trace_id] = trace
-            except Exception as e:
-                logger.warning("langfuse_trace_failed", error=str(e))
-
-        # Always use fallback for local tracking
-        self._fallback.start_trace(name, metadata)
+        # Always use fallback for local tracking, under the same ID
+        self._fallback.start_trace(name, metadata, trace_id=trace_id)
         return trace_id
 
     def start_span(self, trace_id: str, name: str, metadata: dict | None = None) -> str:
         span_id = str(uuid.uuid4())
-
-        if self._client and trace_id in self._traces:
-            try:
-                self._traces[trace_id].span(
-                    id=span_id,
-                    name=name,
-                    metadata=metadata,
-                )
-            except Exception as e:
-                logger.warning("langfuse_span_failed", error=str(e))
-
-        self._fallback.start_span(trace_id, name, metadata)
+        self._submit("start_span", trace_id, span_id=span_id, name=name, metadata=metadata)
+        self._fallback.start_span(trace_id, name, metadata, span_id=span_id)
         return span_id
 
     def end_span(
@@ -283,17 +463,12 @@ class LangfuseBackend(TracingBackend):
         status: str = "success",
         output: Any = None,
     ) -> None:
-        # Langfuse spans are ended automatically or via update
+        self._submit("end_span", trace_id, span_id=span_id, status=status, output=output)
         self._fallback.end_span(trace_id, span_id, status, output)
 
-    def end_trace(self, trace_id: str, output: Any = None) -> None:
-        if self._client and trace_id in self._traces:
-            try:
-                self._traces[trace_id].update(output=output)
-            except Exception as e:
-                logger.warning("langfuse_trace_end_failed", error=str(e))
-
-        self._fallback.end_trace(trace_id, output)
+    def end_trace(self, trace_id: str, output: Any = None, status: str = "success") -> None:
+        self._submit("end_trace", trace_id, output=output)
+        self._fallback.end_trace(trace_id, output, status)
 
     def log_llm_call(
         self,
@@ -305,34 +480,110 @@ class LangfuseBackend(TracingBackend):
         tokens: dict | None = None,
         duration_ms: float = 0,
     ) -> None:
-        if self._client and trace_id in self._traces:
-            try:
-                self._traces[trace_id].generation(
-                    name=f"{provider}:{model}",
-                    model=model,
-                    input=messages,
-                    output=response,
-                    usage={
-                        "input": tokens.get("input_tokens", 0) if tokens else 0,
-                        "output": tokens.get("output_tokens", 0) if tokens else 0,
-                    },
-                    metadata={"provider": provider, "duration_ms": duration_ms},
-                )
-            except Exception as e:
-                logger.warning("langfuse_generation_failed", error=str(e))
-
+        self._submit(
+            "llm_call",
+            trace_id,
+            provider=provider,
+            model=model,
+            messages=messages,
+            response=response,
+            tokens=tokens,
+            duration_ms=duration_ms,
+        )
         self._fallback.log_llm_call(
             trace_id, provider, model, messages, response, tokens, duration_ms
         )
 
+    def _export(self, events: list[TraceEvent]) -> int:
+        """Make the Langfuse SDK calls for a batch of events, in order.
+
+        Returns:
+            Number of events whose SDK call failed.
+        """
+        failed = 0
+        for event in events:
+            try:
+                self._export_event(event)
+            except Exception as e:
+                failed += 1
+                logger.warning("langfuse_export_failed", kind=event.kind, error=str(e))
+        return failed
+
+    def _remember(self, objects: OrderedDict[str, Any], key: str, value: Any) -> None:
+        objects[key] = value
+        while len(objects) > self.max_open:
+            objects.popitem(last=False)
+
+    def _export_event(self, event: TraceEvent) -> None:
+        data = event.data
+        if event.kind == "start_trace":
+            self._remember(
+                self._traces,
+                event.trace_id,
+                self._client.trace(
+                    id=event.trace_id,
+                    name=data["name"],
+                    metadata=data["metadata"],
+                ),
+            )
+            return
+        if event.kind == "end_span":
+            span = self._spans.pop(data["span_id"], None)
+            if span is not None:
+                span.end(
+                    output=data["output"],
+                    level="ERROR" if data["status"] == "error" else "DEFAULT",
+                )
+            return
+
+        trace = self._traces.get(event.trace_id)
+        if trace is None:
+            return
+        if event.kind == "start_span":
+            self._remember(
+                self._spans,
+                data["span_id"],
+                trace.span(
+                    id=data["span_id"],
+                    name=data["name"],
+                    metadata=data["metadata"],
+                ),
+            )
+        elif event.kind == "end_trace":
+            trace.update(output=data["output"])
+            del self._traces[event.trace_id]
+        elif event.kind == "llm_call":
+            tokens = data["tokens"]
+            trace.generation(
+                name=f"{data['provider']}:{data['model']}",
+                model=data["model"],
+                input=data["messages"],
+                output=data["response"],
+                usage={
+                    "input": tokens.get("input_tokens", 0) if tokens else 0,
+                    "output": tokens.get("output_tokens", 0) if tokens else 0,
+                },
+                metadata={"provider": data["provider"], "duration_ms": data["duration_ms"]},
+            )
+
     def flush(self) -> None:
-        """Flush pending traces to Langfuse."""
+        """Export queued events and flush pending traces to Langfuse."""
+        self._export_queue.flush()
         if self._client:
             try:
                 self._client.flush()
             except Exception as e:
                 logger.warning("langfuse_flush_failed", error=str(e))
 
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """Drain the export queue and flush Langfuse without blocking the loop.
+
+        Args:
+            timeout: Maximum seconds to wait for queued events.
+        """
+        await self._export_queue.stop(drain=True, timeout=timeout)
+        await asyncio.to_thread(self.flush)
+
 
 class ObservabilityManager:
     """Unified observability manager with environment-based routing."""
@@ -379,6 +630,7 @@ class ObservabilityManager:
         logger.info("trace_started", trace_name=name)
 
         start_time = time.time()
+        status = "success"
         try:
             yield trace_id
             duration = time.time() - start_time
@@ -388,6 +640,7 @@ class ObservabilityManager:
                 duration_seconds=duration,
             )
         except Exception as e:
+            status = "error"
             duration = time.time() - start_time
             logger.error(
                 "trace_failed",
@@ -397,7 +650,7 @@ class ObservabilityManager:
             )
             raise
         finally:
-            self._backend.end_trace(trace_id)
+            self._backend.end_trace(trace_id, status=status)
             self._active_traces.pop(correlation_id, None)
 
     @contextmanager
@@ -414,12 +667,14 @@ class ObservabilityManager:
         correlation_id = get_correlation_id()
         trace_id = self._active_traces.get(correlation_id) if correlation_id else None
 
-        if not trace_id:
+        standalone = not trace_id
+        if standalone:
             # Create a standalone trace if none exists
             trace_id = self._backend.start_trace(f"standalone:{name}")
 
         span_id = self._backend.start_span(trace_id, name, metadata)
         start_time = time.time()
+        status = "success"
 
         try:
             yield span_id
@@ -431,6 +686,7 @@ class ObservabilityManager:
                 duration_seconds=duration,
             )
         except Exception as e:
+            status = "error"
             duration = time.time() - start_time
             self._backend.end_span(trace_id, span_id, "error", str(e))
             logger.error(
@@ -440,6 +696,9 @@ class ObservabilityManager:
                 error=str(e),
             )
             raise
+        finally:
+            if standalone:
+                self._backend.end_trace(trace_id, status=status)
 
     def trace_agent(self, agent_name: str) -> Callable:
         """Decorator to trace agent execution.
@@ -532,11 +791,38 @@ class ObservabilityManager:
             available=available,
         )
 
+    @property
+    def trace_buffer(self) -> InMemoryBackend:
+        """The bounded in-memory buffer that keeps recent traces locally."""
+        if isinstance(self._backend, InMemoryBackend):
+            return self._backend
+        return self._backend._fallback
+
+    def recent_traces(self, limit: int = 50) -> list[dict]:
+        """Most recent locally buffered traces, newest first.
+
+        Args:
+            limit: Maximum number of traces to return.
+
+        Returns:
+            The trace dicts.
+        """
+        return self.trace_buffer.recent_traces(limit)
+
     def flush(self) -> None:
         """Flush pending data to backends."""
         if isinstance(self._backend, LangfuseBackend):
             self._backend.flush()
 
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Drain queued trace exports and flush backends, for app shutdown.
+
+        Args:
+            timeout: Maximum seconds to wait for queued events.
+        """
+        if isinstance(self._backend, LangfuseBackend):
+            await self._backend.aclose(timeout)
+
 
 # Global observability instance
 _observability: ObservabilityManager | None = None
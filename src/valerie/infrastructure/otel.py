@@ -0,0 +1,225 @@
+"""OpenTelemetry span export.
+
+Records LangGraph nodes, LLM provider calls and SQL queries as OpenTelemetry
+spans and exports them over OTLP/HTTP to a collector, so a slow chat turn
+can be broken down end to end in one trace. Every span carries the
+request's correlation ID as ``valerie.correlation_id``.
+
+Export is off unless ``VALERIE_OTEL_ENABLED=true`` and the optional
+dependencies are installed (``pip install 'valerie-chatbot[otel]'``). The
+collector is configured with the standard OpenTelemetry variables, e.g.
+``OTEL_EXPORTER_OTLP_ENDPOINT`` (default ``http://localhost:4318``).
+While disabled the instrumentation is a single ``None`` check.
+"""
+
+import os
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+
+from .correlation import get_correlation_id
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+OTEL_ENABLED = os.getenv("VALERIE_OTEL_ENABLED", "false").lower() == "true"
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "valerie-chatbot")
+# Characters of SQL kept in the db.statement attribute
+OTEL_MAX_STATEMENT_CHARS = int(os.getenv("VALERIE_OTEL_MAX_STATEMENT_CHARS", "2000"))
+
+CORRELATION_ID_ATTRIBUTE = "valerie.correlation_id"
+
+_provider: Any = None
+_tracer: Any = None
+
+
+def configure_tracing(exporter: Any = None, enabled: bool | None = None) -> bool:
+    """Start exporting spans.
+
+    Args:
+        exporter: OpenTelemetry span exporter, defaults to OTLP over HTTP.
+            Passing one enables tracing regardless of ``VALERIE_OTEL_ENABLED``.
+        enabled: Override ``VALERIE_OTEL_ENABLED``.
+
+    Returns:
+        True if spans are being exported.
+    """
+    global _provider, _tracer
+    if _tracer is not None:
+        return True
+    if exporter is None and not (OTEL_ENABLED if enabled is None else enabled):
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        if exporter is None:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            exporter = OTLPSpanExporter()
+    except ImportError:
+        logger.warning(
+            "opentelemetry_not_installed",
+            message="pip install 'valerie-chatbot[otel]' to export spans",
+        )
+        return False
+
+    # A private provider: the global one can only be set once per process
+    _provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer("valerie")
+    logger.info("otel_tracing_enabled", exporter=type(exporter).__name__)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Export pending spans and stop tracing."""
+    global _provider, _tracer
+    provider, _provider, _tracer = _provider, None, None
+    if provider is not None:
+        provider.shutdown()
+
+
+def tracing_enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _tracer is not None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Generator[Any, None, None]:
+    """Record a span around a block, as a child of the current span.
+
+    Exceptions are recorded on the span and re-raised.
+
+    Args:
+        name: Span name.
+        **attributes: Span attributes; None values are skipped.
+
+    Yields:
+        The OpenTelemetry span, or None when tracing is disabled.
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    attributes = {k: v for k, v in attributes.items() if v is not None}
+    correlation_id = get_correlation_id()
+    if correlation_id:
+        attributes[CORRELATION_ID_ATTRIBUTE] = correlation_id
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def start_span(name: str, **attributes: Any) -> Any:
+    """Start a span without making it the current one.
+
+    For work that hands control back to its caller before finishing, such
+    as a stream being consumed, where a ``with span(...)`` block would leave
+    the span current in the caller's context. End it with ``end_span``.
+
+    Args:
+        name: Span name.
+        **attributes: Span attributes; None values are skipped.
+
+    Returns:
+        The OpenTelemetry span, or None when tracing is disabled.
+    """
+    if _tracer is None:
+        return None
+
+    attributes = {k: v for k, v in attributes.items() if v is not None}
+    correlation_id = get_correlation_id()
+    if correlation_id:
+        attributes[CORRELATION_ID_ATTRIBUTE] = correlation_id
+    return _tracer.start_span(name, attributes=attributes)
+
+
+def end_span(current: Any, error: BaseException | None = None) -> None:
+    """End a span from ``start_span``, recording the error it failed with.
+
+    Args:
+        current: Span returned by ``start_span``; None is ignored.
+        error: Exception that ended the work, if any.
+    """
+    if current is None:
+        return
+    if error is not None:
+        from opentelemetry.trace import Status, StatusCode
+
+        current.record_exception(error)
+        current.set_status(Status(StatusCode.ERROR))
+    current.end()
+
+
+def trace_node(name: str, node: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+    """Wrap a LangGraph node so each run is recorded as a span.
+
+    Args:
+        name: Node name in the graph.
+        node: Async node function taking the graph state.
+
+    Returns:
+        The wrapped node.
+    """
+
+    @wraps(node)
+    async def traced(state: Any) -> Any:
+        if _tracer is None:
+            return await node(state)
+        with span(
+            f"graph.node {name}",
+            **{"valerie.node": name, "valerie.session_id": getattr(state, "session_id", None)},
+        ):
+            return await node(state)
+
+    return traced
+
+
+def instrument_engine(engine: Any) -> None:
+    """Record every SQL statement run on a SQLAlchemy engine as a span.
+
+    Args:
+        engine: SQLAlchemy (sync) engine; for an async engine pass
+            ``async_engine.sync_engine``.
+    """
+    from sqlalchemy import event
+
+    if getattr(engine, "_valerie_otel", False):
+        return
+    engine._valerie_otel = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _tracer is None or context is None:
+            return
+        attributes = {
+            "db.system": engine.dialect.name,
+            "db.statement": statement[:OTEL_MAX_STATEMENT_CHARS],
+            "db.operation": statement.split(maxsplit=1)[0].upper() if statement.strip() else "",
+        }
+        correlation_id = get_correlation_id()
+        if correlation_id:
+            attributes[CORRELATION_ID_ATTRIBUTE] = correlation_id
+        context._valerie_span = _tracer.start_span("db.query", attributes=attributes)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        current = getattr(context, "_valerie_span", None)
+        if current is not None:
+            current.set_attribute("db.rows", cursor.rowcount)
+            current.end()
+            context._valerie_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        current = getattr(exception_context.execution_context, "_valerie_span", None)
+        if current is not None:
+            from opentelemetry.trace import Status, StatusCode
+
+            current.record_exception(exception_context.original_exception)
+            current.set_status(Status(StatusCode.ERROR))
+            current.end()
+            exception_context.execution_context._valerie_span = None
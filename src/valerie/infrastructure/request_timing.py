@@ -0,0 +1,181 @@
+"""Per-request latency breakdown.
+
+A ``RequestTimings`` collector is started for every HTTP request by the
+correlation ID middleware and registered under the request's correlation
+ID. Code serving the request adds measured phases to it (``timed`` /
+``record_timing``), and the middleware returns them in a ``Server-Timing``
+header (https://www.w3.org/TR/server-timing/) so browsers, the front end
+and load tests can see where a slow request spent its time:
+
+    Server-Timing: guardrails;dur=0.4, classification;dur=0.2, db;dur=3.1,
+        llm_ttft;dur=412.0, llm;dur=1630.5, serialization;dur=0.3, total;dur=1641.2
+
+Recording outside a request (CLI, scripts, tests) is a no-op.
+"""
+
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+@dataclass
+class TimingEntry:
+    """Accumulated duration of one phase of a request."""
+
+    name: str
+    duration_ms: float = 0.0
+    count: int = 0
+    description: str | None = None
+
+
+class RequestTimings:
+    """Measured durations of the phases of one request, in first-recorded order."""
+
+    def __init__(self, correlation_id: str):
+        """Start timing a request.
+
+        Args:
+            correlation_id: Correlation ID of the request.
+        """
+        self.correlation_id = correlation_id
+        self.started = time.perf_counter()
+        self._entries: dict[str, TimingEntry] = {}
+
+    @property
+    def entries(self) -> list[TimingEntry]:
+        """Recorded phases."""
+        return list(self._entries.values())
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the request started."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def record(self, name: str, duration_ms: float, description: str | None = None) -> None:
+        """Add a measured duration; repeated phases (e.g. queries) accumulate.
+
+        Args:
+            name: Phase name, a token such as "db" or "llm_ttft".
+            duration_ms: Measured duration in milliseconds.
+            description: Optional human-readable description.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = TimingEntry(name, description=description)
+        entry.duration_ms += duration_ms
+        entry.count += 1
+
+    @contextmanager
+    def measure(self, name: str, description: str | None = None) -> Generator[None, None, None]:
+        """Record the duration of a block, including when it raises.
+
+        Args:
+            name: Phase name.
+            description: Optional human-readable description.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, description)
+
+    def duration_ms(self, name: str) -> int:
+        """Recorded duration of a phase, rounded to whole milliseconds (0 if absent)."""
+        entry = self._entries.get(name)
+        return round(entry.duration_ms) if entry else 0
+
+    def server_timing(self, total: bool = True) -> str:
+        """Format the phases as a ``Server-Timing`` header value.
+
+        Args:
+            total: Append a "total" metric with the time elapsed so far.
+        """
+        metrics = []
+        for entry in self._entries.values():
+            metric = f"{entry.name};dur={entry.duration_ms:.1f}"
+            if entry.description:
+                description = entry.description.replace("\\", "").replace('"', "")
+                metric += f';desc="{description}"'
+            metrics.append(metric)
+        if total:
+            metrics.append(f"total;dur={self.elapsed_ms:.1f}")
+        return ", ".join(metrics)
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+# Collectors of in-flight requests by correlation ID
+_active: dict[str, RequestTimings] = {}
+
+
+def start_request_timing(correlation_id: str) -> RequestTimings:
+    """Start the collector for a request and make it current.
+
+    Args:
+        correlation_id: Correlation ID of the request.
+
+    Returns:
+        The new collector.
+    """
+    timings = RequestTimings(correlation_id)
+    _active[correlation_id] = timings
+    _current_timings.set(timings)
+    return timings
+
+
+def end_request_timing(timings: RequestTimings) -> None:
+    """Unregister a finished request's collector.
+
+    Args:
+        timings: Collector returned by ``start_request_timing``.
+    """
+    if _active.get(timings.correlation_id) is timings:
+        del _active[timings.correlation_id]
+    if _current_timings.get() is timings:
+        _current_timings.set(None)
+
+
+def get_request_timings(correlation_id: str | None = None) -> RequestTimings | None:
+    """Get the collector of an in-flight request.
+
+    Args:
+        correlation_id: Request to look up, defaults to the current one.
+
+    Returns:
+        The collector, or None outside a request.
+    """
+    if correlation_id is not None:
+        return _active.get(correlation_id)
+    return _current_timings.get()
+
+
+def record_timing(name: str, duration_ms: float, description: str | None = None) -> None:
+    """Add a duration to the current request's collector, if any.
+
+    Args:
+        name: Phase name.
+        duration_ms: Measured duration in milliseconds.
+        description: Optional human-readable description.
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.record(name, duration_ms, description)
+
+
+@contextmanager
+def timed(name: str, description: str | None = None) -> Generator[None, None, None]:
+    """Record the duration of a block in the current request's collector, if any.
+
+    Args:
+        name: Phase name.
+        description: Optional human-readable description.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, (time.perf_counter() - start) * 1000, description)
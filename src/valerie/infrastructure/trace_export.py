@@ -0,0 +1,215 @@
+"""Background export of tracing events.
+
+Remote tracing backends make an SDK call for every trace, span and LLM
+generation. Making those calls inline adds latency to every chat turn, so
+backends submit a ``TraceEvent`` instead. A bounded in-process queue is
+drained by a background task in batches, and each batch is exported in a
+worker thread so the event loop never blocks on the SDK.
+
+When the queue is full events are dropped rather than slowing requests
+down: the "newest" policy rejects the incoming event, "oldest" evicts the
+oldest queued one. Queue depth and drops are exported as Prometheus
+metrics. Outside an event loop (CLI, scripts) events are exported inline.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .logging_config import get_logger
+from .metrics import record_trace_export, trace_export_queue_depth
+
+logger = get_logger(__name__)
+
+DROP_POLICIES = ("newest", "oldest")
+
+
+@dataclass
+class TraceEvent:
+    """One tracing call waiting to be sent to a remote backend."""
+
+    kind: str  # start_trace/start_span/end_span/end_trace/llm_call
+    trace_id: str
+    data: dict[str, Any] = field(default_factory=dict)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+# Sends a batch in order; returns how many of its events failed (None for none)
+Exporter = Callable[[list[TraceEvent]], int | None]
+
+
+class TraceExportQueue:
+    """Bounded queue of tracing events drained in batches by a background task."""
+
+    def __init__(
+        self,
+        exporter: Exporter,
+        max_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        drop_policy: str = "newest",
+    ):
+        """Initialize the queue.
+
+        Args:
+            exporter: Sends a batch of events, in order, and returns the number
+                that failed; runs in a worker thread.
+            max_size: Maximum queued events before the drop policy applies.
+            batch_size: Maximum events per exporter call.
+            flush_interval: Seconds to wait for a batch to fill.
+            drop_policy: "newest" or "oldest" event to drop when full.
+
+        Raises:
+            ValueError: If the drop policy is unknown.
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                f"Unknown drop policy '{drop_policy}', expected one of {', '.join(DROP_POLICIES)}"
+            )
+        self.exporter = exporter
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self.exported = 0
+        self.failed = 0
+        self._events: deque[TraceEvent] = deque()
+        self._lock = threading.Lock()  # Guards _events
+        self._export_lock = threading.Lock()  # One exporter call at a time, in order
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        """Number of events waiting."""
+        return len(self._events)
+
+    @property
+    def running(self) -> bool:
+        """Whether the drain task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Start the drain task on the running event loop.
+
+        Returns:
+            False if there is no running event loop in this thread.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._loop is not loop:
+            # Tasks belong to one loop; queued events carry over to the new one
+            self._task, self._loop, self._wakeup = None, loop, asyncio.Event()
+        if not self.running:
+            self._task = loop.create_task(self._drain(), name="trace-export")
+        return True
+
+    def submit(self, event: TraceEvent) -> bool:
+        """Queue an event without waiting.
+
+        Args:
+            event: Event to export.
+
+        Returns:
+            True if queued (or exported inline outside an event loop), False
+            if it was dropped.
+        """
+        if not self.start():
+            # No event loop to block: export inline
+            self._export([event])
+            return True
+
+        with self._lock:
+            if len(self._events) >= self.max_size:
+                self.dropped += 1
+                record_trace_export("dropped")
+                if self.drop_policy == "newest":
+                    return False
+                self._events.popleft()
+            self._events.append(event)
+            depth = len(self._events)
+        record_trace_export("enqueued")
+        trace_export_queue_depth.set(depth)
+        if depth >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _take(self) -> list[TraceEvent]:
+        with self._lock:
+            batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+            depth = len(self._events)
+        trace_export_queue_depth.set(depth)
+        return batch
+
+    def _export(self, batch: list[TraceEvent]) -> None:
+        """Send one batch, counting failures instead of raising."""
+        with self._export_lock:
+            try:
+                failed = min(self.exporter(batch) or 0, len(batch))
+            except Exception as e:
+                failed = len(batch)
+                logger.warning("trace_export_failed", error=str(e), batch=len(batch))
+        if failed:
+            self.failed += failed
+            record_trace_export("failed", failed)
+        if failed < len(batch):
+            self.exported += len(batch) - failed
+            record_trace_export("exported", len(batch) - failed)
+
+    async def _drain(self) -> None:
+        """Export batches until stopped."""
+        while not self._stopping:
+            if len(self._events) < self.batch_size:
+                try:
+                    async with asyncio.timeout(self.flush_interval):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+            self._wakeup.clear()
+            while not self._stopping and (batch := self._take()):
+                await asyncio.to_thread(self._export, batch)
+
+    def flush(self) -> None:
+        """Export every queued event in the calling thread."""
+        while batch := self._take():
+            self._export(batch)
+
+    async def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop the drain task.
+
+        Args:
+            drain: Export queued events first, in a worker thread.
+            timeout: Maximum seconds to wait while draining.
+        """
+        task, self._task = self._task, None
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            # Let the task finish its current batch and exit, then cancel it
+            self._stopping = True
+            self._wakeup.set()
+            _, pending = await asyncio.wait({task}, timeout=timeout)
+            if pending:
+                task.cancel()
+                await asyncio.wait({task}, timeout=1.0)
+            self._stopping = False
+
+        if drain:
+            try:
+                await asyncio.wait_for(asyncio.to_thread(self.flush), timeout)
+            except TimeoutError:
+                logger.warning("trace_export_drain_timeout", pending=len(self))
+
+        with self._lock:
+            pending = len(self._events)
+            self._events.clear()
+        if pending:
+            self.dropped += pending
+            record_trace_export("dropped", pending)
+        trace_export_queue_depth.set(0)
@@ -21,6 +21,7 @@ from valerie.llm.base import (
     LLMConfig,
     LLMMessage,
     LLMResponse,
+    close_http_clients,
 )
 from valerie.llm.factory import (
     ProviderType,
@@ -36,4 +37,5 @@ __all__ = [
     "get_llm_provider",
     "get_available_providers",
     "ProviderType",
+    "close_http_clients",
 ]
@@ -173,54 +173,54 @@ class AnthropicProvider(BaseLLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/messages",
-                    json=payload,
-                    headers=headers,
-                )
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self.BASE_URL}/messages",
+                json=payload,
+                headers=headers,
+            )
 
-                if response.status_code == 401:
-                    raise AuthenticationError(self.name)
+            if response.status_code == 401:
+                raise AuthenticationError(self.name)
 
-                if response.status_code == 429:
-                    retry_after = response.headers.get("retry-after")
-                    raise RateLimitError(
-                        self.name,
-                        retry_after=int(retry_after) if retry_after else None,
-                    )
+            if response.status_code == 429:
+                retry_after = response.headers.get("retry-after")
+                raise RateLimitError(
+                    self.name,
+                    retry_after=int(retry_after) if retry_after else None,
+                )
 
-                if response.status_code == 404:
-                    raise ModelNotFoundError(self.name, model)
+            if response.status_code == 404:
+                raise ModelNotFoundError(self.name, model)
 
-                if response.status_code != 200:
-                    raise LLMProviderError(
-                        f"Anthropic request failed: {response.text}",
-                        provider=self.name,
-                        status_code=response.status_code,
-                        retryable=response.status_code >= 500,
-                    )
+            if response.status_code != 200:
+                raise LLMProviderError(
+                    f"Anthropic request failed: {response.text}",
+                    provider=self.name,
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
+                )
 
-                data = response.json()
+            data = response.json()
 
-                # Extract content from response
-                content_blocks = data.get("content", [])
-                content = ""
-                for block in content_blocks:
-                    if block.get("type") == "text":
-                        content += block.get("text", "")
+            # Extract content from response
+            content_blocks = data.get("content", [])
+            content = ""
+            for block in content_blocks:
+                if block.get("type") == "text":
+                    content += block.get("text", "")
 
-                return LLMResponse(
-                    content=content,
-                    model=model,
-                    provider=self.name,
-                    usage={
-                        "input_tokens": data.get("usage", {}).get("input_tokens", 0),
-                        "output_tokens": data.get("usage", {}).get("output_tokens", 0),
-                    },
-                    finish_reason=data.get("stop_reason", "stop"),
-                    raw_response=data,
-                )
+            return LLMResponse(
+                content=content,
+                model=model,
+                provider=self.name,
+                usage={
+                    "input_tokens": data.get("usage", {}).get("input_tokens", 0),
+                    "output_tokens": data.get("usage", {}).get("output_tokens", 0),
+                },
+                finish_reason=data.get("stop_reason", "stop"),
+                raw_response=data,
+            )
 
         except httpx.TimeoutException:
             raise LLMProviderError(
@@ -273,55 +273,66 @@ class AnthropicProvider(BaseLLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.BASE_URL}/messages",
-                    json=payload,
-                    headers=headers,
-                ) as response:
-                    if response.status_code == 401:
-                        raise AuthenticationError(self.name)
-
-                    if response.status_code == 429:
-                        raise RateLimitError(self.name)
-
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        raise LLMProviderError(
-                            f"Anthropic request failed: {error_text.decode()}",
-                            provider=self.name,
-                            status_code=response.status_code,
-                        )
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            try:
-                                data = json.loads(data_str)
-                                event_type = data.get("type")
-
-                                if event_type == "content_block_delta":
-                                    delta = data.get("delta", {})
-                                    if delta.get("type") == "text_delta":
-                                        yield StreamChunk(
-                                            content=delta.get("text", ""),
-                                            done=False,
-                                            model=model,
-                                            provider=self.name,
-                                        )
-
-                                elif event_type == "message_stop":
+            client = self._get_http_client()
+            async with client.stream(
+                "POST",
+                f"{self.BASE_URL}/messages",
+                json=payload,
+                headers=headers,
+            ) as response:
+                if response.status_code == 401:
+                    raise AuthenticationError(self.name)
+
+                if response.status_code == 429:
+                    raise RateLimitError(self.name)
+
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    raise LLMProviderError(
+                        f"Anthropic request failed: {error_text.decode()}",
+                        provider=self.name,
+                        status_code=response.status_code,
+                    )
+
+                usage = {"input_tokens": 0, "output_tokens": 0}
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        try:
+                            data = json.loads(data_str)
+                            event_type = data.get("type")
+
+                            if event_type == "message_start":
+                                message_usage = data.get("message", {}).get("usage", {})
+                                usage["input_tokens"] = message_usage.get("input_tokens", 0)
+
+                            elif event_type == "message_delta":
+                                usage["output_tokens"] = data.get("usage", {}).get(
+                                    "output_tokens", 0
+                                )
+
+                            elif event_type == "content_block_delta":
+                                delta = data.get("delta", {})
+                                if delta.get("type") == "text_delta":
                                     yield StreamChunk(
-                                        content="",
-                                        done=True,
+                                        content=delta.get("text", ""),
+                                        done=False,
                                         model=model,
                                         provider=self.name,
                                     )
-                                    break
 
-                            except json.JSONDecodeError:
-                                continue
+                            elif event_type == "message_stop":
+                                yield StreamChunk(
+                                    content="",
+                                    done=True,
+                                    model=model,
+                                    provider=self.name,
+                                    usage=usage,
+                                )
+                                break
+
+                        except json.JSONDecodeError:
+                            continue
 
         except httpx.TimeoutException:
             raise LLMProviderError(
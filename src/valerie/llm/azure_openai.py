@@ -138,22 +138,23 @@ class AzureOpenAIProvider(BaseLLMProvider):
 
         try:
             # Test with a minimal request
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.post(
-                    self._get_chat_url(self.deployment),
-                    headers={
-                        "api-key": self.api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "messages": [{"role": "user", "content": "test"}],
-                        "max_tokens": 1,
-                    },
-                )
-                # Accept both 200 and 400 (bad request) as signs the endpoint is available
-                # 401 would mean auth failed, 404 would mean deployment not found
-                self._is_available = response.status_code in (200, 400)
-                return self._is_available
+            client = self._get_http_client()
+            response = await client.post(
+                self._get_chat_url(self.deployment),
+                headers={
+                    "api-key": self.api_key,
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "messages": [{"role": "user", "content": "test"}],
+                    "max_tokens": 1,
+                },
+                timeout=10,
+            )
+            # Accept both 200 and 400 (bad request) as signs the endpoint is available
+            # 401 would mean auth failed, 404 would mean deployment not found
+            self._is_available = response.status_code in (200, 400)
+            return self._is_available
         except Exception as e:
             logger.debug(f"Azure OpenAI not available: {e}")
             self._is_available = False
@@ -206,58 +207,58 @@ class AzureOpenAIProvider(BaseLLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self._get_chat_url(deployment),
-                    json=payload,
-                    headers=headers,
-                )
-
-                if response.status_code == 401:
-                    raise AuthenticationError(self.name)
-
-                if response.status_code == 404:
-                    raise ModelNotFoundError(self.name, deployment)
-
-                if response.status_code == 429:
-                    retry_after = response.headers.get("retry-after")
-                    raise RateLimitError(
-                        self.name,
-                        retry_after=int(retry_after) if retry_after else None,
-                    )
+            client = self._get_http_client()
+            response = await client.post(
+                self._get_chat_url(deployment),
+                json=payload,
+                headers=headers,
+            )
 
-                if response.status_code != 200:
-                    error_message = response.text
-                    # Azure-specific error handling
-                    try:
-                        error_data = response.json()
-                        if "error" in error_data:
-                            error_message = error_data["error"].get("message", error_message)
-                    except Exception:
-                        pass
+            if response.status_code == 401:
+                raise AuthenticationError(self.name)
 
-                    raise LLMProviderError(
-                        f"Azure OpenAI request failed: {error_message}",
-                        provider=self.name,
-                        status_code=response.status_code,
-                        retryable=response.status_code >= 500,
-                    )
+            if response.status_code == 404:
+                raise ModelNotFoundError(self.name, deployment)
 
-                data = response.json()
-                choice = data.get("choices", [{}])[0]
+            if response.status_code == 429:
+                retry_after = response.headers.get("retry-after")
+                raise RateLimitError(
+                    self.name,
+                    retry_after=int(retry_after) if retry_after else None,
+                )
 
-                return LLMResponse(
-                    content=choice.get("message", {}).get("content", ""),
-                    model=config.model or self.default_model,
+            if response.status_code != 200:
+                error_message = response.text
+                # Azure-specific error handling
+                try:
+                    error_data = response.json()
+                    if "error" in error_data:
+                        error_message = error_data["error"].get("message", error_message)
+                except Exception:
+                    pass
+
+                raise LLMProviderError(
+                    f"Azure OpenAI request failed: {error_message}",
                     provider=self.name,
-                    usage={
-                        "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
-                        "output_tokens": data.get("usage", {}).get("completion_tokens", 0),
-                    },
-                    finish_reason=choice.get("finish_reason", "stop"),
-                    raw_response=data,
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
                 )
 
+            data = response.json()
+            choice = data.get("choices", [{}])[0]
+
+            return LLMResponse(
+                content=choice.get("message", {}).get("content", ""),
+                model=config.model or self.default_model,
+                provider=self.name,
+                usage={
+                    "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
+                    "output_tokens": data.get("usage", {}).get("completion_tokens", 0),
+                },
+                finish_reason=choice.get("finish_reason", "stop"),
+                raw_response=data,
+            )
+
         except httpx.TimeoutException:
             raise LLMProviderError(
                 "Azure OpenAI request timed out",
@@ -311,66 +312,66 @@ class AzureOpenAIProvider(BaseLLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    self._get_chat_url(deployment),
-                    json=payload,
-                    headers=headers,
-                ) as response:
-                    if response.status_code == 401:
-                        raise AuthenticationError(self.name)
-
-                    if response.status_code == 404:
-                        raise ModelNotFoundError(self.name, deployment)
-
-                    if response.status_code == 429:
-                        raise RateLimitError(self.name)
-
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        error_message = error_text.decode()
-                        # Try to parse Azure error format
+            client = self._get_http_client()
+            async with client.stream(
+                "POST",
+                self._get_chat_url(deployment),
+                json=payload,
+                headers=headers,
+            ) as response:
+                if response.status_code == 401:
+                    raise AuthenticationError(self.name)
+
+                if response.status_code == 404:
+                    raise ModelNotFoundError(self.name, deployment)
+
+                if response.status_code == 429:
+                    raise RateLimitError(self.name)
+
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    error_message = error_text.decode()
+                    # Try to parse Azure error format
+                    try:
+                        error_data = json.loads(error_message)
+                        if "error" in error_data:
+                            error_message = error_data["error"].get("message", error_message)
+                    except Exception:
+                        pass
+
+                    raise LLMProviderError(
+                        f"Azure OpenAI request failed: {error_message}",
+                        provider=self.name,
+                        status_code=response.status_code,
+                    )
+
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        if data_str == "[DONE]":
+                            yield StreamChunk(
+                                content="",
+                                done=True,
+                                model=config.model or self.default_model,
+                                provider=self.name,
+                            )
+                            break
+
                         try:
-                            error_data = json.loads(error_message)
-                            if "error" in error_data:
-                                error_message = error_data["error"].get("message", error_message)
-                        except Exception:
-                            pass
-
-                        raise LLMProviderError(
-                            f"Azure OpenAI request failed: {error_message}",
-                            provider=self.name,
-                            status_code=response.status_code,
-                        )
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                yield StreamChunk(
-                                    content="",
-                                    done=True,
-                                    model=config.model or self.default_model,
-                                    provider=self.name,
-                                )
-                                break
-
-                            try:
-                                data = json.loads(data_str)
-                                choice = data.get("choices", [{}])[0]
-                                delta = choice.get("delta", {})
-                                content = delta.get("content", "")
-                                finish_reason = choice.get("finish_reason")
-
-                                yield StreamChunk(
-                                    content=content,
-                                    done=finish_reason is not None,
-                                    model=config.model or self.default_model,
-                                    provider=self.name,
-                                )
-                            except json.JSONDecodeError:
-                                continue
+                            data = json.loads(data_str)
+                            choice = data.get("choices", [{}])[0]
+                            delta = choice.get("delta", {})
+                            content = delta.get("content", "")
+                            finish_reason = choice.get("finish_reason")
+
+                            yield StreamChunk(
+                                content=content,
+                                done=finish_reason is not None,
+                                model=config.model or self.default_model,
+                                provider=self.name,
+                            )
+                        except json.JSONDecodeError:
+                            continue
 
         except httpx.TimeoutException:
             raise LLMProviderError(
@@ -1,13 +1,102 @@
 """Base LLM Provider Interface.
 
 Defines the abstract base class and common types for all LLM providers.
+
+HTTP providers share one pooled ``httpx.AsyncClient`` per provider instance
+(see ``BaseLLMProvider._get_http_client``) so keep-alive connections are
+reused across calls and health probes. Pool limits are configurable:
+
+    VALERIE_LLM_MAX_CONNECTIONS: 100 (default)
+    VALERIE_LLM_MAX_KEEPALIVE: 20 (default)
+    VALERIE_LLM_KEEPALIVE_EXPIRY: 30 seconds (default)
+    VALERIE_LLM_HTTP2: true (default; needs ``pip install 'valerie-chatbot[http2]'``)
 """
 
+import asyncio
+import functools
+import importlib.util
+import logging
+import os
+import time
+import weakref
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from enum import Enum
 
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_TIMEOUT = 60.0
+
+# Providers holding an open pooled client, closed by close_http_clients()
+_open_providers: "weakref.WeakSet[BaseLLMProvider]" = weakref.WeakSet()
+
+
+def http2_available() -> bool:
+    """Return True if httpx can negotiate HTTP/2 (the ``h2`` package is installed)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _parse_flag(value: object) -> bool:
+    """Parse a boolean flag that may be given as a string, e.g. "false"."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return _parse_flag(value)
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool settings for a provider's shared HTTP client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_config(cls, config: dict | None = None) -> "HTTPPoolConfig":
+        """Build pool settings from provider config, falling back to environment.
+
+        Args:
+            config: Provider configuration dictionary. Recognised keys are
+                ``max_connections``, ``max_keepalive_connections``,
+                ``keepalive_expiry`` and ``http2``.
+
+        Returns:
+            HTTPPoolConfig with config values taking precedence over env vars.
+        """
+        config = config or {}
+        return cls(
+            max_connections=int(
+                config.get("max_connections", os.getenv("VALERIE_LLM_MAX_CONNECTIONS", 100))
+            ),
+            max_keepalive_connections=int(
+                config.get("max_keepalive_connections", os.getenv("VALERIE_LLM_MAX_KEEPALIVE", 20))
+            ),
+            keepalive_expiry=float(
+                config.get("keepalive_expiry", os.getenv("VALERIE_LLM_KEEPALIVE_EXPIRY", 30.0))
+            ),
+            http2=_parse_flag(config.get("http2", _env_flag("VALERIE_LLM_HTTP2", True))),
+        )
+
+    def to_limits(self) -> httpx.Limits:
+        """Convert to ``httpx.Limits``."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
 
 class MessageRole(str, Enum):
     """Message roles in a conversation."""
@@ -62,6 +151,7 @@ class LLMResponse:
     usage: dict = field(default_factory=dict)
     finish_reason: str = "stop"
     raw_response: dict = field(default_factory=dict)
+    cache_hit: str | None = None  # "exact"/"semantic" when served from the response cache
 
     @property
     def input_tokens(self) -> int:
@@ -87,15 +177,129 @@ class StreamChunk:
     done: bool = False
     model: str = ""
     provider: str = ""
+    usage: dict = field(default_factory=dict)  # Token counts, on the chunk that reports them
+
+
+def _set_attributes(current, **attributes) -> None:
+    """Set span attributes, skipping None values (which OpenTelemetry rejects)."""
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value)
+
+
+def _traced_generate(generate):
+    """Wrap a provider's ``generate`` so each call is recorded as an OpenTelemetry span."""
+
+    @functools.wraps(generate)
+    async def traced(self, messages, config=None, *args, **kwargs):
+        # Imported lazily: valerie.infrastructure imports the agents, which use the llm package
+        from valerie.infrastructure.otel import span, tracing_enabled
+
+        if not tracing_enabled():
+            return await generate(self, messages, config, *args, **kwargs)
+        with span(
+            "llm.generate",
+            **{
+                "gen_ai.system": self.name,
+                "gen_ai.request.model": self._get_model(config),
+                "valerie.llm.messages": len(messages),
+            },
+        ) as current:
+            response = await generate(self, messages, config, *args, **kwargs)
+            _set_attributes(
+                current,
+                **{
+                    "gen_ai.response.model": response.model or None,
+                    "gen_ai.usage.input_tokens": response.input_tokens,
+                    "gen_ai.usage.output_tokens": response.output_tokens,
+                    "valerie.llm.cache_hit": response.cache_hit,
+                },
+            )
+            return response
+
+    return traced
+
+
+def _traced_generate_stream(generate_stream):
+    """Wrap a provider's ``generate_stream`` so each stream is recorded as a span.
+
+    The span lasts until the stream is exhausted or closed, so its duration
+    is the total streaming time; time to first token is recorded as the
+    ``valerie.llm.ttft_ms`` attribute and a ``first_token`` event.
+    """
+
+    @functools.wraps(generate_stream)
+    async def traced(self, messages, config=None, *args, **kwargs):
+        from valerie.infrastructure.otel import end_span, start_span, tracing_enabled
+
+        stream = generate_stream(self, messages, config, *args, **kwargs)
+        if not tracing_enabled():
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+            return
+
+        # Not made current: the consumer runs between chunks in its own context
+        current = start_span(
+            "llm.generate_stream",
+            **{
+                "gen_ai.system": self.name,
+                "gen_ai.request.model": self._get_model(config),
+                "valerie.llm.messages": len(messages),
+            },
+        )
+        started = time.perf_counter()
+        model = ttft_ms = None
+        usage: dict = {}
+        error = None
+        try:
+            async for chunk in stream:
+                if chunk.content and ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - started) * 1000
+                    current.add_event("first_token")
+                model = chunk.model or model
+                usage.update(chunk.usage)
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            await stream.aclose()
+            _set_attributes(
+                current,
+                **{
+                    "gen_ai.response.model": model,
+                    "gen_ai.usage.input_tokens": usage.get("input_tokens"),
+                    "gen_ai.usage.output_tokens": usage.get("output_tokens"),
+                    "valerie.llm.ttft_ms": ttft_ms,
+                },
+            )
+            end_span(current, error)
+
+    return traced
 
 
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers.
 
     All LLM providers must implement this interface to ensure
-    consistent behavior across different backends.
+    consistent behavior across different backends. Every subclass's
+    ``generate`` and ``generate_stream`` are recorded as OpenTelemetry spans
+    when span export is enabled (see ``valerie.infrastructure.otel``).
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for method, wrap in (
+            ("generate", _traced_generate),
+            ("generate_stream", _traced_generate_stream),
+        ):
+            function = cls.__dict__.get(method)
+            if function is not None and not getattr(function, "__isabstractmethod__", False):
+                setattr(cls, method, wrap(function))
+
     def __init__(self, config: dict | None = None):
         """Initialize the provider.
 
@@ -104,6 +308,9 @@ class BaseLLMProvider(ABC):
         """
         self.config = config or {}
         self._is_available: bool | None = None
+        self.http_pool = HTTPPoolConfig.from_config(self.config)
+        self._http_client: httpx.AsyncClient | None = None
+        self._http_client_loop: asyncio.AbstractEventLoop | None = None
 
     @property
     @abstractmethod
@@ -122,6 +329,15 @@ class BaseLLMProvider(ABC):
         """Return list of available models for this provider."""
         return [self.default_model]
 
+    @property
+    def member_names(self) -> list[str]:
+        """Return the names of the providers answering calls.
+
+        A plain provider is its only member; composite providers such as
+        ``HedgedLLMProvider`` list every provider they send requests to.
+        """
+        return [self.name]
+
     @abstractmethod
     async def generate(
         self,
@@ -171,6 +387,10 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    def reset_availability(self) -> None:
+        """Forget the memoized ``is_available`` result so the next call re-checks."""
+        self._is_available = None
+
     async def health_check(self) -> dict:
         """Perform a health check on the provider.
 
@@ -192,6 +412,42 @@ class BaseLLMProvider(ABC):
                 "error": str(e),
             }
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the provider's pooled HTTP client, creating it on first use.
+
+        The client is bound to the running event loop; if the loop changes
+        (e.g. successive ``asyncio.run`` calls in the CLI) a fresh client is
+        created, since pooled connections cannot cross loops.
+
+        Returns:
+            Shared ``httpx.AsyncClient`` with keep-alive and pool limits.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        client = self._http_client
+        if client is not None and not client.is_closed and self._http_client_loop is loop:
+            return client
+
+        self._http_client = httpx.AsyncClient(
+            timeout=getattr(self, "timeout", DEFAULT_HTTP_TIMEOUT),
+            limits=self.http_pool.to_limits(),
+            http2=self.http_pool.http2 and http2_available(),
+        )
+        self._http_client_loop = loop
+        _open_providers.add(self)
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        client, self._http_client = self._http_client, None
+        self._http_client_loop = None
+        _open_providers.discard(self)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
     def _get_model(self, config: LLMConfig | None) -> str:
         """Get model from config or use default."""
         if config and config.model:
@@ -207,6 +463,18 @@ class BaseLLMProvider(ABC):
         return config
 
 
+async def close_http_clients() -> None:
+    """Close the pooled HTTP clients of every provider that opened one.
+
+    Called from the API lifespan on shutdown.
+    """
+    for provider in list(_open_providers):
+        try:
+            await provider.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP client for {provider.name}: {e}")
+
+
 class LLMProviderError(Exception):
     """Base exception for LLM provider errors."""
 
@@ -248,6 +516,19 @@ class AuthenticationError(LLMProviderError):
         )
 
 
+class DeadlineExceededError(LLMProviderError):
+    """Raised when a request's retry/failover deadline budget runs out."""
+
+    def __init__(self, provider: str, deadline: float):
+        super().__init__(
+            f"LLM request deadline of {deadline:g}s exceeded ({provider})",
+            provider=provider,
+            status_code=504,
+            retryable=False,
+        )
+        self.deadline = deadline
+
+
 class ModelNotFoundError(LLMProviderError):
     """Raised when the requested model is not available."""
 
@@ -0,0 +1,567 @@
+"""LLM Response Cache.
+
+Provider-agnostic cache for LLM generations with two tiers:
+
+- exact: keyed on (provider, model, messages, temperature, max_tokens)
+- semantic (optional): the last user message is embedded and matched by
+  cosine similarity against cached prompts that share everything else
+  (provider, model, parameters, system prompt and earlier turns)
+
+Entries are bounded and expire after a TTL. Responses are stored in memory
+or in Redis; the semantic index is always in-process.
+
+Configuration:
+    VALERIE_LLM_CACHE: off (default), memory or redis
+    VALERIE_LLM_CACHE_TTL: 3600 seconds (default)
+    VALERIE_LLM_CACHE_MAX_ENTRIES: 2048 (default)
+    VALERIE_LLM_CACHE_REDIS_URL: falls back to VALERIE_REDIS_URL
+    VALERIE_LLM_CACHE_SEMANTIC: false (default)
+    VALERIE_LLM_CACHE_SIMILARITY: 0.95 (default)
+
+Usage:
+    from valerie.llm.cache import CachedLLMProvider, get_response_cache
+
+    cache = get_response_cache()
+    if cache is not None:
+        provider = CachedLLMProvider(provider, cache)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import asdict, replace
+
+from redis import asyncio as aioredis
+
+from valerie.llm.base import (
+    BaseLLMProvider,
+    LLMConfig,
+    LLMMessage,
+    LLMResponse,
+    MessageRole,
+    StreamChunk,
+)
+from valerie.utils.cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_SIMILARITY = 0.95
+EMBEDDING_BUCKETS = 4096
+
+Embedding = Mapping[int, float]
+Embedder = Callable[[str], Embedding]
+
+
+def _digest(payload: object) -> str:
+    """Stable SHA-256 digest of a JSON-serializable payload."""
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    messages: list[LLMMessage],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """Build the exact-match cache key for a generation request.
+
+    Args:
+        provider: Provider name.
+        model: Model name.
+        messages: Conversation messages, in order.
+        temperature: Sampling temperature.
+        max_tokens: Maximum output tokens.
+
+    Returns:
+        Hex digest identifying the request.
+    """
+    return _digest(
+        [provider, model, temperature, max_tokens, [[m.role.value, m.content] for m in messages]]
+    )
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a prompt for similarity matching.
+
+    Lowercases, strips accents and punctuation and collapses whitespace, so
+    "¿Qué es NADCAP?" and "que es nadcap" normalize to the same string.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def ngram_embedding(text: str, buckets: int = EMBEDDING_BUCKETS) -> Embedding:
+    """Embed text as a sparse, L2-normalized vector of hashed character trigrams.
+
+    Args:
+        text: Text to embed.
+        buckets: Number of hash buckets.
+
+    Returns:
+        Mapping of bucket index to weight.
+    """
+    padded = f" {normalize_text(text)} "
+    counts: dict[int, float] = {}
+    for i in range(len(padded) - 2):
+        gram = padded[i : i + 3].encode("utf-8")
+        bucket = int.from_bytes(hashlib.blake2b(gram, digest_size=4).digest(), "little") % buckets
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    return {k: v / norm for k, v in counts.items()} if norm else {}
+
+
+def cosine_similarity(a: Embedding, b: Embedding) -> float:
+    """Cosine similarity of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+def _record_lookup(tier: str, hit: bool) -> None:
+    # Imported lazily: valerie.infrastructure imports the agents, which use this module
+    from valerie.infrastructure.metrics import record_llm_cache
+
+    record_llm_cache(tier, hit)
+
+
+def _response_to_dict(response: LLMResponse) -> dict:
+    data = asdict(response)
+    data.pop("cache_hit", None)
+    return data
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses, keyed by exact cache key."""
+
+    @abstractmethod
+    async def get(self, key: str) -> dict | None:
+        """Get a cached response dictionary, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        """Store a response dictionary with a TTL in seconds."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        pass
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Bounded in-process backend with LRU eviction and per-entry TTL."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the backend.
+
+        Args:
+            max_entries: Maximum number of cached responses.
+        """
+        self._cache = TTLLRUCache(max_entries=max_entries, ttl_seconds=DEFAULT_TTL_SECONDS)
+
+    async def get(self, key: str) -> dict | None:
+        """Get a cached response dictionary."""
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        """Store a response dictionary."""
+        self._cache.set(key, value, ttl_seconds=ttl)
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis backend shared across processes; Redis handles TTL expiry.
+
+    Bound memory with a Redis ``maxmemory`` eviction policy such as
+    ``volatile-lru``.
+    """
+
+    def __init__(self, redis_url: str = "redis://localhost:6379", prefix: str = "valerie:llm:"):
+        """Initialize the backend.
+
+        Args:
+            redis_url: Redis connection URL.
+            prefix: Key prefix for namespacing cache entries.
+        """
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self._client: aioredis.Redis | None = None
+
+    async def _get_client(self) -> aioredis.Redis:
+        """Get or create Redis client."""
+        if self._client is None:
+            self._client = await aioredis.from_url(
+                self.redis_url, encoding="utf-8", decode_responses=True
+            )
+        return self._client
+
+    async def get(self, key: str) -> dict | None:
+        """Get a cached response dictionary."""
+        client = await self._get_client()
+        serialized = await client.get(f"{self.prefix}{key}")
+        return json.loads(serialized) if serialized is not None else None
+
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        """Store a response dictionary."""
+        client = await self._get_client()
+        await client.setex(f"{self.prefix}{key}", ttl, json.dumps(value, default=str))
+
+    async def clear(self) -> None:
+        """Remove all cached responses under the prefix."""
+        client = await self._get_client()
+        keys = [key async for key in client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await client.delete(*keys)
+
+    async def close(self) -> None:
+        """Close Redis connection."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class SemanticIndex:
+    """In-process similarity index from prompt embeddings to exact cache keys.
+
+    Only prompts in the same scope (everything but the last user message)
+    are compared, and prompts whose numbers differ never match, so
+    "status of PO 123" cannot be answered with the entry for "PO 124".
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        embedder: Embedder = ngram_embedding,
+    ):
+        """Initialize the index.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit.
+            max_entries: Maximum number of indexed prompts.
+            embedder: Function mapping text to a normalized sparse vector.
+        """
+        self.threshold = threshold
+        self.embedder = embedder
+        self._entries = TTLLRUCache(max_entries=max_entries, ttl_seconds=DEFAULT_TTL_SECONDS)
+
+    @staticmethod
+    def _numbers(text: str) -> tuple[str, ...]:
+        return tuple(re.findall(r"\d+", text))
+
+    def add(self, scope: str, text: str, key: str, ttl: int) -> None:
+        """Index a prompt.
+
+        Args:
+            scope: Digest of the request without its last user message.
+            text: Last user message.
+            key: Exact cache key holding the response.
+            ttl: Entry TTL in seconds.
+        """
+        self._entries.set(key, (scope, self._numbers(text), self.embedder(text)), ttl_seconds=ttl)
+
+    def search(self, scope: str, text: str) -> str | None:
+        """Find the exact key of the most similar indexed prompt.
+
+        Args:
+            scope: Digest of the request without its last user message.
+            text: Last user message.
+
+        Returns:
+            Exact cache key of the best match above the threshold, or None.
+        """
+        numbers = self._numbers(text)
+        vector = self.embedder(text)
+        best_key, best_score = None, self.threshold
+        for key, (entry_scope, entry_numbers, entry_vector) in self._entries.items():
+            if entry_scope != scope or entry_numbers != numbers:
+                continue
+            score = cosine_similarity(vector, entry_vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def clear(self) -> None:
+        """Remove all indexed prompts."""
+        self._entries.clear()
+
+
+class ResponseCache:
+    """Exact and optional semantic cache of LLM responses."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        semantic: SemanticIndex | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            backend: Response storage, defaults to an in-memory backend.
+            ttl_seconds: TTL applied to every cached response.
+            semantic: Optional similarity index for near-duplicate prompts.
+        """
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.semantic = semantic
+
+    @staticmethod
+    def _semantic_parts(
+        provider: str, model: str, messages: list[LLMMessage], config: LLMConfig
+    ) -> tuple[str, str] | None:
+        """Split a request into (scope digest, last user message) for the semantic tier."""
+        if not messages or messages[-1].role != MessageRole.USER:
+            return None
+        scope = make_cache_key(
+            provider, model, messages[:-1], config.temperature, config.max_tokens
+        )
+        return scope, messages[-1].content
+
+    async def get(
+        self,
+        provider: str,
+        model: str,
+        messages: list[LLMMessage],
+        config: LLMConfig,
+    ) -> LLMResponse | None:
+        """Look up a cached response.
+
+        Args:
+            provider: Provider name.
+            model: Model name.
+            messages: Conversation messages.
+            config: Generation configuration.
+
+        Returns:
+            The cached response with zero token usage and ``cache_hit`` set
+            to "exact" or "semantic", or None on a miss.
+        """
+        key = make_cache_key(provider, model, messages, config.temperature, config.max_tokens)
+        tier = "exact"
+        data = await self._backend_get(key)
+
+        if data is None and self.semantic is not None:
+            parts = self._semantic_parts(provider, model, messages, config)
+            match = self.semantic.search(*parts) if parts else None
+            if match is not None:
+                tier = "semantic"
+                data = await self._backend_get(match)
+
+        _record_lookup(tier, data is not None)
+        if data is None:
+            return None
+        response = LLMResponse(**data)
+        return replace(response, usage={}, raw_response=dict(response.raw_response), cache_hit=tier)
+
+    async def set(
+        self,
+        provider: str,
+        model: str,
+        messages: list[LLMMessage],
+        config: LLMConfig,
+        response: LLMResponse,
+    ) -> None:
+        """Store a response.
+
+        Args:
+            provider: Provider name.
+            model: Model name.
+            messages: Conversation messages.
+            config: Generation configuration.
+            response: Response to cache.
+        """
+        key = make_cache_key(provider, model, messages, config.temperature, config.max_tokens)
+        try:
+            await self.backend.set(key, _response_to_dict(response), self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+            return
+        if self.semantic is not None:
+            parts = self._semantic_parts(provider, model, messages, config)
+            if parts:
+                self.semantic.add(*parts, key=key, ttl=self.ttl_seconds)
+
+    async def _backend_get(self, key: str) -> dict | None:
+        """Read from the backend, treating backend errors as misses."""
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        await self.backend.clear()
+        if self.semantic is not None:
+            self.semantic.clear()
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        await self.backend.close()
+
+
+class CachedLLMProvider(BaseLLMProvider):
+    """Provider wrapper that serves repeated generations from a ResponseCache.
+
+    Streaming requests are answered from the cache on a hit and forwarded
+    to the wrapped provider otherwise.
+    """
+
+    def __init__(self, provider: BaseLLMProvider, cache: ResponseCache):
+        """Initialize the wrapper.
+
+        Args:
+            provider: Provider to forward cache misses to.
+            cache: Response cache.
+        """
+        super().__init__(provider.config)
+        self.inner = provider
+        self.cache = cache
+
+    @property
+    def name(self) -> str:
+        """Return the wrapped provider name."""
+        return self.inner.name
+
+    @property
+    def default_model(self) -> str:
+        """Return the wrapped provider default model."""
+        return self.inner.default_model
+
+    @property
+    def available_models(self) -> list[str]:
+        """Return the wrapped provider models."""
+        return self.inner.available_models
+
+    @property
+    def member_names(self) -> list[str]:
+        """Return the wrapped provider members."""
+        return self.inner.member_names
+
+    async def generate(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> LLMResponse:
+        """Generate a response, serving it from the cache when possible."""
+        config = self.inner._get_config(config)
+        model = self.inner._get_model(config)
+
+        cached = await self.cache.get(self.name, model, messages, config)
+        if cached is not None:
+            return cached
+
+        response = await self.inner.generate(messages, config)
+        await self.cache.set(self.name, model, messages, config, response)
+        return response
+
+    async def generate_stream(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a response, yielding a cached response as a single chunk."""
+        config = self.inner._get_config(config)
+        model = self.inner._get_model(config)
+
+        cached = await self.cache.get(self.name, model, messages, config)
+        if cached is not None:
+            yield StreamChunk(content=cached.content, done=True, model=model, provider=self.name)
+            return
+
+        async for chunk in self.inner.generate_stream(messages, config):
+            yield chunk
+
+    async def is_available(self) -> bool:
+        """Check if the wrapped provider is available."""
+        return await self.inner.is_available()
+
+    async def health_check(self) -> dict:
+        """Health check of the wrapped provider."""
+        return await self.inner.health_check()
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider's HTTP client."""
+        await self.inner.aclose()
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_loaded = False
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+def create_response_cache() -> ResponseCache | None:
+    """Create a response cache from environment configuration.
+
+    Returns:
+        Configured ResponseCache, or None if caching is off.
+    """
+    backend_type = os.getenv("VALERIE_LLM_CACHE", "off").strip().lower()
+    if backend_type in ("", "off", "none", "false", "0"):
+        return None
+
+    max_entries = int(os.getenv("VALERIE_LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    if backend_type == "redis":
+        redis_url = os.getenv(
+            "VALERIE_LLM_CACHE_REDIS_URL", os.getenv("VALERIE_REDIS_URL", "redis://localhost:6379")
+        )
+        backend: CacheBackend = RedisCacheBackend(redis_url=redis_url)
+    else:
+        if backend_type != "memory":
+            logger.warning(f"Unknown LLM cache backend '{backend_type}', using memory")
+        backend = InMemoryCacheBackend(max_entries=max_entries)
+
+    semantic = None
+    if _env_flag("VALERIE_LLM_CACHE_SEMANTIC"):
+        semantic = SemanticIndex(
+            threshold=float(os.getenv("VALERIE_LLM_CACHE_SIMILARITY", DEFAULT_SIMILARITY)),
+            max_entries=max_entries,
+        )
+
+    return ResponseCache(
+        backend=backend,
+        ttl_seconds=int(os.getenv("VALERIE_LLM_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+        semantic=semantic,
+    )
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Get the process-wide response cache, or None if caching is off."""
+    global _response_cache, _response_cache_loaded
+    if not _response_cache_loaded:
+        _response_cache = create_response_cache()
+        _response_cache_loaded = True
+    return _response_cache
+
+
+def reset_response_cache() -> None:
+    """Drop the process-wide response cache so configuration is re-read."""
+    global _response_cache, _response_cache_loaded
+    _response_cache = None
+    _response_cache_loaded = False
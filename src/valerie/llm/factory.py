@@ -33,6 +33,7 @@ from valerie.llm.base import (
 from valerie.llm.bedrock import BedrockProvider
 from valerie.llm.gemini import GeminiProvider
 from valerie.llm.groq import GroqProvider
+from valerie.llm.health import get_health_registry
 from valerie.llm.lightllm import LightLLMProvider
 from valerie.llm.ollama import OllamaProvider
 
@@ -174,6 +175,11 @@ async def get_available_provider(
 ) -> BaseLLMProvider:
     """Get the first available provider from the fallback chain.
 
+    Availability comes from the background health registry when it has a
+    fresh probe, so no network call is made; providers without one are
+    checked directly. Providers known to be down are skipped and slow ones
+    are tried last (see ``ProviderHealthRegistry.rank``).
+
     Args:
         preferred: Preferred provider to try first.
 
@@ -197,11 +203,14 @@ async def get_available_provider(
             chain.remove(preferred)
             chain = [preferred] + chain
 
+    registry = get_health_registry()
+
     # Try each provider in chain
-    for provider_type in chain:
+    for provider_type in registry.rank(chain):
         try:
             provider = get_llm_provider(provider_type)
-            if await provider.is_available():
+            cached = registry.is_available(provider_type.value)
+            if cached or (cached is None and await provider.is_available()):
                 logger.info(f"Using LLM provider: {provider.name}")
                 return provider
             else:
@@ -220,25 +229,24 @@ async def get_available_provider(
 async def health_check_all() -> dict[str, dict]:
     """Perform health check on all providers.
 
+    Uses the health registry's cached results when every provider has a
+    fresh probe; otherwise probes all providers concurrently.
+
     Returns:
         Dictionary mapping provider names to their health status.
     """
-    results = {}
-    for provider_type in ProviderType:
-        try:
-            provider = get_llm_provider(provider_type)
-            results[provider_type.value] = await provider.health_check()
-        except Exception as e:
-            results[provider_type.value] = {
-                "available": False,
-                "error": str(e),
-            }
-    return results
+    registry = get_health_registry()
+    snapshot = registry.snapshot()
+    if all(provider_type.value in snapshot for provider_type in ProviderType):
+        return snapshot
+    results = await registry.refresh()
+    return {name: health.to_dict() for name, health in results.items()}
 
 
 def clear_provider_cache() -> None:
-    """Clear cached provider instances."""
+    """Clear cached provider instances and their cached health."""
     _provider_instances.clear()
+    get_health_registry().clear()
 
 
 # Convenience function for quick generation
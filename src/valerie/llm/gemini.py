@@ -141,13 +141,14 @@ class GeminiProvider(BaseLLMProvider):
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/models",
-                    params={"key": self.api_key},
-                )
-                self._is_available = response.status_code == 200
-                return self._is_available
+            client = self._get_http_client()
+            response = await client.get(
+                f"{self.BASE_URL}/models",
+                params={"key": self.api_key},
+                timeout=10,
+            )
+            self._is_available = response.status_code == 200
+            return self._is_available
         except Exception as e:
             logger.debug(f"Gemini not available: {e}")
             self._is_available = False
@@ -195,62 +196,62 @@ class GeminiProvider(BaseLLMProvider):
         url = f"{self.BASE_URL}/models/{model}:generateContent"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    params={"key": self.api_key},
-                    headers={"Content-Type": "application/json"},
-                )
+            client = self._get_http_client()
+            response = await client.post(
+                url,
+                json=payload,
+                params={"key": self.api_key},
+                headers={"Content-Type": "application/json"},
+            )
 
-                if response.status_code == 401 or response.status_code == 403:
-                    raise AuthenticationError(self.name)
+            if response.status_code == 401 or response.status_code == 403:
+                raise AuthenticationError(self.name)
 
-                if response.status_code == 429:
-                    raise RateLimitError(self.name)
+            if response.status_code == 429:
+                raise RateLimitError(self.name)
 
-                if response.status_code == 404:
-                    raise ModelNotFoundError(self.name, model)
+            if response.status_code == 404:
+                raise ModelNotFoundError(self.name, model)
 
-                if response.status_code != 200:
-                    raise LLMProviderError(
-                        f"Gemini request failed: {response.text}",
-                        provider=self.name,
-                        status_code=response.status_code,
-                        retryable=response.status_code >= 500,
-                    )
+            if response.status_code != 200:
+                raise LLMProviderError(
+                    f"Gemini request failed: {response.text}",
+                    provider=self.name,
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
+                )
 
-                data = response.json()
+            data = response.json()
 
-                # Extract content from Gemini response
-                candidates = data.get("candidates", [])
-                if not candidates:
-                    raise LLMProviderError(
-                        "Gemini returned no candidates",
-                        provider=self.name,
-                    )
+            # Extract content from Gemini response
+            candidates = data.get("candidates", [])
+            if not candidates:
+                raise LLMProviderError(
+                    "Gemini returned no candidates",
+                    provider=self.name,
+                )
 
-                content = ""
-                candidate = candidates[0]
-                parts = candidate.get("content", {}).get("parts", [])
-                for part in parts:
-                    if "text" in part:
-                        content += part["text"]
+            content = ""
+            candidate = candidates[0]
+            parts = candidate.get("content", {}).get("parts", [])
+            for part in parts:
+                if "text" in part:
+                    content += part["text"]
 
-                # Extract usage metadata
-                usage_metadata = data.get("usageMetadata", {})
+            # Extract usage metadata
+            usage_metadata = data.get("usageMetadata", {})
 
-                return LLMResponse(
-                    content=content,
-                    model=model,
-                    provider=self.name,
-                    usage={
-                        "input_tokens": usage_metadata.get("promptTokenCount", 0),
-                        "output_tokens": usage_metadata.get("candidatesTokenCount", 0),
-                    },
-                    finish_reason=candidate.get("finishReason", "STOP"),
-                    raw_response=data,
-                )
+            return LLMResponse(
+                content=content,
+                model=model,
+                provider=self.name,
+                usage={
+                    "input_tokens": usage_metadata.get("promptTokenCount", 0),
+                    "output_tokens": usage_metadata.get("candidatesTokenCount", 0),
+                },
+                finish_reason=candidate.get("finishReason", "STOP"),
+                raw_response=data,
+            )
 
         except httpx.TimeoutException:
             raise LLMProviderError(
@@ -301,64 +302,64 @@ class GeminiProvider(BaseLLMProvider):
         url = f"{self.BASE_URL}/models/{model}:streamGenerateContent"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    url,
-                    json=payload,
-                    params={"key": self.api_key, "alt": "sse"},
-                    headers={"Content-Type": "application/json"},
-                ) as response:
-                    if response.status_code == 401 or response.status_code == 403:
-                        raise AuthenticationError(self.name)
-
-                    if response.status_code == 429:
-                        raise RateLimitError(self.name)
-
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        raise LLMProviderError(
-                            f"Gemini request failed: {error_text.decode()}",
-                            provider=self.name,
-                            status_code=response.status_code,
-                        )
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            try:
-                                data = json.loads(data_str)
-                                candidates = data.get("candidates", [])
-
-                                if candidates:
-                                    candidate = candidates[0]
-                                    parts = candidate.get("content", {}).get("parts", [])
-                                    content = ""
-                                    for part in parts:
-                                        if "text" in part:
-                                            content += part["text"]
-
-                                    finish_reason = candidate.get("finishReason")
-                                    done = finish_reason is not None and finish_reason != "STOP"
-
-                                    yield StreamChunk(
-                                        content=content,
-                                        done=done,
-                                        model=model,
-                                        provider=self.name,
-                                    )
-
-                            except json.JSONDecodeError:
-                                continue
-
-                    # Final chunk
-                    yield StreamChunk(
-                        content="",
-                        done=True,
-                        model=model,
+            client = self._get_http_client()
+            async with client.stream(
+                "POST",
+                url,
+                json=payload,
+                params={"key": self.api_key, "alt": "sse"},
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                if response.status_code == 401 or response.status_code == 403:
+                    raise AuthenticationError(self.name)
+
+                if response.status_code == 429:
+                    raise RateLimitError(self.name)
+
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    raise LLMProviderError(
+                        f"Gemini request failed: {error_text.decode()}",
                         provider=self.name,
+                        status_code=response.status_code,
                     )
 
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        try:
+                            data = json.loads(data_str)
+                            candidates = data.get("candidates", [])
+
+                            if candidates:
+                                candidate = candidates[0]
+                                parts = candidate.get("content", {}).get("parts", [])
+                                content = ""
+                                for part in parts:
+                                    if "text" in part:
+                                        content += part["text"]
+
+                                finish_reason = candidate.get("finishReason")
+                                done = finish_reason is not None and finish_reason != "STOP"
+
+                                yield StreamChunk(
+                                    content=content,
+                                    done=done,
+                                    model=model,
+                                    provider=self.name,
+                                )
+
+                        except json.JSONDecodeError:
+                            continue
+
+                # Final chunk
+                yield StreamChunk(
+                    content="",
+                    done=True,
+                    model=model,
+                    provider=self.name,
+                )
+
         except httpx.TimeoutException:
             raise LLMProviderError(
                 "Gemini request timed out",
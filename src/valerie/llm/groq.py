@@ -108,13 +108,14 @@ class GroqProvider(BaseLLMProvider):
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/models",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                )
-                self._is_available = response.status_code == 200
-                return self._is_available
+            client = self._get_http_client()
+            response = await client.get(
+                f"{self.BASE_URL}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=10,
+            )
+            self._is_available = response.status_code == 200
+            return self._is_available
         except Exception as e:
             logger.debug(f"Groq not available: {e}")
             self._is_available = False
@@ -161,49 +162,49 @@ class GroqProvider(BaseLLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/chat/completions",
-                    json=payload,
-                    headers=headers,
-                )
-
-                if response.status_code == 401:
-                    raise AuthenticationError(self.name)
-
-                if response.status_code == 429:
-                    retry_after = response.headers.get("retry-after")
-                    raise RateLimitError(
-                        self.name,
-                        retry_after=int(retry_after) if retry_after else None,
-                    )
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self.BASE_URL}/chat/completions",
+                json=payload,
+                headers=headers,
+            )
 
-                if response.status_code == 404:
-                    raise ModelNotFoundError(self.name, model)
+            if response.status_code == 401:
+                raise AuthenticationError(self.name)
 
-                if response.status_code != 200:
-                    raise LLMProviderError(
-                        f"Groq request failed: {response.text}",
-                        provider=self.name,
-                        status_code=response.status_code,
-                        retryable=response.status_code >= 500,
-                    )
+            if response.status_code == 429:
+                retry_after = response.headers.get("retry-after")
+                raise RateLimitError(
+                    self.name,
+                    retry_after=int(retry_after) if retry_after else None,
+                )
 
-                data = response.json()
-                choice = data.get("choices", [{}])[0]
+            if response.status_code == 404:
+                raise ModelNotFoundError(self.name, model)
 
-                return LLMResponse(
-                    content=choice.get("message", {}).get("content", ""),
-                    model=model,
+            if response.status_code != 200:
+                raise LLMProviderError(
+                    f"Groq request failed: {response.text}",
                     provider=self.name,
-                    usage={
-                        "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
-                        "output_tokens": data.get("usage", {}).get("completion_tokens", 0),
-                    },
-                    finish_reason=choice.get("finish_reason", "stop"),
-                    raw_response=data,
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
                 )
 
+            data = response.json()
+            choice = data.get("choices", [{}])[0]
+
+            return LLMResponse(
+                content=choice.get("message", {}).get("content", ""),
+                model=model,
+                provider=self.name,
+                usage={
+                    "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
+                    "output_tokens": data.get("usage", {}).get("completion_tokens", 0),
+                },
+                finish_reason=choice.get("finish_reason", "stop"),
+                raw_response=data,
+            )
+
         except httpx.TimeoutException:
             raise LLMProviderError(
                 "Groq request timed out",
@@ -252,54 +253,64 @@ class GroqProvider(BaseLLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.BASE_URL}/chat/completions",
-                    json=payload,
-                    headers=headers,
-                ) as response:
-                    if response.status_code == 401:
-                        raise AuthenticationError(self.name)
-
-                    if response.status_code == 429:
-                        raise RateLimitError(self.name)
-
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        raise LLMProviderError(
-                            f"Groq request failed: {error_text.decode()}",
-                            provider=self.name,
-                            status_code=response.status_code,
-                        )
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                yield StreamChunk(
-                                    content="",
-                                    done=True,
-                                    model=model,
-                                    provider=self.name,
-                                )
-                                break
-
-                            try:
-                                data = json.loads(data_str)
-                                choice = data.get("choices", [{}])[0]
-                                delta = choice.get("delta", {})
-                                content = delta.get("content", "")
-                                finish_reason = choice.get("finish_reason")
-
-                                yield StreamChunk(
-                                    content=content,
-                                    done=finish_reason is not None,
-                                    model=model,
-                                    provider=self.name,
-                                )
-                            except json.JSONDecodeError:
-                                continue
+            client = self._get_http_client()
+            async with client.stream(
+                "POST",
+                f"{self.BASE_URL}/chat/completions",
+                json=payload,
+                headers=headers,
+            ) as response:
+                if response.status_code == 401:
+                    raise AuthenticationError(self.name)
+
+                if response.status_code == 429:
+                    raise RateLimitError(self.name)
+
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    raise LLMProviderError(
+                        f"Groq request failed: {error_text.decode()}",
+                        provider=self.name,
+                        status_code=response.status_code,
+                    )
+
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        if data_str == "[DONE]":
+                            yield StreamChunk(
+                                content="",
+                                done=True,
+                                model=model,
+                                provider=self.name,
+                            )
+                            break
+
+                        try:
+                            data = json.loads(data_str)
+                            choice = data.get("choices", [{}])[0]
+                            delta = choice.get("delta", {})
+                            content = delta.get("content", "")
+                            finish_reason = choice.get("finish_reason")
+                            # Groq reports usage on the last chunk under x_groq
+                            usage = data.get("usage") or data.get("x_groq", {}).get("usage") or {}
+
+                            yield StreamChunk(
+                                content=content,
+                                done=finish_reason is not None,
+                                model=model,
+                                provider=self.name,
+                                usage=(
+                                    {
+                                        "input_tokens": usage.get("prompt_tokens", 0),
+                                        "output_tokens": usage.get("completion_tokens", 0),
+                                    }
+                                    if usage
+                                    else {}
+                                ),
+                            )
+                        except json.JSONDecodeError:
+                            continue
 
         except httpx.TimeoutException:
             raise LLMProviderError(
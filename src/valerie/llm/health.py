@@ -0,0 +1,283 @@
+"""Background LLM provider health registry.
+
+Probes every provider concurrently on an interval and caches the result,
+so provider selection and ``/health`` read availability from memory
+instead of making network calls on the request path.
+
+Each probe records availability, round-trip latency and any error, and
+updates the ``valerie_llm_provider_available`` gauge. Results older than
+the TTL are treated as unknown.
+
+Configuration:
+    VALERIE_LLM_HEALTH_INTERVAL: 30 seconds between probe rounds (default)
+    VALERIE_LLM_HEALTH_TTL: 90 seconds before a result is stale (default)
+    VALERIE_LLM_HEALTH_TIMEOUT: 5 seconds per probe (default)
+    VALERIE_LLM_SLOW_PROVIDER_MS: 2000 probe round-trip above which a
+        provider is tried after faster ones (default)
+
+Usage:
+    from valerie.llm.health import get_health_registry
+
+    registry = get_health_registry()
+    registry.start()
+    registry.is_available("groq")  # True/False, or None if unknown
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def _set_gauge(provider: str, available: bool) -> None:
+    # Imported lazily: valerie.infrastructure imports the agents, which use the llm package
+    from valerie.infrastructure.metrics import set_provider_availability
+
+    set_provider_availability(provider, available)
+
+
+@dataclass
+class ProviderHealth:
+    """Result of the latest probe of one provider."""
+
+    provider: str
+    available: bool
+    latency_ms: float = 0.0
+    error: str | None = None
+    details: dict[str, Any] = field(default_factory=dict)
+    checked_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        """Seconds since the probe completed."""
+        return time.monotonic() - self.checked_at
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the ``health_check`` dictionary layout."""
+        result = {
+            **self.details,
+            "provider": self.provider,
+            "available": self.available,
+            "latency_ms": round(self.latency_ms, 1),
+            "checked_seconds_ago": round(self.age(), 1),
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+class ProviderHealthRegistry:
+    """Cached provider availability, refreshed by a background task."""
+
+    def __init__(
+        self,
+        provider_types: list | None = None,
+        interval: float = 30.0,
+        ttl: float = 90.0,
+        probe_timeout: float = 5.0,
+        slow_ms: float = 2000.0,
+    ):
+        """Initialize the registry.
+
+        Args:
+            provider_types: Providers to probe, defaults to every registered one.
+            interval: Seconds between probe rounds.
+            ttl: Seconds a probe result stays valid.
+            probe_timeout: Maximum seconds per probe.
+            slow_ms: Probe round-trip above which a provider is ranked last.
+        """
+        self._provider_types = provider_types
+        self.interval = interval
+        self.ttl = ttl
+        self.probe_timeout = probe_timeout
+        self.slow_ms = slow_ms
+        self._states: dict[str, ProviderHealth] = {}
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_env(cls) -> "ProviderHealthRegistry":
+        """Build a registry configured from ``VALERIE_LLM_HEALTH_*`` variables."""
+        return cls(
+            interval=float(os.getenv("VALERIE_LLM_HEALTH_INTERVAL", "30")),
+            ttl=float(os.getenv("VALERIE_LLM_HEALTH_TTL", "90")),
+            probe_timeout=float(os.getenv("VALERIE_LLM_HEALTH_TIMEOUT", "5")),
+            slow_ms=float(os.getenv("VALERIE_LLM_SLOW_PROVIDER_MS", "2000")),
+        )
+
+    @property
+    def provider_types(self) -> list:
+        """Providers probed by the registry."""
+        if self._provider_types is None:
+            from valerie.llm.factory import ProviderType
+
+            return list(ProviderType)
+        return self._provider_types
+
+    @property
+    def running(self) -> bool:
+        """Whether the background probe task is active."""
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # Probing
+    # ------------------------------------------------------------------
+
+    async def probe(self, provider_type) -> ProviderHealth:
+        """Probe one provider now and cache the result.
+
+        Args:
+            provider_type: Provider to probe.
+
+        Returns:
+            The new ProviderHealth.
+        """
+        from valerie.llm import factory
+
+        name = getattr(provider_type, "value", str(provider_type))
+        start = time.monotonic()
+        try:
+            provider = factory.get_llm_provider(provider_type)
+            # Providers memoize availability; a probe must ask again
+            provider.reset_availability()
+            details = await asyncio.wait_for(provider.health_check(), self.probe_timeout)
+            health = ProviderHealth(
+                provider=name,
+                available=bool(details.get("available")),
+                latency_ms=(time.monotonic() - start) * 1000,
+                error=details.get("error"),
+                details={k: v for k, v in details.items() if k not in ("available", "error")},
+            )
+        except TimeoutError:
+            health = ProviderHealth(
+                provider=name,
+                available=False,
+                latency_ms=(time.monotonic() - start) * 1000,
+                error=f"Probe timed out after {self.probe_timeout}s",
+            )
+        except Exception as e:
+            health = ProviderHealth(provider=name, available=False, error=str(e))
+
+        previous = self._states.get(name)
+        if previous is None or previous.available != health.available:
+            logger.info(f"LLM provider {name} is {'up' if health.available else 'down'}")
+        self._states[name] = health
+        _set_gauge(name, health.available)
+        return health
+
+    async def refresh(self) -> dict[str, ProviderHealth]:
+        """Probe every provider concurrently.
+
+        Returns:
+            Mapping of provider name to its new health.
+        """
+        results = await asyncio.gather(*(self.probe(t) for t in self.provider_types))
+        return {health.provider: health for health in results}
+
+    async def _run(self) -> None:
+        """Probe on an interval until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:  # pragma: no cover - probe() already catches
+                logger.warning(f"Provider health refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start background probing on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._task, self._loop = None, loop
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="llm-health-registry")
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Cached reads (no I/O)
+    # ------------------------------------------------------------------
+
+    def get(self, provider: str) -> ProviderHealth | None:
+        """Latest fresh health of a provider, or None if unknown or stale."""
+        health = self._states.get(provider)
+        if health is None or health.age() > self.ttl:
+            return None
+        return health
+
+    def is_available(self, provider: str) -> bool | None:
+        """Cached availability of a provider.
+
+        Returns:
+            True or False from a fresh probe, None if there is none.
+        """
+        health = self.get(provider)
+        return health.available if health is not None else None
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Fresh probe results as ``health_check`` dictionaries."""
+        snapshot = {}
+        for name in self._states:
+            health = self.get(name)
+            if health is not None:
+                snapshot[name] = health.to_dict()
+        return snapshot
+
+    def rank(self, chain: list) -> list:
+        """Order a provider chain for selection using cached health.
+
+        Providers known to be down are dropped. The chain's preference order
+        is kept, except that providers whose probe round-trip exceeds
+        ``slow_ms`` move behind the others, fastest first. Providers without
+        a fresh probe keep their place.
+
+        Args:
+            chain: Provider types in preference order.
+
+        Returns:
+            Provider types to try, in order.
+        """
+        preferred, slow = [], []
+        for provider_type in chain:
+            health = self.get(getattr(provider_type, "value", str(provider_type)))
+            if health is None:
+                preferred.append(provider_type)
+            elif not health.available:
+                continue
+            elif health.latency_ms > self.slow_ms:
+                slow.append((health.latency_ms, provider_type))
+            else:
+                preferred.append(provider_type)
+        slow.sort(key=lambda item: item[0])
+        return preferred + [provider_type for _, provider_type in slow]
+
+    def clear(self) -> None:
+        """Forget every cached result."""
+        self._states.clear()
+
+
+_registry: ProviderHealthRegistry | None = None
+
+
+def get_health_registry() -> ProviderHealthRegistry:
+    """Get the process-wide provider health registry."""
+    global _registry
+    if _registry is None:
+        _registry = ProviderHealthRegistry.from_env()
+    return _registry
+
+
+async def shutdown_health_registry() -> None:
+    """Stop background probing and drop the process-wide registry."""
+    global _registry
+    if _registry is not None:
+        await _registry.stop()
+        _registry = None
@@ -0,0 +1,409 @@
+"""Hedged LLM requests.
+
+Sends a request to the primary provider and, if it has not answered after
+the hedge delay, sends the same request to the next provider. The first
+successful answer wins and the other in-flight requests are cancelled.
+
+The hedge delay adapts to each primary's recent latency (a high quantile
+of a sliding window, p95 by default), so hedges fire only for the slow
+tail. The window holds winners' latencies as well as how long losing,
+cancelled and timed-out requests ran, so a provider that keeps losing
+races does not look faster than it is. Tokens spent on losing requests
+are counted as wasted. Each member provider's outcome is recorded on its
+shared circuit breaker, and members whose circuit is open are left out of
+the race.
+
+Configuration:
+    VALERIE_LLM_HEDGE_PROVIDERS: comma-separated providers, e.g. "groq,anthropic"
+    VALERIE_LLM_HEDGE_DELAY: 1.0 seconds (default, until enough samples)
+    VALERIE_LLM_HEDGE_QUANTILE: 0.95 (default)
+
+Usage:
+    from valerie.llm.hedging import HedgedLLMProvider
+
+    provider = HedgedLLMProvider([get_llm_provider("groq"), get_llm_provider("anthropic")])
+    response = await provider.generate(messages)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TypeVar
+
+import httpx
+
+from valerie.llm.base import (
+    BaseLLMProvider,
+    LLMConfig,
+    LLMMessage,
+    LLMProviderError,
+    LLMResponse,
+    StreamChunk,
+)
+from valerie.llm.factory import ProviderType, get_llm_provider
+from valerie.llm.retry import RetryPolicy, _config_for, get_provider_breaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_HEDGE_DELAY = 1.0
+DEFAULT_QUANTILE = 0.95
+MIN_SAMPLES = 20
+
+
+def estimate_tokens(messages: list[LLMMessage]) -> int:
+    """Rough prompt token count (about four characters per token)."""
+    return sum(len(m.content) for m in messages) // 4 + 1
+
+
+def _record_hedge(provider: str, outcome: str) -> None:
+    # Imported lazily: valerie.infrastructure imports the agents, which use the llm package
+    from valerie.infrastructure.metrics import record_llm_hedge
+
+    record_llm_hedge(provider, outcome)
+
+
+def _record_wasted_tokens(provider: str, tokens: int) -> None:
+    from valerie.infrastructure.metrics import record_llm_hedge_waste
+
+    record_llm_hedge_waste(provider, tokens)
+
+
+def _is_timeout(error: BaseException) -> bool:
+    """Whether a failed request timed out (directly or as the cause of a provider error)."""
+    timeouts = (TimeoutError, httpx.TimeoutException)
+    return isinstance(error, timeouts) or isinstance(error.__context__, timeouts)
+
+
+def _record_latency(provider: str, model: str, seconds: float, response: LLMResponse) -> None:
+    from valerie.infrastructure.metrics import record_llm_request
+
+    record_llm_request(
+        provider,
+        model,
+        "success",
+        seconds,
+        input_tokens=response.input_tokens,
+        output_tokens=response.output_tokens,
+    )
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies per provider."""
+
+    def __init__(self, window: int = 200):
+        """Initialize the tracker.
+
+        Args:
+            window: Samples kept per provider.
+        """
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, provider: str, seconds: float) -> None:
+        """Record how long a call ran."""
+        samples = self._samples.get(provider)
+        if samples is None:
+            samples = self._samples[provider] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, provider: str) -> int:
+        """Number of samples held for a provider."""
+        return len(self._samples.get(provider, ()))
+
+    def quantile(self, provider: str, q: float) -> float | None:
+        """Latency quantile for a provider, or None without samples.
+
+        Args:
+            provider: Provider name.
+            q: Quantile in [0, 1].
+
+        Returns:
+            Nearest-rank quantile in seconds.
+        """
+        samples = self._samples.get(provider)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[rank]
+
+
+class HedgedLLMProvider(BaseLLMProvider):
+    """Composes providers, hedging slow requests to the next one in line."""
+
+    def __init__(
+        self,
+        providers: list[BaseLLMProvider],
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        quantile: float = DEFAULT_QUANTILE,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        tracker: LatencyTracker | None = None,
+        policy: RetryPolicy | None = None,
+    ):
+        """Initialize the hedged provider.
+
+        Args:
+            providers: Providers in preference order; the first is the primary.
+            hedge_delay: Delay before hedging while a provider has too few samples.
+            quantile: Latency quantile of the waiting provider used as the delay.
+            min_delay: Lower bound for the adaptive delay, in seconds.
+            max_delay: Upper bound for the adaptive delay, in seconds.
+            tracker: Latency tracker, shared between instances if given.
+            policy: Circuit breaker settings for the member providers.
+        """
+        if len(providers) < 2:
+            raise ValueError("Hedging needs at least two providers")
+        super().__init__()
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.tracker = tracker or LatencyTracker()
+        self.policy = policy or RetryPolicy()
+
+    @property
+    def name(self) -> str:
+        """Return the composite provider name."""
+        return "hedged:" + "+".join(p.name for p in self.providers)
+
+    @property
+    def default_model(self) -> str:
+        """Return the primary provider's default model."""
+        return self.providers[0].default_model
+
+    @property
+    def member_names(self) -> list[str]:
+        """Return the names of the composed providers."""
+        return [name for p in self.providers for name in p.member_names]
+
+    def delay_for(self, provider: BaseLLMProvider) -> float:
+        """How long to wait on a provider before hedging.
+
+        Args:
+            provider: Provider whose answer is awaited.
+
+        Returns:
+            The configured quantile of its recent latency, clamped to
+            [min_delay, max_delay], or ``hedge_delay`` without enough samples.
+        """
+        if self.tracker.count(provider.name) < MIN_SAMPLES:
+            return self.hedge_delay
+        observed = self.tracker.quantile(provider.name, self.quantile)
+        return min(self.max_delay, max(self.min_delay, observed))
+
+    def _breaker(self, provider: BaseLLMProvider):
+        """Shared circuit breaker of a member provider."""
+        return get_provider_breaker(provider.name, self.policy)
+
+    async def _race(
+        self,
+        start: Callable[[BaseLLMProvider], Awaitable[T]],
+        on_loser: Callable[[BaseLLMProvider, T | None], Awaitable[None]],
+    ) -> tuple[BaseLLMProvider, T]:
+        """Run ``start`` on providers, adding one more each hedge delay or failure.
+
+        Args:
+            start: Coroutine function performing the request on a provider.
+            on_loser: Called for each request that did not win, with its result
+                if it completed or None if it was cancelled.
+
+        Returns:
+            (winning provider, its result)
+        """
+        pending: dict[asyncio.Task, tuple[BaseLLMProvider, float]] = {}
+        queue = [p for p in self.providers if self._breaker(p).can_execute()]
+        errors: list[BaseException] = []
+        if not queue:
+            raise LLMProviderError(
+                "No LLM provider available: all circuits are open",
+                provider=self.name,
+                retryable=True,
+            )
+
+        def launch() -> BaseLLMProvider:
+            provider = queue.pop(0)
+            task = asyncio.ensure_future(start(provider))
+            pending[task] = (provider, time.monotonic())
+            return provider
+
+        waiting_on = launch()
+        hedged = False
+        try:
+            while pending:
+                timeout = self.delay_for(waiting_on) if queue else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    waiting_on = launch()
+                    _record_hedge(waiting_on.name, "launched")
+                    continue
+
+                winner: tuple[BaseLLMProvider, asyncio.Task, float] | None = None
+                for task in done:
+                    provider, started = pending.pop(task)
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        if _is_timeout(task.exception()):
+                            self.tracker.observe(provider.name, time.monotonic() - started)
+                        if isinstance(task.exception(), (LLMProviderError, httpx.TransportError)):
+                            self._breaker(provider).record_failure()
+                        logger.debug(
+                            f"Hedged request to {provider.name} failed: {task.exception()}"
+                        )
+                    elif winner is None:
+                        winner = (provider, task, started)
+                    else:
+                        # Finished in the same tick as the winner
+                        self.tracker.observe(provider.name, time.monotonic() - started)
+                        _record_hedge(provider.name, "lost")
+                        await on_loser(provider, task.result())
+
+                if winner is not None:
+                    provider, task, started = winner
+                    self.tracker.observe(provider.name, time.monotonic() - started)
+                    self._breaker(provider).record_success()
+                    if hedged:
+                        _record_hedge(provider.name, "won")
+                    return provider, task.result()
+
+                # A request failed: send the next one now instead of waiting
+                if queue:
+                    hedged = True
+                    waiting_on = launch()
+                    _record_hedge(waiting_on.name, "launched")
+        finally:
+            # Cancelled requests ran at least this long
+            cancelled_at = time.monotonic()
+            for task, (provider, started) in pending.items():
+                task.cancel()
+                self.tracker.observe(provider.name, cancelled_at - started)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task, (provider, _) in pending.items():
+                result = None
+                if not task.cancelled() and task.exception() is None:
+                    result = task.result()
+                _record_hedge(provider.name, "lost")
+                await on_loser(provider, result)
+
+        raise errors[-1]
+
+    async def generate(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> LLMResponse:
+        """Generate, hedging to the next provider when the current one is slow."""
+        prompt_tokens = estimate_tokens(messages)
+
+        async def start(provider: BaseLLMProvider) -> LLMResponse:
+            started = time.monotonic()
+            response = await provider.generate(
+                messages, _config_for(provider, self.providers[0], config)
+            )
+            _record_latency(provider.name, response.model, time.monotonic() - started, response)
+            return response
+
+        async def on_loser(provider: BaseLLMProvider, response: LLMResponse | None) -> None:
+            # A cancelled request has at least consumed its prompt
+            wasted = response.total_tokens if response is not None else prompt_tokens
+            _record_wasted_tokens(provider.name, wasted)
+
+        _, response = await self._race(start, on_loser)
+        return response
+
+    async def generate_stream(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream from whichever provider produces the first chunk first."""
+        prompt_tokens = estimate_tokens(messages)
+
+        async def start(provider: BaseLLMProvider):
+            stream = provider.generate_stream(
+                messages, _config_for(provider, self.providers[0], config)
+            )
+            try:
+                return await anext(stream, None), stream
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        async def on_loser(provider: BaseLLMProvider, result) -> None:
+            if result is not None:
+                await result[1].aclose()
+            _record_wasted_tokens(provider.name, prompt_tokens)
+
+        _, (first, stream) = await self._race(start, on_loser)
+        if first is None:
+            return
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+    async def is_available(self) -> bool:
+        """Available if any composed provider is."""
+        results = await asyncio.gather(
+            *(p.is_available() for p in self.providers), return_exceptions=True
+        )
+        return any(r is True for r in results)
+
+    async def aclose(self) -> None:
+        """Close every composed provider's HTTP client."""
+        for provider in self.providers:
+            await provider.aclose()
+
+
+_hedged_provider: HedgedLLMProvider | None = None
+_hedged_provider_loaded = False
+
+
+def get_hedged_provider() -> HedgedLLMProvider | None:
+    """Get the process-wide hedged provider configured from the environment.
+
+    Returns:
+        HedgedLLMProvider composing ``VALERIE_LLM_HEDGE_PROVIDERS`` from
+        ``factory.PROVIDERS``, or None if fewer than two are configured.
+    """
+    global _hedged_provider, _hedged_provider_loaded
+    if _hedged_provider_loaded:
+        return _hedged_provider
+    _hedged_provider_loaded = True
+
+    names = [n.strip().lower() for n in os.getenv("VALERIE_LLM_HEDGE_PROVIDERS", "").split(",")]
+    providers = []
+    for name in names:
+        if not name:
+            continue
+        try:
+            providers.append(get_llm_provider(ProviderType(name)))
+        except (ValueError, LLMProviderError) as e:
+            logger.warning(f"Ignoring hedge provider '{name}': {e}")
+    if len(providers) < 2:
+        return None
+
+    _hedged_provider = HedgedLLMProvider(
+        providers,
+        hedge_delay=float(os.getenv("VALERIE_LLM_HEDGE_DELAY", DEFAULT_HEDGE_DELAY)),
+        quantile=float(os.getenv("VALERIE_LLM_HEDGE_QUANTILE", DEFAULT_QUANTILE)),
+        policy=RetryPolicy.from_settings(),
+    )
+    return _hedged_provider
+
+
+def reset_hedged_provider() -> None:
+    """Drop the process-wide hedged provider so configuration is re-read."""
+    global _hedged_provider, _hedged_provider_loaded
+    _hedged_provider = None
+    _hedged_provider_loaded = False
@@ -0,0 +1,193 @@
+"""LangChain chat model adapter.
+
+Agents on the legacy path talk to a LangChain chat model (``ChatAnthropic``
+by default) instead of a ``BaseLLMProvider``. ``LangChainChatProvider``
+wraps such a model in the provider interface so those calls go through the
+same machinery as provider calls: the ``RetryEngine`` (backoff,
+retry-after, deadline, failover, circuit breakers), the response cache and
+OpenTelemetry spans.
+
+SDK errors raised by the model (HTTP status errors, connection errors and
+timeouts) are converted to ``LLMProviderError`` subclasses so the retry
+engine can tell retryable failures from permanent ones.
+
+Usage:
+    from valerie.llm.langchain_chat import LangChainChatProvider
+
+    provider = LangChainChatProvider(ChatAnthropic(model="claude-sonnet-4-20250514"))
+    response = await RetryEngine().generate(provider, messages)
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from valerie.llm.base import (
+    AuthenticationError,
+    BaseLLMProvider,
+    LLMConfig,
+    LLMMessage,
+    LLMProviderError,
+    LLMResponse,
+    MessageRole,
+    RateLimitError,
+    StreamChunk,
+)
+
+_MESSAGE_TYPES = {
+    MessageRole.SYSTEM: SystemMessage,
+    MessageRole.USER: HumanMessage,
+    MessageRole.ASSISTANT: AIMessage,
+}
+
+
+def _connection_errors() -> tuple[type[BaseException], ...]:
+    """Connection and timeout error types of the installed model SDKs."""
+    errors: list[type[BaseException]] = [httpx.TransportError, TimeoutError, ConnectionError]
+    for module_name in ("anthropic", "openai"):
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        errors.append(module.APIConnectionError)
+    return tuple(errors)
+
+
+def _usage(message: Any) -> dict:
+    """Token counts from a LangChain message's usage metadata."""
+    usage = getattr(message, "usage_metadata", None)
+    if not isinstance(usage, dict):
+        return {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+    }
+
+
+def to_provider_error(error: Exception, provider: str) -> Exception:
+    """Convert a model SDK error to the matching ``LLMProviderError``.
+
+    Args:
+        error: Exception raised by the chat model.
+        provider: Provider name to report.
+
+    Returns:
+        An ``LLMProviderError`` for HTTP status, connection and timeout
+        errors; any other exception unchanged.
+    """
+    if isinstance(error, LLMProviderError):
+        return error
+
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        if status_code == 429:
+            response = getattr(error, "response", None)
+            retry_after = response.headers.get("retry-after") if response is not None else None
+            try:
+                retry_after = int(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            return RateLimitError(provider, retry_after=retry_after)
+        if status_code in (401, 403):
+            return AuthenticationError(provider)
+        return LLMProviderError(
+            str(error),
+            provider=provider,
+            status_code=status_code,
+            retryable=status_code >= 500 or status_code in (408, 409),
+        )
+
+    if isinstance(error, _connection_errors()):
+        return LLMProviderError(str(error) or type(error).__name__, provider, retryable=True)
+    return error
+
+
+class LangChainChatProvider(BaseLLMProvider):
+    """Provider interface over a LangChain chat model.
+
+    The model's own settings (model name, temperature, max tokens) are
+    used; ``LLMConfig`` values only apply to providers failed over to.
+    """
+
+    def __init__(self, chat_model: Any, model_name: str | None = None):
+        """Initialize the adapter.
+
+        Args:
+            chat_model: LangChain chat model.
+            model_name: Model name to report when the chat model does not
+                expose one.
+        """
+        super().__init__()
+        self.chat_model = chat_model
+        provider_name, model = type(chat_model).__name__.lower(), model_name or ""
+        if isinstance(chat_model, BaseChatModel):
+            params = chat_model._get_ls_params()
+            provider_name = params.get("ls_provider") or chat_model._llm_type
+            model = params.get("ls_model_name") or model
+        self._name = provider_name
+        self._model = model
+
+    @property
+    def name(self) -> str:
+        """Return the chat model's provider, e.g. "anthropic"."""
+        return self._name
+
+    @property
+    def default_model(self) -> str:
+        """Return the chat model's model name."""
+        return self._model
+
+    @staticmethod
+    def to_langchain_messages(messages: list[LLMMessage]) -> list[BaseMessage]:
+        """Convert provider messages to LangChain messages."""
+        return [_MESSAGE_TYPES[m.role](content=m.content) for m in messages]
+
+    async def generate(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> LLMResponse:
+        """Generate a response with the chat model."""
+        try:
+            response = await self.chat_model.ainvoke(self.to_langchain_messages(messages))
+        except Exception as e:
+            raise to_provider_error(e, self.name) from e
+
+        return LLMResponse(
+            content=str(response.content),
+            model=self._get_model(None),
+            provider=self.name,
+            usage=_usage(response),
+        )
+
+    async def generate_stream(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a response from the chat model."""
+        model = self._get_model(None)
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        try:
+            async for chunk in self.chat_model.astream(self.to_langchain_messages(messages)):
+                # Chunk usage is incremental, e.g. input tokens first and output tokens last
+                for key, value in _usage(chunk).items():
+                    usage[key] += value
+                if chunk.content:
+                    yield StreamChunk(content=str(chunk.content), model=model, provider=self.name)
+        except Exception as e:
+            raise to_provider_error(e, self.name) from e
+        yield StreamChunk(
+            content="",
+            done=True,
+            model=model,
+            provider=self.name,
+            usage=usage if any(usage.values()) else {},
+        )
+
+    async def is_available(self) -> bool:
+        """The chat model is configured by the agent, so it is always usable."""
+        return True
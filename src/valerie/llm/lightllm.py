@@ -129,14 +129,15 @@ class LightLLMProvider(BaseLLMProvider):
             return self._is_available
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Try to reach the server's health endpoint or base URL
-                response = await client.get(
-                    f"{self.base_url}/v1/models",
-                    headers=self._get_headers(),
-                )
-                self._is_available = response.status_code == 200
-                return self._is_available
+            client = self._get_http_client()
+            # Try to reach the server's health endpoint or base URL
+            response = await client.get(
+                f"{self.base_url}/v1/models",
+                headers=self._get_headers(),
+                timeout=10,
+            )
+            self._is_available = response.status_code == 200
+            return self._is_available
         except (httpx.ConnectError, httpx.TimeoutException) as e:
             logger.debug(f"LightLLM not available: {e}")
             self._is_available = False
@@ -195,49 +196,49 @@ class LightLLMProvider(BaseLLMProvider):
             payload["stop"] = config.stop_sequences
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json=payload,
-                    headers=self._get_headers(),
-                )
-
-                if response.status_code == 401:
-                    raise AuthenticationError(self.name)
-
-                if response.status_code == 429:
-                    retry_after = response.headers.get("retry-after")
-                    raise RateLimitError(
-                        self.name,
-                        retry_after=int(retry_after) if retry_after else None,
-                    )
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self.base_url}/v1/chat/completions",
+                json=payload,
+                headers=self._get_headers(),
+            )
 
-                if response.status_code == 404:
-                    raise ModelNotFoundError(self.name, model)
+            if response.status_code == 401:
+                raise AuthenticationError(self.name)
 
-                if response.status_code != 200:
-                    raise LLMProviderError(
-                        f"LightLLM request failed: {response.text}",
-                        provider=self.name,
-                        status_code=response.status_code,
-                        retryable=response.status_code >= 500,
-                    )
+            if response.status_code == 429:
+                retry_after = response.headers.get("retry-after")
+                raise RateLimitError(
+                    self.name,
+                    retry_after=int(retry_after) if retry_after else None,
+                )
 
-                data = response.json()
-                choice = data.get("choices", [{}])[0]
+            if response.status_code == 404:
+                raise ModelNotFoundError(self.name, model)
 
-                return LLMResponse(
-                    content=choice.get("message", {}).get("content", ""),
-                    model=model,
+            if response.status_code != 200:
+                raise LLMProviderError(
+                    f"LightLLM request failed: {response.text}",
                     provider=self.name,
-                    usage={
-                        "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
-                        "output_tokens": data.get("usage", {}).get("completion_tokens", 0),
-                    },
-                    finish_reason=choice.get("finish_reason", "stop"),
-                    raw_response=data,
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
                 )
 
+            data = response.json()
+            choice = data.get("choices", [{}])[0]
+
+            return LLMResponse(
+                content=choice.get("message", {}).get("content", ""),
+                model=model,
+                provider=self.name,
+                usage={
+                    "input_tokens": data.get("usage", {}).get("prompt_tokens", 0),
+                    "output_tokens": data.get("usage", {}).get("completion_tokens", 0),
+                },
+                finish_reason=choice.get("finish_reason", "stop"),
+                raw_response=data,
+            )
+
         except httpx.ConnectError:
             raise LLMProviderError(
                 f"Failed to connect to LightLLM server at {self.base_url}. "
@@ -290,59 +291,59 @@ class LightLLMProvider(BaseLLMProvider):
             payload["stop"] = config.stop_sequences
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/v1/chat/completions",
-                    json=payload,
-                    headers=self._get_headers(),
-                ) as response:
-                    if response.status_code == 401:
-                        raise AuthenticationError(self.name)
-
-                    if response.status_code == 429:
-                        raise RateLimitError(self.name)
-
-                    if response.status_code == 404:
-                        raise ModelNotFoundError(self.name, model)
-
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        raise LLMProviderError(
-                            f"LightLLM request failed: {error_text.decode()}",
-                            provider=self.name,
-                            status_code=response.status_code,
-                        )
-
-                    # Parse Server-Sent Events (SSE) stream
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                yield StreamChunk(
-                                    content="",
-                                    done=True,
-                                    model=model,
-                                    provider=self.name,
-                                )
-                                break
-
-                            try:
-                                data = json.loads(data_str)
-                                choice = data.get("choices", [{}])[0]
-                                delta = choice.get("delta", {})
-                                content = delta.get("content", "")
-                                finish_reason = choice.get("finish_reason")
-
-                                yield StreamChunk(
-                                    content=content,
-                                    done=finish_reason is not None,
-                                    model=model,
-                                    provider=self.name,
-                                )
-                            except json.JSONDecodeError:
-                                # Skip malformed JSON lines
-                                continue
+            client = self._get_http_client()
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/v1/chat/completions",
+                json=payload,
+                headers=self._get_headers(),
+            ) as response:
+                if response.status_code == 401:
+                    raise AuthenticationError(self.name)
+
+                if response.status_code == 429:
+                    raise RateLimitError(self.name)
+
+                if response.status_code == 404:
+                    raise ModelNotFoundError(self.name, model)
+
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    raise LLMProviderError(
+                        f"LightLLM request failed: {error_text.decode()}",
+                        provider=self.name,
+                        status_code=response.status_code,
+                    )
+
+                # Parse Server-Sent Events (SSE) stream
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        if data_str == "[DONE]":
+                            yield StreamChunk(
+                                content="",
+                                done=True,
+                                model=model,
+                                provider=self.name,
+                            )
+                            break
+
+                        try:
+                            data = json.loads(data_str)
+                            choice = data.get("choices", [{}])[0]
+                            delta = choice.get("delta", {})
+                            content = delta.get("content", "")
+                            finish_reason = choice.get("finish_reason")
+
+                            yield StreamChunk(
+                                content=content,
+                                done=finish_reason is not None,
+                                model=model,
+                                provider=self.name,
+                            )
+                        except json.JSONDecodeError:
+                            # Skip malformed JSON lines
+                            continue
 
         except httpx.ConnectError:
             raise LLMProviderError(
@@ -367,14 +368,15 @@ class LightLLMProvider(BaseLLMProvider):
 
         # Try to get model info if available
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(
-                    f"{self.base_url}/v1/models",
-                    headers=self._get_headers(),
-                )
-                if response.status_code == 200:
-                    models_data = response.json()
-                    base_check["server_models"] = models_data.get("data", [])
+            client = self._get_http_client()
+            response = await client.get(
+                f"{self.base_url}/v1/models",
+                headers=self._get_headers(),
+                timeout=10,
+            )
+            if response.status_code == 200:
+                models_data = response.json()
+                base_check["server_models"] = models_data.get("data", [])
         except Exception as e:
             logger.debug(f"Could not fetch models from LightLLM: {e}")
 
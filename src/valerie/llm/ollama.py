@@ -108,13 +108,13 @@ class OllamaProvider(BaseLLMProvider):
     async def _fetch_available_models(self) -> list[str]:
         """Fetch list of available models from Ollama server."""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    data = response.json()
-                    models = [m["name"] for m in data.get("models", [])]
-                    self._cached_models = models
-                    return models
+            client = self._get_http_client()
+            response = await client.get(f"{self.base_url}/api/tags", timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                models = [m["name"] for m in data.get("models", [])]
+                self._cached_models = models
+                return models
         except Exception as e:
             logger.debug(f"Failed to fetch Ollama models: {e}")
         return self.POPULAR_MODELS
@@ -125,14 +125,14 @@ class OllamaProvider(BaseLLMProvider):
             return self._is_available
 
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                self._is_available = response.status_code == 200
-                if self._is_available:
-                    # Cache available models
-                    data = response.json()
-                    self._cached_models = [m["name"] for m in data.get("models", [])]
-                return self._is_available
+            client = self._get_http_client()
+            response = await client.get(f"{self.base_url}/api/tags", timeout=5)
+            self._is_available = response.status_code == 200
+            if self._is_available:
+                # Cache available models
+                data = response.json()
+                self._cached_models = [m["name"] for m in data.get("models", [])]
+            return self._is_available
         except Exception as e:
             logger.debug(f"Ollama not available: {e}")
             self._is_available = False
@@ -173,37 +173,37 @@ class OllamaProvider(BaseLLMProvider):
             payload["options"]["stop"] = config.stop_sequences
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload,
-                )
-
-                if response.status_code == 404:
-                    raise ModelNotFoundError(self.name, model)
-
-                if response.status_code != 200:
-                    raise LLMProviderError(
-                        f"Ollama request failed: {response.text}",
-                        provider=self.name,
-                        status_code=response.status_code,
-                        retryable=response.status_code >= 500,
-                    )
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self.base_url}/api/chat",
+                json=payload,
+            )
 
-                data = response.json()
+            if response.status_code == 404:
+                raise ModelNotFoundError(self.name, model)
 
-                return LLMResponse(
-                    content=data.get("message", {}).get("content", ""),
-                    model=model,
+            if response.status_code != 200:
+                raise LLMProviderError(
+                    f"Ollama request failed: {response.text}",
                     provider=self.name,
-                    usage={
-                        "input_tokens": data.get("prompt_eval_count", 0),
-                        "output_tokens": data.get("eval_count", 0),
-                    },
-                    finish_reason="stop" if data.get("done") else "length",
-                    raw_response=data,
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
                 )
 
+            data = response.json()
+
+            return LLMResponse(
+                content=data.get("message", {}).get("content", ""),
+                model=model,
+                provider=self.name,
+                usage={
+                    "input_tokens": data.get("prompt_eval_count", 0),
+                    "output_tokens": data.get("eval_count", 0),
+                },
+                finish_reason="stop" if data.get("done") else "length",
+                raw_response=data,
+            )
+
         except httpx.ConnectError:
             raise LLMProviderError(
                 f"Cannot connect to Ollama at {self.base_url}. "
@@ -253,41 +253,41 @@ class OllamaProvider(BaseLLMProvider):
             payload["options"]["stop"] = config.stop_sequences
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/api/chat",
-                    json=payload,
-                ) as response:
-                    if response.status_code == 404:
-                        raise ModelNotFoundError(self.name, model)
-
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        raise LLMProviderError(
-                            f"Ollama request failed: {error_text.decode()}",
-                            provider=self.name,
-                            status_code=response.status_code,
-                        )
-
-                    async for line in response.aiter_lines():
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                content = data.get("message", {}).get("content", "")
-                                done = data.get("done", False)
-
-                                yield StreamChunk(
-                                    content=content,
-                                    done=done,
-                                    model=model,
-                                    provider=self.name,
-                                )
-
-                                if done:
-                                    break
-                            except json.JSONDecodeError:
-                                continue
+            client = self._get_http_client()
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/api/chat",
+                json=payload,
+            ) as response:
+                if response.status_code == 404:
+                    raise ModelNotFoundError(self.name, model)
+
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    raise LLMProviderError(
+                        f"Ollama request failed: {error_text.decode()}",
+                        provider=self.name,
+                        status_code=response.status_code,
+                    )
+
+                async for line in response.aiter_lines():
+                    if line:
+                        try:
+                            data = json.loads(line)
+                            content = data.get("message", {}).get("content", "")
+                            done = data.get("done", False)
+
+                            yield StreamChunk(
+                                content=content,
+                                done=done,
+                                model=model,
+                                provider=self.name,
+                            )
+
+                            if done:
+                                break
+                        except json.JSONDecodeError:
+                            continue
 
         except httpx.ConnectError:
             raise LLMProviderError(
@@ -307,12 +307,13 @@ class OllamaProvider(BaseLLMProvider):
             True if successful, False otherwise.
         """
         try:
-            async with httpx.AsyncClient(timeout=300) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/pull",
-                    json={"name": model},
-                )
-                return response.status_code == 200
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self.base_url}/api/pull",
+                json={"name": model},
+                timeout=300,
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to pull model {model}: {e}")
             return False
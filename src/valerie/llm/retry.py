@@ -0,0 +1,421 @@
+"""Retry and failover for LLM calls.
+
+Wraps ``BaseLLMProvider.generate``/``generate_stream`` with:
+
+- retries of retryable errors (``LLMProviderError.retryable`` and httpx
+  transport errors) using full-jitter exponential backoff
+- ``RateLimitError.retry_after`` honoured as the wait before the next attempt
+- a per-request deadline budget covering every attempt and wait
+- failover along ``_get_fallback_chain()`` once a provider is exhausted
+- one shared ``CircuitBreaker`` per provider, so a provider that keeps
+  failing is skipped by every request until its timeout passes; composite
+  providers (``member_names``) are skipped only when every member's
+  circuit is open, and record outcomes on their members' breakers
+
+Streams are retried only until the first chunk arrives; once content has
+been yielded, errors propagate to the caller.
+
+Usage:
+    from valerie.llm.retry import RetryEngine
+
+    engine = RetryEngine()
+    response = await engine.generate(provider, messages, config)
+"""
+
+import asyncio
+import logging
+import random
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+from valerie.llm.base import (
+    BaseLLMProvider,
+    DeadlineExceededError,
+    LLMConfig,
+    LLMMessage,
+    LLMProviderError,
+    LLMResponse,
+    RateLimitError,
+    StreamChunk,
+)
+from valerie.llm.factory import _get_fallback_chain, get_llm_provider
+from valerie.llm.health import get_health_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class RetryPolicy:
+    """Retry, backoff and deadline settings for one LLM request."""
+
+    max_attempts: int = 3  # per provider, including the first call
+    base_delay: float = 0.25
+    max_delay: float = 8.0
+    multiplier: float = 2.0
+    deadline: float = 30.0  # seconds for the whole request, across providers
+    failover: bool = True
+    failure_threshold: int = 5
+    breaker_timeout: int = 60
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "RetryPolicy":
+        """Build a policy from application settings.
+
+        Args:
+            settings: Settings instance, defaults to ``get_settings()``.
+
+        Returns:
+            RetryPolicy using the configured retry and circuit breaker values.
+        """
+        if settings is None:
+            from valerie.models import get_settings
+
+            settings = get_settings()
+        return cls(
+            max_attempts=max(1, settings.max_retries),
+            base_delay=settings.llm_retry_base_delay_seconds,
+            max_delay=settings.llm_retry_max_delay_seconds,
+            deadline=settings.llm_deadline_seconds,
+            failover=settings.llm_failover_enabled,
+            failure_threshold=settings.circuit_breaker_threshold,
+            breaker_timeout=settings.circuit_breaker_timeout_seconds,
+        )
+
+    def backoff(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Full-jitter backoff delay before retry number ``attempt + 1``.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            rng: Random source, defaults to the ``random`` module.
+
+        Returns:
+            Delay in seconds, uniform in [0, min(max_delay, base * multiplier**attempt)].
+        """
+        cap = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        return (rng or random).uniform(0, cap)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is worth retrying on the same provider."""
+    if isinstance(error, LLMProviderError):
+        return error.retryable
+    return isinstance(error, httpx.TransportError)
+
+
+def _record_retry(provider: str, reason: str) -> None:
+    # Imported lazily: valerie.infrastructure imports the agents, which use this module
+    from valerie.infrastructure.metrics import record_llm_retry
+
+    record_llm_retry(provider, reason)
+
+
+def _record_failover(provider: str) -> None:
+    from valerie.infrastructure.metrics import record_llm_failover
+
+    record_llm_failover(provider)
+
+
+def get_provider_breaker(name: str, policy: RetryPolicy | None = None):
+    """Get the shared circuit breaker of an LLM provider.
+
+    Args:
+        name: Provider name, e.g. "groq".
+        policy: Policy whose breaker settings are used if the breaker is new.
+
+    Returns:
+        The shared CircuitBreaker for ``llm:<name>``.
+    """
+    from valerie.infrastructure.fallback import get_shared_circuit_breaker
+
+    policy = policy or RetryPolicy()
+    return get_shared_circuit_breaker(
+        f"llm:{name}",
+        failure_threshold=policy.failure_threshold,
+        timeout_seconds=policy.breaker_timeout,
+    )
+
+
+class RetryEngine:
+    """Runs LLM calls with retries, deadline and failover."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        rng: random.Random | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """Initialize the engine.
+
+        Args:
+            policy: Retry policy, defaults to one built from settings.
+            rng: Random source for jitter.
+            sleep: Coroutine used to wait between attempts.
+        """
+        self.policy = policy or RetryPolicy.from_settings()
+        self.rng = rng
+        self.sleep = sleep
+
+    def _breaker(self, provider: BaseLLMProvider):
+        """Breaker recording a provider's outcomes, or None for a composite provider.
+
+        Composite providers record outcomes on their members' breakers.
+        """
+        if provider.member_names != [provider.name]:
+            return None
+        return get_provider_breaker(provider.name, self.policy)
+
+    def _can_execute(self, provider: BaseLLMProvider) -> bool:
+        """Whether any member of a provider has a closed or half-open circuit."""
+        return any(
+            get_provider_breaker(name, self.policy).can_execute() for name in provider.member_names
+        )
+
+    def _fallbacks(self, primary: BaseLLMProvider) -> Iterator[BaseLLMProvider]:
+        """Other providers from the fallback chain, instantiated lazily."""
+        if not self.policy.failover:
+            return
+        # A hedged primary already sent the request to each of its members
+        tried = set(primary.member_names)
+        for provider_type in get_health_registry().rank(_get_fallback_chain()):
+            if provider_type.value in tried:
+                continue
+            try:
+                yield get_llm_provider(provider_type)
+            except Exception as e:
+                logger.debug(f"Skipping fallback provider {provider_type.value}: {e}")
+
+    async def run(
+        self,
+        primary: BaseLLMProvider,
+        call: Callable[[BaseLLMProvider], Awaitable[T]],
+    ) -> T:
+        """Run ``call`` against the primary provider, retrying and failing over.
+
+        Args:
+            primary: Provider to try first.
+            call: Coroutine function performing one attempt on a provider.
+
+        Returns:
+            The result of the first successful attempt.
+
+        Raises:
+            DeadlineExceededError: If the deadline budget ran out.
+            Exception: The last provider error once every option is exhausted,
+                or any non-provider error immediately.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.policy.deadline
+        last_error: BaseException | None = None
+
+        def providers() -> Iterator[BaseLLMProvider]:
+            yield primary
+            yield from self._fallbacks(primary)
+
+        for index, provider in enumerate(providers()):
+            breaker = self._breaker(provider)
+            if not self._can_execute(provider):
+                logger.debug(f"Circuit open for LLM provider {provider.name}, skipping")
+                continue
+            if index > 0:
+                if not await self._available(provider, deadline - loop.time()):
+                    continue
+                logger.info(f"Failing over to LLM provider {provider.name}")
+
+            for attempt in range(self.policy.max_attempts):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise DeadlineExceededError(provider.name, self.policy.deadline) from last_error
+                try:
+                    result = await asyncio.wait_for(call(provider), remaining)
+                except TimeoutError as e:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    raise DeadlineExceededError(provider.name, self.policy.deadline) from e
+                except (LLMProviderError, httpx.TransportError) as e:
+                    last_error = e
+                    if breaker is not None:
+                        breaker.record_failure()
+                    if not is_retryable(e) or attempt + 1 >= self.policy.max_attempts:
+                        break
+                    delay = self._delay(e, attempt)
+                    if delay is None or delay >= deadline - loop.time():
+                        break
+                    _record_retry(provider.name, type(e).__name__)
+                    logger.debug(
+                        f"Retrying {provider.name} in {delay:.2f}s "
+                        f"(attempt {attempt + 2}/{self.policy.max_attempts}): {e}"
+                    )
+                    await self.sleep(delay)
+                else:
+                    if breaker is not None:
+                        breaker.record_success()
+                    return result
+
+            _record_failover(provider.name)
+
+        if last_error is not None:
+            raise last_error
+        raise LLMProviderError(
+            "No LLM provider available: all circuits are open",
+            provider=primary.name,
+            retryable=True,
+        )
+
+    def _delay(self, error: BaseException, attempt: int) -> float | None:
+        """Wait before the next attempt, or None to fail over instead."""
+        if isinstance(error, RateLimitError) and error.retry_after is not None:
+            # A long server-mandated wait is better spent on another provider
+            if error.retry_after > self.policy.max_delay:
+                return None
+            return float(error.retry_after)
+        return self.policy.backoff(attempt, self.rng)
+
+    @staticmethod
+    async def _available(provider: BaseLLMProvider, remaining: float) -> bool:
+        """Check a fallback provider is configured, within the remaining budget."""
+        if remaining <= 0:
+            return False
+        cached = get_health_registry().is_available(provider.name)
+        if cached is not None:
+            return cached
+        try:
+            return await asyncio.wait_for(provider.is_available(), remaining)
+        except Exception:
+            return False
+
+    async def generate(
+        self,
+        provider: BaseLLMProvider,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> LLMResponse:
+        """Generate a response with retries and failover.
+
+        Args:
+            provider: Provider to try first.
+            messages: Conversation messages.
+            config: Generation configuration; the model is left to each
+                provider when failing over.
+
+        Returns:
+            LLMResponse from the first provider that succeeded.
+        """
+
+        async def attempt(p: BaseLLMProvider) -> LLMResponse:
+            return await p.generate(messages, _config_for(p, provider, config))
+
+        return await self.run(provider, attempt)
+
+    async def generate_stream(
+        self,
+        provider: BaseLLMProvider,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a response, retrying and failing over until the first chunk.
+
+        Args:
+            provider: Provider to try first.
+            messages: Conversation messages.
+            config: Generation configuration.
+
+        Yields:
+            StreamChunk objects from the provider that produced the first chunk.
+        """
+
+        async def first_chunk(p: BaseLLMProvider):
+            stream = p.generate_stream(messages, _config_for(p, provider, config))
+            try:
+                return await anext(stream), stream
+            except StopAsyncIteration:
+                return None, stream
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        first, stream = await self.run(provider, first_chunk)
+        if first is None:
+            return
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+
+def _config_for(
+    provider: BaseLLMProvider, primary: BaseLLMProvider, config: LLMConfig | None
+) -> LLMConfig | None:
+    """Drop the primary's model name when calling a different provider."""
+    if config is None or provider is primary or not config.model:
+        return config
+    return LLMConfig(
+        temperature=config.temperature,
+        max_tokens=config.max_tokens,
+        top_p=config.top_p,
+        stop_sequences=config.stop_sequences,
+        stream=config.stream,
+    )
+
+
+class ResilientLLMProvider(BaseLLMProvider):
+    """Provider wrapper applying a RetryEngine to every call."""
+
+    def __init__(self, provider: BaseLLMProvider, engine: RetryEngine | None = None):
+        """Initialize the wrapper.
+
+        Args:
+            provider: Provider to try first.
+            engine: Retry engine, defaults to one built from settings.
+        """
+        super().__init__(provider.config)
+        self.inner = provider
+        self.engine = engine or RetryEngine()
+
+    @property
+    def name(self) -> str:
+        """Return the wrapped provider name."""
+        return self.inner.name
+
+    @property
+    def default_model(self) -> str:
+        """Return the wrapped provider default model."""
+        return self.inner.default_model
+
+    @property
+    def available_models(self) -> list[str]:
+        """Return the wrapped provider models."""
+        return self.inner.available_models
+
+    @property
+    def member_names(self) -> list[str]:
+        """Return the wrapped provider members."""
+        return self.inner.member_names
+
+    async def generate(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> LLMResponse:
+        """Generate with retries and failover."""
+        return await self.engine.generate(self.inner, messages, config)
+
+    async def generate_stream(
+        self,
+        messages: list[LLMMessage],
+        config: LLMConfig | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream with retries and failover until the first chunk."""
+        async for chunk in self.engine.generate_stream(self.inner, messages, config):
+            yield chunk
+
+    async def is_available(self) -> bool:
+        """Check if the wrapped provider is available."""
+        return await self.inner.is_available()
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider's HTTP client."""
+        await self.inner.aclose()
@@ -4,6 +4,14 @@ Middleware components for valerie-chatbot.
 
 from .auth import JWTAuthMiddleware
 from .rate_limit import InMemoryStore, RateLimitMiddleware, RateLimitStore, RedisStore
+from .rate_limiters import (
+    GCRALimiter,
+    RateLimiter,
+    RateLimitResult,
+    RedisRateLimiter,
+    SlidingWindowLimiter,
+    create_rate_limiter,
+)
 
 __all__ = [
     "JWTAuthMiddleware",
@@ -11,4 +19,10 @@ __all__ = [
     "RateLimitStore",
     "InMemoryStore",
     "RedisStore",
+    "RateLimiter",
+    "RateLimitResult",
+    "GCRALimiter",
+    "SlidingWindowLimiter",
+    "RedisRateLimiter",
+    "create_rate_limiter",
 ]
@@ -1,11 +1,14 @@
 """
-Rate limiting middleware for FastAPI using sliding window algorithm.
+Rate limiting middleware for FastAPI.
 
 Supports both in-memory and Redis-backed rate limiting with per-IP
-and per-tenant tracking.
+and per-tenant tracking. The algorithm is selectable: constant-memory
+GCRA (default) or sliding window counter from ``rate_limiters``, or the
+original sliding log that stores every request timestamp.
 """
 
 import logging
+import math
 import os
 import time
 from collections import defaultdict
@@ -14,6 +17,8 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
+from .rate_limiters import ALGORITHMS, create_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -145,10 +150,11 @@ class RedisStore(RateLimitStore):
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Rate limiting middleware using sliding window algorithm.
+    Rate limiting middleware with per-minute and per-hour limits.
 
-    Supports per-IP and per-tenant rate limiting with configurable limits
-    and optional Redis backend for distributed systems.
+    Supports per-IP and per-tenant rate limiting with configurable limits,
+    a selectable algorithm ("gcra", "sliding_window" or "sliding_log") and
+    optional Redis backend for distributed systems.
     """
 
     def __init__(
@@ -158,6 +164,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         per_minute: int | None = None,
         per_hour: int | None = None,
         redis_url: str | None = None,
+        algorithm: str | None = None,
     ):
         super().__init__(app)
 
@@ -170,9 +177,21 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.per_minute = per_minute or int(os.getenv("VALERIE_RATE_LIMIT_PER_MINUTE", "60"))
         self.per_hour = per_hour or int(os.getenv("VALERIE_RATE_LIMIT_PER_HOUR", "1000"))
 
+        self.algorithm = algorithm or os.getenv("VALERIE_RATE_LIMIT_ALGORITHM", "gcra")
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown rate limit algorithm '{self.algorithm}', "
+                f"expected one of {', '.join(ALGORITHMS)}"
+            )
+
         # Initialize storage backend
         redis_url = redis_url or os.getenv("VALERIE_RATE_LIMIT_REDIS_URL")
-        if redis_url:
+        self.limiter = None
+        if self.algorithm != "sliding_log":
+            self.limiter = create_rate_limiter(self.algorithm, redis_url)
+            backend = "Redis" if redis_url else "in-memory"
+            logger.info(f"Rate limiting initialized with {self.algorithm} on {backend} backend")
+        elif redis_url:
             self.store = RedisStore(redis_url)
             logger.info("Rate limiting initialized with Redis backend")
         else:
@@ -180,7 +199,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             logger.info("Rate limiting initialized with in-memory backend")
 
         logger.info(
-            f"Rate limiting configured: enabled={self.enabled}, "
+            f"Rate limiting configured: enabled={self.enabled}, algorithm={self.algorithm}, "
             f"per_minute={self.per_minute}, per_hour={self.per_hour}"
         )
 
@@ -219,6 +238,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         Returns:
             Tuple of (is_allowed, limit, remaining, reset_time)
         """
+        if self.limiter is not None:
+            result = await self.limiter.hit(
+                identifier, [(60, self.per_minute), (3600, self.per_hour)], timestamp
+            )
+            return result.allowed, result.limit, result.remaining, math.ceil(result.reset)
+
         # Check minute limit
         minute_key = f"{identifier}:minute"
         minute_count = await self.store.add_request(minute_key, timestamp, 60)
@@ -0,0 +1,369 @@
+"""
+Constant-memory rate limiting algorithms.
+
+Two algorithms are available, both storing a few numbers per client
+instead of one timestamp per request:
+
+- ``gcra``: Generic Cell Rate Algorithm. Each window keeps a single
+  "theoretical arrival time" (TAT). A request is allowed if advancing the
+  TAT by ``window / limit`` keeps it within ``window`` of now, which allows
+  bursts of up to ``limit`` requests and then spaces them out evenly.
+- ``sliding_window``: sliding window counter. Each window keeps the count
+  for the current and previous fixed window, and estimates the requests in
+  the last ``window`` seconds as ``previous * (1 - elapsed) + current``.
+
+Every check covers all (window, limit) pairs at once and only counts the
+request when all of them allow it. The Redis limiter runs each check as one
+atomic Lua script, so a request costs a single round trip. The in-memory
+limiters periodically sweep clients whose windows have fully recovered.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# (window_seconds, max_requests) pairs checked together for one client
+Limits = Sequence[tuple[int, int]]
+
+# Float slack so that exactly `limit` requests fit in a window
+_EPSILON = 1e-6
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of one rate limit check."""
+
+    allowed: bool
+    limit: int  # Limit of the window that rejected, or the most restrictive one
+    remaining: int
+    reset: float  # Epoch seconds when that window recovers
+    retry_after: float  # Seconds until a request would be allowed, 0 if allowed
+
+
+class RateLimiter(ABC):
+    """Checks and counts a request against several windows at once."""
+
+    algorithm: str = ""
+
+    @abstractmethod
+    async def hit(self, key: str, limits: Limits, now: float) -> RateLimitResult:
+        """Check a request and count it if every window allows it.
+
+        Args:
+            key: Client identifier.
+            limits: (window_seconds, max_requests) pairs.
+            now: Current epoch time in seconds.
+
+        Returns:
+            The RateLimitResult.
+        """
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Base for in-memory limiters: per-key state plus an idle-key sweep."""
+
+    def __init__(self, sweep_interval: float = 60.0):
+        """Initialize the limiter.
+
+        Args:
+            sweep_interval: Seconds between sweeps of idle clients.
+        """
+        # key -> [expires_at, per-window state]
+        self.state: dict[str, list] = {}
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    async def hit(self, key: str, limits: Limits, now: float) -> RateLimitResult:
+        """Check a request, sweeping idle clients when due."""
+        if now >= self._next_sweep:
+            self.sweep(now)
+            self._next_sweep = now + self.sweep_interval
+        return self._hit(key, limits, now)
+
+    @abstractmethod
+    def _hit(self, key: str, limits: Limits, now: float) -> RateLimitResult:
+        """Check a request against the stored state."""
+
+    def sweep(self, now: float) -> int:
+        """Forget clients whose windows have all recovered.
+
+        Returns:
+            Number of clients removed.
+        """
+        idle = [key for key, (expires_at, _) in self.state.items() if expires_at <= now]
+        for key in idle:
+            del self.state[key]
+        return len(idle)
+
+    def __len__(self) -> int:
+        """Number of tracked clients."""
+        return len(self.state)
+
+
+class GCRALimiter(InMemoryRateLimiter):
+    """In-memory GCRA: one theoretical arrival time per window."""
+
+    algorithm = "gcra"
+
+    def _hit(self, key: str, limits: Limits, now: float) -> RateLimitResult:
+        entry = self.state.get(key)
+        tats = entry[1] if entry is not None and len(entry[1]) == len(limits) else None
+
+        new_tats = []
+        blocked, retry_after = None, 0.0
+        for i, (window, limit) in enumerate(limits):
+            tat = max(tats[i], now) if tats is not None else now
+            new_tat = tat + window / limit
+            if new_tat - now > window + _EPSILON:
+                wait = new_tat - window - now
+                if blocked is None or wait > retry_after:
+                    blocked, retry_after = i, wait
+            new_tats.append(new_tat)
+
+        if blocked is not None:
+            return RateLimitResult(False, limits[blocked][1], 0, now + retry_after, retry_after)
+
+        self.state[key] = [max(new_tats), new_tats]
+        remaining = [
+            math.floor((window - (tat - now)) * limit / window + _EPSILON)
+            for (window, limit), tat in zip(limits, new_tats, strict=True)
+        ]
+        best = remaining.index(min(remaining))
+        return RateLimitResult(True, limits[best][1], remaining[best], new_tats[best], 0.0)
+
+
+def _sliding_retry_after(
+    window: int, limit: int, index: int, current: float, previous: float, now: float
+) -> float:
+    """Seconds until the sliding window estimate leaves room for one request."""
+    if current + 1 <= limit and previous > 0:
+        # Wait for the previous window's weight to decay enough
+        return (index + 1 - (limit - 1 - current) / previous) * window - now
+    # Wait for the next window, where this window's count becomes the previous one
+    need = max(0.0, 1 - (limit - 1) / current) if current else 0.0
+    return (index + 1 + need) * window - now
+
+
+class SlidingWindowLimiter(InMemoryRateLimiter):
+    """In-memory sliding window counter: two counts per window."""
+
+    algorithm = "sliding_window"
+
+    def _hit(self, key: str, limits: Limits, now: float) -> RateLimitResult:
+        entry = self.state.get(key)
+        stored = entry[1] if entry is not None and len(entry[1]) == len(limits) else None
+
+        counters, estimates = [], []
+        blocked, retry_after = None, 0.0
+        for i, (window, limit) in enumerate(limits):
+            index = int(now // window)
+            current, previous = 0, 0
+            if stored is not None:
+                stored_index, stored_current, stored_previous = stored[i]
+                if stored_index == index:
+                    current, previous = stored_current, stored_previous
+                elif stored_index == index - 1:
+                    previous = stored_current
+            elapsed = now / window - index
+            estimate = previous * (1 - elapsed) + current
+            if estimate + 1 > limit + _EPSILON:
+                wait = _sliding_retry_after(window, limit, index, current, previous, now)
+                if blocked is None or wait > retry_after:
+                    blocked, retry_after = i, wait
+            counters.append([index, current, previous])
+            estimates.append(estimate)
+
+        if blocked is not None:
+            return RateLimitResult(False, limits[blocked][1], 0, now + retry_after, retry_after)
+
+        for counter in counters:
+            counter[1] += 1
+        # A window's count matters until the end of the following window
+        expires_at = max(
+            (index + 2) * window
+            for (window, _), (index, _, _) in zip(limits, counters, strict=True)
+        )
+        self.state[key] = [expires_at, counters]
+        remaining = [
+            math.floor(limit - estimate - 1 + _EPSILON)
+            for (_, limit), estimate in zip(limits, estimates, strict=True)
+        ]
+        best = remaining.index(min(remaining))
+        window = limits[best][0]
+        return RateLimitResult(
+            True, limits[best][1], max(0, remaining[best]), (counters[best][0] + 1) * window, 0.0
+        )
+
+
+# KEYS[1]: hash with the client's state, one group of fields per window
+# ARGV[1]: now in seconds; ARGV[2i], ARGV[2i+1]: window seconds and limit
+# Returns {allowed, 1-based window index, remaining, reset_ms, retry_after_ms}
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local n = (#ARGV - 1) / 2
+local tats = {}
+local blocked, retry = 0, 0
+for i = 1, n do
+  local window = tonumber(ARGV[2 * i])
+  local limit = tonumber(ARGV[2 * i + 1])
+  local stored = redis.call('HGET', KEYS[1], ARGV[2 * i])
+  local tat = stored and tonumber(stored) or now
+  if tat < now then tat = now end
+  local new_tat = tat + window / limit
+  if new_tat - now > window + 1e-6 then
+    local wait = new_tat - window - now
+    if blocked == 0 or wait > retry then blocked, retry = i, wait end
+  end
+  tats[i] = new_tat
+end
+if blocked > 0 then
+  return {0, blocked, 0, math.floor((now + retry) * 1000), math.ceil(retry * 1000)}
+end
+local best, best_remaining, latest = 1, nil, now
+for i = 1, n do
+  local window = tonumber(ARGV[2 * i])
+  local limit = tonumber(ARGV[2 * i + 1])
+  redis.call('HSET', KEYS[1], ARGV[2 * i], string.format('%.6f', tats[i]))
+  local remaining = math.floor((window - (tats[i] - now)) * limit / window + 1e-6)
+  if best_remaining == nil or remaining < best_remaining then
+    best, best_remaining = i, remaining
+  end
+  if tats[i] > latest then latest = tats[i] end
+end
+redis.call('PEXPIRE', KEYS[1], math.ceil((latest - now) * 1000) + 1000)
+return {1, best, best_remaining, math.floor(tats[best] * 1000), 0}
+"""
+
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local n = (#ARGV - 1) / 2
+local indexes, estimates = {}, {}
+local blocked, retry = 0, 0
+local longest = 0
+for i = 1, n do
+  local field = ARGV[2 * i]
+  local window = tonumber(field)
+  local limit = tonumber(ARGV[2 * i + 1])
+  local index = math.floor(now / window)
+  local stored = redis.call('HMGET', KEYS[1], field .. ':i', field .. ':c', field .. ':p')
+  local stored_index = tonumber(stored[1])
+  local current, previous = 0, 0
+  if stored_index == index then
+    current, previous = tonumber(stored[2]) or 0, tonumber(stored[3]) or 0
+  elseif stored_index == index - 1 then
+    previous = tonumber(stored[2]) or 0
+  end
+  local estimate = previous * (1 - (now / window - index)) + current
+  if estimate + 1 > limit + 1e-6 then
+    local wait
+    if current + 1 <= limit and previous > 0 then
+      wait = (index + 1 - (limit - 1 - current) / previous) * window - now
+    else
+      local need = 0
+      if current > 0 then need = math.max(0, 1 - (limit - 1) / current) end
+      wait = (index + 1 + need) * window - now
+    end
+    if blocked == 0 or wait > retry then blocked, retry = i, wait end
+  end
+  indexes[i], estimates[i] = index, estimate
+  redis.call('HSET', KEYS[1], field .. ':i', index, field .. ':c', current, field .. ':p', previous)
+  if window > longest then longest = window end
+end
+if blocked > 0 then
+  return {0, blocked, 0, math.floor((now + retry) * 1000), math.ceil(retry * 1000)}
+end
+local best, best_remaining = 1, nil
+for i = 1, n do
+  local field = ARGV[2 * i]
+  local limit = tonumber(ARGV[2 * i + 1])
+  redis.call('HINCRBY', KEYS[1], field .. ':c', 1)
+  local remaining = math.floor(limit - estimates[i] - 1 + 1e-6)
+  if best_remaining == nil or remaining < best_remaining then
+    best, best_remaining = i, remaining
+  end
+end
+redis.call('PEXPIRE', KEYS[1], longest * 2000)
+local reset = (indexes[best] + 1) * tonumber(ARGV[2 * best])
+return {1, best, math.max(0, best_remaining), reset * 1000, 0}
+"""
+
+_SCRIPTS = {"gcra": GCRA_SCRIPT, "sliding_window": SLIDING_WINDOW_SCRIPT}
+_IN_MEMORY = {"gcra": GCRALimiter, "sliding_window": SlidingWindowLimiter}
+
+ALGORITHMS = ("gcra", "sliding_window", "sliding_log")
+
+
+class RedisRateLimiter(RateLimiter):
+    """Distributed limiter running each check as one atomic Lua script."""
+
+    def __init__(self, redis_url: str, algorithm: str = "gcra"):
+        """Initialize the limiter.
+
+        Args:
+            redis_url: Redis connection URL.
+            algorithm: "gcra" or "sliding_window".
+        """
+        self.algorithm = algorithm
+        # Always initialize fallback
+        self.fallback = _IN_MEMORY[algorithm]()
+
+        try:
+            import redis.asyncio as aioredis
+
+            self.redis = aioredis.from_url(redis_url, decode_responses=False)
+            self._script = self.redis.register_script(_SCRIPTS[algorithm])
+            self._available = True
+        except ImportError:
+            logger.warning("redis package not installed, falling back to in-memory limiter")
+            self._available = False
+        except Exception as e:
+            logger.warning(f"Failed to connect to Redis: {e}, falling back to in-memory limiter")
+            self._available = False
+
+    async def hit(self, key: str, limits: Limits, now: float) -> RateLimitResult:
+        """Check a request with a single script call."""
+        if not self._available:
+            return await self.fallback.hit(key, limits, now)
+
+        args: list = [repr(now)]
+        for window, limit in limits:
+            args.extend((window, limit))
+        try:
+            allowed, index, remaining, reset_ms, retry_ms = await self._script(
+                keys=[f"ratelimit:{self.algorithm}:{key}"], args=args
+            )
+        except Exception as e:
+            logger.error(f"Redis error: {e}, using fallback")
+            return await self.fallback.hit(key, limits, now)
+        return RateLimitResult(
+            bool(allowed),
+            limits[int(index) - 1][1],
+            int(remaining),
+            int(reset_ms) / 1000,
+            int(retry_ms) / 1000,
+        )
+
+
+def create_rate_limiter(algorithm: str, redis_url: str | None = None) -> RateLimiter:
+    """Build a constant-memory limiter.
+
+    Args:
+        algorithm: "gcra" or "sliding_window".
+        redis_url: Redis URL for a distributed limiter, in-memory if None.
+
+    Returns:
+        The RateLimiter.
+
+    Raises:
+        ValueError: If the algorithm is unknown.
+    """
+    if algorithm not in _IN_MEMORY:
+        raise ValueError(
+            f"Unknown rate limit algorithm '{algorithm}', expected one of {', '.join(ALGORITHMS)}"
+        )
+    if redis_url:
+        return RedisRateLimiter(redis_url, algorithm)
+    return _IN_MEMORY[algorithm]()
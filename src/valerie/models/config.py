@@ -280,11 +280,21 @@ class Settings(BaseSettings):
     oracle_base_url: str = "http://localhost:3000"
     oracle_client_id: str = "test"
     oracle_client_secret: str = "test"
+    oracle_max_concurrency: int = 8  # parallel supplier lookups (and pooled connections)
+    oracle_cache_ttl_seconds: float = 60.0  # supplier payload cache, 0 disables
 
     # Guardrails Configuration
     pii_detection_enabled: bool = True
     itar_detection_enabled: bool = True
     max_input_length: int = 5000
+    guardrails_scan_max_chars: int = 200_000  # PII/injection/ITAR scan cap for pasted documents
+
+    # Intent Classification: pattern match, then local model, then LLM
+    intent_tiered_classification: bool = True  # False always asks the LLM
+    intent_pattern_threshold: float = 0.75  # Pattern confidence that skips the LLM
+    intent_local_model: str = "tfidf"  # tfidf (logistic regression) or embedding (centroids)
+    intent_local_model_threshold: float = 0.7  # TF-IDF model probability that skips the LLM
+    intent_embedding_threshold: float = 0.6  # Embedding cosine similarity that skips the LLM
 
     # HITL Configuration
     hitl_enabled: bool = True
@@ -301,10 +311,18 @@ class Settings(BaseSettings):
     circuit_breaker_threshold: int = 5
     circuit_breaker_timeout_seconds: int = 60
     max_retries: int = 3
+    llm_retry_base_delay_seconds: float = 0.25
+    llm_retry_max_delay_seconds: float = 8.0
+    llm_deadline_seconds: float = 30.0  # Budget per LLM request across retries and failover
+    llm_failover_enabled: bool = True
 
     # Evaluation
     evaluation_enabled: bool = True
     evaluation_sample_rate: float = 0.1
+    evaluation_async: bool = True  # Score in a background queue, off the request path
+    evaluation_queue_size: int = 1000
+    evaluation_batch_size: int = 8
+    evaluation_results_path: str = ""  # JSONL results file; empty logs results instead
 
 
 def get_settings() -> Settings:
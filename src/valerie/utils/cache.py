@@ -0,0 +1,88 @@
+"""Size-bounded LRU cache with per-entry TTL."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLLRUCache:
+    """In-process LRU cache whose entries also expire after a TTL.
+
+    Lookups move entries to the most-recently-used end; inserts beyond
+    ``max_entries`` evict from the least-recently-used end. Expired entries
+    are dropped lazily on lookup or pushed out by LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept.
+            ttl_seconds: Default time-to-live for entries, in seconds.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        """Store a value, evicting least-recently-used entries if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            ttl_seconds: Entry TTL, defaults to the cache TTL.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Return a snapshot of live (key, value) pairs, oldest first."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value)
+                for key, (expires_at, value) in self._entries.items()
+                if expires_at > now
+            ]
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
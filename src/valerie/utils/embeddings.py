@@ -0,0 +1,141 @@
+"""CPU-only hashed n-gram embeddings and nearest-centroid classification.
+
+Texts are embedded without a model download: words and their character
+3/4-grams are hashed into a fixed-size signed vector, which is then L2
+normalized. Character n-grams make the vectors tolerant of inflections and
+typos ("proveedor"/"proveedores", "categoria"/"categorías").
+
+A CentroidClassifier averages the embeddings of each label's examples once
+and classifies by cosine similarity against all centroids in a single
+matrix product, so routing a message costs microseconds and no tokens.
+
+Requires numpy: pip install 'valerie-chatbot[classifier]'
+"""
+
+import zlib
+from collections.abc import Hashable, Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from .text_classifier import tokenize
+
+# Centroids per (dimensions, examples), shared by every classifier in the process
+_centroid_cache: dict[tuple[int, tuple[str, ...]], np.ndarray] = {}
+
+
+@lru_cache(maxsize=65536)
+def _word_features(word: str, dimensions: int) -> tuple[tuple[int, ...], tuple[float, ...]]:
+    """Hashed (bucket, sign) pairs for a word and its character n-grams."""
+    padded = f"<{word}>"
+    grams = [word] + [padded[i : i + n] for n in (3, 4) for i in range(len(padded) - n + 1)]
+    buckets, signs = [], []
+    for gram in grams:
+        h = zlib.crc32(gram.encode())
+        buckets.append(h % dimensions)
+        signs.append(1.0 if h & 0x80000000 else -1.0)
+    return tuple(buckets), tuple(signs)
+
+
+class HashedNgramEmbedder:
+    """Embeds text as a normalized hashed bag of words and character n-grams."""
+
+    def __init__(self, dimensions: int = 1024):
+        """Initialize the embedder.
+
+        Args:
+            dimensions: Vector size; larger means fewer hash collisions.
+        """
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text as a unit vector (all zeros if it has no words)."""
+        words = tokenize(text)
+        buckets: list[int] = []
+        signs: list[float] = []
+        for word in words:
+            b, s = _word_features(word, self.dimensions)
+            buckets.extend(b)
+            signs.extend(s)
+        for first, second in zip(words, words[1:], strict=False):
+            h = zlib.crc32(f"{first} {second}".encode())
+            buckets.append(h % self.dimensions)
+            signs.append(1.0 if h & 0x80000000 else -1.0)
+        vector = np.bincount(buckets, weights=signs, minlength=self.dimensions)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray:
+        """Embed texts as the rows of a matrix."""
+        rows = [self.embed(text) for text in texts]
+        return np.vstack(rows) if rows else np.zeros((0, self.dimensions))
+
+
+class CentroidClassifier:
+    """Nearest-centroid classifier by cosine similarity."""
+
+    def __init__(
+        self,
+        examples: Mapping[Hashable, list[str]],
+        embedder: HashedNgramEmbedder | None = None,
+    ):
+        """Compute (or reuse cached) centroids for every label.
+
+        Args:
+            examples: Example texts per label; labels without examples are skipped.
+            embedder: Embedder to use, defaults to HashedNgramEmbedder().
+        """
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.labels = [label for label, texts in examples.items() if texts]
+        self.centroids = (
+            np.vstack([self._centroid(examples[label]) for label in self.labels])
+            if self.labels
+            else np.zeros((0, self.embedder.dimensions))
+        )
+
+    def _centroid(self, texts: list[str]) -> np.ndarray:
+        key = (self.embedder.dimensions, tuple(texts))
+        centroid = _centroid_cache.get(key)
+        if centroid is None:
+            mean = self.embedder.embed_many(texts).mean(axis=0)
+            norm = np.linalg.norm(mean)
+            centroid = mean / norm if norm else mean
+            _centroid_cache[key] = centroid
+        return centroid
+
+    def scores(self, text: str) -> dict[Any, float]:
+        """Cosine similarity of a text to every label's centroid."""
+        similarities = self.centroids @ self.embedder.embed(text)
+        return {label: float(s) for label, s in zip(self.labels, similarities, strict=True)}
+
+    def predict(self, text: str) -> tuple[Any, float]:
+        """Closest label and its cosine similarity.
+
+        Args:
+            text: Text to classify.
+
+        Returns:
+            Tuple of (label, similarity), or (None, 0.0) without labels.
+        """
+        if not self.labels:
+            return None, 0.0
+        similarities = self.centroids @ self.embedder.embed(text)
+        best = int(np.argmax(similarities))
+        return self.labels[best], float(similarities[best])
+
+    def predict_many(self, texts: Iterable[str]) -> list[tuple[Any, float]]:
+        """Classify a batch of texts with one matrix product.
+
+        Args:
+            texts: Texts to classify.
+
+        Returns:
+            One (label, similarity) tuple per text, in input order.
+        """
+        matrix = self.embedder.embed_many(texts)
+        if not self.labels or not len(matrix):
+            return [(None, 0.0)] * len(matrix)
+        similarities = matrix @ self.centroids.T
+        best = similarities.argmax(axis=1)
+        return [(self.labels[b], float(similarities[row, b])) for row, b in enumerate(best)]
@@ -0,0 +1,202 @@
+"""Compiled keyword/regex intent matcher.
+
+Intent detection patterns mostly start with a literal word ("cuánto
+cuesta", "busco proveedores?", "ranking"). The matcher extracts that
+literal prefix from every pattern and arranges the distinct prefixes in a
+prefix trie: a prefix is only tested when its parent prefix occurs in the
+text, and a pattern's regex only runs when its prefix occurs. Substring
+tests run in C, so one pass over the trie rules out most patterns without
+calling the regex engine, and fully literal patterns never need it.
+
+Every intent is scored in that single pass; the winner is the first intent
+in priority order that matched.
+"""
+
+import re
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+_META = set("\\.^$*+?{}[]()|")
+_QUANTIFIERS = set("?*{")
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether a regex has a ``|`` outside every group and character class."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 1
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right after "[" or "[^" is a literal member of the class
+            if pattern[i + 1 : i + 2] == "^":
+                i += 1
+            if pattern[i + 1 : i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def literal_prefix(pattern: str) -> str:
+    """Literal text every match of a regex must start with.
+
+    Args:
+        pattern: Regular expression, optionally anchored with ``^``.
+
+    Returns:
+        The longest leading literal, or "" if the pattern starts with a
+        class, group or escape, or has top-level alternatives ("a|b").
+    """
+    if _has_top_level_alternation(pattern):
+        return ""
+    i = 1 if pattern.startswith("^") else 0
+    prefix = []
+    while i < len(pattern) and pattern[i] not in _META:
+        prefix.append(pattern[i])
+        i += 1
+    # A quantifier makes the preceding character optional
+    if prefix and i < len(pattern) and pattern[i] in _QUANTIFIERS:
+        prefix.pop()
+    return "".join(prefix)
+
+
+class IntentMatch(NamedTuple):
+    """Result of matching one message."""
+
+    intent: Any  # Winning label in priority order, or the matcher's default
+    confidence: float
+    scores: dict[Any, float]  # Every matching label with its confidence
+
+
+@dataclass
+class _Rule:
+    label: Any
+    order: int  # Position within the label's pattern list
+    confidence: float
+    regex: re.Pattern | None  # None when the prefix test is the whole pattern
+
+
+@dataclass
+class _Node:
+    prefix: str
+    rules: list[_Rule] = field(default_factory=list)
+    children: list["_Node"] = field(default_factory=list)
+
+
+class IntentMatcher:
+    """Scores a message against every intent's patterns in one pass."""
+
+    def __init__(
+        self,
+        patterns: Mapping[Hashable, list[str]],
+        priority: list[Hashable] | None = None,
+        confidence: float | Mapping[Hashable, float] | Callable[[str], float] = 1.0,
+        default: tuple[Any, float] = (None, 0.0),
+        literal: bool = False,
+    ):
+        """Compile the patterns.
+
+        Args:
+            patterns: Regexes per label, matched against the lowercased message.
+            priority: Labels in the order they win ties, defaults to mapping order.
+            confidence: Confidence of a match, fixed, per label, or computed
+                from the matching pattern.
+            default: (label, confidence) returned when nothing matches.
+            literal: Treat patterns as plain substrings instead of regexes.
+        """
+        self.priority = list(priority) if priority is not None else list(patterns)
+        self.default = default
+        self._root = _Node("")
+        nodes: dict[str, _Node] = {"": self._root}
+
+        rules: list[tuple[str, _Rule]] = []
+        for label in self.priority:
+            for order, pattern in enumerate(patterns.get(label, [])):
+                if literal:
+                    prefix, regex = pattern.lower(), None
+                else:
+                    prefix = literal_prefix(pattern)
+                    bare = pattern[1:] if pattern.startswith("^") else pattern
+                    regex = None if bare == prefix and bare == pattern else re.compile(pattern)
+                score = self._confidence(confidence, label, pattern)
+                rules.append((prefix, _Rule(label, order, score, regex)))
+
+        # Shorter prefixes first, so every node's parent already exists
+        for prefix in sorted({prefix for prefix, _ in rules}, key=len):
+            if prefix in nodes:
+                continue
+            parent = max(
+                (node for p, node in nodes.items() if prefix.startswith(p)),
+                key=lambda node: len(node.prefix),
+            )
+            nodes[prefix] = _Node(prefix)
+            parent.children.append(nodes[prefix])
+        for prefix, rule in rules:
+            nodes[prefix].rules.append(rule)
+
+    @staticmethod
+    def _confidence(confidence, label, pattern: str) -> float:
+        if callable(confidence):
+            return confidence(pattern)
+        if isinstance(confidence, Mapping):
+            return confidence[label]
+        return confidence
+
+    def scores(self, message: str) -> dict[Any, float]:
+        """Confidence of every label with a matching pattern.
+
+        A label's confidence comes from its first matching pattern, in the
+        order the patterns were given.
+        """
+        text = message.lower()
+        first: dict[Any, tuple[int, float]] = {}
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for rule in node.rules:
+                best = first.get(rule.label)
+                if best is not None and best[0] < rule.order:
+                    continue
+                if rule.regex is None or rule.regex.search(text) is not None:
+                    first[rule.label] = (rule.order, rule.confidence)
+            stack.extend(child for child in node.children if child.prefix in text)
+        return {label: confidence for label, (_, confidence) in first.items()}
+
+    def classify(self, message: str) -> IntentMatch:
+        """Match a message and pick the winning intent.
+
+        Args:
+            message: Raw user message.
+
+        Returns:
+            IntentMatch with the highest-priority matching label, or the
+            default label when nothing matched.
+        """
+        scores = self.scores(message)
+        for label in self.priority:
+            if label in scores:
+                return IntentMatch(label, scores[label], scores)
+        return IntentMatch(self.default[0], self.default[1], scores)
+
+    def classify_many(self, messages: Iterable[str]) -> list[IntentMatch]:
+        """Classify a batch of messages, e.g. to label chat logs offline.
+
+        Args:
+            messages: Raw user messages.
+
+        Returns:
+            One IntentMatch per message, in input order.
+        """
+        return [self.classify(message) for message in messages]
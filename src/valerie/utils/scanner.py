@@ -0,0 +1,159 @@
+"""Precompiled multi-pattern text scanner.
+
+Used by the guardrails to check every message against dozens of PII,
+injection and keyword patterns. Patterns are compiled once, and a rule can
+name a cheap prerequisite (e.g. "contains a digit") that is tested once per
+text, so whole groups of rules are skipped on texts that cannot match them.
+
+CPython's regex engine tries every branch of an alternation at every
+position, so merging the rules into one ``a|b|c`` pattern is slower than
+searching them one by one, and it hides overlapping matches. Each rule is
+therefore searched separately, which lets ``re`` use its literal-prefix
+scanning per rule.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import NamedTuple
+
+
+class ScanMatch(NamedTuple):
+    """One pattern match found by a scan."""
+
+    rule: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """A named pattern, optionally gated by a prerequisite pattern."""
+
+    name: str
+    pattern: str
+    requires: str | None = None  # regex that must occur somewhere for ``pattern`` to match
+
+
+class PatternScanner:
+    """Scans text for many named patterns, compiled once."""
+
+    def __init__(
+        self,
+        rules: list[ScanRule] | dict[str, str],
+        flags: int = 0,
+        max_chars: int | None = None,
+    ):
+        """Compile the rules.
+
+        Args:
+            rules: Rules in reporting order, or a mapping of name to regex.
+            flags: ``re`` flags applied to every rule.
+            max_chars: Default cap on how much of a text is scanned.
+        """
+        if isinstance(rules, dict):
+            rules = [ScanRule(name, pattern) for name, pattern in rules.items()]
+        self.rules = list(rules)
+        self.names = [rule.name for rule in self.rules]
+        self.max_chars = max_chars
+        self._compiled = [
+            (rule.name, re.compile(rule.pattern, flags), rule.requires) for rule in self.rules
+        ]
+        self._gates = {
+            rule.requires: re.compile(rule.requires, flags) for rule in self.rules if rule.requires
+        }
+
+    def _active(self, text: str, endpos: int):
+        """Yield (name, compiled) for rules whose prerequisite occurs in the text."""
+        gates: dict[str, bool] = {}
+        for name, compiled, requires in self._compiled:
+            if requires is not None:
+                if requires not in gates:
+                    gates[requires] = self._gates[requires].search(text, 0, endpos) is not None
+                if not gates[requires]:
+                    continue
+            yield name, compiled
+
+    def _endpos(self, text: str, max_chars: int | None) -> int:
+        cap = max_chars if max_chars is not None else self.max_chars
+        return len(text) if cap is None else min(len(text), cap)
+
+    def scan(self, text: str, max_chars: int | None = None) -> list[ScanMatch]:
+        """Find every match of every rule.
+
+        Args:
+            text: Text to scan.
+            max_chars: Scan at most this many characters, overriding the default.
+
+        Returns:
+            Non-overlapping matches per rule, ordered by position then rule order.
+        """
+        endpos = self._endpos(text, max_chars)
+        matches = [
+            ScanMatch(name, m.start(), m.end())
+            for name, compiled in self._active(text, endpos)
+            for m in compiled.finditer(text, 0, endpos)
+        ]
+        order = {name: i for i, name in enumerate(self.names)}
+        matches.sort(key=lambda m: (m.start, order[m.rule]))
+        return matches
+
+    def search(self, text: str, max_chars: int | None = None) -> ScanMatch | None:
+        """Find the first rule that matches, stopping there (early exit).
+
+        Returns:
+            The match of the first matching rule in rule order, or None.
+        """
+        endpos = self._endpos(text, max_chars)
+        for name, compiled in self._active(text, endpos):
+            m = compiled.search(text, 0, endpos)
+            if m is not None:
+                return ScanMatch(name, m.start(), m.end())
+        return None
+
+    def matched(self, text: str, max_chars: int | None = None) -> list[str]:
+        """Names of the rules that match anywhere, in rule order."""
+        endpos = self._endpos(text, max_chars)
+        return [
+            name
+            for name, compiled in self._active(text, endpos)
+            if compiled.search(text, 0, endpos) is not None
+        ]
+
+
+class KeywordScanner:
+    """Finds literal keywords, including keywords inside other keywords.
+
+    ``str.find`` runs in C with a fast substring search, which beats a
+    pure-Python Aho-Corasick automaton for keyword lists of this size.
+    """
+
+    def __init__(self, keywords: list[str], max_chars: int | None = None):
+        """Initialize the scanner.
+
+        Args:
+            keywords: Keywords in reporting order.
+            max_chars: Default cap on how much of a text is scanned.
+        """
+        self.keywords = list(keywords)
+        self.max_chars = max_chars
+
+    def _text(self, text: str, max_chars: int | None) -> str:
+        cap = max_chars if max_chars is not None else self.max_chars
+        return text if cap is None else text[:cap]
+
+    def scan(self, text: str, max_chars: int | None = None) -> list[ScanMatch]:
+        """Find every occurrence of every keyword, ordered by position."""
+        text = self._text(text, max_chars)
+        matches = []
+        for keyword in self.keywords:
+            start = text.find(keyword)
+            while start != -1:
+                matches.append(ScanMatch(keyword, start, start + len(keyword)))
+                start = text.find(keyword, start + 1)
+        matches.sort(key=lambda m: m.start)
+        return matches
+
+    def matched(self, text: str, max_chars: int | None = None) -> list[str]:
+        """Keywords that occur in the text, in keyword order."""
+        text = self._text(text, max_chars)
+        return [keyword for keyword in self.keywords if keyword in text]
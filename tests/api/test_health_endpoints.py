@@ -1,5 +1,9 @@
 """Tests for health check endpoints."""
 
+from unittest.mock import patch
+
+import pytest
+
 
 class TestHealthEndpoints:
     """Tests for /health, /ready, /live endpoints."""
@@ -78,3 +82,43 @@ class TestHealthEndpoints:
         assert "openapi" in data
         assert "paths" in data
         assert "info" in data
+
+
+class TestTraceExport:
+    """Test the recent traces export endpoint."""
+
+    @pytest.fixture
+    def export_enabled(self):
+        with patch("valerie.api.main.TRACE_EXPORT_ENABLED", True):
+            yield
+
+    @pytest.mark.usefixtures("export_enabled")
+    def test_recent_traces(self, client):
+        """Test /debug/traces returns buffered traces newest first."""
+        from valerie.infrastructure import get_observability
+
+        observability = get_observability()
+        with observability.trace("export-test", metadata={"session_id": "s1"}) as trace_id:
+            pass
+
+        response = client.get("/debug/traces", params={"limit": 5})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["stats"]["capacity"] >= 1
+        assert data["traces"][0]["trace_id"] == trace_id
+
+        detail = client.get(f"/debug/traces/{trace_id}")
+        assert detail.status_code == 200
+        assert detail.json()["metadata"] == {"session_id": "s1"}
+
+    @pytest.mark.usefixtures("export_enabled")
+    def test_unknown_trace(self, client):
+        """Test /debug/traces/{id} returns 404 for unknown traces."""
+        response = client.get("/debug/traces/does-not-exist")
+        assert response.status_code == 404
+
+    def test_export_disabled_by_default(self, client):
+        """Test the export is opt-in and hidden unless enabled."""
+        response = client.get("/debug/traces")
+        assert response.status_code == 404
@@ -1,5 +1,6 @@
 """Tests for agent modules."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
@@ -279,6 +280,214 @@ class TestIntentClassifierAgent:
         assert intent is None
         assert confidence == 0.0
 
+    def test_match_intent_scores_every_intent(self):
+        """Test the compiled matcher reports all matching intents."""
+        from valerie.agents.intent_classifier import match_intent
+
+        match = match_intent("Compara precios de guantes, cuanto cuesta cada uno?")
+        assert match.intent == Intent.ITEM_COMPARISON
+        assert set(match.scores) == {Intent.ITEM_COMPARISON, Intent.PRICE_INQUIRY}
+
+    def test_pattern_matcher_batch(self):
+        """Test batch labeling agrees with single-message detection."""
+        from valerie.agents.intent_classifier import PATTERN_MATCHER, match_intent
+
+        messages = ["Hola", "Top 5 proveedores", "Random message"]
+        results = PATTERN_MATCHER.classify_many(messages)
+        assert results == [match_intent(m) for m in messages]
+        assert [r.intent for r in results] == [Intent.GREETING, Intent.TOP_SUPPLIERS, None]
+
+
+class TestTieredIntentClassification:
+    """Tests for the pattern -> local model -> LLM classification tiers."""
+
+    @pytest.fixture
+    def agent(self):
+        return IntentClassifierAgent()
+
+    def tier_count(self, tier: str, result: str) -> float:
+        from valerie.infrastructure.metrics import intent_tier_decisions_total
+
+        return intent_tier_decisions_total.labels(tier=tier, result=result)._value.get()
+
+    @pytest.mark.asyncio
+    async def test_confident_pattern_skips_llm(self, agent):
+        """Test a confident fast-path pattern match never calls the LLM."""
+        state = ChatState(messages=[HumanMessage(content="Busco proveedores de acetona")])
+        hits_before = self.tier_count("pattern", "hit")
+
+        with patch.object(agent, "invoke_llm", new_callable=AsyncMock) as mock_llm:
+            result = await agent.process(state)
+
+        mock_llm.assert_not_called()
+        assert result.intent == Intent.PRODUCT_SEARCH
+        assert result.agent_outputs["intent_classifier"].data["classification_method"] == (
+            "pattern_matching"
+        )
+        assert self.tier_count("pattern", "hit") == hits_before + 1
+
+    @pytest.mark.asyncio
+    async def test_entity_intents_still_use_llm(self, agent):
+        """Test pattern matches for intents needing entities go to the LLM."""
+        state = ChatState(messages=[HumanMessage(content="Necesito un proveedor con nadcap")])
+        entities = {"certifications": ["nadcap"]}
+        response = json.dumps(
+            {"intent": "supplier_search", "confidence": 0.9, "entities": entities}
+        )
+
+        with patch.object(agent, "invoke_llm", new_callable=AsyncMock, return_value=response):
+            result = await agent.process(state)
+
+        assert result.intent == Intent.SUPPLIER_SEARCH
+        assert result.entities == entities
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "Compara los proveedores Acme y Boeing",
+            "Categorías de aluminio",
+            "Dame información del proveedor Acme",
+        ],
+    )
+    async def test_entity_dependent_supplier_intents_use_llm(self, agent, message):
+        """Test comparison, category browse and supplier detail get LLM entities."""
+        state = ChatState(messages=[HumanMessage(content=message)])
+        response = json.dumps({"intent": "unknown", "confidence": 0.1, "entities": {}})
+
+        with patch.object(agent, "invoke_llm", new_callable=AsyncMock, return_value=response) as m:
+            await agent.process(state)
+
+        m.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_comparison_entities_reach_supplier_detail_agent(self, agent):
+        """Test the suppliers named in a comparison are the ones compared."""
+        from valerie.domains.supplier.agents.supplier_detail import SupplierDetailAgent
+
+        state = ChatState(messages=[HumanMessage(content="Compara los proveedores Acme y Boeing")])
+        entities = {"supplier_ids": ["Acme", "Boeing"]}
+        response = json.dumps(
+            {"intent": "item_comparison", "confidence": 0.9, "entities": entities}
+        )
+        data_source = AsyncMock()
+        data_source.compare_suppliers.return_value = None
+
+        with patch.object(agent, "invoke_llm", new_callable=AsyncMock, return_value=response):
+            state = await agent.process(state)
+        with patch(
+            "valerie.domains.supplier.agents.supplier_detail.get_default_data_source",
+            return_value=data_source,
+        ):
+            state = await SupplierDetailAgent().process(state)
+
+        assert state.intent == Intent.ITEM_COMPARISON
+        assert state.agent_outputs["supplier_detail"].success
+        data_source.compare_suppliers.assert_awaited_once_with(["Acme", "Boeing"])
+        data_source.get_top_suppliers.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_local_model_tier(self, agent):
+        """Test the local model decides when no pattern matches."""
+        state = ChatState(messages=[HumanMessage(content="Mejores proveedores por volumen")])
+        agent.settings.intent_pattern_threshold = 1.0  # Force the pattern tier to pass
+
+        with patch.object(agent, "_detect_intent_by_pattern", return_value=(None, 0.0)):
+            with patch.object(agent, "invoke_llm", new_callable=AsyncMock) as mock_llm:
+                result = await agent.process(state)
+
+        mock_llm.assert_not_called()
+        assert result.intent == Intent.TOP_SUPPLIERS
+        data = result.agent_outputs["intent_classifier"].data
+        assert data["classification_method"] == "local_model"
+        assert data["confidence"] >= agent.settings.intent_local_model_threshold
+
+    @pytest.mark.asyncio
+    async def test_embedding_local_model(self, agent):
+        """Test the embedding centroid model can serve as the local tier."""
+        agent.settings.intent_local_model = "embedding"
+        state = ChatState(messages=[HumanMessage(content="Mejores proveedores por volumen")])
+
+        with patch.object(agent, "_detect_intent_by_pattern", return_value=(None, 0.0)):
+            with patch.object(agent, "invoke_llm", new_callable=AsyncMock) as mock_llm:
+                result = await agent.process(state)
+
+        mock_llm.assert_not_called()
+        assert result.intent == Intent.TOP_SUPPLIERS
+        assert result.confidence >= agent.settings.intent_embedding_threshold
+
+    @pytest.mark.asyncio
+    async def test_unconfident_local_model_falls_through(self, agent):
+        """Test text unlike any example reaches the LLM."""
+        state = ChatState(messages=[HumanMessage(content="What is the weather today?")])
+        misses_before = self.tier_count("local_model", "miss")
+
+        with patch.object(agent, "invoke_llm", new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = json.dumps({"intent": "unknown", "confidence": 0.3})
+            await agent.process(state)
+
+        mock_llm.assert_called_once()
+        assert self.tier_count("local_model", "miss") == misses_before + 1
+
+    @pytest.mark.asyncio
+    async def test_tiering_can_be_disabled(self, agent):
+        """Test every message goes to the LLM when tiering is off."""
+        agent.settings.intent_tiered_classification = False
+        state = ChatState(messages=[HumanMessage(content="Busco proveedores de acetona")])
+        response = json.dumps({"intent": "product_search", "confidence": 0.95, "entities": {}})
+
+        with patch.object(agent, "invoke_llm", new_callable=AsyncMock, return_value=response) as m:
+            result = await agent.process(state)
+
+        m.assert_called_once()
+        assert result.agent_outputs["intent_classifier"].data["classification_method"] == "llm"
+
+    @pytest.mark.asyncio
+    async def test_llm_call_is_hedged(self, agent):
+        """Test the classifier's LLM call fires a hedge when the primary is slow."""
+        from valerie.infrastructure.metrics import llm_hedges_total
+        from valerie.llm.base import BaseLLMProvider, LLMResponse
+        from valerie.llm.hedging import HedgedLLMProvider
+
+        class DelayedProvider(BaseLLMProvider):
+            def __init__(self, name: str, delay: float):
+                super().__init__()
+                self._name, self.delay = name, delay
+
+            @property
+            def name(self) -> str:
+                return self._name
+
+            @property
+            def default_model(self) -> str:
+                return "m"
+
+            async def generate(self, messages, config=None):
+                await asyncio.sleep(self.delay)
+                content = json.dumps({"intent": "greeting", "confidence": 0.9, "entities": {}})
+                return LLMResponse(content=content, model="m", provider=self._name)
+
+            async def generate_stream(self, messages, config=None):
+                yield  # pragma: no cover
+
+            async def is_available(self) -> bool:
+                return True
+
+        hedged = HedgedLLMProvider(
+            [DelayedProvider("slow-primary", 5), DelayedProvider("fast-backup", 0)],
+            hedge_delay=0.01,
+        )
+        agent.settings.intent_tiered_classification = False
+        state = ChatState(messages=[HumanMessage(content="hola")])
+        launched = llm_hedges_total.labels(provider="fast-backup", outcome="launched")
+        launched_before = launched._value.get()
+
+        with patch("valerie.agents.base.get_hedged_provider", return_value=hedged):
+            result = await asyncio.wait_for(agent.process(state), 2)
+
+        assert result.intent == Intent.GREETING
+        assert launched._value.get() == launched_before + 1
+
 
 class TestOrchestratorAgent:
     """Tests for OrchestratorAgent."""
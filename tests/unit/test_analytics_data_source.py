@@ -0,0 +1,203 @@
+"""Tests for the columnar analytics data source."""
+
+import os
+import random
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from tests.unit.test_sqlite_data_source import seed_data_source
+from valerie.data.factory import DataSourceConfig, _create_data_source
+from valerie.data.rankings import refresh_supplier_rankings
+from valerie.data.schema import Category, Supplier, SupplierCategory, SupplierItem
+from valerie.data.sources.analytics import AnalyticsDataSource
+from valerie.data.sources.cached import import_marker_path
+from valerie.data.sources.sqlite import SQLiteDataSource
+
+
+def seed_random(source: SQLiteDataSource, seed: int = 3) -> None:
+    """Populate a data source with random data, including ties and NULLs."""
+    rng = random.Random(seed)
+    with source.db as session:
+        categories = []
+        for i in range(12):
+            level2 = rng.choice(["Chemicals", "Metals", "", None])
+            level3 = rng.choice([f"Type {i}", "", None]) if level2 else None
+            categories.append(
+                Category(
+                    name=f"Cat {i:02d}",
+                    level1=rng.choice(["Controlled Material", "Non-Controlled Service", None]),
+                    level2=level2,
+                    level3=level3,
+                    item_count=rng.randint(0, 9),
+                    total_amount=rng.choice([None, rng.uniform(0, 1000)]),
+                )
+            )
+        session.add_all(categories)
+        session.flush()
+
+        suppliers = [
+            Supplier(
+                name=f"{rng.choice(['Acme', 'Delta', 'Pacific'])} Supplier {i}",
+                total_orders=rng.choice([1, 2, 5]),
+                total_amount=rng.choice([100.0, 250.0, None, rng.uniform(0, 5000)]),
+                avg_order_value=rng.uniform(0, 100),
+            )
+            for i in range(30)
+        ]
+        session.add_all(suppliers)
+        session.flush()
+
+        for supplier in suppliers:
+            for category in rng.sample(categories, k=rng.randint(0, 8)):
+                session.add(
+                    SupplierCategory(
+                        supplier_id=supplier.id,
+                        category_id=category.id,
+                        item_count=rng.randint(1, 4),
+                        total_amount=rng.choice([10.0, rng.uniform(0, 900)]),
+                    )
+                )
+            for j in range(rng.randint(0, 8)):
+                session.add(
+                    SupplierItem(
+                        supplier_id=supplier.id,
+                        item_code=f"I-{j}",
+                        description=f"Item {j}",
+                        category_id=rng.choice([None, rng.choice(categories).id]),
+                        avg_price=rng.uniform(1, 10),
+                        total_ordered_amount=rng.choice([5.0, rng.uniform(0, 500)]),
+                    )
+                )
+        session.commit()
+    refresh_supplier_rankings(source.db.engine)
+
+
+@pytest.fixture(params=["fixture", "random"])
+def sources(request) -> tuple[SQLiteDataSource, AnalyticsDataSource]:
+    """A seeded SQLite source and an analytics engine over it."""
+    sqlite = SQLiteDataSource(":memory:")
+    if request.param == "fixture":
+        seed_data_source(sqlite)
+        refresh_supplier_rankings(sqlite.db.engine)
+    else:
+        seed_random(sqlite)
+    return sqlite, AnalyticsDataSource(sqlite)
+
+
+def dump(results) -> list | dict:
+    if isinstance(results, list):
+        return [r.model_dump() for r in results]
+    return results.model_dump()
+
+
+class TestParity:
+    """Tests that analytics results match the SQLite queries."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("by", ["amount", "orders", "items", "unknown"])
+    @pytest.mark.parametrize("limit", [1, 5, 100])
+    async def test_top_suppliers(self, sources, by, limit):
+        """Test rankings match, including tie order."""
+        sqlite, analytics = sources
+        expected = await sqlite.get_top_suppliers(by=by, limit=limit)
+        assert dump(await analytics.get_top_suppliers(by=by, limit=limit)) == dump(expected)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "parent", [None, "controlled", "Non-Controlled Service-Quím", "Controlled-Met", "zzz"]
+    )
+    @pytest.mark.parametrize("level", [None, 1, 2, 3])
+    async def test_categories(self, sources, parent, level):
+        """Test category rollups match for every level/parent filter."""
+        sqlite, analytics = sources
+        expected = await sqlite.get_categories(parent=parent, level=level)
+        assert dump(await analytics.get_categories(parent=parent, level=level)) == dump(expected)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "ids",
+        [
+            ["1", "2"],
+            ["acme", "PACIFIC", "delta"],
+            ["3", "missing", "1", "3"],
+            ["999", "supplier 1"],
+            [],
+        ],
+    )
+    async def test_compare_suppliers(self, sources, ids):
+        """Test comparisons match, including name fallback and ordering."""
+        sqlite, analytics = sources
+        expected = await sqlite.compare_suppliers(ids)
+        result = await analytics.compare_suppliers(ids)
+        expected_dump, result_dump = dump(expected), dump(result)
+        # Set intersection order is arbitrary in both implementations
+        assert sorted(result_dump.pop("common_categories")) == sorted(
+            expected_dump.pop("common_categories")
+        )
+        assert result_dump == expected_dump
+
+
+class TestSnapshot:
+    """Tests for snapshot loading and refresh."""
+
+    @pytest.mark.asyncio
+    async def test_loaded_once(self):
+        """Test the snapshot is loaded lazily and reused."""
+        sqlite = SQLiteDataSource(":memory:")
+        seed_data_source(sqlite)
+        analytics = AnalyticsDataSource(sqlite)
+        await analytics.get_top_suppliers()
+        snapshot = analytics._snapshot
+        await analytics.get_categories()
+        assert analytics._snapshot is snapshot
+
+    @pytest.mark.asyncio
+    async def test_reloads_after_import(self, tmp_path, monkeypatch):
+        """Test a touched import marker reloads the snapshot."""
+        monkeypatch.setattr("valerie.data.sources.cached._MARKER_CHECK_INTERVAL", 0.0)
+        db_path = tmp_path / "valerie.db"
+        sqlite = SQLiteDataSource(db_path)
+        seed_data_source(sqlite)
+        analytics = AnalyticsDataSource(sqlite, marker_path=import_marker_path(db_path))
+        assert (await analytics.get_top_suppliers(limit=1))[0].supplier_name == "Acme Chemicals"
+
+        with sqlite.db as session:
+            session.query(Supplier).filter_by(name="Delta Supply").one().total_amount = 9000.0
+            session.commit()
+        assert (await analytics.get_top_suppliers(limit=1))[0].supplier_name == "Acme Chemicals"
+
+        marker = import_marker_path(db_path)
+        marker.touch()
+        stamp = time.time_ns()
+        os.utime(marker, ns=(stamp, stamp))
+        assert (await analytics.get_top_suppliers(limit=1))[0].supplier_name == "Delta Supply"
+        await analytics.close()
+
+    @pytest.mark.asyncio
+    async def test_empty_database(self):
+        """Test an empty database yields empty results."""
+        analytics = AnalyticsDataSource(SQLiteDataSource(":memory:"))
+        assert await analytics.get_top_suppliers() == []
+        assert await analytics.get_categories() == []
+        assert (await analytics.compare_suppliers(["1"])).suppliers == []
+
+    @pytest.mark.asyncio
+    async def test_forwards_other_methods(self):
+        """Test non-analytics methods are served by the SQLite source."""
+        sqlite = SQLiteDataSource(":memory:")
+        seed_data_source(sqlite)
+        analytics = AnalyticsDataSource(sqlite)
+        assert [p.item_code for p in await analytics.search_products("acetone")] == ["ACE-100"]
+        assert await analytics.health_check() is True
+
+    def test_factory_option(self, tmp_path):
+        """Test the factory wraps SQLite when analytics is enabled."""
+        config = DataSourceConfig(
+            type="sqlite", sqlite_path=str(tmp_path / "v.db"), analytics_enabled=True
+        )
+        source = _create_data_source(config)
+        assert isinstance(source, AnalyticsDataSource)
+        assert isinstance(source.inner, SQLiteDataSource)
@@ -241,7 +241,7 @@ class TestBaseAgentInvokeProvider:
         mock_response.model = "test-model"
         mock_response.total_tokens = 100
 
-        mock_provider = AsyncMock()
+        mock_provider = AsyncMock(member_names=["test"])
         mock_provider.generate.return_value = mock_response
         agent._provider = mock_provider
 
@@ -258,7 +258,7 @@ class TestBaseAgentInvokeProvider:
         mock_response.model = "test-model"
         mock_response.total_tokens = 50
 
-        mock_provider = AsyncMock()
+        mock_provider = AsyncMock(member_names=["test"])
         mock_provider.generate.return_value = mock_response
         agent._provider = mock_provider
 
@@ -285,7 +285,7 @@ class TestBaseAgentInvokeProvider:
             AIMessage(content="Assistant answer"),
         ]
 
-        mock_provider = AsyncMock()
+        mock_provider = AsyncMock(member_names=["test"])
         mock_provider.generate.return_value = mock_response
         agent._provider = mock_provider
 
@@ -304,7 +304,7 @@ class TestBaseAgentInvokeProvider:
     async def test_invoke_provider_error(self):
         agent = ConcreteProviderAgent()
 
-        mock_provider = AsyncMock()
+        mock_provider = AsyncMock(member_names=["test"])
         mock_provider.generate.side_effect = Exception("Provider error")
         agent._provider = mock_provider
 
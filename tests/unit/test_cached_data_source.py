@@ -0,0 +1,203 @@
+"""Tests for the caching data source decorator."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from valerie.data.factory import DataSourceConfig, get_data_source
+from valerie.data.sources.cached import (
+    CachedDataSource,
+    import_marker_path,
+    invalidate_caches,
+    mark_data_changed,
+)
+from valerie.data.sources.mock import MockDataSource
+from valerie.infrastructure.metrics import (
+    data_source_cache_hits_total,
+    data_source_cache_misses_total,
+)
+
+
+class CountingDataSource(MockDataSource):
+    """Mock data source that counts calls per method."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls: dict[str, int] = {}
+
+    async def get_top_suppliers(self, by="amount", limit=10):
+        self.calls["get_top_suppliers"] = self.calls.get("get_top_suppliers", 0) + 1
+        return await super().get_top_suppliers(by, limit)
+
+    async def search_suppliers(self, name=None, category=None, product=None, limit=10):
+        self.calls["search_suppliers"] = self.calls.get("search_suppliers", 0) + 1
+        return await super().search_suppliers(name, category, product, limit)
+
+    async def get_supplier_detail(self, supplier_id):
+        self.calls["get_supplier_detail"] = self.calls.get("get_supplier_detail", 0) + 1
+        return await super().get_supplier_detail(supplier_id)
+
+    async def health_check(self):
+        self.calls["health_check"] = self.calls.get("health_check", 0) + 1
+        return True
+
+
+@pytest.fixture
+def inner() -> CountingDataSource:
+    return CountingDataSource()
+
+
+@pytest.fixture
+def cached(inner) -> CachedDataSource:
+    return CachedDataSource(inner, max_entries=8, ttl_seconds=60)
+
+
+class TestCachedDataSource:
+    """Tests for CachedDataSource."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_calls_hit_cache(self, cached, inner):
+        """Test identical calls only reach the inner source once."""
+        first = await cached.get_top_suppliers(by="amount", limit=5)
+        second = await cached.get_top_suppliers(by="amount", limit=5)
+        assert first == second
+        assert inner.calls["get_top_suppliers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_arguments_are_normalized(self, cached, inner):
+        """Test positional, keyword and default arguments share a key."""
+        await cached.get_top_suppliers()
+        await cached.get_top_suppliers("amount")
+        await cached.get_top_suppliers(by="amount", limit=10)
+        assert inner.calls["get_top_suppliers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_match_text_is_case_insensitive(self, cached, inner):
+        """Test partial-match text arguments ignore ASCII case."""
+        await cached.search_suppliers(name="Acme")
+        await cached.search_suppliers(name="ACME")
+        assert inner.calls["search_suppliers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ids_stay_case_sensitive(self, cached, inner):
+        """Test supplier IDs are not folded."""
+        await cached.get_supplier_detail("SUP-001")
+        await cached.get_supplier_detail("sup-001")
+        assert inner.calls["get_supplier_detail"] == 2
+
+    @pytest.mark.asyncio
+    async def test_different_arguments_miss(self, cached, inner):
+        """Test different arguments are cached separately."""
+        await cached.get_top_suppliers(limit=5)
+        await cached.get_top_suppliers(limit=3)
+        assert inner.calls["get_top_suppliers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_results_are_copies(self, cached):
+        """Test mutating a returned result does not change the cache."""
+        results = await cached.get_top_suppliers(limit=2)
+        results[0].supplier_name = "Changed"
+        results.clear()
+        again = await cached.get_top_suppliers(limit=2)
+        assert len(again) == 2
+        assert again[0].supplier_name != "Changed"
+
+    @pytest.mark.asyncio
+    async def test_health_check_not_cached(self, cached, inner):
+        """Test health checks always reach the inner source."""
+        await cached.health_check()
+        await cached.health_check()
+        assert inner.calls["health_check"] == 2
+
+    @pytest.mark.asyncio
+    async def test_metrics(self, cached):
+        """Test hit and miss counters."""
+        hits = data_source_cache_hits_total.labels(method="get_categories")
+        misses = data_source_cache_misses_total.labels(method="get_categories")
+        hits_before, misses_before = hits._value.get(), misses._value.get()
+        await cached.get_categories(level=1)
+        await cached.get_categories(level=1)
+        assert misses._value.get() == misses_before + 1
+        assert hits._value.get() == hits_before + 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, cached, inner):
+        """Test explicit invalidation of one and all caches."""
+        await cached.get_top_suppliers()
+        cached.invalidate()
+        await cached.get_top_suppliers()
+        invalidate_caches()
+        await cached.get_top_suppliers()
+        assert inner.calls["get_top_suppliers"] == 3
+
+    @pytest.mark.asyncio
+    async def test_import_marker_invalidates(self, inner, tmp_path, monkeypatch):
+        """Test an import in another process invalidates through the marker file."""
+        db_path = tmp_path / "valerie.db"
+        monkeypatch.setattr("valerie.data.sources.cached._MARKER_CHECK_INTERVAL", 0.0)
+        cached = CachedDataSource(inner, marker_path=import_marker_path(db_path))
+        await cached.get_top_suppliers()
+
+        # Simulate another process touching the marker without our in-process hook
+        marker = import_marker_path(db_path)
+        marker.touch()
+        stamp = time.time_ns()
+        os.utime(marker, ns=(stamp, stamp))
+
+        await cached.get_top_suppliers()
+        assert inner.calls["get_top_suppliers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_mark_data_changed(self, cached, inner, tmp_path):
+        """Test the importer hook creates the marker and clears caches."""
+        await cached.get_top_suppliers()
+        mark_data_changed(tmp_path / "valerie.db")
+        assert import_marker_path(tmp_path / "valerie.db").exists()
+        await cached.get_top_suppliers()
+        assert inner.calls["get_top_suppliers"] == 2
+
+
+class TestFactoryCaching:
+    """Tests for cache wiring in the data source factory."""
+
+    def test_sqlite_is_wrapped(self, tmp_path):
+        """Test SQLite sources are cached by default."""
+        source = get_data_source(
+            DataSourceConfig(type="sqlite", sqlite_path=str(tmp_path / "valerie.db"))
+        )
+        assert isinstance(source, CachedDataSource)
+
+    def test_cache_can_be_disabled(self, tmp_path):
+        """Test disabling the cache returns the raw source."""
+        source = get_data_source(
+            DataSourceConfig(
+                type="sqlite", sqlite_path=str(tmp_path / "valerie.db"), cache_enabled=False
+            )
+        )
+        assert not isinstance(source, CachedDataSource)
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            DataSourceConfig(type="api", api_base_url="https://valence.example"),
+            DataSourceConfig(
+                type="oracle",
+                oracle_base_url="https://oracle.example",
+                oracle_client_id="client",
+                oracle_client_secret="secret",
+            ),
+        ],
+    )
+    def test_live_sources_not_wrapped_by_default(self, config):
+        """Test live sources are only cached when opted in."""
+        with patch("valerie.data.factory._create_data_source", return_value=MockDataSource()):
+            assert isinstance(get_data_source(config), MockDataSource)
+
+            config.cache_enabled = True
+            assert isinstance(get_data_source(config), CachedDataSource)
+
+    def test_mock_is_not_wrapped(self):
+        """Test the mock source is never cached."""
+        assert isinstance(get_data_source(DataSourceConfig(type="mock")), MockDataSource)
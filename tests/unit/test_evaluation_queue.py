@@ -0,0 +1,208 @@
+"""Tests for the background evaluation pipeline."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+from prometheus_client import REGISTRY
+
+from valerie.infrastructure.evaluation import EvaluationAgent
+from valerie.infrastructure.evaluation_queue import (
+    EvaluationJob,
+    EvaluationQueue,
+    EvaluationResult,
+    EvaluationSink,
+    JSONLEvaluationSink,
+)
+from valerie.models import ChatState, Intent
+
+
+class MemorySink(EvaluationSink):
+    """Collects result batches in memory."""
+
+    def __init__(self):
+        self.batches: list[list[EvaluationResult]] = []
+
+    async def write(self, results):
+        self.batches.append(results)
+
+    @property
+    def results(self) -> list[EvaluationResult]:
+        return [r for batch in self.batches for r in batch]
+
+
+def job(query: str = "que es nadcap") -> EvaluationJob:
+    return EvaluationJob(query=query, response="NADCAP is...", intent="technical_question")
+
+
+def jobs_metric(status: str) -> float:
+    return REGISTRY.get_sample_value("valerie_evaluation_jobs_total", {"status": status}) or 0.0
+
+
+class TestEvaluationQueue:
+    """Tests for EvaluationQueue."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_evaluated_and_written(self):
+        """Test submitted jobs reach the sink with their evaluation."""
+        sink = MemorySink()
+        queue = EvaluationQueue(AsyncMock(return_value={"overall": 80}), sink=sink)
+        assert queue.submit(job("a"))
+        assert queue.submit(job("b"))
+        await queue.stop()
+
+        assert [r.job.query for r in sink.results] == ["a", "b"]
+        assert all(r.evaluation == {"overall": 80} for r in sink.results)
+        assert queue.completed == 2
+
+    @pytest.mark.asyncio
+    async def test_batches(self):
+        """Test queued jobs are evaluated in batches of batch_size."""
+        sink = MemorySink()
+        queue = EvaluationQueue(
+            AsyncMock(return_value={}), sink=sink, batch_size=3, flush_interval=0.01
+        )
+        for i in range(7):
+            queue.submit(job(str(i)))
+        await queue.join()
+        await queue.stop()
+        assert [len(batch) for batch in sink.batches] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_wait_for_judge(self):
+        """Test submit returns while the judge is still running."""
+        release = asyncio.Event()
+
+        async def slow_judge(job):
+            await release.wait()
+            return {"overall": 1}
+
+        sink = MemorySink()
+        queue = EvaluationQueue(slow_judge, sink=sink, flush_interval=0)
+        queue.submit(job())
+        await asyncio.sleep(0)
+        assert sink.results == []
+        release.set()
+        await queue.stop()
+        assert len(sink.results) == 1
+
+    @pytest.mark.asyncio
+    async def test_backpressure_drops(self):
+        """Test jobs beyond max_size are dropped and counted."""
+        release = asyncio.Event()
+
+        async def blocked_judge(job):
+            await release.wait()
+            return {}
+
+        before = jobs_metric("dropped")
+        queue = EvaluationQueue(
+            blocked_judge, sink=MemorySink(), max_size=2, batch_size=1, flush_interval=0
+        )
+        queue.submit(job())
+        await asyncio.sleep(0)  # the worker takes the first job
+        accepted = [queue.submit(job()) for _ in range(4)]
+
+        assert accepted == [True, True, False, False]
+        assert queue.dropped == 2
+        assert jobs_metric("dropped") - before == 2
+        release.set()
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_judge_failure_recorded(self):
+        """Test a failing judge produces an error result without stopping the worker."""
+        judge = AsyncMock(side_effect=[RuntimeError("judge down"), {"overall": 70}])
+        sink = MemorySink()
+        queue = EvaluationQueue(judge, sink=sink, batch_size=1)
+        queue.submit(job("a"))
+        queue.submit(job("b"))
+        await queue.stop()
+
+        assert [r.error for r in sink.results] == ["judge down", None]
+        assert sink.results[1].success
+
+    @pytest.mark.asyncio
+    async def test_stop_without_drain_drops_pending(self):
+        """Test stopping without draining counts pending jobs as dropped."""
+        queue = EvaluationQueue(AsyncMock(return_value={}), sink=MemorySink())
+        for _ in range(3):
+            queue.submit(job())
+        await queue.stop(drain=False)
+        assert queue.dropped == 3
+        assert not queue.running
+
+    @pytest.mark.asyncio
+    async def test_jsonl_sink(self, tmp_path):
+        """Test the JSONL sink appends one record per result."""
+        path = tmp_path / "evals" / "results.jsonl"
+        queue = EvaluationQueue(
+            AsyncMock(return_value={"overall": 90}), sink=JSONLEvaluationSink(path)
+        )
+        queue.submit(job("¿qué es nadcap?"))
+        await queue.stop()
+
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert records[0]["query"] == "¿qué es nadcap?"
+        assert records[0]["evaluation"] == {"overall": 90}
+        assert "enqueued_at" not in records[0]
+
+
+class TestEvaluationAgentSubmit:
+    """Tests for EvaluationAgent.submit."""
+
+    @pytest.fixture
+    def state(self) -> ChatState:
+        state = ChatState(session_id="s1", messages=[HumanMessage(content="que es nadcap")])
+        state.final_response = "NADCAP is an accreditation program."
+        state.intent = Intent.TECHNICAL_QUESTION
+        return state
+
+    def test_build_job(self, state):
+        """Test a job captures query, response, intent and context."""
+        built = EvaluationAgent().build_job(state)
+        assert built.query == "que es nadcap"
+        assert built.response == state.final_response
+        assert built.intent == "technical_question"
+        assert built.session_id == "s1"
+        assert built.context["suppliers_found"] == 0
+
+    @pytest.mark.asyncio
+    async def test_submit_queues(self, state):
+        """Test a sampled response is queued and scored in the background."""
+        agent = EvaluationAgent()
+        sink = MemorySink()
+        queue = EvaluationQueue(agent.evaluate_job, sink=sink)
+
+        with (
+            patch("random.random", return_value=0.0),
+            patch.object(agent, "invoke_llm", new_callable=AsyncMock) as mock_llm,
+        ):
+            mock_llm.return_value = '{"overall": 88}'
+            result = agent.submit(state, queue=queue)
+            assert result.agent_outputs["evaluation"].data == {"queued": True}
+            assert result.evaluation_score is None
+            await queue.stop()
+
+        assert sink.results[0].evaluation["overall"] == 88
+
+    @pytest.mark.asyncio
+    async def test_submit_not_sampled(self, state):
+        """Test unsampled responses are not queued."""
+        queue = EvaluationQueue(AsyncMock(), sink=MemorySink())
+        with patch("random.random", return_value=1.0):
+            result = EvaluationAgent().submit(state, queue=queue)
+        assert result.agent_outputs["evaluation"].data["reason"] == "Not sampled"
+        assert queue.qsize() == 0
+
+    @pytest.mark.asyncio
+    async def test_submit_queue_full(self, state):
+        """Test a full queue skips evaluation instead of blocking."""
+        queue = EvaluationQueue(AsyncMock(), sink=MemorySink(), max_size=1)
+        queue.submit(job())
+        with patch("random.random", return_value=0.0):
+            result = EvaluationAgent().submit(state, queue=queue)
+        assert result.agent_outputs["evaluation"].data["reason"] == "Evaluation queue full"
+        await queue.stop(drain=False)
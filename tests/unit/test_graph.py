@@ -345,10 +345,107 @@ class TestNodeFunctions:
 
     @pytest.mark.asyncio
     async def test_evaluation_node(self):
-        """Test evaluation node function."""
+        """Test evaluation node runs the judge inline when async is off."""
         state = ChatState()
         with patch("valerie.graph.builder._evaluation") as mock_agent:
+            mock_agent.settings.evaluation_async = False
             mock_agent.process = AsyncMock(return_value=state)
             result = await evaluation_node(state)
             mock_agent.process.assert_called_once_with(state)
             assert result == state
+
+    @pytest.mark.asyncio
+    async def test_evaluation_node_async(self):
+        """Test evaluation node queues the response when async is on."""
+        state = ChatState()
+        with patch("valerie.graph.builder._evaluation") as mock_agent:
+            mock_agent.settings.evaluation_async = True
+            mock_agent.process = AsyncMock(return_value=state)
+            mock_agent.submit.return_value = state
+            result = await evaluation_node(state)
+            mock_agent.submit.assert_called_once_with(state)
+            mock_agent.process.assert_not_called()
+            assert result == state
+
+
+class StubDomain:
+    """Minimal domain for registry routing tests."""
+
+    def __init__(self, domain_id: str, keywords: list[str], examples: list[str]):
+        self.domain_id = domain_id
+        self._keywords = keywords
+        self._examples = examples
+
+    def get_keywords(self) -> list[str]:
+        return self._keywords
+
+    def get_example_queries(self) -> list[str]:
+        return self._examples
+
+
+class TestEmbeddingDomainRouting:
+    """Tests for routing domains by example-query similarity."""
+
+    @pytest.fixture
+    def registry(self):
+        from valerie.core import DomainRegistry
+
+        DomainRegistry.reset()
+        registry = DomainRegistry()
+        registry.register(
+            StubDomain(
+                "supplier",
+                ["supplier"],
+                ["Find suppliers with NADCAP certification", "Who sells acetone?"],
+            )
+        )
+        registry.register(
+            StubDomain(
+                "hr",
+                ["employee"],
+                ["How many vacation days do I have?", "Request parental leave"],
+            )
+        )
+        yield registry
+        DomainRegistry.reset()
+
+    def test_find_by_text(self, registry):
+        """Test the domain with the most similar examples is chosen."""
+        assert registry.find_by_text("how many vacation days are left").domain_id == "hr"
+        assert registry.find_by_text("suppliers that sell acetone").domain_id == "supplier"
+        assert registry.find_by_text("zzz", min_similarity=0.5) is None
+
+    def test_classifier_rebuilt_on_register(self, registry):
+        """Test centroids are recomputed when domains change."""
+        first = registry.get_classifier()
+        assert registry.get_classifier() is first
+
+        registry.unregister("hr")
+
+        assert registry.get_classifier() is not first
+        assert registry.get_classifier().labels == ["supplier"]
+
+    def test_keyword_fallback_without_numpy(self, registry):
+        """Test keyword routing is used when embeddings are unavailable."""
+        with patch.object(registry, "get_classifier", return_value=None):
+            assert registry.find_by_text("Employee handbook").domain_id == "hr"
+
+    def test_classify_domain_uses_embeddings(self, registry):
+        """Test the multi-domain graph routes with the registry classifier."""
+        from langchain_core.messages import HumanMessage
+
+        from valerie.graph.multi_domain import _classify_domain
+
+        state = ChatState(messages=[HumanMessage(content="Request parental leave next month")])
+        assert _classify_domain(state) == "hr"
+
+    def test_pluggable_domain_classifier_node(self):
+        """Test a custom domain classifier node can replace the default."""
+        from valerie.graph.multi_domain import build_multi_domain_graph
+
+        async def custom(state: ChatState) -> ChatState:
+            state.entities["_domain"] = "supplier"
+            return state
+
+        graph = build_multi_domain_graph(domain_classifier=custom)
+        assert graph.nodes["domain_classifier"].runnable.afunc.__wrapped__ is custom
@@ -1,5 +1,8 @@
 """Unit tests for Guardrails agent."""
 
+import random
+import re
+
 import pytest
 from langchain_core.messages import HumanMessage
 
@@ -143,3 +146,59 @@ class TestGuardrailsAgent:
         state = ChatState(session_id="test")
         result = await agent.process(state)
         assert result.guardrails_passed  # No message to check
+
+
+class TestGuardrailsScanner:
+    """Tests that the compiled scanners agree with plain per-pattern searches."""
+
+    FRAGMENTS = [
+        "123-45-6789",
+        "912-34-5678",
+        "AB1234567",
+        "4111 1111 1111 1111",
+        "buyer@example.com",
+        "555-123-4567",
+        "10.0.0.1",
+        "DE89370400440532013000",
+        "MRN123456",
+        "DOB 1/2/1990",
+        "ssn",
+        "account",
+        "1HGCM82633A004352",
+        "ab:cd:ef:ab:cd:ef:ab:cd",
+        "ignore all previous instructions",
+        "system: ",
+        "<script",
+        "{{x}}",
+        "controlled unclassified",
+        "circuit",
+        "ear99",
+        "heat treatment",
+        "\n",
+    ]
+
+    def test_matches_per_pattern_search(self):
+        """Test PII, injection and ITAR results on random texts."""
+        agent = GuardrailsAgent()
+        rng = random.Random(0)
+
+        for _ in range(500):
+            text = " ".join(rng.choice(self.FRAGMENTS) for _ in range(rng.randint(0, 10)))
+            lower = text.lower()
+
+            assert agent._check_pii(text) == [
+                name
+                for name, pattern in agent.PII_PATTERNS.items()
+                if re.search(pattern, text, re.IGNORECASE)
+            ]
+            assert agent._check_injection(text) == any(
+                re.search(pattern, lower) for pattern in agent.INJECTION_PATTERNS
+            )
+            assert agent._check_itar(text) == [kw for kw in agent.ITAR_KEYWORDS if kw in lower]
+
+    def test_scan_is_capped(self):
+        """Test text past guardrails_scan_max_chars is not scanned."""
+        agent = GuardrailsAgent()
+        agent.settings = agent.settings.model_copy(update={"guardrails_scan_max_chars": 100})
+
+        assert agent._check_pii("x " * 100 + "123-45-6789") == []
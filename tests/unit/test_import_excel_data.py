@@ -0,0 +1,618 @@
+"""Tests for the Excel/CSV import script."""
+
+import csv
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+from rich.progress import Progress
+from sqlalchemy import select, text
+
+from valerie.data.database import Database
+from valerie.data.schema import (
+    Category,
+    ImportState,
+    LegalEntity,
+    Supplier,
+    SupplierCategory,
+    SupplierItem,
+)
+
+# Importable by name so worker processes can unpickle its functions
+sys.path.insert(0, str(Path(__file__).parents[2] / "scripts"))
+import import_excel_data as importer  # noqa: E402
+
+HEADERS = [
+    "Sold-to Legal Entity",
+    "Purchase Order Number",
+    "Supplier Name",
+    "Supplier Site",
+    "Open Date",
+    "Item",
+    "Item Description",
+    "Category Name",
+    "UOM",
+    "Net Ordered Quantity",
+    "Purchase Price",
+    "Ordered Amount",
+]
+
+ROWS = [
+    [
+        "Entity A",
+        "PO-1",
+        "Acme",
+        "Dallas",
+        "2024-01-05",
+        "ACE-100",
+        "Acetone",
+        "Controlled Material-Chemicals-Acetone",
+        "GAL",
+        10,
+        5.0,
+        50.0,
+    ],
+    [
+        "Entity A",
+        "PO-1",
+        "Acme",
+        "Dallas",
+        "2024-01-05",
+        "IPA-200",
+        "Alcohol",
+        "Controlled Material-Chemicals-Alcohol",
+        "GAL",
+        2,
+        8.0,
+        16.0,
+    ],
+    [
+        "Entity B",
+        "PO-2",
+        "Acme",
+        "Dallas",
+        "2024-03-01",
+        "ACE-100",
+        "Acetone",
+        "Controlled Material-Chemicals-Acetone",
+        "GAL",
+        4,
+        7.0,
+        28.0,
+    ],
+    [
+        "Entity B",
+        "PO-3",
+        "Delta",
+        "Tulsa",
+        "2024-02-10",
+        "ACE-100",
+        "Acetone",
+        "Controlled Material-Chemicals-Acetone",
+        "GAL",
+        1,
+        6.0,
+        6.0,
+    ],
+    ["Entity B", "PO-3", "", "", "2024-02-10", "X-1", "No supplier", "", "EA", 1, 1.0, 1.0],
+]
+
+
+def write_csv(path: Path, rows=ROWS) -> Path:
+    """Write rows to a CSV file with the export headers."""
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+    return path
+
+
+def write_xlsx(path: Path, rows=ROWS) -> Path:
+    """Write rows to an Excel workbook with the export headers."""
+    wb = Workbook()
+    sheet = wb.active
+    sheet.append(HEADERS)
+    for row in rows:
+        sheet.append([datetime.fromisoformat(v) if i == 4 and v else v for i, v in enumerate(row)])
+    wb.save(path)
+    return path
+
+
+def snapshot(db: Database) -> dict:
+    """Read every imported table into comparable tuples."""
+    with db.get_session() as session:
+        return {
+            "suppliers": sorted(
+                (
+                    s.name,
+                    s.site,
+                    s.total_orders,
+                    s.total_amount,
+                    s.avg_order_value,
+                    s.first_order_date,
+                    s.last_order_date,
+                )
+                for s in session.execute(select(Supplier)).scalars()
+            ),
+            "items": sorted(
+                (
+                    i.supplier.name,
+                    i.item_code,
+                    i.category.name if i.category else None,
+                    i.avg_price,
+                    i.min_price,
+                    i.max_price,
+                    i.total_ordered_qty,
+                    i.total_ordered_amount,
+                    i.order_count,
+                    i.last_order_date,
+                )
+                for i in session.execute(select(SupplierItem)).scalars()
+            ),
+            "categories": sorted(
+                (c.name, c.level1, c.level2, c.level3, c.item_count, c.total_amount)
+                for c in session.execute(select(Category)).scalars()
+            ),
+            "supplier_categories": sorted(
+                (sc.supplier.name, sc.category.name, sc.item_count, sc.total_amount)
+                for sc in session.execute(select(SupplierCategory)).scalars()
+            ),
+            "legal_entities": sorted(
+                (le.name, le.total_orders, le.total_amount)
+                for le in session.execute(select(LegalEntity)).scalars()
+            ),
+        }
+
+
+@pytest.fixture
+def progress():
+    return Progress(disable=True)
+
+
+def import_orm(db: Database, aggregates, progress) -> None:
+    with db.get_session() as session:
+        importer.insert_or_update_data(
+            session,
+            aggregates.suppliers,
+            aggregates.items,
+            aggregates.categories,
+            aggregates.supplier_categories,
+            aggregates.legal_entities,
+            progress,
+        )
+
+
+def import_bulk(db: Database, aggregates, progress, batch_size=2) -> None:
+    with db.engine.begin() as connection:
+        importer.bulk_upsert_data(connection, aggregates, progress, batch_size=batch_size)
+
+
+class TestDistinctCounter:
+    """Tests for the bounded-memory PO counter."""
+
+    def test_exact_counting(self):
+        """Test duplicates are counted once while exact."""
+        counter = importer.DistinctCounter()
+        for value in ["PO-1", "PO-2", "PO-1", "PO-3", "PO-2"]:
+            counter.add(value)
+        assert len(counter) == 3
+        assert counter.is_exact
+
+    def test_switches_to_sketch_past_limit(self):
+        """Test the counter becomes an approximate sketch past its limit."""
+        counter = importer.DistinctCounter(exact_limit=100)
+        for i in range(50_000):
+            counter.add(f"PO-{i}")
+            counter.add(f"PO-{i}")
+        assert not counter.is_exact
+        assert len(counter) == pytest.approx(50_000, rel=0.05)
+
+    def test_sketch_small_range_is_accurate(self):
+        """Test small cardinalities stay near-exact after conversion."""
+        counter = importer.DistinctCounter(exact_limit=10)
+        for i in range(200):
+            counter.add(f"PO-{i}")
+        assert not counter.is_exact
+        assert len(counter) == pytest.approx(200, rel=0.05)
+
+    def test_merge_exact(self):
+        """Test merging two exact counters is a set union."""
+        a, b = importer.DistinctCounter(), importer.DistinctCounter()
+        for value in ["PO-1", "PO-2"]:
+            a.add(value)
+        for value in ["PO-2", "PO-3"]:
+            b.add(value)
+        a.merge(b)
+        assert len(a) == 3
+        assert a.is_exact
+
+    def test_merge_exact_into_sketch(self):
+        """Test merging mixes exact and sketch counters."""
+        a = importer.DistinctCounter(exact_limit=100)
+        b = importer.DistinctCounter(exact_limit=100)
+        for i in range(5_000):
+            a.add(f"PO-{i}")
+        for i in range(4_000, 4_050):
+            b.add(f"PO-{i}")
+        b.merge(a)
+        assert not b.is_exact
+        assert len(b) == pytest.approx(5_000, rel=0.05)
+
+
+class TestItemAgg:
+    """Tests for running price aggregates."""
+
+    def test_running_prices(self):
+        """Test min/max/mean match the list-based computation."""
+        item = importer.ItemAgg(item_code="A", supplier_name="S")
+        prices = [5.0, 2.5, 9.0, 4.0]
+        for price in prices:
+            item.add_price(price)
+        assert item.min_price == min(prices)
+        assert item.max_price == max(prices)
+        assert item.avg_price == sum(prices) / len(prices)
+
+    def test_no_prices(self):
+        """Test an item without priced lines reports zeros."""
+        item = importer.ItemAgg(item_code="A", supplier_name="S")
+        assert (item.min_price, item.max_price, item.avg_price) == (0.0, 0.0, 0.0)
+
+
+class TestAggregateData:
+    """Tests for reading and aggregating export files."""
+
+    def test_csv(self, tmp_path, progress):
+        """Test CSV exports are aggregated."""
+        aggregates = importer.aggregate_data(write_csv(tmp_path / "po.csv"), progress)
+
+        assert aggregates.rows_read == 5
+        assert set(aggregates.suppliers) == {"Acme", "Delta"}
+        acme = aggregates.suppliers["Acme"]
+        assert acme.total_orders == 2
+        assert acme.total_amount == 94.0
+        assert acme.first_order_date == datetime(2024, 1, 5)
+        item = aggregates.items[("Acme", "ACE-100")]
+        assert (item.min_price, item.max_price, item.avg_price) == (5.0, 7.0, 6.0)
+        assert aggregates.legal_entities["Entity B"].total_orders == 2
+
+    def test_csv_matches_xlsx(self, tmp_path, progress):
+        """Test CSV and Excel inputs produce the same aggregates."""
+        from_csv = importer.aggregate_data(write_csv(tmp_path / "po.csv"), progress)
+        from_xlsx = importer.aggregate_data(write_xlsx(tmp_path / "po.xlsx"), progress)
+
+        assert from_csv.rows_read == from_xlsx.rows_read
+        for name, agg in from_csv.suppliers.items():
+            other = from_xlsx.suppliers[name]
+            assert (agg.total_orders, agg.total_amount, agg.last_order_date) == (
+                other.total_orders,
+                other.total_amount,
+                other.last_order_date,
+            )
+        assert set(from_csv.items) == set(from_xlsx.items)
+        assert set(from_csv.supplier_categories) == set(from_xlsx.supplier_categories)
+
+
+def summarize(aggregates) -> dict:
+    """Reduce aggregates to plain comparable values."""
+    return {
+        "rows_read": aggregates.rows_read,
+        "suppliers": {
+            k: (v.site, v.total_orders, v.total_amount, v.first_order_date, v.last_order_date)
+            for k, v in aggregates.suppliers.items()
+        },
+        "items": {
+            k: (
+                v.description,
+                v.category,
+                v.uom,
+                v.min_price,
+                v.max_price,
+                v.avg_price,
+                v.total_qty,
+                v.total_amount,
+                v.order_count,
+                v.last_order_date,
+            )
+            for k, v in aggregates.items.items()
+        },
+        "categories": {
+            k: (v.level1, v.level2, v.level3, v.item_count, v.total_amount)
+            for k, v in aggregates.categories.items()
+        },
+        "supplier_categories": {
+            k: (v.item_count, v.total_amount) for k, v in aggregates.supplier_categories.items()
+        },
+        "legal_entities": {
+            k: (v.total_orders, v.total_amount) for k, v in aggregates.legal_entities.items()
+        },
+    }
+
+
+class TestParallelAggregation:
+    """Tests for sharded multi-process aggregation."""
+
+    def test_matches_sequential(self, tmp_path, progress):
+        """Test sharded aggregation equals a single-process run."""
+        rows = ROWS * 7
+        path = write_csv(tmp_path / "po.csv", rows)
+
+        sequential = importer.aggregate_data(path, progress)
+        parallel = importer.aggregate_data(path, progress, workers=2, chunk_rows=3)
+
+        assert summarize(parallel) == summarize(sequential)
+
+    def test_merge_keeps_first_seen_fields(self):
+        """Test merging in file order keeps values from the earliest row."""
+        first = importer.aggregate_rows(
+            [
+                {
+                    "supplier_name": "Acme",
+                    "supplier_site": "Dallas",
+                    "item_code": "A",
+                    "item_description": "Old",
+                    "unit_price": 4,
+                    "amount": 4,
+                    "po_number": "PO-1",
+                },
+            ]
+        )
+        second = importer.aggregate_rows(
+            [
+                {
+                    "supplier_name": "Acme",
+                    "supplier_site": "Austin",
+                    "item_code": "A",
+                    "item_description": "New",
+                    "unit_price": 2,
+                    "amount": 2,
+                    "po_number": "PO-2",
+                },
+            ]
+        )
+        first.merge(second)
+
+        assert first.suppliers["Acme"].site == "Dallas"
+        assert first.suppliers["Acme"].total_orders == 2
+        item = first.items[("Acme", "A")]
+        assert item.description == "Old"
+        assert (item.min_price, item.max_price, item.avg_price) == (2.0, 4.0, 3.0)
+        assert first.rows_read == 2
+
+    def test_parse_category_is_memoized(self):
+        """Test repeated category strings are parsed once."""
+        importer.parse_category.cache_clear()
+        for _ in range(3):
+            importer.parse_category("Controlled Material-Chemicals-Acetone")
+        info = importer.parse_category.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+
+class TestBulkUpsert:
+    """Tests for the batched ON CONFLICT writer."""
+
+    def test_matches_orm_import(self, tmp_path, progress):
+        """Test bulk upserts write the same data as the ORM path."""
+        aggregates = importer.aggregate_data(write_csv(tmp_path / "po.csv"), progress)
+
+        orm_db = Database(tmp_path / "orm.db")
+        orm_db.create_tables()
+        import_orm(orm_db, aggregates, progress)
+
+        bulk_db = Database(tmp_path / "bulk.db")
+        bulk_db.create_tables()
+        import_bulk(bulk_db, aggregates, progress)
+
+        assert snapshot(bulk_db) == snapshot(orm_db)
+
+    def test_reimport_updates_in_place(self, tmp_path, progress):
+        """Test re-running an import updates rows instead of duplicating them."""
+        db = Database(tmp_path / "bulk.db")
+        db.create_tables()
+        import_bulk(db, importer.aggregate_data(write_csv(tmp_path / "a.csv"), progress), progress)
+
+        changed = [row.copy() for row in ROWS]
+        changed[0][10], changed[0][11] = 1.0, 10.0
+        aggregates = importer.aggregate_data(write_csv(tmp_path / "b.csv", changed), progress)
+        import_bulk(db, aggregates, progress)
+
+        with db.get_session() as session:
+            assert session.query(Supplier).count() == 2
+            assert session.query(SupplierItem).count() == 3
+            item = session.execute(
+                select(SupplierItem)
+                .join(Supplier)
+                .where(Supplier.name == "Acme", SupplierItem.item_code == "ACE-100")
+            ).scalar_one()
+            assert item.min_price == 1.0
+            acme = session.execute(select(Supplier).where(Supplier.name == "Acme")).scalar_one()
+            assert acme.total_amount == 54.0
+
+    def test_adds_unique_key_to_older_databases(self, tmp_path, progress):
+        """Test databases with a non-unique supplier item index are upgraded."""
+        db = Database(tmp_path / "old.db")
+        db.create_tables()
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_supplier_item"))
+            connection.execute(
+                text("CREATE INDEX ix_supplier_item ON supplier_items (supplier_id, item_code)")
+            )
+
+        aggregates = importer.aggregate_data(write_csv(tmp_path / "po.csv"), progress)
+        import_bulk(db, aggregates, progress)
+        import_bulk(db, aggregates, progress)
+
+        with db.get_session() as session:
+            assert session.query(SupplierItem).count() == 3
+
+
+def run_import(*args: str):
+    """Invoke the import command line and assert it succeeded."""
+    from typer.testing import CliRunner
+
+    result = CliRunner().invoke(importer.app, list(args))
+    assert result.exit_code == 0, result.output
+    return result
+
+
+class TestWatermarkFilter:
+    """Tests for incremental-import row filtering."""
+
+    def test_date_watermark(self):
+        """Test only rows after the stored date pass, and the high mark advances."""
+        watermark = importer.WatermarkFilter("date", "2024-02-10T00:00:00")
+        rows = [
+            {"creation_date": datetime(2024, 1, 5)},
+            {"creation_date": "2024-02-10"},
+            {"creation_date": "2024-03-01"},
+            {"creation_date": None},
+        ]
+        passed = list(watermark(rows))
+
+        assert passed == [{"creation_date": "2024-03-01"}]
+        assert watermark.rows_skipped == 3
+        assert (watermark.rows_at_watermark, watermark.rows_without_value) == (1, 1)
+        assert watermark.high == "2024-03-01T00:00:00"
+
+    def test_po_watermark_is_numeric(self):
+        """Test numeric PO numbers compare as numbers, not strings."""
+        watermark = importer.WatermarkFilter("po", "999")
+        passed = list(watermark([{"po_number": "1000"}, {"po_number": "998"}]))
+
+        assert passed == [{"po_number": "1000"}]
+        assert watermark.high == "1000"
+
+    def test_without_watermark_passes_everything(self):
+        """Test a full import passes every row and records the high mark."""
+        watermark = importer.WatermarkFilter("po")
+        passed = list(watermark([{"po_number": "7"}, {"po_number": ""}, {"po_number": "3"}]))
+
+        assert len(passed) == 3
+        assert watermark.high == "7"
+
+
+class TestIncrementalImport:
+    """Tests for delta imports merged into stored aggregates."""
+
+    def test_delta_matches_full_import(self, tmp_path):
+        """Test full import + incremental delta equals one full import."""
+        earlier = [row for row in ROWS if row[4] <= "2024-02-10"]
+        write_csv(tmp_path / "day1.csv", earlier)
+        write_csv(tmp_path / "day2.csv", ROWS)
+
+        run_import("--input", str(tmp_path / "day1.csv"), "-d", str(tmp_path / "inc.db"))
+        result = run_import(
+            "--input", str(tmp_path / "day2.csv"), "-d", str(tmp_path / "inc.db"), "--incremental"
+        )
+        assert "Skipped 4 rows" in result.output
+        assert "2 rows equal to the watermark" in result.output
+        run_import("--input", str(tmp_path / "day2.csv"), "-d", str(tmp_path / "full.db"))
+
+        incremental_db = Database(tmp_path / "inc.db")
+        assert snapshot(incremental_db) == snapshot(Database(tmp_path / "full.db"))
+        with incremental_db.get_session() as session:
+            state = session.get(ImportState, "po_history")
+            assert (state.last_mode, state.watermark) == ("incremental", "2024-03-01T00:00:00")
+            assert (state.rows_read, state.rows_imported) == (5, 1)
+
+    def test_first_incremental_runs_full_import(self, tmp_path):
+        """Test --incremental without stored state imports everything."""
+        write_csv(tmp_path / "po.csv")
+        result = run_import(
+            "--input", str(tmp_path / "po.csv"), "-d", str(tmp_path / "v.db"), "--incremental"
+        )
+
+        assert "running a full import" in result.output
+        with Database(tmp_path / "v.db").get_session() as session:
+            assert session.query(Supplier).count() == 2
+            assert session.get(ImportState, "po_history").last_mode == "full"
+
+    def test_missing_watermark_fails(self, tmp_path):
+        """Test --incremental refuses to re-add everything when no watermark was stored."""
+        from typer.testing import CliRunner
+
+        rows = [[*row[:4], "01/15/2024", *row[5:]] for row in ROWS]
+        write_csv(tmp_path / "po.csv", rows)
+        result = run_import("--input", str(tmp_path / "po.csv"), "-d", str(tmp_path / "v.db"))
+        assert "5 rows have no parseable Open Date" in result.output
+
+        result = CliRunner().invoke(
+            importer.app,
+            ["--input", str(tmp_path / "po.csv"), "-d", str(tmp_path / "v.db"), "--incremental"],
+        )
+
+        assert result.exit_code == 1
+        assert "no stored watermark" in result.output
+        with Database(tmp_path / "v.db").get_session() as session:
+            acme = session.execute(select(Supplier).where(Supplier.name == "Acme")).scalar_one()
+            assert (acme.total_orders, acme.total_amount) == (2, 94.0)
+
+    def test_watermark_column_mismatch_fails(self, tmp_path):
+        """Test switching the watermark column requires a full import."""
+        from typer.testing import CliRunner
+
+        write_csv(tmp_path / "po.csv")
+        run_import("--input", str(tmp_path / "po.csv"), "-d", str(tmp_path / "v.db"))
+        result = CliRunner().invoke(
+            importer.app,
+            [
+                "--input",
+                str(tmp_path / "po.csv"),
+                "-d",
+                str(tmp_path / "v.db"),
+                "--incremental",
+                "--watermark-by",
+                "po",
+            ],
+        )
+
+        assert result.exit_code == 1
+
+    @pytest.mark.parametrize(
+        "options",
+        [["--watermark-by", "id"], ["--incremental"]],
+        ids=["bad-watermark", "incremental"],
+    )
+    def test_invalid_options_do_not_drop_tables(self, tmp_path, options):
+        """Test options are validated before --drop-existing deletes anything."""
+        from typer.testing import CliRunner
+
+        write_csv(tmp_path / "po.csv")
+        run_import("--input", str(tmp_path / "po.csv"), "-d", str(tmp_path / "v.db"))
+        result = CliRunner().invoke(
+            importer.app,
+            [
+                "--input",
+                str(tmp_path / "po.csv"),
+                "-d",
+                str(tmp_path / "v.db"),
+                "--drop-existing",
+                *options,
+            ],
+        )
+
+        assert result.exit_code == 1
+        with Database(tmp_path / "v.db").get_session() as session:
+            assert session.query(Supplier).count() == 2
+            assert session.get(ImportState, "po_history") is not None
+
+    def test_items_without_price_stats(self, tmp_path, progress):
+        """Test items imported before price stats existed still merge sensibly."""
+        db = Database(tmp_path / "v.db")
+        db.create_tables()
+        earlier = importer.aggregate_data(write_csv(tmp_path / "a.csv", ROWS[:1]), progress)
+        import_bulk(db, earlier, progress)
+        with db.engine.begin() as connection:
+            connection.execute(text("DELETE FROM supplier_item_price_stats"))
+
+        delta = importer.aggregate_data(write_csv(tmp_path / "b.csv", ROWS[2:3]), progress)
+        with db.engine.begin() as connection:
+            importer.merge_delta(connection, delta, progress)
+
+        with db.get_session() as session:
+            item = session.execute(
+                select(SupplierItem).where(SupplierItem.item_code == "ACE-100")
+            ).scalar_one()
+            assert (item.min_price, item.max_price, item.avg_price) == (5.0, 7.0, 6.0)
+            assert item.order_count == 2
@@ -8,8 +8,10 @@ import pytest
 from valerie.infrastructure.evaluation import EvaluationAgent
 from valerie.infrastructure.hitl import HITLAgent
 from valerie.infrastructure.observability import (
+    InMemoryBackend,
     ObservabilityManager,
     get_observability,
+    truncate_payload,
 )
 from valerie.models import (
     ChatState,
@@ -408,3 +410,126 @@ class TestObservabilityManager:
         state = ChatState()
         result = await mock_agent(state)
         assert result is not None
+
+
+class TestInMemoryBackend:
+    """Tests for the bounded in-memory tracing backend."""
+
+    def test_ring_buffer_evicts_oldest(self):
+        """Test that only the most recent traces are kept."""
+        backend = InMemoryBackend(max_traces=3, sample_rate=1.0)
+        trace_ids = [backend.start_trace(f"trace-{i}") for i in range(5)]
+
+        assert backend.get_trace(trace_ids[0]) is None
+        assert backend.get_trace(trace_ids[1]) is None
+        assert [t["name"] for t in backend.recent_traces()] == ["trace-4", "trace-3", "trace-2"]
+        assert backend.stats()["evicted"] == 2
+
+    def test_span_lookup_by_id(self):
+        """Test that spans are ended by ID regardless of order."""
+        backend = InMemoryBackend(sample_rate=1.0)
+        trace_id = backend.start_trace("trace")
+        first = backend.start_span(trace_id, "first")
+        second = backend.start_span(trace_id, "second")
+
+        backend.end_span(trace_id, first, "success", output="done")
+        backend.end_span(trace_id, second, "error", output="boom")
+
+        spans = backend.get_trace(trace_id)["spans"]
+        assert [s["status"] for s in spans] == ["success", "error"]
+        assert spans[0]["output"] == "done"
+
+    def test_max_spans_per_trace(self):
+        """Test that spans beyond the per-trace limit are counted, not stored."""
+        backend = InMemoryBackend(sample_rate=1.0, max_spans=2)
+        trace_id = backend.start_trace("trace")
+        for i in range(4):
+            backend.start_span(trace_id, f"span-{i}")
+
+        trace = backend.get_trace(trace_id)
+        assert len(trace["spans"]) == 2
+        assert trace["dropped_spans"] == 2
+
+    def test_head_sampling_drops_successful_traces(self):
+        """Test that unsampled traces are discarded when they succeed."""
+        backend = InMemoryBackend(sample_rate=0.0)
+        trace_id = backend.start_trace("trace")
+        backend.end_trace(trace_id)
+
+        assert backend.get_trace(trace_id) is None
+        assert backend.stats()["sampled_out"] == 1
+
+    def test_tail_sampling_keeps_errors(self):
+        """Test that unsampled traces are kept when a span fails."""
+        backend = InMemoryBackend(sample_rate=0.0)
+        trace_id = backend.start_trace("trace")
+        span_id = backend.start_span(trace_id, "agent:search")
+        backend.end_span(trace_id, span_id, "error", "boom")
+        backend.end_trace(trace_id)
+
+        trace = backend.get_trace(trace_id)
+        assert trace["status"] == "error"
+        assert "duration_ms" in trace
+
+    def test_tail_sampling_keeps_slow_traces(self):
+        """Test that unsampled traces are kept when they are slow."""
+        backend = InMemoryBackend(sample_rate=0.0, slow_trace_ms=50)
+        fast = backend.start_trace("fast")
+        slow = backend.start_trace("slow")
+        backend.end_trace(fast)
+        with patch("valerie.infrastructure.observability.time.monotonic", return_value=1e9):
+            backend.end_trace(slow)
+
+        assert backend.get_trace(fast) is None
+        assert backend.get_trace(slow) is not None
+
+    def test_payload_truncation(self):
+        """Test that stored messages and outputs are truncated."""
+        backend = InMemoryBackend(sample_rate=1.0, max_payload_chars=10)
+        trace_id = backend.start_trace("trace", metadata={"query": "x" * 50})
+        backend.log_llm_call(
+            trace_id, "groq", "llama", [{"role": "user", "content": "y" * 50}], "z" * 50
+        )
+        backend.end_trace(trace_id, output=object())
+
+        trace = backend.get_trace(trace_id)
+        assert trace["metadata"]["query"] == "x" * 10 + "...[40 chars truncated]"
+        assert trace["llm_calls"][0]["messages"][0]["content"].startswith("y" * 10 + "...")
+        assert trace["llm_calls"][0]["response"].startswith("z" * 10 + "...")
+        assert isinstance(trace["output"], str)
+
+    def test_truncate_payload_disabled(self):
+        """Test that a zero limit stores payloads unchanged."""
+        payload = {"text": "x" * 100}
+        assert truncate_payload(payload, 0) is payload
+        assert truncate_payload(("a", 1, None), 5) == ["a", 1, None]
+
+    def test_manager_records_failed_trace(self):
+        """Test that the manager ends failed traces with an error status."""
+        manager = ObservabilityManager()
+        manager._backend = InMemoryBackend(sample_rate=0.0)
+
+        with pytest.raises(ValueError):
+            with manager.trace("failing"):
+                raise ValueError("boom")
+        with manager.trace("ok"):
+            pass
+
+        traces = manager.recent_traces()
+        assert [t["name"] for t in traces] == ["failing"]
+        assert traces[0]["status"] == "error"
+
+    def test_manager_ends_standalone_span_traces(self):
+        """Test that spans outside a trace end their standalone trace."""
+        from valerie.infrastructure.correlation import reset_correlation_context
+
+        reset_correlation_context()
+        manager = ObservabilityManager()
+        manager._backend = InMemoryBackend(sample_rate=1.0)
+
+        with manager.span("lookup"):
+            pass
+
+        trace = manager.recent_traces(1)[0]
+        assert trace["name"] == "standalone:lookup"
+        assert "end_time" in trace
@@ -0,0 +1,154 @@
+"""Tests for the LangChain chat model adapter."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import anthropic
+import httpx
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessageChunk
+
+from valerie.infrastructure.fallback import reset_shared_circuit_breakers
+from valerie.llm.base import (
+    AuthenticationError,
+    LLMMessage,
+    LLMProviderError,
+    MessageRole,
+    RateLimitError,
+)
+from valerie.llm.langchain_chat import LangChainChatProvider, to_provider_error
+from valerie.llm.retry import RetryEngine, RetryPolicy
+
+MESSAGES = [
+    LLMMessage(role=MessageRole.SYSTEM, content="You classify intents."),
+    LLMMessage(role=MessageRole.USER, content="que es nadcap"),
+]
+
+
+class StatusError(Exception):
+    """SDK-style error carrying an HTTP status and response."""
+
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = httpx.Response(status_code, headers=headers or {})
+
+
+def usage(input_tokens: int, output_tokens: int) -> dict:
+    """LangChain usage metadata."""
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_shared_circuit_breakers()
+    yield
+    reset_shared_circuit_breakers()
+
+
+class TestToProviderError:
+    """Tests for SDK error conversion."""
+
+    def test_rate_limit_keeps_retry_after(self):
+        """Test a 429 becomes a RateLimitError with the server's retry-after."""
+        error = to_provider_error(StatusError(429, {"retry-after": "3"}), "anthropic")
+
+        assert isinstance(error, RateLimitError)
+        assert error.retry_after == 3
+
+    @pytest.mark.parametrize(
+        ("status_code", "retryable"), [(529, True), (500, True), (400, False), (404, False)]
+    )
+    def test_status_errors(self, status_code, retryable):
+        """Test server errors are retryable and client errors are not."""
+        error = to_provider_error(StatusError(status_code), "anthropic")
+
+        assert isinstance(error, LLMProviderError)
+        assert (error.status_code, error.retryable) == (status_code, retryable)
+
+    def test_authentication(self):
+        """Test 401 becomes an AuthenticationError."""
+        assert isinstance(to_provider_error(StatusError(401), "anthropic"), AuthenticationError)
+
+    def test_connection_errors_are_retryable(self):
+        """Test SDK connection errors are retryable provider errors."""
+        sdk_error = anthropic.APIConnectionError(
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        )
+        error = to_provider_error(sdk_error, "anthropic")
+
+        assert isinstance(error, LLMProviderError)
+        assert error.retryable is True
+
+    def test_other_errors_unchanged(self):
+        """Test unrelated errors are left for the caller."""
+        error = ValueError("bad prompt")
+        assert to_provider_error(error, "anthropic") is error
+
+
+class TestLangChainChatProvider:
+    """Tests for the provider interface over a chat model."""
+
+    @pytest.mark.asyncio
+    async def test_generate(self):
+        """Test a response is returned with the model's provider and name."""
+        provider = LangChainChatProvider(FakeListChatModel(responses=["NADCAP"]), "fallback")
+
+        response = await provider.generate(MESSAGES)
+
+        assert (response.content, response.provider) == ("NADCAP", "fakelistchatmodel")
+        assert response.model == "fallback"
+
+    @pytest.mark.asyncio
+    async def test_generate_stream(self):
+        """Test streamed chunks carry the content and end with a done chunk."""
+        provider = LangChainChatProvider(FakeListChatModel(responses=["NADCAP"]))
+
+        chunks = [chunk async for chunk in provider.generate_stream(MESSAGES)]
+
+        assert "".join(c.content for c in chunks) == "NADCAP"
+        assert chunks[-1].done
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_sums_usage(self):
+        """Test incremental chunk usage is summed onto the done chunk."""
+
+        async def astream(messages):
+            yield AIMessageChunk(content="NAD", usage_metadata=usage(12, 0))
+            yield AIMessageChunk(content="CAP", usage_metadata=usage(0, 3))
+
+        llm = MagicMock()
+        llm.astream = astream
+
+        chunks = [c async for c in LangChainChatProvider(llm).generate_stream(MESSAGES)]
+
+        assert chunks[-1].usage == {"input_tokens": 12, "output_tokens": 3}
+
+    @pytest.mark.asyncio
+    async def test_retried_by_engine(self):
+        """Test an overloaded model is retried through the retry engine."""
+        llm = AsyncMock()
+        llm.ainvoke.side_effect = [StatusError(529), MagicMock(content="NADCAP")]
+        engine = RetryEngine(RetryPolicy(base_delay=0, failover=False))
+
+        response = await engine.generate(LangChainChatProvider(llm), MESSAGES)
+
+        assert response.content == "NADCAP"
+        assert llm.ainvoke.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_agent_langchain_path_retried(self):
+        """Test agents on the LangChain path get retries from their retry engine."""
+        from tests.unit.test_base_agent import ConcreteAgent
+
+        agent = ConcreteAgent()
+        agent._llm = AsyncMock()
+        agent._llm.ainvoke.side_effect = [StatusError(503), MagicMock(content="NADCAP")]
+        agent._retry_engine = RetryEngine(RetryPolicy(base_delay=0, failover=False))
+
+        assert await agent.invoke_llm("que es nadcap") == "NADCAP"
+        assert agent._llm.ainvoke.await_count == 2
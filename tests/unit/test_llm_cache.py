@@ -0,0 +1,328 @@
+"""Tests for the LLM response cache."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from valerie.llm.base import LLMConfig, LLMMessage, LLMResponse, MessageRole, StreamChunk
+from valerie.llm.cache import (
+    CachedLLMProvider,
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    SemanticIndex,
+    cosine_similarity,
+    create_response_cache,
+    get_response_cache,
+    make_cache_key,
+    ngram_embedding,
+    normalize_text,
+    reset_response_cache,
+)
+from valerie.llm.ollama import OllamaProvider
+
+
+def conversation(question: str, system: str = "You classify intents.") -> list[LLMMessage]:
+    return [
+        LLMMessage(role=MessageRole.SYSTEM, content=system),
+        LLMMessage(role=MessageRole.USER, content=question),
+    ]
+
+
+def make_provider(content: str = "NADCAP is an accreditation program") -> OllamaProvider:
+    """An Ollama provider whose generate() is mocked."""
+    provider = OllamaProvider()
+    provider.generate = AsyncMock(
+        return_value=LLMResponse(
+            content=content,
+            model="llama3.2",
+            provider="ollama",
+            usage={"input_tokens": 40, "output_tokens": 12},
+        )
+    )
+    return provider
+
+
+class TestCacheKey:
+    """Tests for exact-match cache keys."""
+
+    def test_same_request_same_key(self):
+        """Test identical requests share a key."""
+        key = make_cache_key("groq", "m", conversation("hola"), 0.1, 100)
+        assert key == make_cache_key("groq", "m", conversation("hola"), 0.1, 100)
+
+    @pytest.mark.parametrize(
+        "changed",
+        [
+            ("ollama", "m", conversation("hola"), 0.1, 100),
+            ("groq", "other", conversation("hola"), 0.1, 100),
+            ("groq", "m", conversation("hola!"), 0.1, 100),
+            ("groq", "m", conversation("hola", system="Other"), 0.1, 100),
+            ("groq", "m", conversation("hola"), 0.7, 100),
+            ("groq", "m", conversation("hola"), 0.1, 200),
+        ],
+    )
+    def test_any_field_changes_key(self, changed):
+        """Test every key component is significant."""
+        assert make_cache_key("groq", "m", conversation("hola"), 0.1, 100) != make_cache_key(
+            *changed
+        )
+
+
+class TestSemanticIndex:
+    """Tests for the similarity tier."""
+
+    def test_normalize_text(self):
+        """Test accents, case and punctuation are normalized."""
+        assert normalize_text("¿Qué es  NADCAP?") == "que es nadcap"
+
+    def test_embedding_similarity(self):
+        """Test near-duplicates score high and unrelated text low."""
+        base = ngram_embedding("que es nadcap")
+        assert cosine_similarity(base, ngram_embedding("¿Qué es NADCAP?")) == pytest.approx(1.0)
+        assert cosine_similarity(base, ngram_embedding("what is as9100")) < 0.5
+
+    def test_search_respects_scope_and_numbers(self):
+        """Test matches require the same scope and the same numbers."""
+        index = SemanticIndex(threshold=0.8)
+        index.add("scope", "status of PO 123", key="k1", ttl=60)
+        assert index.search("scope", "Status of PO 123?") == "k1"
+        assert index.search("other", "status of PO 123") is None
+        assert index.search("scope", "status of PO 124") is None
+
+    def test_below_threshold(self):
+        """Test dissimilar prompts do not match."""
+        index = SemanticIndex(threshold=0.95)
+        index.add("scope", "que es nadcap", key="k1", ttl=60)
+        assert index.search("scope", "que es as9100") is None
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    @pytest.mark.asyncio
+    async def test_exact_hit(self):
+        """Test a stored response is returned without token usage."""
+        cache = ResponseCache()
+        config = LLMConfig(model="m", temperature=0.1, max_tokens=100)
+        messages = conversation("que es nadcap")
+        assert await cache.get("groq", "m", messages, config) is None
+
+        response = LLMResponse(
+            content="answer", model="m", provider="groq", usage={"input_tokens": 5}
+        )
+        await cache.set("groq", "m", messages, config, response)
+        hit = await cache.get("groq", "m", messages, config)
+        assert hit.content == "answer"
+        assert hit.cache_hit == "exact"
+        assert hit.total_tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_semantic_hit(self):
+        """Test a near-duplicate question is served by the semantic tier."""
+        cache = ResponseCache(semantic=SemanticIndex())
+        config = LLMConfig(model="m")
+        response = LLMResponse(content="answer", model="m", provider="groq")
+        await cache.set("groq", "m", conversation("¿Qué es NADCAP?"), config, response)
+
+        hit = await cache.get("groq", "m", conversation("que es nadcap"), config)
+        assert hit.content == "answer"
+        assert hit.cache_hit == "semantic"
+        other_prompt = conversation("que es nadcap", system="Other agent")
+        assert await cache.get("groq", "m", other_prompt, config) is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after the TTL."""
+        cache = ResponseCache(ttl_seconds=10)
+        config = LLMConfig(model="m")
+        response = LLMResponse(content="answer", model="m", provider="groq")
+        await cache.set("groq", "m", conversation("q"), config, response)
+
+        now = time.monotonic()
+        monkeypatch.setattr("valerie.utils.cache.time.monotonic", lambda: now + 11)
+        assert await cache.get("groq", "m", conversation("q"), config) is None
+
+    @pytest.mark.asyncio
+    async def test_bounded(self):
+        """Test the in-memory backend evicts beyond max_entries."""
+        backend = InMemoryCacheBackend(max_entries=2)
+        cache = ResponseCache(backend=backend)
+        config = LLMConfig(model="m")
+        for i in range(5):
+            response = LLMResponse(content=str(i), model="m", provider="groq")
+            await cache.set("groq", "m", conversation(f"q{i}"), config, response)
+        assert len(backend) == 2
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_misses(self):
+        """Test a failing backend does not break generation."""
+        backend = MagicMock(spec=InMemoryCacheBackend)
+        backend.get = AsyncMock(side_effect=ConnectionError("down"))
+        backend.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = ResponseCache(backend=backend)
+        config = LLMConfig(model="m")
+        response = LLMResponse(content="a", model="m", provider="groq")
+        await cache.set("groq", "m", conversation("q"), config, response)
+        assert await cache.get("groq", "m", conversation("q"), config) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_backend(self):
+        """Test the Redis backend serializes with a TTL."""
+        client = AsyncMock()
+        backend = RedisCacheBackend(prefix="t:")
+        backend._client = client
+        await backend.set("k", {"content": "a"}, ttl=30)
+        client.setex.assert_awaited_once_with("t:k", 30, '{"content": "a"}')
+
+        client.get.return_value = '{"content": "a"}'
+        assert await backend.get("k") == {"content": "a"}
+        client.get.return_value = None
+        assert await backend.get("k") is None
+
+
+class TestCachedLLMProvider:
+    """Tests for the caching provider wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_question_served_from_cache(self):
+        """Test a repeated question calls the provider once."""
+        inner = make_provider()
+        provider = CachedLLMProvider(inner, ResponseCache())
+        first = await provider.generate(conversation("que es nadcap"))
+        second = await provider.generate(conversation("que es nadcap"))
+
+        assert inner.generate.await_count == 1
+        assert first.total_tokens == 52
+        assert second.content == first.content
+        assert second.total_tokens == 0
+        assert provider.name == "ollama"
+
+    @pytest.mark.asyncio
+    async def test_config_is_part_of_key(self):
+        """Test different generation settings miss the cache."""
+        inner = make_provider()
+        provider = CachedLLMProvider(inner, ResponseCache())
+        await provider.generate(conversation("q"), LLMConfig(temperature=0.1))
+        await provider.generate(conversation("q"), LLMConfig(temperature=0.9))
+        assert inner.generate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_hit(self):
+        """Test a cached response is streamed as one chunk."""
+        inner = make_provider()
+        provider = CachedLLMProvider(inner, ResponseCache())
+        await provider.generate(conversation("q"))
+        chunks = [c async for c in provider.generate_stream(conversation("q"))]
+        assert chunks == [
+            StreamChunk(
+                content="NADCAP is an accreditation program",
+                done=True,
+                model="llama3.2",
+                provider="ollama",
+            )
+        ]
+
+
+class TestConfiguration:
+    """Tests for environment configuration."""
+
+    def test_off_by_default(self, monkeypatch):
+        """Test caching is disabled unless configured."""
+        monkeypatch.delenv("VALERIE_LLM_CACHE", raising=False)
+        assert create_response_cache() is None
+
+    def test_memory_with_semantic(self, monkeypatch):
+        """Test the memory backend and semantic tier are configured from env."""
+        monkeypatch.setenv("VALERIE_LLM_CACHE", "memory")
+        monkeypatch.setenv("VALERIE_LLM_CACHE_SEMANTIC", "true")
+        monkeypatch.setenv("VALERIE_LLM_CACHE_SIMILARITY", "0.9")
+        monkeypatch.setenv("VALERIE_LLM_CACHE_TTL", "60")
+        cache = create_response_cache()
+        assert isinstance(cache.backend, InMemoryCacheBackend)
+        assert cache.semantic.threshold == 0.9
+        assert cache.ttl_seconds == 60
+
+    def test_redis(self, monkeypatch):
+        """Test the Redis backend uses the shared Redis URL."""
+        monkeypatch.setenv("VALERIE_LLM_CACHE", "redis")
+        monkeypatch.setenv("VALERIE_REDIS_URL", "redis://cache:6379")
+        cache = create_response_cache()
+        assert isinstance(cache.backend, RedisCacheBackend)
+        assert cache.backend.redis_url == "redis://cache:6379"
+
+    def test_singleton(self, monkeypatch):
+        """Test the process-wide cache is created once."""
+        monkeypatch.setenv("VALERIE_LLM_CACHE", "memory")
+        reset_response_cache()
+        try:
+            assert get_response_cache() is get_response_cache()
+        finally:
+            reset_response_cache()
+
+
+class TestAgentIntegration:
+    """Tests for BaseAgent using the response cache."""
+
+    @pytest.fixture
+    def memory_cache(self, monkeypatch):
+        monkeypatch.setenv("VALERIE_LLM_CACHE", "memory")
+        reset_response_cache()
+        yield get_response_cache()
+        reset_response_cache()
+
+    @pytest.mark.asyncio
+    async def test_provider_path(self, memory_cache):
+        """Test provider-based agents reuse cached answers."""
+        from tests.unit.test_base_agent import ConcreteProviderAgent
+
+        inner = make_provider()
+        with patch("valerie.agents.base.get_llm_provider", return_value=inner):
+            agent = ConcreteProviderAgent()
+            assert isinstance(agent.provider, CachedLLMProvider)
+            await agent.invoke_llm("que es nadcap")
+            assert await agent.invoke_llm("que es nadcap") == inner.generate.return_value.content
+        assert inner.generate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_langchain_path(self, memory_cache):
+        """Test LangChain-based agents reuse cached answers."""
+        from tests.unit.test_base_agent import ConcreteAgent
+
+        agent = ConcreteAgent()
+        agent._llm = AsyncMock()
+        agent._llm.ainvoke.return_value = MagicMock(content="cached answer")
+        await agent.invoke_llm("que es nadcap")
+        assert await agent.invoke_llm("que es nadcap") == "cached answer"
+        assert agent._llm.ainvoke.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_langchain_path_keyed_by_real_provider(self, memory_cache):
+        """Test LangChain answers are cached under the chat model's own provider."""
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+        from tests.unit.test_base_agent import ConcreteAgent
+
+        agent = ConcreteAgent()
+        agent._llm = FakeListChatModel(responses=["first answer", "second answer"])
+        provider = agent._langchain_provider()
+        assert (provider.name, provider.default_model) == (
+            "fakelistchatmodel",
+            agent.settings.model_name,
+        )
+
+        with patch.object(memory_cache, "set", wraps=memory_cache.set) as cache_set:
+            await agent.invoke_llm("que es nadcap")
+            assert await agent.invoke_llm("que es nadcap") == "first answer"
+
+        provider_name, _, _, _, response = cache_set.call_args.args
+        assert provider_name == response.provider == "fakelistchatmodel"
+
+    def test_anthropic_model_info(self):
+        """Test the default ChatAnthropic model reports its provider and model."""
+        from tests.unit.test_base_agent import ConcreteAgent
+
+        agent = ConcreteAgent()
+        provider = agent._langchain_provider()
+        assert (provider.name, provider.default_model) == ("anthropic", agent.settings.model_name)
@@ -0,0 +1,199 @@
+"""Tests for the background LLM provider health registry."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from valerie.infrastructure.metrics import llm_provider_available
+from valerie.llm.base import LLMProviderError
+from valerie.llm.factory import (
+    ProviderType,
+    clear_provider_cache,
+    get_available_provider,
+    health_check_all,
+)
+from valerie.llm.health import ProviderHealth, ProviderHealthRegistry
+
+
+def fake_provider(name: str, available: bool = True, delay: float = 0.0) -> MagicMock:
+    """Mock provider whose health check takes ``delay`` seconds."""
+
+    async def health_check():
+        await asyncio.sleep(delay)
+        return {"provider": name, "available": available, "default_model": f"{name}-model"}
+
+    provider = MagicMock()
+    provider.name = name
+    provider.health_check = AsyncMock(side_effect=health_check)
+    provider.is_available = AsyncMock(return_value=available)
+    return provider
+
+
+def patched_factory(providers: dict[str, MagicMock]):
+    """Patch the factory to return the given providers by name."""
+    return patch(
+        "valerie.llm.factory.get_llm_provider",
+        side_effect=lambda t: providers[getattr(t, "value", t)],
+    )
+
+
+class TestProviderHealthRegistry:
+    """Test probing and cached reads."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_probes_concurrently(self):
+        """Test all providers are probed at the same time."""
+        providers = {
+            "ollama": fake_provider("ollama", delay=0.2),
+            "groq": fake_provider("groq", delay=0.2),
+            "anthropic": fake_provider("anthropic", available=False, delay=0.2),
+        }
+        registry = ProviderHealthRegistry(
+            provider_types=[ProviderType.OLLAMA, ProviderType.GROQ, ProviderType.ANTHROPIC]
+        )
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with patched_factory(providers):
+            results = await registry.refresh()
+
+        assert loop.time() - start < 0.5
+        assert results["groq"].available is True
+        assert results["anthropic"].available is False
+        assert results["groq"].latency_ms >= 150
+        for provider in providers.values():
+            provider.reset_availability.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_probe_updates_gauge(self):
+        """Test probes set the provider availability gauge."""
+        registry = ProviderHealthRegistry(provider_types=[ProviderType.GROQ])
+
+        with patched_factory({"groq": fake_provider("groq", available=False)}):
+            await registry.refresh()
+
+        assert llm_provider_available.labels(provider="groq")._value.get() == 0
+
+    @pytest.mark.asyncio
+    async def test_probe_timeout_marks_unavailable(self):
+        """Test a hanging probe is cut off and reported as down."""
+        registry = ProviderHealthRegistry(provider_types=[ProviderType.OLLAMA], probe_timeout=0.05)
+
+        with patched_factory({"ollama": fake_provider("ollama", delay=5)}):
+            health = await registry.probe(ProviderType.OLLAMA)
+
+        assert health.available is False
+        assert "timed out" in health.error
+
+    @pytest.mark.asyncio
+    async def test_probe_error_marks_unavailable(self):
+        """Test factory errors are recorded instead of raised."""
+        registry = ProviderHealthRegistry(provider_types=[ProviderType.GROQ])
+
+        with patch("valerie.llm.factory.get_llm_provider", side_effect=Exception("no key")):
+            health = await registry.probe(ProviderType.GROQ)
+
+        assert health.available is False
+        assert health.error == "no key"
+
+    def test_stale_results_are_unknown(self):
+        """Test results older than the TTL are ignored."""
+        registry = ProviderHealthRegistry(ttl=10)
+        registry._states["groq"] = ProviderHealth(provider="groq", available=True, checked_at=0)
+
+        assert registry.get("groq") is None
+        assert registry.is_available("groq") is None
+        assert registry.snapshot() == {}
+
+    def test_rank_skips_down_and_demotes_slow(self):
+        """Test ranking keeps preference order for healthy, fast providers."""
+        registry = ProviderHealthRegistry(slow_ms=1000)
+        registry._states = {
+            "ollama": ProviderHealth(provider="ollama", available=False),
+            "lightllm": ProviderHealth(provider="lightllm", available=True, latency_ms=3000),
+            "groq": ProviderHealth(provider="groq", available=True, latency_ms=1500),
+            "anthropic": ProviderHealth(provider="anthropic", available=True, latency_ms=10),
+        }
+        chain = [
+            ProviderType.OLLAMA,
+            ProviderType.LIGHTLLM,
+            ProviderType.GROQ,
+            ProviderType.GEMINI,
+            ProviderType.ANTHROPIC,
+        ]
+
+        assert registry.rank(chain) == [
+            ProviderType.GEMINI,  # never probed: keeps its place
+            ProviderType.ANTHROPIC,
+            ProviderType.GROQ,
+            ProviderType.LIGHTLLM,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        """Test the background task probes and can be stopped."""
+        registry = ProviderHealthRegistry(provider_types=[ProviderType.GROQ], interval=60)
+
+        with patched_factory({"groq": fake_provider("groq")}):
+            registry.start()
+            registry.start()  # idempotent
+            await asyncio.sleep(0.05)
+            assert registry.running
+            assert registry.is_available("groq") is True
+            await registry.stop()
+
+        assert not registry.running
+
+
+class TestFactoryUsesRegistry:
+    """Test provider selection reads cached health."""
+
+    def setup_method(self):
+        clear_provider_cache()
+
+    def teardown_method(self):
+        clear_provider_cache()
+
+    @pytest.mark.asyncio
+    async def test_get_available_provider_without_io(self, monkeypatch):
+        """Test cached availability is used instead of probing."""
+        monkeypatch.setenv("VALERIE_LLM_FALLBACK", "ollama,groq")
+        from valerie.llm.health import get_health_registry
+
+        registry = get_health_registry()
+        registry._states["ollama"] = ProviderHealth(provider="ollama", available=False)
+        registry._states["groq"] = ProviderHealth(provider="groq", available=True)
+        providers = {"ollama": fake_provider("ollama"), "groq": fake_provider("groq")}
+
+        with patched_factory(providers):
+            provider = await get_available_provider()
+
+        assert provider.name == "groq"
+        providers["ollama"].is_available.assert_not_called()
+        providers["groq"].is_available.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_available_provider_all_down(self, monkeypatch):
+        """Test an error is raised when every cached probe is down."""
+        monkeypatch.setenv("VALERIE_LLM_FALLBACK", "groq")
+        from valerie.llm.health import get_health_registry
+
+        get_health_registry()._states["groq"] = ProviderHealth(provider="groq", available=False)
+
+        with patched_factory({"groq": fake_provider("groq")}):
+            with pytest.raises(LLMProviderError):
+                await get_available_provider()
+
+    @pytest.mark.asyncio
+    async def test_health_check_all_uses_cache(self):
+        """Test a second health check is served from the registry."""
+        providers = {t.value: fake_provider(t.value) for t in ProviderType}
+
+        with patched_factory(providers):
+            first = await health_check_all()
+            second = await health_check_all()
+
+        assert set(first) == {t.value for t in ProviderType}
+        assert second["groq"]["available"] is True
+        providers["groq"].health_check.assert_awaited_once()
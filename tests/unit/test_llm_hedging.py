@@ -0,0 +1,338 @@
+"""Tests for hedged LLM requests."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from valerie.infrastructure.fallback import (
+    CircuitState,
+    get_shared_circuit_breaker,
+    reset_shared_circuit_breakers,
+)
+from valerie.infrastructure.metrics import llm_hedge_wasted_tokens_total, llm_hedges_total
+from valerie.llm.base import (
+    BaseLLMProvider,
+    LLMConfig,
+    LLMMessage,
+    LLMProviderError,
+    LLMResponse,
+    MessageRole,
+    StreamChunk,
+)
+from valerie.llm.hedging import (
+    MIN_SAMPLES,
+    HedgedLLMProvider,
+    LatencyTracker,
+    estimate_tokens,
+    get_hedged_provider,
+    reset_hedged_provider,
+)
+from valerie.llm.retry import RetryPolicy
+
+MESSAGES = [LLMMessage(role=MessageRole.USER, content="que es nadcap")]
+
+
+class TimedProvider(BaseLLMProvider):
+    """Provider answering after a fixed delay, or failing."""
+
+    def __init__(self, name: str, delay: float, error: BaseException | None = None):
+        super().__init__()
+        self._name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def default_model(self) -> str:
+        return f"{self._name}-model"
+
+    async def generate(self, messages, config=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return LLMResponse(
+            content=f"from {self._name}",
+            model="m",
+            provider=self._name,
+            usage={"input_tokens": 10, "output_tokens": 5},
+        )
+
+    async def generate_stream(self, messages, config=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        for part in ("a", "b"):
+            yield StreamChunk(content=part, provider=self._name)
+
+    async def is_available(self) -> bool:
+        return self.error is None
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_shared_circuit_breakers()
+    yield
+    reset_shared_circuit_breakers()
+
+
+def counter(metric, **labels) -> float:
+    """Current value of a labelled Prometheus counter."""
+    return metric.labels(**labels)._value.get()
+
+
+class TestLatencyTracker:
+    """Test the per-provider latency window."""
+
+    def test_quantile(self):
+        """Test nearest-rank quantiles."""
+        tracker = LatencyTracker()
+        for value in range(1, 101):
+            tracker.observe("groq", value / 100)
+
+        assert tracker.quantile("groq", 0.95) == 0.95
+        assert tracker.quantile("groq", 0.5) == 0.5
+        assert tracker.quantile("anthropic", 0.95) is None
+
+    def test_window_is_bounded(self):
+        """Test old samples fall out of the window."""
+        tracker = LatencyTracker(window=3)
+        for value in (10.0, 1.0, 1.0, 1.0):
+            tracker.observe("groq", value)
+
+        assert tracker.count("groq") == 3
+        assert tracker.quantile("groq", 1.0) == 1.0
+
+
+class TestHedgedLLMProvider:
+    """Test hedging between providers."""
+
+    def test_requires_two_providers(self):
+        """Test a single provider cannot be hedged."""
+        with pytest.raises(ValueError):
+            HedgedLLMProvider([TimedProvider("groq", 0)])
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test no hedge is sent when the primary answers within the delay."""
+        primary, backup = TimedProvider("groq", 0), TimedProvider("anthropic", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=0.5)
+
+        response = await provider.generate(MESSAGES)
+
+        assert response.provider == "groq"
+        assert backup.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test a slow primary loses to the hedge and is cancelled."""
+        primary, backup = TimedProvider("slow", 5), TimedProvider("fast", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=0.01)
+        wasted_before = counter(llm_hedge_wasted_tokens_total, provider="slow")
+        won_before = counter(llm_hedges_total, provider="fast", outcome="won")
+
+        response = await asyncio.wait_for(provider.generate(MESSAGES), 1)
+
+        assert response.provider == "fast"
+        assert primary.cancelled == 1
+        assert counter(llm_hedges_total, provider="fast", outcome="won") == won_before + 1
+        wasted = counter(llm_hedge_wasted_tokens_total, provider="slow") - wasted_before
+        assert wasted == estimate_tokens(MESSAGES)
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_hedges_immediately(self):
+        """Test a failure sends the next request without waiting for the delay."""
+        primary = TimedProvider("broken", 0, error=LLMProviderError("boom", provider="broken"))
+        backup = TimedProvider("anthropic", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=10)
+
+        response = await asyncio.wait_for(provider.generate(MESSAGES), 1)
+
+        assert response.provider == "anthropic"
+
+    @pytest.mark.asyncio
+    async def test_all_failed_raises_last_error(self):
+        """Test the last error is raised when every provider fails."""
+        providers = [
+            TimedProvider("a", 0, error=LLMProviderError("first", provider="a")),
+            TimedProvider("b", 0, error=LLMProviderError("second", provider="b")),
+        ]
+        provider = HedgedLLMProvider(providers, hedge_delay=10)
+
+        with pytest.raises(LLMProviderError, match="second"):
+            await provider.generate(MESSAGES)
+
+    def test_delay_adapts_to_observed_latency(self):
+        """Test the hedge delay follows the primary's latency quantile."""
+        primary, backup = TimedProvider("groq", 0), TimedProvider("anthropic", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=1.0, min_delay=0.01)
+        assert provider.delay_for(primary) == 1.0
+
+        for _ in range(MIN_SAMPLES):
+            provider.tracker.observe("groq", 0.2)
+        assert provider.delay_for(primary) == 0.2
+
+        for _ in range(5):
+            provider.tracker.observe("groq", 100)
+        assert provider.delay_for(primary) == provider.max_delay
+
+    @pytest.mark.asyncio
+    async def test_primary_model_not_sent_to_hedge(self):
+        """Test the hedge uses its own default model."""
+        seen: list[LLMConfig | None] = []
+
+        class Recording(TimedProvider):
+            async def generate(self, messages, config=None):
+                seen.append(config)
+                return await super().generate(messages, config)
+
+        primary, backup = Recording("slow", 5), Recording("fast", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=0.01)
+
+        await asyncio.wait_for(provider.generate(MESSAGES, LLMConfig(model="slow-model")), 1)
+
+        assert seen[0].model == "slow-model"
+        assert not seen[1].model
+
+    @pytest.mark.asyncio
+    async def test_stream_from_first_to_respond(self):
+        """Test streaming keeps the provider that produced the first chunk."""
+        primary, backup = TimedProvider("slow", 5), TimedProvider("fast", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=0.01)
+
+        chunks = [c async for c in provider.generate_stream(MESSAGES)]
+
+        assert [c.provider for c in chunks] == ["fast", "fast"]
+        assert "".join(c.content for c in chunks) == "ab"
+
+    @pytest.mark.asyncio
+    async def test_losers_latency_observed(self):
+        """Test cancelled and timed-out requests feed the adaptive delay."""
+        timeout = LLMProviderError("timed out", provider="timeout")
+        timeout.__context__ = TimeoutError()
+        primary, backup = TimedProvider("slow", 5), TimedProvider("fast", 0.05)
+        timed_out = TimedProvider("timeout", 0.01, error=timeout)
+        provider = HedgedLLMProvider([primary, timed_out, backup], hedge_delay=0.02)
+
+        await asyncio.wait_for(provider.generate(MESSAGES), 1)
+
+        assert provider.tracker.count("slow") == 1
+        assert provider.tracker.quantile("slow", 1.0) >= 0.05
+        assert provider.tracker.count("timeout") == 1
+        assert provider.tracker.count("fast") == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_not_observed(self):
+        """Test a fast failure does not pull the delay down."""
+        primary = TimedProvider("broken", 0, error=LLMProviderError("boom", provider="broken"))
+        provider = HedgedLLMProvider([primary, TimedProvider("anthropic", 0)], hedge_delay=10)
+
+        await asyncio.wait_for(provider.generate(MESSAGES), 1)
+
+        assert provider.tracker.count("broken") == 0
+
+    def test_member_names(self):
+        """Test the composed providers are exposed by name."""
+        provider = HedgedLLMProvider([TimedProvider("groq", 0), TimedProvider("anthropic", 0)])
+
+        assert provider.name == "hedged:groq+anthropic"
+        assert provider.member_names == ["groq", "anthropic"]
+
+    @pytest.mark.asyncio
+    async def test_outcomes_recorded_per_member(self):
+        """Test each member's failure or success lands on its own breaker."""
+        primary = TimedProvider("broken", 0, error=LLMProviderError("boom", provider="broken"))
+        provider = HedgedLLMProvider(
+            [primary, TimedProvider("anthropic", 0)],
+            hedge_delay=10,
+            policy=RetryPolicy(failure_threshold=1),
+        )
+
+        await asyncio.wait_for(provider.generate(MESSAGES), 1)
+
+        assert get_shared_circuit_breaker("llm:broken").state == CircuitState.OPEN
+        assert get_shared_circuit_breaker("llm:anthropic").state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_open_member_left_out(self):
+        """Test a member with an open circuit is not sent the request."""
+        get_shared_circuit_breaker("llm:groq", failure_threshold=1).record_failure()
+        primary, backup = TimedProvider("groq", 0), TimedProvider("anthropic", 0)
+        provider = HedgedLLMProvider([primary, backup], hedge_delay=10)
+
+        response = await asyncio.wait_for(provider.generate(MESSAGES), 1)
+
+        assert response.provider == "anthropic"
+        assert primary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_all_members_open_raises(self):
+        """Test no request is sent when every member's circuit is open."""
+        for name in ("groq", "anthropic"):
+            get_shared_circuit_breaker(f"llm:{name}", failure_threshold=1).record_failure()
+        primary, backup = TimedProvider("groq", 0), TimedProvider("anthropic", 0)
+        provider = HedgedLLMProvider([primary, backup])
+
+        with pytest.raises(LLMProviderError, match="circuits are open"):
+            await provider.generate(MESSAGES)
+        assert primary.calls == backup.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_is_available_if_any(self):
+        """Test availability when at least one provider is up."""
+        broken = TimedProvider("a", 0, error=LLMProviderError("x", provider="a"))
+        provider = HedgedLLMProvider([broken, TimedProvider("b", 0)])
+
+        assert await provider.is_available() is True
+
+
+class TestGetHedgedProvider:
+    """Test building the hedged provider from the environment."""
+
+    def setup_method(self):
+        reset_hedged_provider()
+
+    def teardown_method(self):
+        reset_hedged_provider()
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test no hedging without configured providers."""
+        monkeypatch.delenv("VALERIE_LLM_HEDGE_PROVIDERS", raising=False)
+
+        assert get_hedged_provider() is None
+
+    def test_composes_configured_providers(self, monkeypatch):
+        """Test providers are built through the factory in the given order."""
+        monkeypatch.setenv("VALERIE_LLM_HEDGE_PROVIDERS", "groq, anthropic")
+        monkeypatch.setenv("VALERIE_LLM_HEDGE_DELAY", "0.3")
+
+        with patch(
+            "valerie.llm.hedging.get_llm_provider",
+            side_effect=lambda t: TimedProvider(t.value, 0),
+        ):
+            provider = get_hedged_provider()
+
+        assert [p.name for p in provider.providers] == ["groq", "anthropic"]
+        assert provider.hedge_delay == 0.3
+        assert provider.name == "hedged:groq+anthropic"
+
+    def test_unknown_provider_ignored(self, monkeypatch):
+        """Test unknown names are skipped, leaving too few to hedge."""
+        monkeypatch.setenv("VALERIE_LLM_HEDGE_PROVIDERS", "groq,nonsense")
+
+        with patch(
+            "valerie.llm.hedging.get_llm_provider",
+            side_effect=lambda t: TimedProvider(t.value, 0),
+        ):
+            assert get_hedged_provider() is None
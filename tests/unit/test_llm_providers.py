@@ -1,5 +1,6 @@
 """Tests for LLM Provider Abstraction Layer."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -9,6 +10,7 @@ from valerie.llm.anthropic import AnthropicProvider
 from valerie.llm.azure_openai import AzureOpenAIProvider
 from valerie.llm.base import (
     AuthenticationError,
+    HTTPPoolConfig,
     LLMConfig,
     LLMMessage,
     LLMProviderError,
@@ -17,6 +19,7 @@ from valerie.llm.base import (
     ModelNotFoundError,
     RateLimitError,
     StreamChunk,
+    close_http_clients,
 )
 from valerie.llm.bedrock import BedrockProvider
 from valerie.llm.factory import (
@@ -2576,3 +2579,94 @@ class TestGeminiProviderStream:
                 async for _ in provider.generate_stream(messages):
                     pass
             assert exc_info.value.retryable is True
+
+
+class TestHTTPClientPool:
+    """Tests for the pooled HTTP client shared by provider calls."""
+
+    def test_pool_config_from_provider_config(self):
+        """Test pool limits are read from provider config."""
+        provider = OllamaProvider({"max_connections": 7, "keepalive_expiry": 5, "http2": False})
+        assert provider.http_pool.max_connections == 7
+        assert provider.http_pool.keepalive_expiry == 5.0
+        assert provider.http_pool.http2 is False
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [("false", False), ("0", False), ("true", True), ("on", True)]
+    )
+    def test_pool_config_http2_string(self, value, expected):
+        """Test string http2 values (e.g. from YAML or env expansion) parse like the env var."""
+        assert HTTPPoolConfig.from_config({"http2": value}).http2 is expected
+
+    def test_pool_config_from_env(self, monkeypatch):
+        """Test pool limits fall back to environment variables."""
+        monkeypatch.setenv("VALERIE_LLM_MAX_KEEPALIVE", "3")
+        monkeypatch.setenv("VALERIE_LLM_HTTP2", "false")
+        pool = HTTPPoolConfig.from_config()
+        assert pool.max_keepalive_connections == 3
+        assert pool.http2 is False
+        assert pool.to_limits().max_keepalive_connections == 3
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self):
+        """Test generate and health probes share one client."""
+        provider = OllamaProvider()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"message": {"content": "ok"}, "done": True}
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.is_closed = False
+            mock_instance.post = AsyncMock(return_value=mock_response)
+            mock_instance.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value = mock_instance
+
+            messages = [LLMMessage(role=MessageRole.USER, content="Hi")]
+            await provider.generate(messages)
+            await provider.generate(messages)
+            await provider.is_available()
+
+            assert mock_client.call_count == 1
+            assert mock_instance.post.await_count == 2
+            assert mock_instance.get.call_args.kwargs["timeout"] == 5
+
+    @pytest.mark.asyncio
+    async def test_client_limits_and_http2(self):
+        """Test the client gets pool limits and HTTP/2 only when h2 is installed."""
+        provider = GroqProvider({"max_connections": 9, "http2": True})
+        with patch("valerie.llm.base.http2_available", return_value=False):
+            client = provider._get_http_client()
+        assert client._transport._pool._max_connections == 9
+        assert client._transport._pool._http2 is False
+        await provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose(self):
+        """Test aclose closes the client and a new one is created on next use."""
+        provider = OllamaProvider()
+        client = provider._get_http_client()
+        await provider.aclose()
+        assert client.is_closed
+        assert provider._get_http_client() is not client
+        await provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_close_http_clients(self):
+        """Test close_http_clients closes every open provider client."""
+        providers = [OllamaProvider(), GroqProvider(), AnthropicProvider()]
+        clients = [p._get_http_client() for p in providers]
+        await close_http_clients()
+        assert all(c.is_closed for c in clients)
+        assert all(p._http_client is None for p in providers)
+
+    def test_new_client_per_event_loop(self):
+        """Test a client is not reused across event loops."""
+        provider = OllamaProvider()
+
+        async def get_client():
+            return provider._get_http_client()
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        assert first is not second
@@ -0,0 +1,324 @@
+"""Tests for LLM retry, backoff and failover."""
+
+import asyncio
+import random
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from valerie.infrastructure.fallback import (
+    CircuitState,
+    get_shared_circuit_breaker,
+    reset_shared_circuit_breakers,
+)
+from valerie.llm.base import (
+    AuthenticationError,
+    BaseLLMProvider,
+    DeadlineExceededError,
+    LLMConfig,
+    LLMMessage,
+    LLMProviderError,
+    LLMResponse,
+    MessageRole,
+    RateLimitError,
+    StreamChunk,
+)
+from valerie.llm.factory import ProviderType
+from valerie.llm.hedging import HedgedLLMProvider
+from valerie.llm.retry import ResilientLLMProvider, RetryEngine, RetryPolicy, is_retryable
+
+MESSAGES = [LLMMessage(role=MessageRole.USER, content="que es nadcap")]
+
+
+class ScriptedProvider(BaseLLMProvider):
+    """Provider that raises or answers according to a script of outcomes."""
+
+    def __init__(self, name: str, outcomes: list, available: bool = True):
+        super().__init__()
+        self._name = name
+        self.outcomes = list(outcomes)
+        self.available = available
+        self.calls: list[LLMConfig | None] = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def default_model(self) -> str:
+        return f"{self._name}-model"
+
+    def _next(self, config):
+        self.calls.append(config)
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    async def generate(self, messages, config=None):
+        outcome = self._next(config)
+        if isinstance(outcome, (int, float)):
+            await asyncio.sleep(outcome)
+        return LLMResponse(content=f"from {self._name}", model="m", provider=self._name)
+
+    async def generate_stream(self, messages, config=None):
+        self._next(config)
+        for part in ("a", "b"):
+            yield StreamChunk(content=part, provider=self._name)
+
+    async def is_available(self) -> bool:
+        return self.available
+
+
+class RecordingSleep:
+    """Fake asyncio.sleep collecting requested delays."""
+
+    def __init__(self):
+        self.delays: list[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_shared_circuit_breakers()
+    yield
+    reset_shared_circuit_breakers()
+
+
+def engine(sleep=None, **policy) -> RetryEngine:
+    policy.setdefault("failover", False)
+    return RetryEngine(RetryPolicy(**policy), rng=random.Random(0), sleep=sleep or RecordingSleep())
+
+
+def with_fallbacks(*providers):
+    """Patch the fallback chain to the given providers."""
+    registry = {ProviderType(p.name): p for p in providers}
+    return (
+        patch("valerie.llm.retry._get_fallback_chain", return_value=list(registry)),
+        patch("valerie.llm.retry.get_llm_provider", side_effect=registry.__getitem__),
+    )
+
+
+def retryable(message: str = "server error") -> LLMProviderError:
+    return LLMProviderError(message, provider="groq", status_code=503, retryable=True)
+
+
+class TestRetryPolicy:
+    """Tests for backoff computation and settings."""
+
+    def test_backoff_full_jitter_bounds(self):
+        """Test delays stay within the exponential cap."""
+        policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+        rng = random.Random(1)
+        for attempt, cap in enumerate([0.5, 1.0, 2.0, 3.0, 3.0]):
+            delays = [policy.backoff(attempt, rng) for _ in range(200)]
+            assert all(0 <= d <= cap for d in delays)
+            assert max(delays) > cap * 0.8
+
+    def test_from_settings(self):
+        """Test the policy reads retry and breaker settings."""
+        from valerie.models import Settings
+
+        settings = Settings(max_retries=5, llm_deadline_seconds=4.0, circuit_breaker_threshold=2)
+        policy = RetryPolicy.from_settings(settings)
+        assert policy.max_attempts == 5
+        assert policy.deadline == 4.0
+        assert policy.failure_threshold == 2
+
+    def test_is_retryable(self):
+        """Test error classification."""
+        assert is_retryable(RateLimitError("groq"))
+        assert is_retryable(httpx.ConnectError("refused"))
+        assert not is_retryable(AuthenticationError("groq"))
+        assert not is_retryable(ValueError("bug"))
+
+
+class TestRetryEngine:
+    """Tests for retries on a single provider."""
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self):
+        """Test retryable errors are retried with backoff."""
+        sleep = RecordingSleep()
+        provider = ScriptedProvider("groq", [retryable(), retryable(), "ok"])
+        response = await engine(sleep).generate(provider, MESSAGES)
+        assert response.content == "from groq"
+        assert len(provider.calls) == 3
+        assert len(sleep.delays) == 2
+        assert all(0 <= d <= 0.5 for d in sleep.delays)
+
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self):
+        """Test a 429 waits exactly retry_after before retrying."""
+        sleep = RecordingSleep()
+        provider = ScriptedProvider("groq", [RateLimitError("groq", retry_after=1), "ok"])
+        await engine(sleep).generate(provider, MESSAGES)
+        assert sleep.delays == [1.0]
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_raises_immediately(self):
+        """Test permanent errors are not retried."""
+        provider = ScriptedProvider("groq", [AuthenticationError("groq")])
+        with pytest.raises(AuthenticationError):
+            await engine().generate(provider, MESSAGES)
+        assert len(provider.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_non_provider_error_propagates(self):
+        """Test unexpected exceptions are not swallowed or retried."""
+        provider = ScriptedProvider("groq", [ValueError("bug")])
+        with pytest.raises(ValueError):
+            await engine().generate(provider, MESSAGES)
+        assert len(provider.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_attempts_exhausted(self):
+        """Test the last error is raised after max_attempts."""
+        provider = ScriptedProvider("groq", [retryable("a"), retryable("b"), retryable("c")])
+        with pytest.raises(LLMProviderError, match="c"):
+            await engine(max_attempts=3).generate(provider, MESSAGES)
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_slow_call(self):
+        """Test a call exceeding the deadline budget is cancelled."""
+        provider = ScriptedProvider("groq", [5.0])
+        with pytest.raises(DeadlineExceededError):
+            await engine(deadline=0.05).generate(provider, MESSAGES)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_gives_up(self):
+        """Test a wait that would overrun the deadline is not taken."""
+        sleep = RecordingSleep()
+        provider = ScriptedProvider("groq", [RateLimitError("groq", retry_after=5)])
+        with pytest.raises(RateLimitError):
+            await engine(sleep, deadline=2.0, max_delay=10.0).generate(provider, MESSAGES)
+        assert sleep.delays == []
+
+    @pytest.mark.asyncio
+    async def test_stream_retried_before_first_chunk(self):
+        """Test streams are retried until the first chunk arrives."""
+        provider = ScriptedProvider("groq", [retryable(), "ok"])
+        chunks = [c.content async for c in engine().generate_stream(provider, MESSAGES)]
+        assert chunks == ["a", "b"]
+        assert len(provider.calls) == 2
+
+
+class TestFailover:
+    """Tests for failover along the fallback chain."""
+
+    @pytest.mark.asyncio
+    async def test_fails_over_after_retries(self):
+        """Test the next available provider answers once the primary is exhausted."""
+        primary = ScriptedProvider("ollama", [retryable()] * 3)
+        down = ScriptedProvider("lightllm", [], available=False)
+        backup = ScriptedProvider("groq", ["ok"])
+        chain, factory = with_fallbacks(primary, down, backup)
+        with chain, factory:
+            config = LLMConfig(model="llama3.2", temperature=0.2)
+            response = await engine(failover=True).generate(primary, MESSAGES, config)
+
+        assert response.provider == "groq"
+        assert down.calls == []
+        # The primary's model name is not sent to the fallback provider
+        assert backup.calls[0].model == ""
+        assert backup.calls[0].temperature == 0.2
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_fails_over(self):
+        """Test a retry_after longer than max_delay moves to the next provider."""
+        sleep = RecordingSleep()
+        primary = ScriptedProvider("ollama", [RateLimitError("ollama", retry_after=60)])
+        backup = ScriptedProvider("groq", ["ok"])
+        chain, factory = with_fallbacks(primary, backup)
+        with chain, factory:
+            response = await engine(sleep, failover=True).generate(primary, MESSAGES)
+        assert response.provider == "groq"
+        assert sleep.delays == []
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_provider(self):
+        """Test a provider with an open shared breaker is not called."""
+        breaker = get_shared_circuit_breaker("llm:ollama", failure_threshold=1)
+        breaker.record_failure()
+        primary = ScriptedProvider("ollama", ["ok"])
+        backup = ScriptedProvider("groq", ["ok"])
+        chain, factory = with_fallbacks(primary, backup)
+        with chain, factory:
+            response = await engine(failover=True).generate(primary, MESSAGES)
+        assert response.provider == "groq"
+        assert primary.calls == []
+
+    @pytest.mark.asyncio
+    async def test_failures_open_shared_breaker(self):
+        """Test repeated failures open the provider's shared breaker."""
+        provider = ScriptedProvider("groq", [retryable()] * 3)
+        with pytest.raises(LLMProviderError):
+            await engine(failure_threshold=3).generate(provider, MESSAGES)
+        assert get_shared_circuit_breaker("llm:groq").state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_resilient_provider_wrapper(self):
+        """Test the wrapper forwards through the engine."""
+        provider = ResilientLLMProvider(
+            ScriptedProvider("groq", [retryable(), "ok"]), engine=engine()
+        )
+        assert provider.name == "groq"
+        assert (await provider.generate(MESSAGES)).content == "from groq"
+
+
+class TestHedgedPrimary:
+    """Tests for a hedged provider passed to the engine."""
+
+    def hedged(self, *providers) -> HedgedLLMProvider:
+        return HedgedLLMProvider(list(providers), hedge_delay=10)
+
+    @pytest.mark.asyncio
+    async def test_members_not_retried_as_fallbacks(self):
+        """Test failover skips providers the hedged primary already tried."""
+        groq = ScriptedProvider("groq", [retryable()])
+        anthropic = ScriptedProvider("anthropic", [retryable()])
+        backup = ScriptedProvider("ollama", ["ok"])
+        chain, factory = with_fallbacks(groq, anthropic, backup)
+        with chain, factory:
+            response = await engine(failover=True, max_attempts=1).generate(
+                self.hedged(groq, anthropic), MESSAGES
+            )
+
+        assert response.provider == "ollama"
+        assert len(groq.calls) == len(anthropic.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_breakers_per_member(self):
+        """Test outcomes land on member breakers, not a composite one."""
+        groq = ScriptedProvider("groq", [retryable()])
+        anthropic = ScriptedProvider("anthropic", ["ok"])
+
+        response = await engine(failure_threshold=1).generate(
+            self.hedged(groq, anthropic), MESSAGES
+        )
+
+        assert response.provider == "anthropic"
+        assert get_shared_circuit_breaker("llm:groq").state == CircuitState.OPEN
+        assert get_shared_circuit_breaker("llm:anthropic").state == CircuitState.CLOSED
+        assert get_shared_circuit_breaker("llm:hedged:groq+anthropic").failure_count == 0
+
+    @pytest.mark.asyncio
+    async def test_skipped_when_every_member_open(self):
+        """Test the hedged primary is skipped only once all its circuits are open."""
+        groq = ScriptedProvider("groq", ["ok"])
+        anthropic = ScriptedProvider("anthropic", ["ok"])
+        backup = ScriptedProvider("ollama", ["ok"])
+        get_shared_circuit_breaker("llm:groq", failure_threshold=1).record_failure()
+        anthropic_breaker = get_shared_circuit_breaker("llm:anthropic", failure_threshold=1)
+        chain, factory = with_fallbacks(groq, anthropic, backup)
+        with chain, factory:
+            hedged = self.hedged(groq, anthropic)
+            response = await engine(failover=True).generate(hedged, MESSAGES)
+            assert response.provider == "anthropic"
+
+            anthropic_breaker.record_failure()
+            response = await engine(failover=True).generate(hedged, MESSAGES)
+            assert response.provider == "ollama"
@@ -17,6 +17,22 @@ from valerie.llm.groq import GroqProvider
 from valerie.llm.ollama import OllamaProvider
 
 
+def streaming_client(lines: list[str]) -> MagicMock:
+    """HTTP client whose ``stream`` returns a 200 response with the given SSE lines."""
+
+    async def aiter_lines():
+        for line in lines:
+            yield line
+
+    response = AsyncMock()
+    response.status_code = 200
+    response.aiter_lines = aiter_lines
+    response.__aenter__.return_value = response
+    client = MagicMock()
+    client.stream.return_value = response
+    return client
+
+
 class TestAnthropicProvider:
     """Additional tests for Anthropic provider."""
 
@@ -83,6 +99,25 @@ class TestAnthropicProvider:
 
             assert exc_info.value.retryable is True
 
+    @pytest.mark.asyncio
+    async def test_generate_stream_reports_usage(self, provider, messages):
+        """Test the final chunk carries the input and output token counts."""
+        client = streaming_client(
+            [
+                'data: {"type": "message_start", "message": {"usage": {"input_tokens": 12}}}',
+                'data: {"type": "content_block_delta", '
+                '"delta": {"type": "text_delta", "text": "Hola"}}',
+                'data: {"type": "message_delta", "usage": {"output_tokens": 3}}',
+                'data: {"type": "message_stop"}',
+            ]
+        )
+
+        with patch.object(provider, "_get_http_client", return_value=client):
+            chunks = [c async for c in provider.generate_stream(messages)]
+
+        assert [c.content for c in chunks] == ["Hola", ""]
+        assert chunks[-1].usage == {"input_tokens": 12, "output_tokens": 3}
+
     @pytest.mark.asyncio
     async def test_is_available_cached(self, provider):
         provider._is_available = True
@@ -163,6 +198,24 @@ class TestGroqProvider:
 
             assert exc_info.value.retryable is True
 
+    @pytest.mark.asyncio
+    async def test_generate_stream_reports_usage(self, provider, messages):
+        """Test the usage Groq sends on the last chunk is passed on."""
+        client = streaming_client(
+            [
+                'data: {"choices": [{"delta": {"content": "Hola"}}]}',
+                'data: {"choices": [{"delta": {}, "finish_reason": "stop"}], '
+                '"x_groq": {"usage": {"prompt_tokens": 12, "completion_tokens": 3}}}',
+                "data: [DONE]",
+            ]
+        )
+
+        with patch.object(provider, "_get_http_client", return_value=client):
+            chunks = [c async for c in provider.generate_stream(messages)]
+
+        assert chunks[0].usage == {}
+        assert chunks[1].usage == {"input_tokens": 12, "output_tokens": 3}
+
     @pytest.mark.asyncio
     async def test_is_available_no_api_key(self):
         provider = GroqProvider({})
@@ -1,6 +1,11 @@
 """Tests for OracleIntegrationAgent HTTP methods."""
 
+import asyncio
+import json
+import threading
+import time
 from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -40,10 +45,11 @@ class TestOracleIntegrationGetClient:
 
             client = await agent._get_client()
 
-            mock_client_class.assert_called_once_with(
-                base_url=agent.settings.oracle_base_url,
-                timeout=30.0,
-            )
+            mock_client_class.assert_called_once()
+            kwargs = mock_client_class.call_args.kwargs
+            assert kwargs["base_url"] == agent.settings.oracle_base_url
+            assert kwargs["timeout"] == 30.0
+            assert kwargs["limits"].max_connections == agent.settings.oracle_max_concurrency
             assert client == mock_client
             assert agent._client == mock_client
 
@@ -299,3 +305,210 @@ class TestOracleIntegrationProcess:
             result = await agent.process(state)
             output = result.agent_outputs["oracle_integration"]
             assert output.processing_time_ms >= 0
+
+
+class StubOracleServer:
+    """Local Oracle Fusion stub serving tokens and supplier records."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.token_requests = 0
+        self.supplier_requests: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.token_requests += 1
+                time.sleep(stub.delay)
+                self._send(200, {"access_token": "stub-token"})
+
+            def do_GET(self):
+                supplier_id = self.path.rsplit("/", 1)[-1]
+                with stub._lock:
+                    stub.supplier_requests.append(supplier_id)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub.active -= 1
+                if supplier_id.startswith("MISSING"):
+                    self._send(404, {"error": "not found"})
+                else:
+                    self._send(200, {"id": supplier_id, "name": f"Supplier {supplier_id}"})
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TestOracleIntegrationStubServer:
+    """Tests for concurrent, coalesced and cached lookups against a stub server."""
+
+    @pytest.fixture
+    def oracle(self):
+        with StubOracleServer(delay=0.1) as server:
+            yield server
+
+    def make_agent(self, oracle: StubOracleServer, **settings) -> OracleIntegrationAgent:
+        return OracleIntegrationAgent(
+            settings=Settings(oracle_base_url=oracle.base_url, **settings)
+        )
+
+    @pytest.mark.asyncio
+    async def test_suppliers_fetched_in_parallel(self, oracle):
+        agent = self.make_agent(oracle)
+        ids = [f"SUP-{i:03d}" for i in range(6)]
+        await agent._ensure_token()
+
+        start = time.monotonic()
+        result = await agent._fetch_suppliers(ids)
+        elapsed = time.monotonic() - start
+        await agent.close()
+
+        assert [r["id"] for r in result] == ids
+        assert elapsed < 0.5  # sequential would take 0.6s
+        assert oracle.max_active > 1
+
+    @pytest.mark.asyncio
+    async def test_parallelism_is_bounded(self, oracle):
+        agent = self.make_agent(oracle, oracle_max_concurrency=2)
+        await agent._ensure_token()
+
+        await agent._fetch_suppliers([f"SUP-{i}" for i in range(6)])
+        await agent.close()
+
+        assert oracle.max_active <= 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_share_one_request(self, oracle):
+        agent = self.make_agent(oracle, oracle_cache_ttl_seconds=0)
+        await agent._ensure_token()
+
+        results = await asyncio.gather(
+            agent._fetch_suppliers(["SUP-001", "SUP-002"]),
+            agent._fetch_suppliers(["SUP-001"]),
+            agent._fetch_suppliers(["SUP-001", "SUP-001"]),
+        )
+        await agent.close()
+
+        assert sorted(oracle.supplier_requests) == ["SUP-001", "SUP-002"]
+        assert [len(r) for r in results] == [2, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_payloads_are_cached(self, oracle):
+        agent = self.make_agent(oracle)
+        await agent._ensure_token()
+
+        await agent._fetch_suppliers(["SUP-001", "MISSING-1"])
+        second = await agent._fetch_suppliers(["SUP-001", "MISSING-1"])
+        await agent.close()
+
+        assert second == [{"id": "SUP-001", "name": "Supplier SUP-001"}]
+        # Only found suppliers are cached
+        assert oracle.supplier_requests.count("SUP-001") == 1
+        assert oracle.supplier_requests.count("MISSING-1") == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_with_zero_ttl(self, oracle):
+        agent = self.make_agent(oracle, oracle_cache_ttl_seconds=0)
+        await agent._ensure_token()
+
+        await agent._fetch_suppliers(["SUP-001"])
+        await agent._fetch_suppliers(["SUP-001"])
+        await agent.close()
+
+        assert oracle.supplier_requests == ["SUP-001", "SUP-001"]
+
+    @pytest.mark.asyncio
+    async def test_token_refresh_is_single_flight(self, oracle):
+        agent = self.make_agent(oracle)
+
+        await asyncio.gather(*(agent._ensure_token() for _ in range(10)))
+        await agent.close()
+
+        assert oracle.token_requests == 1
+        assert agent._token == "stub-token"
+
+    @pytest.mark.asyncio
+    async def test_new_loop_gets_new_client(self, oracle):
+        agent = self.make_agent(oracle, oracle_cache_ttl_seconds=0)
+        await agent._ensure_token()
+        await agent._fetch_suppliers(["SUP-001"])
+        first_client = agent._client
+
+        async def fetch_on_new_loop():
+            result = await agent._fetch_suppliers(["SUP-002"])
+            client = agent._client
+            await agent.close()
+            return result, client
+
+        result, client = await asyncio.to_thread(asyncio.run, fetch_on_new_loop())
+        await first_client.aclose()
+
+        assert result == [{"id": "SUP-002", "name": "Supplier SUP-002"}]
+        assert client is not first_client
+
+    @pytest.mark.asyncio
+    async def test_finished_request_keeps_newer_inflight_entry(self):
+        agent = OracleIntegrationAgent()
+        old, new = asyncio.ensure_future(asyncio.sleep(0)), asyncio.ensure_future(asyncio.sleep(0))
+        await asyncio.gather(old, new)
+        agent._inflight["SUP-001"] = new
+
+        agent._forget("SUP-001", old)
+        assert agent._inflight == {"SUP-001": new}
+
+        agent._forget("SUP-001", new)
+        assert agent._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_process_end_to_end(self, oracle):
+        agent = self.make_agent(oracle)
+        state = ChatState()
+        state.suppliers = [
+            Supplier(id="SUP-001", name="One"),
+            Supplier(id="MISSING-2", name="Gone"),
+        ]
+
+        result = await agent.process(state)
+        await agent.close()
+
+        output = result.agent_outputs["oracle_integration"]
+        assert output.success
+        assert output.data["fetched_count"] == 1
@@ -0,0 +1,225 @@
+"""Tests for OpenTelemetry span export."""
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode  # noqa: E402
+
+from valerie.data.sources.sqlite import SQLiteDataSource  # noqa: E402
+from valerie.infrastructure import otel  # noqa: E402
+from valerie.infrastructure.correlation import CorrelationContext  # noqa: E402
+from valerie.llm.base import (  # noqa: E402
+    BaseLLMProvider,
+    LLMConfig,
+    LLMMessage,
+    LLMResponse,
+    MessageRole,
+    StreamChunk,
+)
+from valerie.models import ChatState  # noqa: E402
+
+MESSAGES = [LLMMessage(role=MessageRole.USER, content="proveedores de titanio")]
+
+
+class EchoProvider(BaseLLMProvider):
+    """Provider answering immediately."""
+
+    @property
+    def name(self) -> str:
+        return "echo"
+
+    @property
+    def default_model(self) -> str:
+        return "echo-1"
+
+    async def generate(self, messages, config=None):
+        return LLMResponse(
+            content=messages[-1].content,
+            model=self._get_model(config),
+            provider="echo",
+            usage={"input_tokens": 4, "output_tokens": 2},
+        )
+
+    async def generate_stream(self, messages, config=None):
+        model = self._get_model(config)
+        for word in messages[-1].content.split():
+            yield StreamChunk(content=word, model=model, provider="echo")
+        usage = {"input_tokens": 4, "output_tokens": 2}
+        yield StreamChunk(content="", done=True, model=model, provider="echo", usage=usage)
+
+    async def is_available(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    assert otel.configure_tracing(exporter)
+    yield exporter
+    otel.shutdown_tracing()
+
+
+def finished(exporter: InMemorySpanExporter) -> dict:
+    """Flush and return finished spans by name."""
+    otel.shutdown_tracing()
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+class TestTracing:
+    """Tests for the span helpers."""
+
+    def test_disabled_by_default(self):
+        """Test nothing is recorded unless tracing is configured."""
+        assert not otel.configure_tracing(enabled=False)
+        assert not otel.tracing_enabled()
+        with otel.span("noop") as current:
+            assert current is None
+
+    def test_span_carries_correlation_id(self, exporter):
+        """Test spans get the current correlation ID."""
+        with CorrelationContext("corr-1"):
+            with otel.span("outer", skipped=None):
+                with otel.span("inner", **{"valerie.node": "x"}):
+                    pass
+
+        spans = finished(exporter)
+        assert spans["outer"].attributes["valerie.correlation_id"] == "corr-1"
+        assert "skipped" not in spans["outer"].attributes
+        assert spans["inner"].parent.span_id == spans["outer"].context.span_id
+
+    def test_span_records_errors(self, exporter):
+        """Test exceptions are recorded on the span and re-raised."""
+        with pytest.raises(ValueError):
+            with otel.span("failing"):
+                raise ValueError("boom")
+
+        span = finished(exporter)["failing"]
+        assert span.status.status_code == StatusCode.ERROR
+        assert span.events[0].name == "exception"
+
+    @pytest.mark.asyncio
+    async def test_trace_node(self, exporter):
+        """Test a wrapped graph node runs inside a node span."""
+
+        async def search_node(state: ChatState) -> ChatState:
+            state.final_response = "ok"
+            return state
+
+        traced = otel.trace_node("supplier_search", search_node)
+        assert traced.__name__ == "search_node"
+
+        state = await traced(ChatState(session_id="s1"))
+
+        assert state.final_response == "ok"
+        span = finished(exporter)["graph.node supplier_search"]
+        assert span.attributes["valerie.node"] == "supplier_search"
+        assert span.attributes["valerie.session_id"] == "s1"
+
+
+class TestInstrumentation:
+    """Tests for the LLM and SQL instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_llm_generate_span(self, exporter):
+        """Test provider generate calls are recorded with model and usage."""
+        with CorrelationContext("corr-llm"):
+            with otel.span("chat"):
+                response = await EchoProvider().generate(MESSAGES, LLMConfig(model="echo-2"))
+
+        assert response.content == "proveedores de titanio"
+        spans = finished(exporter)
+        span = spans["llm.generate"]
+        assert span.parent.span_id == spans["chat"].context.span_id
+        assert span.attributes["gen_ai.system"] == "echo"
+        assert span.attributes["gen_ai.request.model"] == "echo-2"
+        assert span.attributes["gen_ai.usage.output_tokens"] == 2
+        assert span.attributes["valerie.correlation_id"] == "corr-llm"
+
+    @pytest.mark.asyncio
+    async def test_llm_generate_untraced_when_disabled(self):
+        """Test generate works unchanged without tracing."""
+        response = await EchoProvider().generate(MESSAGES)
+        assert response.model == "echo-1"
+
+    @pytest.mark.asyncio
+    async def test_llm_generate_span_skips_missing_model(self, exporter):
+        """Test a response without a model name does not break the span."""
+
+        class Unnamed(EchoProvider):
+            async def generate(self, messages, config=None):
+                return LLMResponse(content="ok", model=None, provider="echo")
+
+        await Unnamed().generate(MESSAGES)
+
+        span = finished(exporter)["llm.generate"]
+        assert "gen_ai.response.model" not in span.attributes
+        assert span.status.status_code != StatusCode.ERROR
+
+    @pytest.mark.asyncio
+    async def test_llm_generate_stream_span(self, exporter):
+        """Test streams are recorded with time to first token and usage."""
+        with otel.span("chat"):
+            chunks = [c async for c in EchoProvider().generate_stream(MESSAGES)]
+
+        assert [c.content for c in chunks] == ["proveedores", "de", "titanio", ""]
+        spans = finished(exporter)
+        span = spans["llm.generate_stream"]
+        assert span.parent.span_id == spans["chat"].context.span_id
+        assert span.attributes["gen_ai.response.model"] == "echo-1"
+        assert span.attributes["gen_ai.usage.output_tokens"] == 2
+        assert 0 <= span.attributes["valerie.llm.ttft_ms"] <= (span.end_time - span.start_time)
+        assert [event.name for event in span.events] == ["first_token"]
+
+    @pytest.mark.asyncio
+    async def test_llm_generate_stream_closed_early(self, exporter):
+        """Test a stream closed by its consumer still ends its span."""
+        stream = EchoProvider().generate_stream(MESSAGES)
+        assert (await anext(stream)).content == "proveedores"
+        await stream.aclose()
+
+        span = finished(exporter)["llm.generate_stream"]
+        assert "gen_ai.usage.output_tokens" not in span.attributes
+        assert span.status.status_code != StatusCode.ERROR
+
+    @pytest.mark.asyncio
+    async def test_langchain_agent_call_span(self, exporter):
+        """Test agents calling their LangChain model are traced too."""
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+        from tests.unit.test_base_agent import ConcreteAgent
+
+        agent = ConcreteAgent()
+        agent._llm = FakeListChatModel(responses=["NADCAP"])
+
+        assert await agent.invoke_llm("que es nadcap") == "NADCAP"
+        assert finished(exporter)["llm.generate"].attributes["gen_ai.system"] == (
+            "fakelistchatmodel"
+        )
+
+    @pytest.mark.asyncio
+    async def test_sqlite_query_spans(self):
+        """Test queries run in the executor are children of the caller's span."""
+        data_source = SQLiteDataSource(":memory:")
+        exporter = InMemorySpanExporter()
+        otel.configure_tracing(exporter)
+        try:
+            with CorrelationContext("corr-db"):
+                with otel.span("chat"):
+                    await data_source.search_suppliers(name="titanio")
+        finally:
+            await data_source.close()
+            otel.shutdown_tracing()
+
+        spans = exporter.get_finished_spans()
+        chat = next(s for s in spans if s.name == "chat")
+        queries = [s for s in spans if s.name == "db.query"]
+        assert queries
+        for query in queries:
+            assert query.parent.span_id == chat.context.span_id
+            assert query.attributes["db.system"] == "sqlite"
+            assert query.attributes["db.operation"] == "SELECT"
+            assert query.attributes["valerie.correlation_id"] == "corr-db"
@@ -3,7 +3,7 @@ Unit tests for rate limiting middleware.
 """
 
 import time
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi import FastAPI, Request
@@ -14,6 +14,14 @@ from valerie.middleware.rate_limit import (
     RateLimitMiddleware,
     RedisStore,
 )
+from valerie.middleware.rate_limiters import (
+    GCRALimiter,
+    RedisRateLimiter,
+    SlidingWindowLimiter,
+    create_rate_limiter,
+)
+
+LIMITS = [(60, 5), (3600, 10)]
 
 
 @pytest.fixture
@@ -164,9 +172,230 @@ class TestRedisStore:
             mock_redis.pipeline.assert_called()
 
 
+class TestGCRALimiter:
+    """Test the in-memory GCRA limiter."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_reject(self):
+        """Test that a burst of `limit` requests is allowed, then rejected."""
+        limiter = GCRALimiter()
+        now = 1_700_000_000.0
+
+        results = [await limiter.hit("client", LIMITS, now) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[5].limit == 5
+        assert results[5].retry_after == pytest.approx(12.0)
+
+    @pytest.mark.asyncio
+    async def test_refills_one_slot_per_interval(self):
+        """Test that a slot frees up every window / limit seconds."""
+        limiter = GCRALimiter()
+        now = 1_700_000_000.0
+        for _ in range(5):
+            await limiter.hit("client", LIMITS, now)
+
+        assert (await limiter.hit("client", LIMITS, now + 11.9)).allowed is False
+        assert (await limiter.hit("client", LIMITS, now + 12.0)).allowed is True
+        assert (await limiter.hit("client", LIMITS, now + 12.0)).allowed is False
+
+    @pytest.mark.asyncio
+    async def test_hour_limit(self):
+        """Test that the longer window rejects once its limit is used up."""
+        limiter = GCRALimiter()
+        now = 1_700_000_000.0
+        allowed = 0
+        for i in range(20):
+            allowed += (await limiter.hit("client", LIMITS, now + i * 13)).allowed
+
+        result = await limiter.hit("client", LIMITS, now + 20 * 13)
+        assert allowed == 10
+        assert result.allowed is False
+        assert result.limit == 10
+
+    @pytest.mark.asyncio
+    async def test_rejected_requests_are_not_counted(self):
+        """Test that rejected requests do not push the next slot back."""
+        limiter = GCRALimiter()
+        now = 1_700_000_000.0
+        for _ in range(50):
+            await limiter.hit("client", LIMITS, now)
+
+        assert (await limiter.hit("client", LIMITS, now + 12.0)).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_sweeps_idle_clients(self):
+        """Test that clients whose windows recovered are forgotten."""
+        limiter = GCRALimiter(sweep_interval=60)
+        now = 1_700_000_000.0
+        await limiter.hit("idle", LIMITS, now)
+        assert len(limiter) == 1
+
+        # The hour window recovers after 360s for one request
+        await limiter.hit("active", LIMITS, now + 300)
+        assert "idle" in limiter.state
+        await limiter.hit("active", LIMITS, now + 400)
+        assert "idle" not in limiter.state
+        assert len(limiter) == 1
+
+
+class TestSlidingWindowLimiter:
+    """Test the in-memory sliding window counter limiter."""
+
+    @pytest.mark.asyncio
+    async def test_limit_within_window(self):
+        """Test that requests beyond the limit in one window are rejected."""
+        limiter = SlidingWindowLimiter()
+        now = 1_700_000_040.0  # Start of a minute
+
+        results = [await limiter.hit("client", LIMITS, now) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[5].reset == pytest.approx(now + results[5].retry_after)
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self):
+        """Test that the previous window's count decays across the next one."""
+        limiter = SlidingWindowLimiter()
+        start = 1_700_000_040.0
+        for _ in range(5):
+            await limiter.hit("client", LIMITS, start)
+
+        # 6s into the next minute the estimate is still 5 * 0.9 = 4.5
+        assert (await limiter.hit("client", LIMITS, start + 66)).allowed is False
+        # Halfway through it is 2.5, leaving room for two more requests
+        results = [await limiter.hit("client", LIMITS, start + 90) for _ in range(3)]
+        assert [r.allowed for r in results] == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_accurate(self):
+        """Test that a request at the advertised retry time is allowed."""
+        limiter = SlidingWindowLimiter()
+        now = 1_700_000_050.0
+        for _ in range(5):
+            await limiter.hit("client", LIMITS, now)
+
+        rejected = await limiter.hit("client", LIMITS, now + 1)
+        retry_at = now + 1 + rejected.retry_after
+
+        assert (await limiter.hit("client", LIMITS, retry_at - 0.5)).allowed is False
+        assert (await limiter.hit("client", LIMITS, retry_at + 0.01)).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_sweeps_idle_clients(self):
+        """Test that clients are forgotten once the following hour window ends."""
+        limiter = SlidingWindowLimiter(sweep_interval=60)
+        now = 1_700_000_000.0
+        await limiter.hit("idle", LIMITS, now)
+
+        await limiter.hit("active", LIMITS, now + 3700)
+        assert "idle" in limiter.state
+        await limiter.hit("active", LIMITS, now + 7300)
+        assert "idle" not in limiter.state
+
+
+class TestRedisRateLimiter:
+    """Test the Redis limiter with a mocked Lua script."""
+
+    def _limiter(self, algorithm: str, script) -> RedisRateLimiter:
+        mock_redis = Mock()
+        mock_redis.register_script = Mock(return_value=script)
+        with patch("redis.asyncio.from_url", return_value=mock_redis):
+            limiter = RedisRateLimiter("redis://localhost:6379", algorithm)
+        mock_redis.register_script.assert_called_once()
+        return limiter
+
+    @pytest.mark.asyncio
+    async def test_single_script_call(self):
+        """Test that one script call checks every window."""
+        script = AsyncMock(return_value=[1, 1, 4, 1_700_000_012_000, 0])
+        limiter = self._limiter("gcra", script)
+
+        result = await limiter.hit("ip:1.2.3.4", LIMITS, 1_700_000_000.0)
+
+        script.assert_awaited_once()
+        kwargs = script.await_args.kwargs
+        assert kwargs["keys"] == ["ratelimit:gcra:ip:1.2.3.4"]
+        assert kwargs["args"] == ["1700000000.0", 60, 5, 3600, 10]
+        assert result.allowed is True
+        assert result.limit == 5
+        assert result.remaining == 4
+        assert result.reset == 1_700_000_012.0
+
+    @pytest.mark.asyncio
+    async def test_rejection_reports_window(self):
+        """Test that the rejecting window's limit and retry time are returned."""
+        script = AsyncMock(return_value=[0, 2, 0, 1_700_000_360_000, 360_000])
+        limiter = self._limiter("sliding_window", script)
+
+        result = await limiter.hit("ip:1.2.3.4", LIMITS, 1_700_000_000.0)
+
+        assert result.allowed is False
+        assert result.limit == 10
+        assert result.retry_after == 360.0
+
+    @pytest.mark.asyncio
+    async def test_fallback_on_redis_error(self):
+        """Test that Redis errors fall back to the in-memory limiter."""
+        script = AsyncMock(side_effect=ConnectionError("Connection refused"))
+        limiter = self._limiter("gcra", script)
+
+        result = await limiter.hit("ip:1.2.3.4", LIMITS, 1_700_000_000.0)
+
+        assert result.allowed is True
+        assert isinstance(limiter.fallback, GCRALimiter)
+        assert "ip:1.2.3.4" in limiter.fallback.state
+
+    def test_fallback_when_redis_unavailable(self):
+        """Test fallback to in-memory when Redis is unavailable."""
+        with patch("redis.asyncio.from_url", side_effect=Exception("Connection failed")):
+            limiter = RedisRateLimiter("redis://localhost:6379", "sliding_window")
+        assert limiter._available is False
+        assert isinstance(limiter.fallback, SlidingWindowLimiter)
+
+    def test_create_rate_limiter(self):
+        """Test limiter construction by algorithm name."""
+        assert isinstance(create_rate_limiter("gcra"), GCRALimiter)
+        assert isinstance(create_rate_limiter("sliding_window"), SlidingWindowLimiter)
+        with patch("redis.asyncio.from_url", return_value=Mock()):
+            assert isinstance(create_rate_limiter("gcra", "redis://x"), RedisRateLimiter)
+        with pytest.raises(ValueError):
+            create_rate_limiter("token_bucket")
+
+
 class TestRateLimitMiddleware:
     """Test rate limiting middleware."""
 
+    @pytest.mark.parametrize("algorithm", ["gcra", "sliding_window", "sliding_log"])
+    def test_algorithms_enforce_minute_limit(self, app, algorithm):
+        """Test that every algorithm rejects the request over the limit."""
+        app.add_middleware(
+            RateLimitMiddleware, enabled=True, per_minute=3, per_hour=10, algorithm=algorithm
+        )
+        client = TestClient(app)
+
+        statuses = [client.get("/test").status_code for _ in range(4)]
+
+        assert statuses == [200, 200, 200, 429]
+
+    def test_algorithm_from_environment(self, app):
+        """Test algorithm selection through the environment."""
+        with patch.dict("os.environ", {"VALERIE_RATE_LIMIT_ALGORITHM": "sliding_window"}):
+            middleware = RateLimitMiddleware(app, redis_url="")
+        assert middleware.algorithm == "sliding_window"
+        assert isinstance(middleware.limiter, SlidingWindowLimiter)
+
+        middleware = RateLimitMiddleware(app, redis_url="", algorithm="sliding_log")
+        assert middleware.limiter is None
+        assert isinstance(middleware.store, InMemoryStore)
+
+    def test_unknown_algorithm(self, app):
+        """Test that an unknown algorithm is rejected at startup."""
+        with pytest.raises(ValueError, match="token_bucket"):
+            RateLimitMiddleware(app, algorithm="token_bucket")
+
     def test_middleware_disabled(self, app):
         """Test that middleware passes through when disabled."""
         app.add_middleware(RateLimitMiddleware, enabled=False)
@@ -0,0 +1,96 @@
+"""Tests for the per-request timing collector."""
+
+import time
+
+import pytest
+
+from valerie.data.sources.sqlite import SQLiteDataSource
+from valerie.infrastructure.request_timing import (
+    RequestTimings,
+    end_request_timing,
+    get_request_timings,
+    record_timing,
+    start_request_timing,
+    timed,
+)
+
+
+class TestRequestTimings:
+    """Tests for RequestTimings."""
+
+    def test_repeated_phases_accumulate(self):
+        """Test durations of a repeated phase add up and keep first-seen order."""
+        timings = RequestTimings("corr-1")
+        timings.record("db", 1.5)
+        timings.record("llm", 10.0)
+        timings.record("db", 2.0)
+
+        assert [(e.name, e.duration_ms, e.count) for e in timings.entries] == [
+            ("db", 3.5, 2),
+            ("llm", 10.0, 1),
+        ]
+        assert timings.duration_ms("db") == 4
+        assert timings.duration_ms("missing") == 0
+
+    def test_measure_records_on_error(self):
+        """Test a block that raises is still measured."""
+        timings = RequestTimings("corr-1")
+        with pytest.raises(RuntimeError):
+            with timings.measure("llm"):
+                time.sleep(0.01)
+                raise RuntimeError("provider down")
+
+        assert timings.entries[0].duration_ms >= 10
+
+    def test_server_timing_header(self):
+        """Test the Server-Timing header format."""
+        timings = RequestTimings("corr-1")
+        timings.record("classification", 0.25)
+        timings.record("llm", 12.34, 'LLM ("groq")')
+
+        header = timings.server_timing()
+        assert header.startswith('classification;dur=0.2, llm;dur=12.3;desc="LLM (groq)", ')
+        assert header.split(", ")[-1].startswith("total;dur=")
+        assert "total" not in timings.server_timing(total=False)
+
+
+class TestRequestScope:
+    """Tests for the current-request collector."""
+
+    def test_no_op_outside_request(self):
+        """Test recording without an active request does nothing."""
+        assert get_request_timings() is None
+        record_timing("db", 1.0)
+        with timed("db"):
+            pass
+
+    def test_keyed_by_correlation_id(self):
+        """Test collectors are registered by correlation ID while active."""
+        timings = start_request_timing("corr-2")
+        try:
+            assert get_request_timings() is timings
+            assert get_request_timings("corr-2") is timings
+            record_timing("guardrails", 0.5)
+        finally:
+            end_request_timing(timings)
+
+        assert timings.entries[0].name == "guardrails"
+        assert get_request_timings() is None
+        assert get_request_timings("corr-2") is None
+
+    @pytest.mark.asyncio
+    async def test_data_source_queries_recorded(self):
+        """Test SQLite data source queries are added to the request's db timing."""
+        data_source = SQLiteDataSource(":memory:")
+        timings = start_request_timing("corr-3")
+        try:
+            await data_source.search_suppliers(name="titanio")
+            await data_source.get_categories()
+        finally:
+            end_request_timing(timings)
+            await data_source.close()
+
+        [entry] = timings.entries
+        assert entry.name == "db"
+        assert entry.count == 2
+        assert entry.duration_ms > 0
@@ -0,0 +1,472 @@
+"""Tests for the SQLite data source."""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import event
+
+from valerie.data.database import SQLiteTuning
+from valerie.data.rankings import refresh_supplier_rankings
+from valerie.data.schema import (
+    Category,
+    Supplier,
+    SupplierCategory,
+    SupplierItem,
+    SupplierRanking,
+)
+from valerie.data.search_index import (
+    CATEGORIES_FTS_TABLE,
+    ITEMS_FTS_TABLE,
+    build_match_query,
+    drop_search_index,
+)
+from valerie.data.sources.sqlite import SQLiteDataSource
+
+
+def seed_data_source(data_source: SQLiteDataSource) -> None:
+    """Populate a data source with a small procurement dataset."""
+    with data_source.db as session:
+        chemicals = Category(
+            name="Controlled Material-Chemicals-Acetone",
+            level1="Controlled Material",
+            level2="Chemicals",
+            level3="Acetone",
+            item_count=3,
+            total_amount=6000.0,
+        )
+        coatings = Category(
+            name="Non-Controlled Service-Químicos-Coating",
+            level1="Non-Controlled Service",
+            level2="Químicos",
+            level3="Coating",
+            item_count=1,
+            total_amount=2500.0,
+        )
+        session.add_all([chemicals, coatings])
+        session.flush()
+
+        acme = Supplier(
+            name="Acme Chemicals", total_orders=10, total_amount=5000.0, avg_order_value=500.0
+        )
+        pacific = Supplier(
+            name="Pacific Coatings", total_orders=4, total_amount=2500.0, avg_order_value=625.0
+        )
+        delta = Supplier(
+            name="Delta Supply", total_orders=2, total_amount=1000.0, avg_order_value=500.0
+        )
+        session.add_all([acme, pacific, delta])
+        session.flush()
+
+        session.add_all(
+            [
+                SupplierItem(
+                    supplier_id=acme.id,
+                    item_code="ACE-100",
+                    description="Acetone technical grade 5 gal",
+                    category_id=chemicals.id,
+                    avg_price=50.0,
+                    min_price=45.0,
+                    max_price=55.0,
+                    total_ordered_amount=4000.0,
+                ),
+                SupplierItem(
+                    supplier_id=delta.id,
+                    item_code="ACE-100",
+                    description="Acetone technical grade 5 gal",
+                    category_id=chemicals.id,
+                    avg_price=60.0,
+                    min_price=60.0,
+                    max_price=60.0,
+                    total_ordered_amount=1000.0,
+                ),
+                SupplierItem(
+                    supplier_id=acme.id,
+                    item_code="IPA-200",
+                    description="Isopropyl alcohol 99%",
+                    category_id=chemicals.id,
+                    avg_price=20.0,
+                    min_price=20.0,
+                    max_price=20.0,
+                    total_ordered_amount=1000.0,
+                ),
+                SupplierItem(
+                    supplier_id=pacific.id,
+                    item_code="CT-1",
+                    description="Primer coating service",
+                    category_id=coatings.id,
+                    avg_price=250.0,
+                    min_price=200.0,
+                    max_price=300.0,
+                    total_ordered_amount=2500.0,
+                ),
+            ]
+        )
+        session.add_all(
+            [
+                SupplierCategory(
+                    supplier_id=acme.id, category_id=chemicals.id, item_count=2, total_amount=5000.0
+                ),
+                SupplierCategory(
+                    supplier_id=delta.id,
+                    category_id=chemicals.id,
+                    item_count=1,
+                    total_amount=1000.0,
+                ),
+                SupplierCategory(
+                    supplier_id=pacific.id,
+                    category_id=coatings.id,
+                    item_count=1,
+                    total_amount=2500.0,
+                ),
+            ]
+        )
+        session.commit()
+
+
+@pytest.fixture(params=[True, False], ids=["fts5", "like"])
+def data_source(request) -> SQLiteDataSource:
+    """Seeded in-memory data source, with and without the FTS5 index."""
+    source = SQLiteDataSource(":memory:")
+    seed_data_source(source)
+    if not request.param:
+        source._fts_enabled = False
+    return source
+
+
+class TestBuildMatchQuery:
+    """Tests for FTS5 MATCH expression building."""
+
+    def test_tokens_become_quoted_prefixes(self):
+        """Test each word becomes a quoted prefix token."""
+        assert build_match_query("acetona grado") == '"acetona"* "grado"*'
+
+    def test_operators_are_neutralized(self):
+        """Test FTS5 syntax in user input is quoted away."""
+        assert build_match_query('level1:foo OR "bar"') == '"level1"* "foo"* "OR"* "bar"*'
+
+    def test_no_tokens_returns_none(self):
+        """Test punctuation-only input has no match expression."""
+        assert build_match_query("%-%") is None
+        assert build_match_query("") is None
+
+
+class TestSearchIndex:
+    """Tests for FTS5 index maintenance."""
+
+    def test_index_created_with_schema(self):
+        """Test the index is created on schema creation."""
+        source = SQLiteDataSource(":memory:")
+        assert source._fts_enabled is True
+
+    @pytest.mark.asyncio
+    async def test_triggers_follow_updates(self):
+        """Test updated descriptions are searchable through the index."""
+        source = SQLiteDataSource(":memory:")
+        seed_data_source(source)
+        with source.db as session:
+            item = session.query(SupplierItem).filter_by(item_code="IPA-200").one()
+            item.description = "Methyl ethyl ketone"
+            session.commit()
+
+        assert await source.search_products("isopropyl") == []
+        results = await source.search_products("ketone")
+        assert [p.item_code for p in results] == ["IPA-200"]
+
+    @pytest.mark.asyncio
+    async def test_existing_database_is_indexed(self, tmp_path):
+        """Test opening a populated database from before the index makes it searchable."""
+        path = tmp_path / "valerie.db"
+        source = SQLiteDataSource(path)
+        with source.db.engine.begin() as connection:
+            drop_search_index(connection)
+            for name in ("ai", "ad", "au"):
+                for table in (ITEMS_FTS_TABLE, CATEGORIES_FTS_TABLE):
+                    connection.exec_driver_sql(f"DROP TRIGGER {table}_{name}")
+        seed_data_source(source)
+        await source.close()
+
+        reopened = SQLiteDataSource(path)
+        try:
+            assert reopened._fts_enabled is True
+            results = await reopened.search_products("acetone")
+            assert {p.item_code for p in results} == {"ACE-100"}
+            suppliers = await reopened.get_category_suppliers("quimicos")
+            assert [s.name for s in suppliers] == ["Pacific Coatings"]
+        finally:
+            await reopened.close()
+
+
+class TestSearch:
+    """Tests for search methods on both FTS5 and LIKE paths."""
+
+    @pytest.mark.asyncio
+    async def test_search_products(self, data_source):
+        """Test product search aggregates across suppliers."""
+        results = await data_source.search_products("acetone")
+        assert len(results) == 1
+        assert results[0].item_code == "ACE-100"
+        assert results[0].supplier_count == 2
+        assert results[0].min_price == 45.0
+        assert results[0].max_price == 60.0
+
+    @pytest.mark.asyncio
+    async def test_search_products_by_code(self, data_source):
+        """Test product search matches item codes."""
+        results = await data_source.search_products("IPA")
+        assert [p.item_code for p in results] == ["IPA-200"]
+
+    @pytest.mark.asyncio
+    async def test_search_products_with_category(self, data_source):
+        """Test product search with a category filter."""
+        assert await data_source.search_products("coating", category="Chemicals") == []
+        results = await data_source.search_products("coating", category="Coating")
+        assert [p.item_code for p in results] == ["CT-1"]
+
+    @pytest.mark.asyncio
+    async def test_search_suppliers_by_product(self, data_source):
+        """Test supplier search by product, ordered by spend."""
+        results = await data_source.search_suppliers(product="acetone")
+        assert [s.name for s in results] == ["Acme Chemicals", "Delta Supply"]
+
+    @pytest.mark.asyncio
+    async def test_search_suppliers_by_category_and_product(self, data_source):
+        """Test supplier search combining category and product filters."""
+        results = await data_source.search_suppliers(category="Chemicals", product="alcohol")
+        assert [s.name for s in results] == ["Acme Chemicals"]
+
+    @pytest.mark.asyncio
+    async def test_get_category_suppliers(self, data_source):
+        """Test category suppliers ordered by category spend."""
+        results = await data_source.get_category_suppliers("chemicals")
+        assert [s.name for s in results] == ["Acme Chemicals", "Delta Supply"]
+
+    @pytest.mark.asyncio
+    async def test_no_match(self, data_source):
+        """Test searches with no hits return empty lists."""
+        assert await data_source.search_products("titanium") == []
+        assert await data_source.get_category_suppliers("forgings") == []
+
+
+class TestFullTextSearch:
+    """Tests for FTS5-only matching behavior."""
+
+    @pytest.mark.asyncio
+    async def test_accent_insensitive(self):
+        """Test diacritics are ignored when matching categories."""
+        source = SQLiteDataSource(":memory:")
+        seed_data_source(source)
+        results = await source.get_category_suppliers("quimicos")
+        assert [s.name for s in results] == ["Pacific Coatings"]
+
+    @pytest.mark.asyncio
+    async def test_prefix_match(self):
+        """Test partial words match as prefixes."""
+        source = SQLiteDataSource(":memory:")
+        seed_data_source(source)
+        results = await source.search_products("aceton")
+        assert [p.item_code for p in results] == ["ACE-100"]
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+class TestSupplierDetail:
+    """Tests for supplier detail and comparison."""
+
+    @pytest.fixture
+    def source(self) -> SQLiteDataSource:
+        source = SQLiteDataSource(":memory:")
+        seed_data_source(source)
+        return source
+
+    @pytest.mark.asyncio
+    async def test_detail_by_name(self, source):
+        """Test detail lookup by partial name."""
+        detail = await source.get_supplier_detail("pacific")
+        assert detail.name == "Pacific Coatings"
+        assert detail.rank_by_volume == 2
+        assert detail.market_share == pytest.approx(29.41, abs=0.01)
+        assert [c.level3 for c in detail.top_categories] == ["Coating"]
+        assert [i.item_code for i in detail.top_items] == ["CT-1"]
+
+    @pytest.mark.asyncio
+    async def test_detail_by_id(self, source):
+        """Test detail lookup by numeric ID."""
+        detail = await source.get_supplier_detail("1")
+        assert detail.name == "Acme Chemicals"
+        assert detail.rank_by_volume == 1
+        assert [i.item_code for i in detail.top_items] == ["ACE-100", "IPA-200"]
+        assert detail.top_categories[0].total_amount == 5000.0
+
+    @pytest.mark.asyncio
+    async def test_detail_not_found(self, source):
+        """Test unknown suppliers return None."""
+        assert await source.get_supplier_detail("Nonexistent") is None
+
+    @pytest.mark.asyncio
+    async def test_compare_preserves_order(self, source):
+        """Test comparison keeps the requested order and skips unknown IDs."""
+        result = await source.compare_suppliers(["delta", "missing", "1"])
+        assert [s.name for s in result.suppliers] == ["Delta Supply", "Acme Chemicals"]
+        assert [s.rank_by_volume for s in result.suppliers] == [3, 1]
+        assert result.common_categories == ["Controlled Material-Chemicals-Acetone"]
+        assert result.metrics["total_amount"]["Delta Supply"] == 1000.0
+        assert result.recommendations[0].startswith("Acme Chemicals")
+
+    @pytest.mark.asyncio
+    async def test_compare_empty(self, source):
+        """Test comparing nothing returns an empty result."""
+        result = await source.compare_suppliers([])
+        assert result.suppliers == []
+        assert result.common_categories == []
+
+    def test_compare_query_count_is_constant(self, source):
+        """Test comparison uses the same number of queries for any supplier count."""
+        counts = []
+        for ids in (["1"], ["1", "2"], ["1", "2", "3", "acme", "pacific"]):
+            with QueryCounter(source.db.engine) as counter:
+                source._call_with_session(source._compare_suppliers_sync, ids)
+            counts.append(counter.count)
+        assert counts[0] == counts[1] == counts[2]
+
+
+class TestSupplierRankings:
+    """Tests for the precomputed supplier_rankings table."""
+
+    @pytest.fixture
+    def source(self) -> SQLiteDataSource:
+        source = SQLiteDataSource(":memory:")
+        seed_data_source(source)
+        return source
+
+    def test_refresh_computes_ranks(self, source):
+        """Test ranks, market share and percentile after a refresh."""
+        assert refresh_supplier_rankings(source.db.engine) == 3
+        with source.db as session:
+            rankings = {r.supplier.name: r for r in session.query(SupplierRanking).all()}
+        acme = rankings["Acme Chemicals"]
+        assert acme.rank_by_amount == 1
+        assert acme.rank_by_orders == 1
+        assert acme.rank_by_items == 1
+        assert acme.item_count == 2
+        assert acme.market_share == pytest.approx(58.82, abs=0.01)
+        assert acme.percentile == pytest.approx(100.0)
+        assert rankings["Delta Supply"].percentile == pytest.approx(0.0)
+        # Pacific and Delta both have one item and share the rank
+        assert rankings["Pacific Coatings"].rank_by_items == 2
+        assert rankings["Delta Supply"].rank_by_items == 2
+
+    def test_refresh_replaces_previous_rows(self, source):
+        """Test a second refresh reflects updated aggregates."""
+        refresh_supplier_rankings(source.db.engine)
+        with source.db as session:
+            delta = session.query(Supplier).filter_by(name="Delta Supply").one()
+            delta.total_amount = 9000.0
+            session.commit()
+        assert refresh_supplier_rankings(source.db.engine) == 3
+        detail = source._call_with_session(source._get_supplier_detail_sync, "delta")
+        assert detail.rank_by_volume == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("refresh", [True, False], ids=["rankings", "live"])
+    @pytest.mark.parametrize(
+        "by,expected,metric",
+        [
+            ("amount", ["Acme Chemicals", "Pacific Coatings"], 5000.0),
+            ("orders", ["Acme Chemicals", "Pacific Coatings"], 10.0),
+            ("items", ["Acme Chemicals"], 2.0),
+        ],
+    )
+    async def test_top_suppliers(self, source, refresh, by, expected, metric):
+        """Test top suppliers match with and without precomputed rankings."""
+        if refresh:
+            refresh_supplier_rankings(source.db.engine)
+        results = await source.get_top_suppliers(by=by, limit=len(expected))
+        assert [r.supplier_name for r in results] == expected
+        assert [r.rank for r in results] == list(range(1, len(expected) + 1))
+        assert results[0].metric_value == metric
+
+    @pytest.mark.asyncio
+    async def test_detail_uses_rankings(self, source):
+        """Test detail rank and share match the live computation."""
+        live = await source.get_supplier_detail("pacific")
+        refresh_supplier_rankings(source.db.engine)
+        ranked = await source.get_supplier_detail("pacific")
+        assert ranked.rank_by_volume == live.rank_by_volume == 2
+        assert ranked.market_share == live.market_share
+
+
+class TestConcurrency:
+    """Tests for the dedicated executor, pragmas and async engine mode."""
+
+    @pytest.fixture
+    def file_source(self, tmp_path) -> SQLiteDataSource:
+        source = SQLiteDataSource(tmp_path / "valerie.db", tuning=SQLiteTuning(pool_size=3))
+        seed_data_source(source)
+        yield source
+        asyncio.run(source.close())
+
+    def test_pragmas_applied(self, file_source):
+        """Test read-optimized pragmas are set on pooled connections."""
+        with file_source.db.engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert connection.exec_driver_sql("PRAGMA cache_size").scalar() == -65536
+
+    def test_executor_sized_to_pool(self, file_source):
+        """Test the query executor defaults to the pool size."""
+        assert file_source._executor._max_workers == 3
+
+    @pytest.mark.asyncio
+    async def test_queries_run_on_dedicated_executor(self, file_source):
+        """Test queries run on the data source's own threads."""
+        thread_name = await file_source._run_sync(lambda session: threading.current_thread().name)
+        assert thread_name.startswith("valerie-db")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries(self, file_source):
+        """Test concurrent calls each get their own session."""
+        results = await asyncio.gather(
+            *[file_source.get_supplier_detail(name) for name in ["acme", "pacific", "delta"] * 10]
+        )
+        assert [r.name for r in results[:3]] == [
+            "Acme Chemicals",
+            "Pacific Coatings",
+            "Delta Supply",
+        ]
+        assert len({r.name for r in results}) == 3
+
+    @pytest.mark.asyncio
+    async def test_async_engine_mode(self, tmp_path):
+        """Test queries through the aiosqlite engine."""
+        pytest.importorskip("aiosqlite")
+        pytest.importorskip("greenlet")
+        source = SQLiteDataSource(tmp_path / "valerie.db", async_engine=True)
+        seed_data_source(source)
+        try:
+            detail = await source.get_supplier_detail("acme")
+            assert detail.name == "Acme Chemicals"
+            assert await source.health_check() is True
+        finally:
+            await source.close()
+
+    def test_async_engine_rejects_memory(self):
+        """Test async engine mode requires a file database."""
+        with pytest.raises(ValueError):
+            SQLiteDataSource(":memory:", async_engine=True)
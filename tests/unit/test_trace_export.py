@@ -0,0 +1,265 @@
+"""Tests for the background trace export pipeline."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from valerie.infrastructure.observability import LangfuseBackend, ObservabilityManager
+from valerie.infrastructure.trace_export import TraceEvent, TraceExportQueue
+
+
+class Recorder:
+    """Collects exported batches and the threads they ran on."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches: list[list[TraceEvent]] = []
+        self.threads: set[int] = set()
+        self.delay = delay
+
+    def __call__(self, batch):
+        if self.delay:
+            time.sleep(self.delay)
+        self.threads.add(threading.get_ident())
+        self.batches.append(batch)
+
+    @property
+    def ids(self) -> list[str]:
+        return [e.trace_id for batch in self.batches for e in batch]
+
+
+def event(trace_id: str) -> TraceEvent:
+    return TraceEvent("start_trace", trace_id, {"name": "chat", "metadata": None})
+
+
+def events_metric(result: str) -> float:
+    return REGISTRY.get_sample_value("valerie_trace_export_events_total", {"result": result}) or 0.0
+
+
+class TestTraceExportQueue:
+    """Tests for TraceExportQueue."""
+
+    @pytest.mark.asyncio
+    async def test_events_exported_in_order_off_loop(self):
+        """Test events are exported in order from a worker thread."""
+        recorder = Recorder()
+        queue = TraceExportQueue(recorder, flush_interval=0.01)
+        for i in range(5):
+            assert queue.submit(event(str(i)))
+        await queue.stop()
+
+        assert recorder.ids == ["0", "1", "2", "3", "4"]
+        assert threading.get_ident() not in recorder.threads
+        assert queue.exported == 5
+
+    @pytest.mark.asyncio
+    async def test_batches(self):
+        """Test a full batch wakes the drain task and events go out in batches."""
+        recorder = Recorder()
+        queue = TraceExportQueue(recorder, batch_size=3, flush_interval=10)
+        queue.submit(event("0"))
+        queue.submit(event("1"))
+        await asyncio.sleep(0.05)
+        assert recorder.batches == []
+
+        # Filling a batch exports without waiting for the interval
+        queue.submit(event("2"))
+        await asyncio.sleep(0.05)
+        assert recorder.ids == ["0", "1", "2"]
+
+        for i in range(3, 10):
+            queue.submit(event(str(i)))
+        await queue.stop()
+        assert [len(batch) for batch in recorder.batches] == [3, 3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_wait_for_exporter(self):
+        """Test submit returns immediately while the exporter is slow."""
+        queue = TraceExportQueue(Recorder(delay=0.2), batch_size=1, flush_interval=0.01)
+        queue.submit(event("a"))
+        await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        for i in range(100):
+            queue.submit(event(str(i)))
+        assert time.perf_counter() - start < 0.05
+        await queue.stop(drain=False)
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_when_full(self):
+        """Test the newest events are dropped when the queue is full."""
+        recorder = Recorder()
+        dropped_before = events_metric("dropped")
+        queue = TraceExportQueue(recorder, max_size=2, flush_interval=10)
+
+        results = [queue.submit(event(str(i))) for i in range(4)]
+        await queue.stop()
+
+        assert results == [True, True, False, False]
+        assert recorder.ids == ["0", "1"]
+        assert queue.dropped == 2
+        assert events_metric("dropped") - dropped_before == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_when_full(self):
+        """Test the oldest events are evicted with the oldest policy."""
+        recorder = Recorder()
+        queue = TraceExportQueue(recorder, max_size=2, flush_interval=10, drop_policy="oldest")
+
+        results = [queue.submit(event(str(i))) for i in range(4)]
+        await queue.stop()
+
+        assert results == [True, True, True, True]
+        assert recorder.ids == ["2", "3"]
+        assert queue.dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_metric(self):
+        """Test the queue depth gauge follows submissions and drains."""
+        queue = TraceExportQueue(Recorder(), flush_interval=10)
+        queue.submit(event("a"))
+        queue.submit(event("b"))
+        assert REGISTRY.get_sample_value("valerie_trace_export_queue_depth") == 2
+
+        await queue.stop()
+        assert REGISTRY.get_sample_value("valerie_trace_export_queue_depth") == 0
+
+    @pytest.mark.asyncio
+    async def test_exporter_failure_counted(self):
+        """Test exporter errors are counted and do not stop the queue."""
+        calls = []
+
+        def flaky(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise ConnectionError("langfuse unreachable")
+
+        queue = TraceExportQueue(flaky, batch_size=1, flush_interval=0.01)
+        queue.submit(event("a"))
+        queue.submit(event("b"))
+        await queue.stop()
+
+        assert queue.failed == 1
+        assert queue.exported == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_without_drain_drops_pending(self):
+        """Test pending events are counted as dropped when not drained."""
+        recorder = Recorder()
+        queue = TraceExportQueue(recorder, flush_interval=10)
+        queue.submit(event("a"))
+        await queue.stop(drain=False)
+
+        assert recorder.batches == []
+        assert queue.dropped == 1
+        assert len(queue) == 0
+
+    def test_exports_inline_without_event_loop(self):
+        """Test events are exported immediately outside an event loop."""
+        recorder = Recorder()
+        queue = TraceExportQueue(recorder)
+
+        assert queue.submit(event("a"))
+        assert recorder.ids == ["a"]
+        assert not queue.running
+
+    def test_unknown_drop_policy(self):
+        """Test an unknown drop policy is rejected."""
+        with pytest.raises(ValueError, match="random"):
+            TraceExportQueue(Recorder(), drop_policy="random")
+
+
+class TestLangfuseExport:
+    """Tests for LangfuseBackend's queued SDK calls."""
+
+    @pytest.fixture
+    def backend(self):
+        backend = LangfuseBackend()
+        backend._client = MagicMock()
+        backend._export_queue.flush_interval = 0.01
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_sdk_calls_are_deferred(self, backend):
+        """Test tracing calls return before any Langfuse SDK call is made."""
+        trace_id = backend.start_trace("chat", {"session_id": "s1"})
+        span_id = backend.start_span(trace_id, "agent:search")
+        backend.log_llm_call(trace_id, "groq", "llama", [], "ok", {"input_tokens": 3})
+        backend.end_span(trace_id, span_id, "error", "boom")
+        backend.end_trace(trace_id, output="done")
+
+        backend._client.trace.assert_not_called()
+        assert backend._fallback.get_trace(trace_id)["status"] == "error"
+
+        await backend.aclose()
+
+        backend._client.trace.assert_called_once_with(
+            id=trace_id, name="chat", metadata={"session_id": "s1"}
+        )
+        langfuse_trace = backend._client.trace.return_value
+        langfuse_trace.span.assert_called_once_with(id=span_id, name="agent:search", metadata=None)
+        langfuse_trace.span.return_value.end.assert_called_once_with(output="boom", level="ERROR")
+        assert langfuse_trace.generation.call_args.kwargs["usage"] == {"input": 3, "output": 0}
+        langfuse_trace.update.assert_called_once_with(output="done")
+        backend._client.flush.assert_called_once()
+        assert [s["span_id"] for s in backend._fallback.get_trace(trace_id)["spans"]] == [span_id]
+        assert backend._traces == {}
+        assert backend._spans == {}
+
+    @pytest.mark.asyncio
+    async def test_sdk_error_does_not_drop_batch(self, backend):
+        """Test one failing SDK call does not prevent the rest of the batch."""
+        backend._client.trace.side_effect = [RuntimeError("bad payload"), MagicMock()]
+        failed_before = events_metric("failed")
+        backend.start_trace("first")
+        second = backend.start_trace("second")
+        await backend.aclose()
+
+        assert list(backend._traces) == [second]
+        assert backend._export_queue.failed == 1
+        assert backend._export_queue.exported == 1
+        assert events_metric("failed") - failed_before == 1
+
+    @pytest.mark.asyncio
+    async def test_payloads_snapshot_at_submit(self, backend):
+        """Test payloads mutated after a tracing call export as submitted."""
+        metadata = {"tags": ["a"]}
+        messages = [{"role": "user", "content": "hola"}]
+        trace_id = backend.start_trace("chat", metadata)
+        backend.log_llm_call(trace_id, "groq", "llama", messages, "ok")
+        metadata["tags"].append("b")
+        messages[0]["content"] = "changed"
+        await backend.aclose()
+
+        assert backend._client.trace.call_args.kwargs["metadata"] == {"tags": ["a"]}
+        generation = backend._client.trace.return_value.generation
+        assert generation.call_args.kwargs["input"] == [{"role": "user", "content": "hola"}]
+
+    @pytest.mark.asyncio
+    async def test_open_traces_bounded(self, backend):
+        """Test traces whose end events never arrive are evicted oldest first."""
+        backend.max_open = 2
+        ids = [backend.start_trace(f"t{i}") for i in range(4)]
+        for trace_id in ids:
+            backend.start_span(trace_id, "agent")
+        await backend.aclose()
+
+        assert list(backend._traces) == ids[2:]
+        assert len(backend._spans) == 2
+
+    @pytest.mark.asyncio
+    async def test_manager_shutdown_drains_queue(self, backend):
+        """Test ObservabilityManager.shutdown drains the export queue."""
+        manager = ObservabilityManager()
+        manager._backend = backend
+        with manager.trace("chat"):
+            pass
+        assert len(backend._export_queue) == 2
+
+        await manager.shutdown()
+
+        assert len(backend._export_queue) == 0
+        backend._client.trace.return_value.update.assert_called_once()
@@ -1,12 +1,23 @@
 """Tests for utility functions."""
 
+import re
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
 from valerie.models import Supplier
+from valerie.utils.cache import TTLLRUCache
+from valerie.utils.embeddings import CentroidClassifier, HashedNgramEmbedder
 from valerie.utils.helpers import (
     format_risk_level,
     format_supplier_list,
     safe_get,
     truncate_text,
 )
+from valerie.utils.intent_matcher import IntentMatcher, literal_prefix
+from valerie.utils.scanner import KeywordScanner, PatternScanner, ScanMatch, ScanRule
+from valerie.utils.text_classifier import TfidfLogisticClassifier, tokenize
 
 
 class TestFormatSupplierList:
@@ -168,3 +179,327 @@ class TestSafeGet:
         """Test empty dictionary."""
         result = safe_get({}, "key")
         assert result is None
+
+
+class TestTTLLRUCache:
+    """Tests for the TTLLRUCache."""
+
+    def test_get_and_set(self):
+        """Test storing and reading values."""
+        cache = TTLLRUCache(max_entries=4)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+        assert "a" in cache
+
+    def test_lru_eviction(self):
+        """Test least-recently-used entries are evicted first."""
+        cache = TTLLRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = TTLLRUCache(ttl_seconds=10)
+        with patch("valerie.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl_seconds=60)
+        with patch("valerie.utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+            assert cache.get("b") == 2
+
+    def test_clear_and_delete(self):
+        """Test removing entries."""
+        cache = TTLLRUCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("a")
+        assert "a" not in cache
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_size(self):
+        """Test max_entries must be positive."""
+        with pytest.raises(ValueError):
+            TTLLRUCache(max_entries=0)
+
+
+class TestPatternScanner:
+    """Tests for PatternScanner."""
+
+    @pytest.fixture
+    def scanner(self):
+        return PatternScanner(
+            [
+                ScanRule("ssn", r"\b\d{3}-\d{2}-\d{4}\b", requires=r"\d"),
+                ScanRule("itin", r"\b9\d{2}-\d{2}-\d{4}\b", requires=r"\d"),
+                ScanRule("email", r"\b\w+@\w+\.\w+\b", requires="@"),
+            ]
+        )
+
+    def test_matched_reports_overlapping_rules(self, scanner):
+        """Test every matching rule is reported, even on the same span."""
+        assert scanner.matched("id 912-34-5678") == ["ssn", "itin"]
+
+    def test_scan_reports_all_matches_in_order(self, scanner):
+        """Test scan returns every match ordered by position."""
+        text = "a@b.com then 123-45-6789 and 912-34-5678"
+
+        assert scanner.scan(text) == [
+            ScanMatch("email", 0, 7),
+            ScanMatch("ssn", 13, 24),
+            ScanMatch("ssn", 29, 40),
+            ScanMatch("itin", 29, 40),
+        ]
+
+    def test_search_stops_at_first_rule(self, scanner):
+        """Test early exit returns the first matching rule."""
+        assert scanner.search("mail a@b.com 123-45-6789") == ScanMatch("ssn", 13, 24)
+        assert scanner.search("nothing here") is None
+
+    def test_prerequisite_skips_rules(self):
+        """Test rules are skipped when their prerequisite is absent."""
+        scanner = PatternScanner([ScanRule("word", r"\bcat\b", requires=r"\d")])
+
+        assert scanner.matched("cat") == []
+        assert scanner.matched("cat 1") == ["word"]
+
+    def test_max_chars_caps_scan(self, scanner):
+        """Test text beyond the cap is ignored."""
+        text = "x" * 100 + " 123-45-6789"
+
+        assert scanner.matched(text, max_chars=50) == []
+        assert PatternScanner({"ssn": r"\d{3}-\d{2}"}, max_chars=50).scan(text) == []
+        assert scanner.matched(text) == ["ssn"]
+
+    def test_accepts_mapping(self):
+        """Test a name-to-pattern mapping is accepted with flags."""
+        scanner = PatternScanner({"dan": r"dan\s+mode"}, flags=re.IGNORECASE)
+
+        assert scanner.matched("Enable DAN mode") == ["dan"]
+
+
+class TestKeywordScanner:
+    """Tests for KeywordScanner."""
+
+    def test_finds_nested_keywords(self):
+        """Test keywords inside other keywords are found."""
+        scanner = KeywordScanner(["classified", "controlled unclassified"])
+
+        assert scanner.matched("controlled unclassified info") == [
+            "classified",
+            "controlled unclassified",
+        ]
+
+    def test_scan_reports_every_occurrence(self):
+        """Test each occurrence is reported with its position."""
+        scanner = KeywordScanner(["itar", "ear99"])
+
+        assert scanner.scan("itar ear99 itar") == [
+            ScanMatch("itar", 0, 4),
+            ScanMatch("ear99", 5, 10),
+            ScanMatch("itar", 11, 15),
+        ]
+
+    def test_max_chars(self):
+        """Test the size cap."""
+        scanner = KeywordScanner(["itar"], max_chars=3)
+
+        assert scanner.matched("itar") == []
+
+
+class TestIntentMatcher:
+    """Tests for IntentMatcher."""
+
+    @pytest.fixture
+    def matcher(self):
+        return IntentMatcher(
+            {
+                "comparison": [r"compara(r)?\s+precios?", r"\svs\.?\s"],
+                "price": [r"precio\s+de", r"cuánto\s+cuesta\s+el\s+item"],
+                "greeting": [r"^hola\b"],
+            },
+            priority=["comparison", "price", "greeting"],
+            confidence=lambda pattern: 0.85 if len(pattern) > 15 else 0.75,
+        )
+
+    def test_literal_prefix(self):
+        """Test the literal prefix stops at metacharacters and quantifiers."""
+        assert literal_prefix(r"precio\s+de") == "precio"
+        assert literal_prefix(r"proveedores?\s+de") == "proveedore"
+        assert literal_prefix(r"^hola\b") == "hola"
+        assert literal_prefix(r"\svs\.?\s") == ""
+        assert literal_prefix("ranking") == "ranking"
+
+    def test_literal_prefix_with_alternation(self):
+        """Test top-level alternatives leave no common prefix."""
+        assert literal_prefix("foo|bar") == ""
+        assert literal_prefix(r"^precio|coste") == ""
+        assert literal_prefix(r"precio (de|del)") == "precio "
+        assert literal_prefix(r"precio[|]de") == "precio"
+        assert literal_prefix(r"precio\|de") == "precio"
+
+    def test_alternation_matches_every_branch(self):
+        """Test a pattern with top-level alternatives matches its later branches."""
+        matcher = IntentMatcher({"a": ["foo|bar"]})
+
+        assert set(matcher.scores("bar")) == {"a"}
+        assert set(matcher.scores("foo")) == {"a"}
+        assert matcher.scores("baz") == {}
+
+    def test_priority_winner_with_scores(self, matcher):
+        """Test every intent is scored and the priority winner returned."""
+        match = matcher.classify("Comparar precios: precio de A vs B")
+
+        assert match.intent == "comparison"
+        assert match.confidence == 0.85
+        assert match.scores == {"comparison": 0.85, "price": 0.75}
+
+    def test_first_matching_pattern_sets_confidence(self, matcher):
+        """Test a label's confidence comes from its first matching pattern."""
+        match = matcher.classify("precio de? cuánto cuesta el item 4")
+
+        assert (match.intent, match.confidence) == ("price", 0.75)
+
+    def test_anchored_pattern(self, matcher):
+        """Test anchors are still honoured after the prefix test."""
+        assert matcher.classify("Hola, buenas").intent == "greeting"
+        assert matcher.classify("dije hola").intent is None
+
+    def test_default_when_nothing_matches(self):
+        """Test the default label and confidence are returned."""
+        matcher = IntentMatcher({"greeting": ["hi"]}, default=("unknown", 0.45), literal=True)
+
+        assert matcher.classify("weather?") == ("unknown", 0.45, {})
+
+    def test_literal_keywords_match_substrings(self):
+        """Test literal keywords behave like ``kw in message.lower()``."""
+        matcher = IntentMatcher(
+            {"blocked": ["system:", "<script"], "greeting": ["hi"]},
+            confidence={"blocked": 1.0, "greeting": 0.98},
+            literal=True,
+        )
+
+        assert matcher.classify("SYSTEM: hi").intent == "blocked"
+        assert matcher.classify("this").scores == {"greeting": 0.98}
+
+    def test_classify_many(self, matcher):
+        """Test batch classification keeps input order."""
+        results = matcher.classify_many(["hola", "precio de x", "nada"])
+
+        assert [r.intent for r in results] == ["greeting", "price", None]
+
+
+class TestTfidfLogisticClassifier:
+    """Tests for TfidfLogisticClassifier."""
+
+    @pytest.fixture
+    def model(self):
+        return TfidfLogisticClassifier().fit(
+            {
+                "price": ["cuánto cuesta el item", "precio de la acetona", "costo de guantes"],
+                "browse": ["qué categorías hay", "lista de categorías", "tipos de productos"],
+            }
+        )
+
+    def test_tokenize_folds_accents(self):
+        """Test accents and punctuation are removed."""
+        assert tokenize("¿Cuánto CUESTA?") == ["cuanto", "cuesta"]
+
+    def test_predicts_examples_confidently(self, model):
+        """Test training examples are classified with high probability."""
+        label, probability = model.predict("Precio de la acetona")
+
+        assert label == "price"
+        assert probability > 0.8
+
+    def test_unknown_text_is_uncertain(self, model):
+        """Test text with no known words gets near-uniform probabilities."""
+        probabilities = model.predict_proba("hello world")
+
+        assert set(probabilities) == {"price", "browse"}
+        assert max(probabilities.values()) < 0.6
+
+    def test_requires_training(self):
+        """Test predicting before fit raises."""
+        with pytest.raises(RuntimeError):
+            TfidfLogisticClassifier().predict("precio")
+
+
+class TestHashedNgramEmbedder:
+    """Tests for HashedNgramEmbedder."""
+
+    def test_unit_vectors(self):
+        """Test embeddings are normalized and deterministic."""
+        embedder = HashedNgramEmbedder(dimensions=256)
+        vector = embedder.embed("Busco proveedores de guantes")
+
+        assert vector.shape == (256,)
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+        assert np.array_equal(vector, embedder.embed("busco proveedores de guantes"))
+
+    def test_empty_text(self):
+        """Test text without words embeds to zeros."""
+        assert not HashedNgramEmbedder().embed("¿?").any()
+
+    def test_inflections_are_similar(self):
+        """Test character n-grams make word variants close."""
+        embedder = HashedNgramEmbedder()
+        base = embedder.embed("categorías de químicos")
+
+        assert base @ embedder.embed("categoria quimico") > base @ embedder.embed("top ranking")
+
+
+class TestCentroidClassifier:
+    """Tests for CentroidClassifier."""
+
+    @pytest.fixture
+    def classifier(self):
+        return CentroidClassifier(
+            {
+                "price": ["cuánto cuesta el item", "precio de la acetona", "costo de guantes"],
+                "browse": ["qué categorías hay", "lista de categorías", "tipos de productos"],
+                "empty": [],
+            }
+        )
+
+    def test_predict(self, classifier):
+        """Test the closest centroid wins and empty labels are skipped."""
+        label, similarity = classifier.predict("precio de los guantes")
+
+        assert label == "price"
+        assert 0 < similarity <= 1
+        assert set(classifier.scores("hola")) == {"price", "browse"}
+
+    def test_predict_many_matches_predict(self, classifier):
+        """Test batch classification agrees with single predictions."""
+        texts = ["categorias disponibles", "cuanto cuesta", "hola"]
+
+        batch = classifier.predict_many(texts)
+
+        assert [label for label, _ in batch] == [classifier.predict(t)[0] for t in texts]
+        assert np.allclose([s for _, s in batch], [classifier.predict(t)[1] for t in texts])
+
+    def test_centroids_are_cached(self):
+        """Test identical example sets reuse the computed centroid."""
+        examples = {"p": ["precio de prueba para la caché"]}
+        CentroidClassifier(examples)
+        embedder = HashedNgramEmbedder()
+
+        with patch.object(embedder, "embed_many", wraps=embedder.embed_many) as embed_many:
+            CentroidClassifier(examples, embedder)
+
+        embed_many.assert_not_called()
+
+    def test_no_labels(self):
+        """Test a classifier without examples predicts nothing."""
+        classifier = CentroidClassifier({})
+
+        assert classifier.predict("hola") == (None, 0.0)
+        assert classifier.predict_many(["hola"]) == [(None, 0.0)]